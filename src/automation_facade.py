@@ -123,8 +123,10 @@ class AutomationFacade:
         self._validate_non_empty(job_application_profile, "Job Application Profile object")
 
         self.job_application_profile = job_application_profile
-        # Pass profile to components that need it *now*? Or wait until configure/run?
-        # Let's assume components get configured later or access via facade if needed.
+        # The task manager seeds the answer bank from the profile when processing starts
+        if hasattr(self.task_manager, 'set_job_application_profile'):
+             self.task_manager.set_job_application_profile(job_application_profile)
+             logger.debug("Job application profile passed to Task Manager.")
         self.state.job_application_profile_set = True
         logger.debug("Job application profile set successfully.")
 
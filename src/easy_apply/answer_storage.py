@@ -1,22 +1,59 @@
 # src/easy_apply/answer_storage.py
 """
-Handles the storage and retrieval of previously used answers for form fields,
-typically stored in a JSON file.
+Handles the storage and retrieval of previously used answers for form fields.
+
+Answers are indexed in memory by (sanitized question, field type), so lookups and
+duplicate checks are constant-time, and persisted to an append-only JSONL file
+(one answer per line): saving an answer appends a single line instead of
+rewriting the whole answer bank. An existing legacy `answers.json` list is
+imported into the JSONL file on first use and left in place.
+
+Questions without an exact match fall back to a similarity index over the stored
+questions (see `question_index.py`), so rephrased questions reuse stored answers.
+
+Entries whose "source" ends in REJECTED_SOURCE_SUFFIX record an answer that was
+obtained but rejected (e.g. an LLM answer outside the field's options). They are
+kept so the question is not asked again, but are never returned as answers.
 """
 import json
 import re
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from loguru import logger
 
+from .question_index import QuestionSimilarityIndex
+
 # Default path relative to project root or data folder - consider making configurable
-DEFAULT_ANSWERS_FILENAME = "answers.json"
+DEFAULT_ANSWERS_FILENAME = "answers.jsonl"
+LEGACY_ANSWERS_FILENAME = "answers.json" # JSON list written by earlier versions
+REJECTED_SOURCE_SUFFIX = "_rejected" # Source tag suffix of recorded answers that must not be reused
 DEFAULT_OUTPUT_DIR = Path("data_folder/output") # Example default
 
+AnswerKey = Tuple[str, str] # (sanitized question, field type)
+
+
+@lru_cache(maxsize=4096)
+def _sanitize(text: str) -> str:
+    """Memoized body of `AnswerStorage.sanitize_text` (form labels repeat across fields and jobs)."""
+    # Lowercase and strip whitespace
+    sanitized = text.lower().strip()
+    # Replace quotes, backslashes, newlines, carriage returns with spaces
+    sanitized = re.sub(r'["\\\n\r]', ' ', sanitized)
+    # Remove trailing commas (often seen in scraped labels)
+    sanitized = sanitized.rstrip(",")
+    # Remove control characters and DEL
+    sanitized = re.sub(r"[\x00-\x1F\x7F]", "", sanitized)
+    # Normalize multiple whitespace characters to a single space
+    sanitized = re.sub(r'\s+', ' ', sanitized).strip()
+    return sanitized
+
+
 class AnswerStorage:
     """
     Manages storing and retrieving answers to previously encountered form questions
-    to speed up form filling. Answers are stored in a JSON file.
+    to speed up form filling. Answers are stored in an append-only JSONL file.
     """
 
     def __init__(self, output_dir: Path = DEFAULT_OUTPUT_DIR):
@@ -24,7 +61,7 @@ class AnswerStorage:
         Initializes the AnswerStorage.
 
         Args:
-            output_dir (Path): The directory where the answers JSON file resides or will be created.
+            output_dir (Path): The directory where the answers file resides or will be created.
                                Defaults to DEFAULT_OUTPUT_DIR.
         """
         if not isinstance(output_dir, Path):
@@ -32,18 +69,29 @@ class AnswerStorage:
 
         self.output_dir: Path = output_dir
         self.output_file: Path = self.output_dir / DEFAULT_ANSWERS_FILENAME
-        self.all_questions: List[Dict[str, Any]] = [] # Initialize empty
+        self.legacy_file: Path = self.output_dir / LEGACY_ANSWERS_FILENAME
+        self._answers: Dict[AnswerKey, Dict[str, Any]] = {} # (sanitized question, type) -> stored item
+        self._rejected: Set[AnswerKey] = set() # Questions with a recorded, unusable answer
+        self._similar = QuestionSimilarityIndex() # Fuzzy fallback for rephrased questions
+        self._lock = threading.Lock()
 
         try:
              # Ensure directory exists during initialization
              self.output_dir.mkdir(parents=True, exist_ok=True)
-             self.all_questions = self._load_questions_from_json() # Load existing answers
-             logger.info(f"AnswerStorage initialized. Loaded {len(self.all_questions)} answers from {self.output_file}")
+             if not self.output_file.exists() and self.legacy_file.exists(): self._import_legacy_json()
+             self._load_answers() # Load existing answers
+             logger.info(f"AnswerStorage initialized. Loaded {len(self._answers)} answers from {self.output_file}")
         except Exception as e:
              logger.error(f"Failed to initialize AnswerStorage or load answers from {self.output_file}: {e}", exc_info=True)
-             # Continue with empty list, but log error
-             self.all_questions = []
+             # Continue with empty index, but log error
+             self._answers = {}
+             self._rejected = set()
+             self._similar = QuestionSimilarityIndex()
 
+    @property
+    def all_questions(self) -> List[Dict[str, Any]]:
+        """All stored answers, in the order they were saved."""
+        return list(self._answers.values())
 
     def sanitize_text(self, text: Optional[str]) -> str:
         """
@@ -58,21 +106,29 @@ class AnswerStorage:
         """
         if text is None:
             return ""
-        # Lowercase and strip whitespace
-        sanitized = text.lower().strip()
-        # Replace quotes, backslashes, newlines, carriage returns with spaces
-        sanitized = re.sub(r'["\\\n\r]', ' ', sanitized)
-        # Remove trailing commas (often seen in scraped labels)
-        sanitized = sanitized.rstrip(",")
-        # Remove control characters and DEL
-        sanitized = re.sub(r"[\x00-\x1F\x7F]", "", sanitized)
-        # Normalize multiple whitespace characters to a single space
-        sanitized = re.sub(r'\s+', ' ', sanitized).strip()
-        return sanitized
+        return _sanitize(text)
+
+    def _index(self, item: Dict[str, Any]) -> bool:
+        """Adds a validated item to the index (first answer wins). Returns False if it was already indexed."""
+        key = (item["question"], item["type"])
+        if str(item.get("source") or "").endswith(REJECTED_SOURCE_SUFFIX):
+            if key in self._rejected: return False
+            self._rejected.add(key)
+            return True
+        if key in self._answers: return False
+        self._answers[key] = item
+        self._similar.add(item["question"], item["type"], str(item["answer"]))
+        return True
+
+    def _validated(self, item: Any) -> Optional[Dict[str, Any]]:
+        """Returns the item with its question sanitized, or None if it is malformed or empty."""
+        if not isinstance(item, dict) or not all(k in item for k in ["type", "question", "answer"]): return None
+        question = self.sanitize_text(item.get("question"))
+        return {**item, "question": question} if question else None
 
     def save_question(self, question_data: Dict[str, Any]) -> None:
         """
-        Saves a new question-answer pair to the JSON file if the question doesn't already exist.
+        Saves a new question-answer pair if no answer is stored yet for the question and field type.
 
         Args:
             question_data (Dict[str, Any]): Dictionary containing 'type', 'question', and 'answer'.
@@ -95,33 +151,13 @@ class AnswerStorage:
         logger.debug(f"Attempting to save sanitized question: '{sanitized_question}' Type: '{question_data.get('type')}'")
 
         try:
-            # Check if question already exists in memory cache (more efficient)
-            if any(self.sanitize_text(item.get("question")) == sanitized_question for item in self.all_questions):
-                logger.trace(f"Question already exists in memory cache, not saving again: '{sanitized_question}'")
-                return
-
-            # If not in memory, load file data again (in case of external changes, though less likely)
-            # and add the new entry. This ensures persistence even if in-memory check fails somehow.
-            current_data = self._load_questions_from_json(log_on_error=False) # Load quietly
-
-            # Double-check file data for duplicates before appending
-            if any(self.sanitize_text(item.get("question")) == sanitized_question for item in current_data):
-                 logger.trace(f"Question already exists in file, not saving again: '{sanitized_question}'")
-                 # Add to in-memory cache if it wasn't there for some reason
-                 if not any(self.sanitize_text(item.get("question")) == sanitized_question for item in self.all_questions):
-                      self.all_questions.append(question_data)
-                 return
-
-            # Add the new question to list
-            current_data.append(question_data)
-
-            # Write the updated list back to the file
-            with self.output_file.open("w", encoding="utf-8") as f:
-                json.dump(current_data, f, indent=4, ensure_ascii=False)
-
-            # Update the in-memory cache as well
-            self.all_questions.append(question_data)
-
+            with self._lock:
+                if not self._index(question_data):
+                    logger.trace(f"Question already stored, not saving again: '{sanitized_question}'")
+                    return
+                # Append one line; the file is never rewritten
+                with self.output_file.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(question_data, ensure_ascii=False) + "\n")
             logger.debug(f"Question saved successfully: '{sanitized_question}'")
 
         except Exception as e:
@@ -129,68 +165,68 @@ class AnswerStorage:
             logger.error(f"Error saving question data to {self.output_file}: {e}", exc_info=True)
 
 
-    def _load_questions_from_json(self, log_on_error: bool = True) -> List[Dict[str, Any]]:
-        """
-        Loads previously answered questions from the JSON file.
-
-        Args:
-            log_on_error (bool): Whether to log errors if loading fails (used internally to avoid recursion).
-
-        Returns:
-            List[Dict[str, Any]]: A list of valid question data dictionaries found in the file.
-        """
-        logger.trace(f"Loading questions from JSON file: {self.output_file}")
-        valid_data: List[Dict[str, Any]] = []
+    def _load_answers(self) -> None:
+        """Loads previously answered questions from the JSONL file into the index, skipping malformed lines."""
+        logger.trace(f"Loading answers from JSONL file: {self.output_file}")
+        if not self.output_file.exists():
+            logger.debug(f"Answers file not found: {self.output_file}. Starting with an empty answer bank.")
+            return
+        skipped, line = 0, "\n"
+        with self.output_file.open("r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip(): continue
+                try: item = self._validated(json.loads(line))
+                except json.JSONDecodeError: item = None # e.g. a line cut short by a crash
+                if item is None:
+                    skipped += 1
+                    logger.warning(f"Invalid answer at {self.output_file.name}:{line_number}. Skipping.")
+                    continue
+                self._index(item)
+        if not line.endswith("\n"): # Terminate a partial last line so the next append starts cleanly
+            with self.output_file.open("a", encoding="utf-8") as f: f.write("\n")
+        logger.trace(f"Loaded {len(self._answers)} answers from JSONL ({skipped} invalid lines skipped).")
+
+    def _import_legacy_json(self) -> None:
+        """Converts a legacy `answers.json` list into the JSONL answers file."""
         try:
-            if not self.output_file.exists():
-                if log_on_error: logger.warning(f"Answers file not found: {self.output_file}. Returning empty list.")
-                return [] # Return empty list, don't create file here
-
-            with self.output_file.open("r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if not content:
-                    logger.debug("Answers file is empty. Returning empty list.")
-                    return []
-
-                try:
-                    data = json.loads(content)
-                except json.JSONDecodeError as json_err:
-                     if log_on_error: logger.error(f"Failed to decode JSON from {self.output_file}: {json_err}. Returning empty list.")
-                     return [] # Return empty on decode error
-
-                if not isinstance(data, list):
-                     if log_on_error: logger.error(f"Invalid format in {self.output_file}. Expected a JSON list, found {type(data)}. Returning empty list.")
-                     return []
-
-                # Validate items in the loaded list
-                for i, item in enumerate(data):
-                    if isinstance(item, dict) and all(k in item for k in ["type", "question", "answer"]):
-                        # Sanitize question during load for consistency? Or keep original? Let's sanitize.
-                        item["question"] = self.sanitize_text(item.get("question"))
-                        if item["question"]: # Only add if sanitized question is not empty
-                             valid_data.append(item)
-                        elif log_on_error:
-                             logger.warning(f"Loaded item {i} has empty sanitized question. Skipping.")
-                    elif log_on_error:
-                        logger.warning(f"Invalid item format found in {self.output_file} at index {i}: {item}. Skipping.")
-
-                logger.trace(f"Loaded {len(valid_data)} valid questions from JSON.")
-                return valid_data
-
-        except IOError as io_err:
-             if log_on_error: logger.error(f"IOError reading answers file {self.output_file}: {io_err}", exc_info=True)
-             return [] # Return empty on IO error
-        except Exception as e:
-            if log_on_error: logger.error(f"Unexpected error loading question data from {self.output_file}: {e}", exc_info=True)
-            return [] # Return empty on other errors
-
-    def get_existing_answer(self, question_text: str, question_type: str) -> Optional[str]:
+            data = json.loads(self.legacy_file.read_text(encoding="utf-8") or "[]")
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to read legacy answers file {self.legacy_file}: {e}. Not importing it.")
+            return
+        if not isinstance(data, list):
+            logger.error(f"Invalid format in {self.legacy_file}. Expected a JSON list, found {type(data)}. Not importing it.")
+            return
+        items, keys = [], set()
+        for item in map(self._validated, data):
+            if item is None or (item["question"], item["type"]) in keys: continue
+            keys.add((item["question"], item["type"]))
+            items.append(item)
+        temp_file = self.output_file.with_suffix(".jsonl.tmp")
+        with temp_file.open("w", encoding="utf-8") as f:
+            for item in items: f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        temp_file.replace(self.output_file)
+        logger.info(f"Imported {len(items)} answers from {self.legacy_file.name} into {self.output_file.name}.")
+
+    def was_rejected(self, question_text: str, question_type: str) -> bool:
+        """True if an unusable answer was recorded for this question and field type (see module docstring)."""
+        return (self.sanitize_text(question_text), question_type) in self._rejected
+
+    def get_stored_answer(self, question_text: str, question_type: str) -> Optional[str]:
+        """The answer stored for exactly this question and field type (no similarity fallback), or None."""
+        item = self._answers.get((self.sanitize_text(question_text), question_type))
+        return item.get("answer") if item else None
+
+    def get_existing_answer(self, question_text: str, question_type: str,
+                            options: Optional[List[str]] = None) -> Optional[str]:
         """
-        Retrieves an existing answer for a question based on sanitized text and type match.
+        Retrieves an existing answer for a question based on sanitized text and type match,
+        falling back to the most similar stored question of the same type.
 
         Args:
             question_text (str): The question text asked in the form.
             question_type (str): The type of form field (e.g., 'radio', 'dropdown', 'text').
+            options (Optional[List[str]]): Current choices of an option field; similar-question
+                                           answers are only returned if they are among them.
 
         Returns:
             Optional[str]: The stored answer string if found, otherwise None.
@@ -201,22 +237,16 @@ class AnswerStorage:
              return None
 
         logger.debug(f"Searching for answer to: '{sanitized_question_to_find}' (Type: {question_type})")
-        try:
-            # Search in the in-memory cache
-            for item in self.all_questions:
-                # Item question should already be sanitized if loaded/saved correctly
-                item_question = item.get("question", "")
-                item_type = item.get("type")
-
-                # Match sanitized question and type
-                if item_question == sanitized_question_to_find and item_type == question_type:
-                    answer = item.get("answer") # Answer itself is stored as originally provided
-                    logger.info(f"Found existing answer for '{sanitized_question_to_find}': '{answer}'")
-                    return answer # Return the stored answer (not sanitized)
-
+        item = self._answers.get((sanitized_question_to_find, question_type))
+        if item is None:
+            try: similar = self._similar.lookup(sanitized_question_to_find, question_type, options)
+            except Exception as e: logger.error(f"Similar question lookup failed for '{sanitized_question_to_find}': {e}"); similar = None
+            if similar is not None:
+                answer, score, stored_question = similar
+                logger.info(f"Found answer of similar question '{stored_question}' ({score:.2f}) for '{sanitized_question_to_find}': '{answer}'")
+                return answer
             logger.debug(f"No existing answer found for: '{sanitized_question_to_find}' (Type: {question_type})")
             return None
-        except Exception as e:
-             # Should not happen if all_questions contains valid dicts, but good safeguard
-             logger.error(f"Unexpected error searching for answer to '{sanitized_question_to_find}': {e}", exc_info=True)
-             return None
\ No newline at end of file
+        answer = item.get("answer") # Answer itself is stored as originally provided
+        logger.info(f"Found existing answer for '{sanitized_question_to_find}': '{answer}'")
+        return answer # Return the stored answer (not sanitized)
@@ -0,0 +1,159 @@
+# src/easy_apply/answer_warmup.py
+"""
+Startup warm-up of the answer bank, so the first applications in an output
+directory answer the common screening questions from storage instead of the LLM.
+
+1. Profile answers: questions the `JobApplicationProfile` already answers (work
+   authorization, sponsorship, relocation, remote/onsite work, background checks,
+   notice period, salary, self-identification) are stored with the profile's
+   answer, tagged `"source": "profile"`.
+2. LLM warm-up: common job-independent questions that depend on the resume
+   (years of experience, education, English level) are answered together with a
+   single LLM call and stored, tagged `"source": "llm_warmup"`.
+
+Yes/No and option questions are stored under both the radio and the dropdown field
+type, since forms ask them either way. Stored answers are never replaced: an answer
+already in the bank (e.g. edited by the user) wins over the profile, and questions
+already answered are not sent to the LLM again, so the warm-up call is made once
+per output directory. LLM answers that are missing or invalid (not one of the
+options, no number) are recorded too, tagged `"source": "llm_warmup_rejected"`,
+so those questions are not re-sent on every startup; the answer bank never
+serves them. Rephrased questions reach these answers through the answer
+bank's similarity index.
+"""
+import re
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+from loguru import logger
+
+from .answer_storage import REJECTED_SOURCE_SUFFIX, AnswerStorage
+
+PROFILE_SOURCE: Final[str] = "profile"
+LLM_WARMUP_SOURCE: Final[str] = "llm_warmup"
+LLM_WARMUP_REJECTED_SOURCE: Final[str] = LLM_WARMUP_SOURCE + REJECTED_SOURCE_SUFFIX
+
+YES_NO: Final[Tuple[str, ...]] = ("Yes", "No")
+OPTION_TYPES: Final[Tuple[str, ...]] = ("radio", "dropdown")
+
+_REGIONS: Final[Tuple[Tuple[str, str], ...]] = (
+    ("us", "the United States"), ("eu", "the European Union"), ("canada", "Canada"), ("uk", "the United Kingdom"),
+)
+
+# (profile section, attribute, question, field types); Yes/No attributes use OPTION_TYPES
+PROFILE_QUESTIONS: Final[Tuple[Tuple[str, str, str, Tuple[str, ...]], ...]] = tuple(
+    entry for region, name in _REGIONS for entry in (
+        ("legal_authorization", f"legally_allowed_to_work_in_{region}", f"Are you legally authorized to work in {name}?", OPTION_TYPES),
+        ("legal_authorization", f"{region}_work_authorization", f"Do you have work authorization for {name}?", OPTION_TYPES),
+        ("legal_authorization", f"requires_{region}_sponsorship",
+         f"Will you now or in the future require sponsorship for employment visa status in {name}?", OPTION_TYPES),
+        ("legal_authorization", f"requires_{region}_visa", f"Do you require a visa to work in {name}?", OPTION_TYPES),
+    )
+) + (
+    ("legal_authorization", "requires_us_sponsorship",
+     "Will you now or in the future require sponsorship for employment visa status (e.g. H-1B visa status)?", OPTION_TYPES),
+    ("work_preferences", "remote_work", "Are you comfortable working in a remote setting?", OPTION_TYPES),
+    ("work_preferences", "in_person_work", "Are you comfortable working in an onsite setting?", OPTION_TYPES),
+    ("work_preferences", "open_to_relocation", "Are you willing to relocate?", OPTION_TYPES),
+    ("work_preferences", "willing_to_complete_assessments", "Are you willing to complete an assessment?", OPTION_TYPES),
+    ("work_preferences", "willing_to_undergo_drug_tests",
+     "Are you willing to take a drug test, in accordance with local law/regulations?", OPTION_TYPES),
+    ("work_preferences", "willing_to_undergo_background_checks",
+     "Are you willing to undergo a background check, in accordance with local law/regulations?", OPTION_TYPES),
+    ("self_identification", "veteran", "Are you a protected veteran?", OPTION_TYPES),
+    ("self_identification", "disability", "Do you have a disability?", OPTION_TYPES),
+    ("self_identification", "gender", "What is your gender?", OPTION_TYPES),
+    ("self_identification", "ethnicity", "What is your race/ethnicity?", OPTION_TYPES),
+    ("self_identification", "pronouns", "What are your pronouns?", OPTION_TYPES + ("textbox",)),
+    ("availability", "notice_period", "What is your notice period?", ("textbox",)),
+    ("salary_expectations", "salary_range_usd", "What are your salary expectations?", ("textbox",)),
+    ("salary_expectations", "salary_range_usd", "What is your desired salary?", ("numeric",)),
+)
+
+# Common job-independent questions answered from the resume: (question, kind, options)
+LLM_WARMUP_QUESTIONS: Final[Tuple[Tuple[str, str, Optional[Tuple[str, ...]]], ...]] = (
+    ("How many years of work experience do you have?", "numeric", None),
+    ("What is your level of proficiency in English?", "options", ("None", "Conversational", "Professional", "Native or bilingual")),
+    ("What is the highest level of education you have completed?", "options",
+     ("High School", "Associate's Degree", "Bachelor's Degree", "Master's Degree", "Doctorate")),
+    ("Have you completed the following level of education: Bachelor's Degree?", "options", YES_NO),
+    ("Are you currently employed?", "options", YES_NO),
+    ("How did you hear about this job?", "text", None),
+)
+_KIND_TYPES: Final[Dict[str, Tuple[str, ...]]] = {"numeric": ("numeric",), "text": ("textbox",), "options": OPTION_TYPES}
+
+
+def _profile_value(profile: Any, section: str, attribute: str) -> Optional[str]:
+    """The profile's answer, or None if missing, empty or a template placeholder like "[Yes/No]"."""
+    value = str(getattr(getattr(profile, section, None), attribute, None) or "").strip()
+    return value if value and not value.startswith("[") else None
+
+
+def profile_answers(profile: Any) -> List[Dict[str, Any]]:
+    """Answer bank entries ('type', 'question', 'answer', 'source') derived from a JobApplicationProfile."""
+    entries: List[Dict[str, Any]] = []
+    for section, attribute, question, field_types in PROFILE_QUESTIONS:
+        answer = _profile_value(profile, section, attribute)
+        if answer is None: continue
+        if field_types == ("numeric",):
+            number = re.search(r"\d[\d,]*", answer) # Lower bound of a range like "90,000 - 110,000"
+            if not number: continue
+            answer = number.group(0).replace(",", "")
+        elif field_types == OPTION_TYPES and answer.lower() in ("yes", "no"):
+            answer = answer.capitalize()
+        entries += [{"type": t, "question": question, "answer": answer, "source": PROFILE_SOURCE} for t in field_types]
+    return entries
+
+
+def _valid_warmup_answer(answer: Optional[str], kind: str, options: Optional[Tuple[str, ...]]) -> Optional[str]:
+    """The LLM answer normalized for storage: the matching option, or the number; None if it is invalid."""
+    if answer is None: return None
+    if options: return next((option for option in options if option.lower() == answer.lower()), None)
+    if kind == "numeric":
+        number = re.search(r"\d+", answer)
+        return number.group(0) if number else None
+    return answer
+
+
+def warm_up_answer_bank(answer_storage: AnswerStorage, profile: Optional[Any] = None,
+                        llm_processor: Optional[Any] = None) -> Tuple[int, int]:
+    """
+    Seeds the answer bank with the profile's answers and answers the common resume questions
+    not yet stored with one LLM call (see module docstring).
+
+    Args:
+        answer_storage: The answer bank of the output directory.
+        profile: The JobApplicationProfile; None skips the profile answers.
+        llm_processor: LLMProcessor for the warm-up call; None skips it.
+
+    Returns:
+        (profile answers stored, LLM warm-up answers stored).
+    """
+    seeded = 0
+    if profile is not None:
+        for entry in profile_answers(profile):
+            if answer_storage.get_stored_answer(entry["question"], entry["type"]) is not None: continue
+            answer_storage.save_question(entry)
+            seeded += 1
+
+    warmed = rejected = 0
+    if llm_processor is not None:
+        pending = [(question, kind, options) for question, kind, options in LLM_WARMUP_QUESTIONS
+                   if any(answer_storage.get_stored_answer(question, t) is None and not answer_storage.was_rejected(question, t)
+                          for t in _KIND_TYPES[kind])]
+        questions = [{"question": q, "type": kind, **({"options": list(options)} if options else {})} for q, kind, options in pending]
+        answers = llm_processor.answer_general_questions(questions) if questions else [] # No call once all are recorded
+        for (question, kind, options), raw_answer in zip(pending, answers):
+            answer = _valid_warmup_answer(raw_answer, kind, options)
+            if answer is None: # Recorded as attempted, so the question is not re-sent next startup
+                logger.debug(f"Rejected LLM warm-up answer {raw_answer!r} to '{question}'.")
+                rejected += 1
+                answer, source = raw_answer, LLM_WARMUP_REJECTED_SOURCE
+            else: source = LLM_WARMUP_SOURCE
+            for field_type in _KIND_TYPES[kind]:
+                if answer_storage.get_stored_answer(question, field_type) is not None: continue
+                answer_storage.save_question({"type": field_type, "question": question, "answer": answer, "source": source})
+                if source == LLM_WARMUP_SOURCE: warmed += 1
+
+    logger.info(f"Answer bank warm-up: {seeded} profile answer(s) and {warmed} LLM warm-up answer(s) stored"
+                f"{f', {rejected} LLM answer(s) rejected' if rejected else ''}.")
+    return seeded, warmed
@@ -33,9 +33,17 @@ try:
 except ImportError:
     from src.job import Job, JobCache, JobStatus
 try:
-    from ..llm import LLMProcessor # Relative import
+    from ..job_evaluation_store import JobEvaluation, JobEvaluationStore # Relative import
 except ImportError:
-    from src.llm import LLMProcessor
+    from src.job_evaluation_store import JobEvaluation, JobEvaluationStore
+try:
+    from ..job_ranker import JobRelevanceRanker # Relative import
+except ImportError:
+    from src.job_ranker import JobRelevanceRanker
+try:
+    from ..llm import LLMProcessor, CircuitOpenError # Relative import
+except ImportError:
+    from src.llm import LLMProcessor, CircuitOpenError
 try:
     from ..resume_manager import ResumeManager # Relative import
 except ImportError:
@@ -48,6 +56,7 @@ except ImportError:
 
 # Easy Apply Components (Relative imports)
 from .answer_storage import AnswerStorage
+from .answer_warmup import warm_up_answer_bank
 from .job_info_extractor import JobInfoExtractor
 from .form_handler import FormHandler
 from .form_processors.processor_manager import FormProcessorManager
@@ -86,6 +95,7 @@ class EasyApplyHandler:
         llm_processor: LLMProcessor,
         cache: Optional[JobCache] = None,
         wait_time: Optional[int] = None,
+        relevance_ranker: Optional[JobRelevanceRanker] = None,
     ):
         """Initializes the EasyApplyHandler."""
         logger.info("Initializing EasyApplyHandler...")
@@ -100,11 +110,14 @@ class EasyApplyHandler:
         self.resume_manager = resume_manager
         self.llm_processor = llm_processor
         self.cache = cache
+        self.relevance_ranker = relevance_ranker # Local pre-check before the LLM score, if configured
 
         # Initialize helper components
         # Use output dir from cache if available, else default
         output_dir = cache.output_directory if cache else Path("data_folder/output")
         self.answer_storage = AnswerStorage(output_dir=output_dir)
+        try: self.evaluation_store: Optional[JobEvaluationStore] = JobEvaluationStore(output_dir) # Scores/salaries across runs
+        except Exception as e: logger.error(f"Failed to open job evaluation store, evaluations will not be reused: {e}"); self.evaluation_store = None
         self.job_info_extractor = JobInfoExtractor(driver, self.wait_time)
         self.form_handler = FormHandler(driver, self.wait_time)
         self.form_processor_manager = FormProcessorManager(
@@ -119,8 +132,24 @@ class EasyApplyHandler:
         logger.info("EasyApplyHandler initialized successfully.")
 
 
+    def warm_up_answers(self, job_application_profile: Optional[Any] = None) -> None:
+        """
+        Seeds the answer bank with the profile's answers and the LLM's answers to common
+        job-independent questions (see `answer_warmup.py`). Failures are logged, not raised.
+        """
+        try: warm_up_answer_bank(self.answer_storage, job_application_profile, self.llm_processor)
+        except Exception as e: logger.error(f"Answer bank warm-up failed, questions will be answered on demand: {e}", exc_info=True)
+
+    def close(self) -> None:
+        """Closes the job evaluation store so its WAL is checkpointed. Safe to call more than once."""
+        if self.evaluation_store is not None: self.evaluation_store.close()
+
+
     def main_job_apply(self, job: Job) -> bool:
-        """Main method to handle the Easy Apply process for a single job."""
+        """
+        Main method to handle the Easy Apply process for a single job.
+        Raises CircuitOpenError, leaving the job unrecorded, while the LLM circuit breaker is open.
+        """
         if not isinstance(job, Job) or not job.link: logger.error("Invalid Job object passed."); return False
 
         logger.info(f"--- Starting for {job.link} ' ---")
@@ -198,6 +227,8 @@ class EasyApplyHandler:
                  #self.form_handler.discard_application()
                  return False
 
+        except CircuitOpenError:
+            raise # The LLM provider is down: leave the job unrecorded and let JobApplier pause
         except RuntimeError as e: # Catch specific errors like Premium redirect failure
              logger.error(f"Runtime error during application process for {job.link}: {e}", exc_info=True)
              if self.cache: self.cache.record_job_status(job, JobStatus.FAILED_APPLICATION); self.cache.record_job_status(job, JobStatus.SEEN)
@@ -217,12 +248,30 @@ class EasyApplyHandler:
         """Evaluates job score and salary against configured thresholds."""
         # --- CORRECTED SYNTAX ---
         proceed = True # Start assuming we proceed
+        estimated_salary = None # Filled when score and salary are evaluated together
+
+        # 0. Reuse an evaluation stored by a previous run (same posting, resume and prompts)
+        stored = self._stored_evaluation(job)
+        if stored is not None:
+             if job.score is None and stored.score is not None:
+                  job.score = stored.score
+                  logger.info(f"Reusing stored Job Score: {job.score:.2f}")
+             estimated_salary = stored.gpt_salary
 
         # 1. Evaluate Score (if enabled)
         if USE_JOB_SCORE:
+             if job.score is None and self.relevance_ranker and not self.relevance_ranker.is_relevant(job):
+                  logger.info("Job description has low relevance to the resume. Skipping without LLM scoring.")
+                  if self.cache:
+                      self.cache.record_job_status(job, JobStatus.SKIPPED_LOW_RELEVANCE)
+                  return False
              if job.score is None:
-                  logger.debug("Calculating job score...")
-                  job.score = self.llm_processor.evaluate_job_fit()
+                  if USE_SALARY_EXPECTATIONS and estimated_salary is None:
+                       logger.debug("Calculating job score and estimating salary concurrently...")
+                       job.score, estimated_salary = self.llm_processor.evaluate_job_fit_and_salary(min_score=MIN_SCORE_APPLY)
+                  else:
+                       logger.debug("Calculating job score...")
+                       job.score = self.llm_processor.evaluate_job_fit()
                   logger.info(f"Calculated Job Score: {job.score:.2f}")
                   if self.cache:
                       self.cache.record_job_status(job, JobStatus.JOB_SCORE) # Record score status
@@ -241,8 +290,10 @@ class EasyApplyHandler:
 
         # 2. Evaluate Salary (if enabled AND score passed)
         if proceed and USE_SALARY_EXPECTATIONS:
-             logger.debug("Estimating job salary...")
-             job.gpt_salary = self.llm_processor.estimate_salary()
+             if estimated_salary is None:
+                  logger.debug("Estimating job salary...")
+                  estimated_salary = self.llm_processor.estimate_salary()
+             job.gpt_salary = estimated_salary
              logger.info(f"Estimated Salary: {job.gpt_salary:.0f} USD (Expected: >{SALARY_EXPECTATIONS:.0f} USD)")
 
              if job.gpt_salary < SALARY_EXPECTATIONS:
@@ -255,11 +306,28 @@ class EasyApplyHandler:
         elif proceed: # Check skipped because USE_SALARY_EXPECTATIONS was false
              logger.debug("Salary expectation check is disabled (USE_SALARY_EXPECTATIONS=False).")
 
+        self._store_evaluation(job)
         if proceed:
             logger.debug("Job meets suitability criteria. Proceeding.")
 
         return proceed
 
+    def _stored_evaluation(self, job: Job) -> Optional[JobEvaluation]:
+        """Looks up a previous run's evaluation of this posting for the current resume and prompts."""
+        if self.evaluation_store is None: return None
+        resume_hash, prompt_version = self.llm_processor.evaluation_fingerprint()
+        return self.evaluation_store.get(job, resume_hash, prompt_version,
+                                         salary_expectation=self.llm_processor.salary_expectations)
+
+    def _store_evaluation(self, job: Job) -> None:
+        """Persists the score and salary from this job's successful LLM calls (error fallbacks are not stored)."""
+        if self.evaluation_store is None: return
+        score, salary = self.llm_processor.memoized_evaluation()
+        if score is None and salary is None: return
+        resume_hash, prompt_version = self.llm_processor.evaluation_fingerprint()
+        self.evaluation_store.put(job, resume_hash, prompt_version, score=score, gpt_salary=salary,
+                                  salary_expectation=self.llm_processor.salary_expectations)
+
 
     # ──────────────────────────────────────────────────────────────────────
     # New: locate container for the *current* step (form OR review)
@@ -330,6 +398,8 @@ class EasyApplyHandler:
                     f"Timeout locating elements on step {form_step} "
                     f"(error {form_errors}/{self.MAX_FORM_ERRORS_PER_JOB}): {te}"
                 )
+            except CircuitOpenError:
+                raise # The LLM provider is down: main_job_apply leaves the job unrecorded instead of failing it
             except Exception as exc:
                 form_errors += 1
                 logger.error(
@@ -400,6 +470,13 @@ class EasyApplyHandler:
                        return # Nothing to fill on review page
              except: pass # Ignore errors finding review content
 
+        # Answer all LLM-bound questions of this step with a single batched call
+        try:
+            form_sections = [el for el in unique_elements if not el.find_elements(By.XPATH, ".//input[@type='file']")]
+            self.form_processor_manager.prefetch_step_answers(form_sections, job)
+        except StaleElementReferenceException:
+            logger.warning("Stale element while collecting step questions. Answering per question.")
+
         processed_count = 0
         for element in unique_elements:
             try:
@@ -415,6 +492,8 @@ class EasyApplyHandler:
             except StaleElementReferenceException:
                  logger.warning("Stale element encountered processing form step. Skipping element.")
                  continue # Skip this specific element
+            except CircuitOpenError:
+                raise
             except Exception as e:
                  logger.error(f"Error processing form element/section: {e}", exc_info=True)
                  continue # Skip this element on error
@@ -22,6 +22,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 import src.utils as utils # Assuming utils has ensure_directory
 from src.job import Job
 from src.llm import LLMProcessor # Use refactored name
+from src.llm.exceptions import CircuitOpenError # Not an upload failure: propagates to main_job_apply
 # Utility for file operations
 from .file_utils import generate_humanized_filename, check_file_size
 # Utility for PDF generation
@@ -134,6 +135,8 @@ class FileUploader:
                     else:
                          logger.warning(f"Upload type '{upload_type}' is unrecognized for label '{field_label}'. Skipping field.")
 
+               except CircuitOpenError:
+                    raise
                except Exception as e:
                     logger.error(f"Failed processing a file input field: {e}", exc_info=True)
                     # Continue to next file input if one fails
@@ -269,6 +272,8 @@ class FileUploader:
 
                logger.info(f"Generated personalized resume PDF: {file_path}")
                return file_path
+          except CircuitOpenError:
+               raise
           except Exception as e:
                logger.error(f"Failed to generate personalized resume PDF: {e}", exc_info=True)
                utils.capture_screenshot(self.driver, "generate_resume_pdf_failed")
@@ -293,6 +298,8 @@ class FileUploader:
                time.sleep(1) # Brief pause
                logger.info(f"Cover letter uploaded successfully: {abs_path}")
 
+          except CircuitOpenError:
+               raise
           except Exception as e:
                logger.error(f"Failed to upload cover letter file '{pdf_path if 'pdf_path' in locals() else 'N/A'}': {e}", exc_info=True)
                utils.capture_screenshot(self.driver, "cover_letter_upload_failed")
@@ -325,6 +332,8 @@ class FileUploader:
 
                logger.info(f"Generated personalized cover letter PDF: {file_path}")
                return file_path
+          except CircuitOpenError:
+               raise
           except Exception as e:
                logger.error(f"Failed to generate personalized cover letter PDF: {e}", exc_info=True)
                utils.capture_screenshot(self.driver, "generate_cover_letter_pdf_failed")
@@ -152,6 +152,42 @@ class BaseProcessor:
         """
         raise NotImplementedError(f"{self.__class__.__name__} must implement the 'handle' method.")
 
+    def describe_questions(self, section: WebElement) -> Optional[List[Dict[str, Any]]]:
+        """
+        Describes the questions in `section` that this processor would need the LLM for,
+        so a whole form step can be answered with a single batched LLM call
+        (see `FormProcessorManager.prefetch_step_answers`). Must not modify the form.
+
+        Args:
+            section (WebElement): The form section to inspect.
+
+        Returns:
+            None if this processor does not handle the section; otherwise a (possibly empty)
+            list of dicts with keys 'question', 'type' ('text', 'numeric', 'options' or 'date')
+            and optionally 'options' / 'max_chars'. Questions already answered from storage
+            are omitted.
+        """
+        return None
+
+    def _pending_question(
+        self,
+        question_text: str,
+        question_type: str,
+        kind: str,
+        options: Optional[List[str]] = None,
+        max_chars: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Builds the `describe_questions` entry for a question, or [] if storage already answers it."""
+        if use_cache:
+            cached = self.get_existing_answer(question_text, question_type, options)
+            if cached is not None and (not options or any(cached.lower() == opt.lower() for opt in options)):
+                return []
+        entry: Dict[str, Any] = {"question": question_text, "type": kind}
+        if options: entry["options"] = options
+        if max_chars: entry["max_chars"] = max_chars
+        return [entry]
+
     def is_upload_field(self, element: WebElement) -> bool:
         """
         Checks if the provided element contains a file input field.
@@ -383,20 +419,23 @@ class BaseProcessor:
              # raise RuntimeError(f"Unexpected error entering text: {e}") from e
 
 
-    def get_existing_answer(self, question_text: str, question_type: str) -> Optional[str]:
+    def get_existing_answer(self, question_text: str, question_type: str,
+                            options: Optional[List[str]] = None) -> Optional[str]:
         """
-        Retrieves a previously stored answer for the given question and type.
+        Retrieves a previously stored answer for the given question and type
+        (or for a similar question, see `AnswerStorage.get_existing_answer`).
 
         Args:
             question_text (str): The text of the question (should be sanitized).
             question_type (str): The type of the form field (e.g., 'textbox', 'dropdown').
+            options (Optional[List[str]]): Current choices of an option field.
 
         Returns:
             Optional[str]: The stored answer string if found, otherwise None.
         """
         logger.trace(f"Checking cache for answer to '{question_text}' (type: {question_type})")
         try:
-            existing_answer = self.answer_storage.get_existing_answer(question_text, question_type)
+            existing_answer = self.answer_storage.get_existing_answer(question_text, question_type, options)
             if existing_answer is not None: # Check explicitly for None, as "" can be a valid answer
                 # Ensure the answer is a string before returning
                 if not isinstance(existing_answer, str):
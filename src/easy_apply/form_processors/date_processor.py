@@ -5,7 +5,7 @@ within LinkedIn Easy Apply forms.
 """
 from __future__ import annotations 
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 from loguru import logger
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
@@ -14,6 +14,7 @@ from selenium.webdriver.remote.webelement import WebElement
 
 # Assuming BaseProcessor correctly imports dependencies
 from .base_processor import BaseProcessor
+from src.llm.exceptions import CircuitOpenError # Not a field failure: propagates to main_job_apply
 # Assuming Job object definition is available
 
 if TYPE_CHECKING:
@@ -103,6 +104,18 @@ class DateProcessor(BaseProcessor):
              return False
 
 
+    def describe_questions(self, section: WebElement) -> Optional[List[Dict[str, Any]]]:
+        """Describes the section's date question for batched answering (see BaseProcessor)."""
+        try:
+            selectors = [self.selectors["common"]["date_field"], self.selectors["common"]["date_field_alt"]]
+            if not any(f.is_displayed() and f.is_enabled() for sel in selectors for f in section.find_elements(By.XPATH, sel)):
+                return None
+            question_text = self.extract_question_text(section)
+        except (StaleElementReferenceException, RuntimeError):
+            return []
+        if any(keyword in question_text.lower() for keyword in self.TODAY_DATE_KEYWORDS): return []
+        return self._pending_question(question_text, "date", "date")
+
     def _get_date_answer(self, question_text: str) -> Optional[str]:
         """
         Determines the appropriate date answer string in 'MM/DD/YYYY' format.
@@ -165,6 +178,8 @@ class DateProcessor(BaseProcessor):
                 logger.error(f"LLM failed to generate a date answer for question: '{question_text}'")
                 return None # LLM failed to provide an answer
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Error generating date answer via LLM for '{question_text}': {e}", exc_info=True)
             return None # Return None on LLM error
\ No newline at end of file
@@ -7,7 +7,7 @@ on the platform. Leverages answer storage and LLM for selecting appropriate opti
 """
 from __future__ import annotations 
 import time
-from typing import List, Optional, Any, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 from loguru import logger
 from selenium.common.exceptions import (
@@ -21,6 +21,7 @@ from selenium.webdriver.support.ui import Select
 
 # Assuming BaseProcessor correctly imports dependencies
 from .base_processor import BaseProcessor
+from src.llm.exceptions import CircuitOpenError # Not a field failure: propagates to main_job_apply
 # Assuming Job object definition is available
 if TYPE_CHECKING:
     from src.job import Job 
@@ -78,6 +79,8 @@ class DropdownProcessor(BaseProcessor):
         except StaleElementReferenceException:
              logger.warning("Stale element reference while searching for new dropdown structure.")
              # Continue to fallback
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.debug(f"Error searching for new dropdown structure using '{new_dropdown_selector}': {e}", exc_info=False)
             # Continue to fallback if specific search fails
@@ -105,11 +108,26 @@ class DropdownProcessor(BaseProcessor):
         except StaleElementReferenceException:
              logger.warning("Stale element reference while searching for standard <select> elements.")
              return False
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error searching for standard <select> elements: {e}", exc_info=True)
             return False
 
 
+    def describe_questions(self, section: WebElement) -> Optional[List[Dict[str, Any]]]:
+        """Describes the section's dropdown question for batched answering (see BaseProcessor)."""
+        try:
+            dropdown = next((d for d in section.find_elements(By.TAG_NAME, self.selectors["common"]["select"])
+                             if d.is_displayed() and d.is_enabled()), None)
+            if dropdown is None: return None
+            valid_options = self._filter_valid_options([option.text.strip() for option in Select(dropdown).options])
+            if not valid_options: return []
+            question_text = self.extract_question_text(section)
+        except (StaleElementReferenceException, UnexpectedTagNameException, RuntimeError):
+            return []
+        return self._pending_question(question_text, "dropdown", "options", options=valid_options)
+
     def _handle_standard_dropdown(self, section: WebElement, dropdown: WebElement, job: Job) -> bool:
         """Handles a standard HTML <select> dropdown element."""
         try:
@@ -138,6 +156,8 @@ class DropdownProcessor(BaseProcessor):
         except StaleElementReferenceException:
              logger.warning("Stale element reference encountered while handling standard dropdown.")
              return False
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Error handling standard dropdown: {e}", exc_info=True)
             return False
@@ -167,6 +187,8 @@ class DropdownProcessor(BaseProcessor):
         except StaleElementReferenceException:
             logger.warning("Stale element reference encountered while handling new dropdown structure.")
             return False
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Error handling new dropdown structure: {e}", exc_info=True)
             return False
@@ -201,7 +223,7 @@ class DropdownProcessor(BaseProcessor):
              return None
 
         # Check cache
-        cached_answer = self.get_existing_answer(question_text, question_type)
+        cached_answer = self.get_existing_answer(question_text, question_type, options)
         if cached_answer:
             # Verify cached answer is still present in the current options list
             # Use case-insensitive comparison for robustness
@@ -246,6 +268,8 @@ class DropdownProcessor(BaseProcessor):
                   self.save_answer(question_text, question_type, fallback_answer) # Save fallback
                   return fallback_answer
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
              logger.error(f"Error getting answer via LLM for '{question_text}': {e}", exc_info=True)
              # Fallback to first option on error
@@ -5,7 +5,7 @@ Manages the selection and execution of appropriate form field processors
 for the LinkedIn Easy Apply workflow.
 """
 from __future__ import annotations 
-from typing import List, Type, Any, TYPE_CHECKING
+from typing import Any, Dict, List, Set, Tuple, Type, TYPE_CHECKING
 
 from loguru import logger
 from selenium.common import StaleElementReferenceException
@@ -21,6 +21,7 @@ from .date_processor import DateProcessor
 from .typeahead_processor import TypeaheadProcessor
 from .tos_processor import TermsOfServiceProcessor
 from .checkbox_processor import CheckboxProcessor
+from src.llm.exceptions import CircuitOpenError # Not a field failure: propagates to main_job_apply
 
 # Import utils for screenshot capability
 try:
@@ -120,6 +121,47 @@ class FormProcessorManager:
         """
         return self.base_processor.is_upload_field(element)
 
+    def prefetch_step_answers(self, sections: List[WebElement], job: Job) -> int:
+        """
+        Collects every question in a form step that would need the LLM and answers them
+        all with one batched LLM call. The answers are primed in the LLMProcessor, so the
+        processors' regular `answer_question_*` calls in `process_form_section` return
+        them without further round trips. Any failure simply leaves the per-question path in place.
+
+        Args:
+            sections (List[WebElement]): The form sections of the current step.
+            job (Job): The current job object, providing context for the LLM.
+
+        Returns:
+            int: The number of answers primed (0 if batching was skipped or failed).
+        """
+        if not hasattr(self.llm_processor, 'prefetch_form_answers'): return 0
+        questions: List[Dict[str, Any]] = []
+        seen: Set[Tuple[str, str]] = set()
+        for section in sections:
+            for processor in self._processors:
+                try: described = processor.describe_questions(section)
+                except Exception as e:
+                    logger.debug(f"{processor.__class__.__name__} could not describe section: {e}")
+                    continue
+                if described is None: continue # Not this processor's field type
+                for question in described:
+                    key = (question["type"], question["question"].lower())
+                    if key not in seen: seen.add(key); questions.append(question)
+                break # Same precedence as process_form_section: first matching processor wins
+
+        if len(questions) < self.llm_processor.BATCH_MIN_QUESTIONS:
+            logger.debug(f"{len(questions)} question(s) need the LLM in this step; not batching.")
+            return 0
+        try:
+            self.llm_processor.set_current_job(job)
+            return self.llm_processor.prefetch_form_answers(questions)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.warning(f"Batched answer prefetch failed, falling back to per-question calls: {e}")
+            return 0
+
     def process_form_section(self, section: WebElement, job: Job) -> bool:
         """
         Processes a given form section by iterating through the registered processors.
@@ -154,6 +196,8 @@ class FormProcessorManager:
                     # Capture screenshot for debugging stale elements
                     if utils: utils.capture_screenshot(self.driver, f"stale_element_{processor_name}")
                     return False # Abort processing this section if it becomes stale
+                except CircuitOpenError:
+                    raise
                 except Exception as e:
                     # Log errors from individual processors but continue trying others
                     logger.error(f"Error occurred within {processor_name} for section '{section_text_preview}...': {e}", exc_info=True)
@@ -167,6 +211,8 @@ class FormProcessorManager:
             # if utils: utils.capture_screenshot(self.driver, "unhandled_form_section")
             return False
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             # Catch unexpected errors during the management process itself
             logger.critical(f"Unexpected error in FormProcessorManager while processing section '{section_text_preview}...': {e}", exc_info=True)
@@ -18,7 +18,7 @@ Key points in this version
 from __future__ import annotations
 
 import time
-from typing import Any, List, Optional, TYPE_CHECKING, Tuple
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Tuple
 
 from loguru import logger
 from selenium.common.exceptions import (
@@ -32,6 +32,7 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 
 from .base_processor import BaseProcessor
+from src.llm.exceptions import CircuitOpenError # Not a field failure: propagates to main_job_apply
 
 if TYPE_CHECKING:                       # — type-only imports
     from src.job import Job
@@ -101,6 +102,29 @@ class RadioProcessor(BaseProcessor):
             logger.trace("No radio buttons processed in this section")
         return handled
 
+    def describe_questions(self, section: WebElement) -> Optional[List[Dict[str, Any]]]:
+        """Describes the section's radio questions for batched answering (see BaseProcessor)."""
+        questions: List[Dict[str, Any]] = []
+        try:
+            fieldsets = section.find_elements(By.CSS_SELECTOR, self.selectors["new"]["radio_fieldset"])
+            for fieldset in fieldsets:
+                legend = fieldset.find_element(By.TAG_NAME, "legend")
+                question = self.answer_storage.sanitize_text(
+                    self.driver.execute_script("return arguments[0].textContent;", legend).strip()
+                )
+                containers = fieldset.find_elements(By.CSS_SELECTOR, self.selectors["new"]["radio_option_container"])
+                labels = [txt for box in containers if (txt := self._extract_label_text(box))]
+                if len(labels) >= 2: questions += self._pending_question(question, "radio", "options", options=labels)
+            if fieldsets: return questions
+
+            options = section.find_elements(By.CSS_SELECTOR, f".{self.selectors['old']['radio_option']}")
+            if len(options) < 2: return None
+            labels = [txt for opt in options if (txt := opt.text.strip())]
+            if labels: questions += self._pending_question(self.extract_question_text(section), "radio", "options", options=labels)
+            return questions
+        except (StaleElementReferenceException, NoSuchElementException, RuntimeError):
+            return questions
+
     # ──────────────────────────────────────────────────────────────────────
     # Internal helpers – NEW LinkedIn layout
     # ──────────────────────────────────────────────────────────────────────
@@ -158,6 +182,8 @@ class RadioProcessor(BaseProcessor):
         except StaleElementReferenceException:
             logger.warning("Fieldset ficou stale – recomeçar no próximo loop")
             return False
+        except CircuitOpenError:
+            raise
         except Exception as exc:
             logger.error(f"Erro inesperado no handler novo: {exc!r}", exc_info=True)
             return False
@@ -219,6 +245,8 @@ class RadioProcessor(BaseProcessor):
         except StaleElementReferenceException:
             logger.warning("Section became stale in old-UI handler")
             return False
+        except CircuitOpenError:
+            raise
         except Exception as exc:
             logger.error(f"Unhandled error in old-UI handler: {exc!r}", exc_info=True)
             return False
@@ -4,7 +4,7 @@ Processor for text input (<input type="text">, <input type="number">) and
 textarea fields within LinkedIn Easy Apply forms.
 """
 from __future__ import annotations 
-from typing import Tuple, Final, Optional, Any, TYPE_CHECKING
+from typing import Any, Dict, Final, List, Optional, Tuple, TYPE_CHECKING
 
 from loguru import logger
 from selenium.common import (
@@ -29,6 +29,7 @@ try:
 except ImportError:
      logger.warning("LLMError not found, using base Exception for LLM issues.")
      LLMError = Exception # type: ignore
+from src.llm.exceptions import CircuitOpenError # Not a field failure: propagates to main_job_apply
 
 
 class TextboxProcessor(BaseProcessor):
@@ -111,6 +112,8 @@ class TextboxProcessor(BaseProcessor):
         except StaleElementReferenceException:
             logger.warning("Stale element reference while searching for 'new structure' text fields.")
             # Continue to fallback
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.debug(f"Did not find or failed processing 'new structure' text field: {e}", exc_info=False)
             # Continue to fallback
@@ -147,6 +150,8 @@ class TextboxProcessor(BaseProcessor):
             except StaleElementReferenceException:
                 logger.warning("Stale element reference while searching for 'old/generic' text fields.")
                 return False
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 logger.error(f"Error searching/handling 'old/generic' text field: {e}", exc_info=True)
                 return False
@@ -157,6 +162,24 @@ class TextboxProcessor(BaseProcessor):
         return handled
 
 
+    def describe_questions(self, section: WebElement) -> Optional[List[Dict[str, Any]]]:
+        """Describes the section's text/numeric question for batched answering (see BaseProcessor)."""
+        try:
+            field = next((el for el in section.find_elements(By.TAG_NAME, "textarea") if el.is_displayed()), None)
+            if field is None:
+                field = next((el for el in section.find_elements(By.TAG_NAME, "input")
+                              if el.is_displayed() and el.get_attribute("type") not in ['file', 'checkbox', 'radio', 'hidden', 'submit', 'button', 'image']), None)
+            if field is None: return None
+            is_textarea = field.tag_name == 'textarea'
+            question, qtype = self._extract_question_info(field, section, is_textarea)
+        except (StaleElementReferenceException, RuntimeError):
+            return []
+        question_lower = question.lower()
+        requires_fresh = any(blk in question_lower for blk in self.QUESTIONS_REQUIRING_FRESH_ANSWERS)
+        char_limit = 2000 if is_textarea and "cover letter" in question_lower else (500 if is_textarea else None)
+        kind = "numeric" if qtype == "numeric" else "text"
+        return self._pending_question(question, qtype, kind, max_chars=char_limit if requires_fresh else None, use_cache=not requires_fresh)
+
     def _process_text_field(self, field: WebElement, section: WebElement, job: Job, is_textarea: bool) -> bool:
         """Helper to process a found text field (input or textarea)."""
         try:
@@ -183,6 +206,8 @@ class TextboxProcessor(BaseProcessor):
         except (TimeoutException, ElementNotInteractableException) as e:
              logger.error(f"Field for '{question_text}' not ready for interaction: {e.__class__.__name__}")
              return False
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error processing text field for '{question_text}': {e}", exc_info=True)
             return False
@@ -343,6 +368,8 @@ class TextboxProcessor(BaseProcessor):
                  logger.warning(f"LLM returned None for question '{question}'. Using fallback.")
                  return fallback_answer
 
+        except CircuitOpenError:
+            raise
         except LLMError as e: # Catch specific LLM errors if defined
              logger.error(f"LLM error generating answer for '{question}': {e}", exc_info=True)
              return fallback_answer
@@ -5,7 +5,7 @@ in LinkedIn Easy Apply forms (e.g., for location, skills, school names).
 """
 from __future__ import annotations 
 import time
-from typing import Optional, Any, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 import re
 
 from loguru import logger
@@ -32,6 +32,7 @@ try:
 except ImportError:
      logger.warning("LLMError not found, using base Exception for LLM issues.")
      LLMError = Exception # type: ignore
+from src.llm.exceptions import CircuitOpenError # Not a field failure: propagates to main_job_apply
 
 # Import utils for screenshot capability
 try:
@@ -117,10 +118,23 @@ class TypeaheadProcessor(BaseProcessor):
         except RuntimeError as e: # Catch specific error raised by _fill_and_select
              logger.error(f"Typeahead fill/select process failed for '{question}': {e}")
              return False
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error handling typeahead field: {e}", exc_info=True)
             return False
 
+    def describe_questions(self, section: WebElement) -> Optional[List[Dict[str, Any]]]:
+        """Describes the section's typeahead question for batched answering (see BaseProcessor)."""
+        try:
+            fields = section.find_elements(By.XPATH, self.selectors["common"]["typeahead"])
+            if not any(f.is_displayed() and f.is_enabled() for f in fields): return None
+            question = self.extract_question_text(section)
+        except (StaleElementReferenceException, RuntimeError):
+            return []
+        limit = 80 if "location" in question.lower() else 50
+        return self._pending_question(question, "typeahead", "text", max_chars=limit)
+
     # ------------------------------------------------------------------
     # Helper interno: normaliza a resposta do LLM antes de digitar
     def _normalize_typeahead_answer(self, raw: str, question: str) -> str:
@@ -177,6 +191,8 @@ class TypeaheadProcessor(BaseProcessor):
             logger.info(f"Resposta normalizada '{answer_clean}' salva no cache")
             return answer_clean
 
+        except CircuitOpenError:
+            raise
         except (LLMError, Exception) as e:
             logger.error(f"LLM falhou em '{question}': {e}")
             self.save_answer(question, "typeahead", self.FALLBACK_TYPEAHEAD_ANSWER)
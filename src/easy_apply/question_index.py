@@ -0,0 +1,191 @@
+# src/easy_apply/question_index.py
+"""
+Similarity index over stored form questions, so rephrased screening questions
+("Years of Python experience?" vs "How many years of work experience do you have
+with Python?") reuse a stored answer instead of costing a new LLM call.
+
+Each question is reduced to its subject, the words left after removing generic
+question wording ("how many years of experience do you have with"), so that the
+wording does not outweigh what is asked: "Years with Java?" must not match "Years
+with Python?". Subjects are embedded as TF-IDF vectors of character trigrams
+hashed into a fixed number of dimensions, which tolerates spelling variants and
+plurals, and compared by cosine similarity with NumPy. Adding a question is
+O(dimensions); the IDF-weighted matrix is rebuilt lazily on the next lookup after
+adds.
+
+Countries and regions, numbers and negation are a small part of a question's
+trigrams but change the answer entirely ("Are you authorized to work in Canada?"
+vs "... in the United States?", "Python 2" vs "Python", "Are you unwilling to
+relocate?" vs "Are you willing to relocate?"). A stored question is only reused
+if it names exactly the same regions and numbers and has the same polarity as the
+new one, however similar the rest of the wording is. Option validation cannot
+catch a Yes/No with flipped meaning, so option types also need a close match.
+"""
+
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Final, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+_WORD: Final = re.compile(r"[a-z0-9+#]+")
+# Wording shared by screening questions that does not change what is being asked
+_QUESTION_WORDS: Final[FrozenSet[str]] = frozenset("""
+    a an the of in on at to for with and or is are do does did you your have has had how many much what which
+    who when where why will would can could please select enter provide indicate describe rate rating level
+    year years experience experienced professional work working total overall long any this that as be been
+    there here if yes me my we our currently current
+    quantos quantas anos de experiência experiencia com em você voce tem possui qual sua seu""".split())
+# Place words -> region they name; "us" is also a pronoun, so the US is matched by _US_FORMS
+_REGION_WORDS: Final[Mapping[str, str]] = {
+    "usa": "us", "states": "us", "america": "us", "american": "us",
+    "canada": "canada", "canadian": "canada",
+    "uk": "uk", "kingdom": "uk", "britain": "uk", "british": "uk", "england": "uk",
+    "eu": "eu", "europe": "eu", "european": "eu", "eea": "eu", "schengen": "eu",
+    **{country: country for country in """
+        germany france spain italy portugal netherlands belgium ireland switzerland austria poland sweden
+        norway denmark finland australia zealand india brazil brasil mexico argentina chile colombia japan
+        china singapore israel emirates uae""".split()},
+}
+_US_FORMS: Final = re.compile(r"\bu\.s\.|\bthe us\b|\bh-?1b\b") # "u.s.", "the us", "h-1b" visas
+_NEGATORS: Final[FrozenSet[str]] = frozenset("no not never none neither nor non without cannot nao nunca sem".split())
+_CONTRACTED_NOT: Final = re.compile(r"n['’]t\b") # "don't", "isn’t"
+_NEGATING_PREFIXES: Final[Tuple[str, ...]] = ("non", "un", "in", "dis")
+
+
+def question_regions(question: str) -> FrozenSet[str]:
+    """Countries/regions a question names, e.g. {"canada"} for "Do you require a visa to work in Canada?"."""
+    lowered = question.lower()
+    regions = {_REGION_WORDS[word] for word in _WORD.findall(lowered) if word in _REGION_WORDS}
+    if _US_FORMS.search(lowered): regions.add("us")
+    return frozenset(regions)
+
+
+@dataclass(frozen=True)
+class QuestionTraits:
+    """Parts of a question that must agree for a stored answer to be reused."""
+    regions: FrozenSet[str]
+    numbers: FrozenSet[str] # Words containing a digit ("2", "h-1b" -> "1b")
+    negated: bool # Has a negation word ("no", "not", "never", "don't", ...)
+    words: FrozenSet[str]
+
+    @classmethod
+    def of(cls, question: str) -> "QuestionTraits":
+        lowered = question.lower()
+        words = frozenset(_WORD.findall(lowered))
+        return cls(question_regions(question), frozenset(w for w in words if any(c.isdigit() for c in w)),
+                   bool(words & _NEGATORS) or bool(_CONTRACTED_NOT.search(lowered)), words)
+
+    def _negates_word_of(self, other: "QuestionTraits") -> bool:
+        """True if a word here is a prefix-negated word of `other` ("unwilling" vs "willing")."""
+        return any(word.startswith(prefix) and word[len(prefix):] in other.words
+                   for word in self.words - other.words for prefix in _NEGATING_PREFIXES)
+
+    def compatible(self, other: "QuestionTraits") -> bool:
+        return (self.regions == other.regions and self.numbers == other.numbers and self.negated == other.negated
+                and not self._negates_word_of(other) and not other._negates_word_of(self))
+
+
+def question_subject(question: str) -> str:
+    """The words of a question that identify what is asked, or the whole question if all are generic."""
+    words = _WORD.findall(question.lower())
+    return " ".join(word for word in words if word not in _QUESTION_WORDS) or " ".join(words)
+
+
+class QuestionSimilarityIndex:
+    """Incremental char-trigram TF-IDF index of (question, field type) -> answer."""
+
+    DIMENSIONS: Final[int] = 4096
+    NGRAM: Final[int] = 3
+    DEFAULT_THRESHOLD: Final[float] = 0.85
+    # Option answers are checked against the current choices, but a Yes/No can still be flipped: match closely
+    DEFAULT_TYPE_THRESHOLDS: Final[Mapping[str, float]] = {
+        "radio": 0.9, "dropdown": 0.9, "numeric": 0.85, "textbox": 0.88, "typeahead": 0.88, "date": 0.9,
+    }
+
+    def __init__(self, thresholds: Optional[Mapping[str, float]] = None, dimensions: int = DIMENSIONS):
+        """
+        Args:
+            thresholds: Field type -> minimum cosine similarity for a match (DEFAULT_THRESHOLD otherwise).
+            dimensions: Hashed trigram feature count.
+        """
+        self.thresholds: Dict[str, float] = {**self.DEFAULT_TYPE_THRESHOLDS, **(thresholds or {})}
+        self.dimensions = dimensions
+        self._tf = np.zeros((64, dimensions), dtype=np.float32) # Grown by doubling
+        self._df = np.zeros(dimensions, dtype=np.float32)
+        self._types: List[str] = []
+        self._entries: List[Tuple[str, str]] = [] # (question, answer)
+        self._traits: List[QuestionTraits] = []
+        self._weighted: Optional[np.ndarray] = None # L2-normalized TF-IDF rows; None after adds
+        self._idf: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _term_frequencies(self, question: str) -> np.ndarray:
+        padded = f" {question_subject(question)} "
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for i in range(max(1, len(padded) - self.NGRAM + 1)):
+            vector[zlib.crc32(padded[i:i + self.NGRAM].encode("utf-8")) % self.dimensions] += 1.0
+        np.log1p(vector, out=vector) # Sublinear TF
+        return vector
+
+    def add(self, question: str, question_type: str, answer: str) -> None:
+        """Indexes a stored answer (question expected sanitized)."""
+        if not question: return
+        vector = self._term_frequencies(question)
+        with self._lock:
+            row = len(self._entries)
+            if row == self._tf.shape[0]: self._tf = np.vstack([self._tf, np.zeros_like(self._tf)])
+            self._tf[row] = vector
+            self._df += vector > 0
+            self._types.append(question_type)
+            self._entries.append((question, answer))
+            self._traits.append(QuestionTraits.of(question))
+            self._weighted = None
+
+    def _rebuild(self) -> None:
+        rows = len(self._entries)
+        self._idf = (np.log((1.0 + rows) / (1.0 + self._df)) + 1.0).astype(np.float32)
+        weighted = self._tf[:rows] * self._idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        self._weighted = weighted / np.maximum(norms, 1e-12)
+
+    def lookup(self, question: str, question_type: str,
+               options: Optional[Sequence[str]] = None) -> Optional[Tuple[str, float, str]]:
+        """
+        Finds the most similar stored question of the same field type above the type's threshold
+        with compatible traits (same regions, numbers and polarity) and whose answer is (if
+        `options` are given) among the current options.
+
+        Returns:
+            (answer, similarity, stored question), or None. Option answers are returned with the
+            casing of the matching current option.
+        """
+        if not question or not self._entries: return None
+        threshold = self.thresholds.get(question_type, self.DEFAULT_THRESHOLD)
+        with self._lock:
+            if self._weighted is None: self._rebuild()
+            candidates = np.fromiter((i for i, t in enumerate(self._types) if t == question_type), dtype=np.intp)
+            if candidates.size == 0: return None
+            query = self._term_frequencies(question) * self._idf
+            query /= max(float(np.linalg.norm(query)), 1e-12)
+            scores = self._weighted[candidates] @ query
+
+        traits = QuestionTraits.of(question)
+        lowered_options = {option.lower(): option for option in options} if options else None
+        for position in np.argsort(-scores, kind="stable"):
+            score = float(scores[position])
+            if score < threshold: break
+            if not traits.compatible(self._traits[candidates[position]]): continue # E.g. another region or negated
+            stored_question, answer = self._entries[candidates[position]]
+            if lowered_options is not None:
+                if str(answer).lower() not in lowered_options: continue
+                answer = lowered_options[str(answer).lower()]
+            logger.trace(f"Similar stored question ({score:.2f}): '{stored_question}'")
+            return answer, score, stored_question
+        return None
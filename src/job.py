@@ -3,13 +3,17 @@
 Defines the Job data structure and the JobCache class for tracking processed jobs.
 """
 
-import json
 from dataclasses import dataclass, field, asdict
-from typing import Optional, Set, Dict, List, Union, Final, Tuple # Added Tuple
+from typing import Optional, Set, Dict, Iterable, List, Union, Final, Tuple # Added Tuple
 from loguru import logger
 from pathlib import Path
 from datetime import datetime
+import atexit
 import enum # For status types
+import threading
+
+from .job_cache_backends import JobCacheBackend, create_backend
+from .job_id import JobIdSet, JobKey, extract_linkedin_job_id, job_cache_key
 
 # --- Job Status Enum ---
 class JobStatus(enum.Enum):
@@ -18,6 +22,7 @@ class JobStatus(enum.Enum):
     SKIPPED_LOW_SCORE = "skipped_low_score"
     SKIPPED_LOW_SALARY = "skipped_low_salary"
     SKIPPED_BLACKLIST = "skipped_blacklist"
+    SKIPPED_LOW_RELEVANCE = "skipped_low_relevance"
     FAILED_APPLICATION = "failed_application"
     JOB_SCORE = "job_score"
 
@@ -43,6 +48,15 @@ class Job:
     search_country: Optional[str] = None
     score: Optional[float] = None
     gpt_salary: Optional[float] = None
+    job_id: Optional[int] = None # Numeric LinkedIn job ID; derived from the link if not given
+
+    def __post_init__(self):
+        self.job_id = extract_linkedin_job_id(self.job_id) or extract_linkedin_job_id(self.link)
+
+    @property
+    def cache_key(self) -> JobKey:
+        """Key used by JobCache: the job ID when known, else the link."""
+        return self.job_id if self.job_id is not None else self.link
 
     def to_dict(self, exclude_fields: Optional[Set[str]] = None) -> Dict:
          """Converts dataclass to dictionary, optionally excluding fields."""
@@ -58,7 +72,21 @@ class Job:
 # --- Job Cache Class ---
 class JobCache:
     """
-    Manages caches of processed job links loaded from and persisted to JSON files.
+    Manages caches of processed jobs, persisted through a pluggable backend
+    (see `src.job_cache_backends`). The default SQLite backend answers status checks
+    with indexed lookups; the journal and legacy JSON backends are preloaded into
+    in-memory sets at startup. Jobs recorded during this run are always kept in memory.
+
+    Jobs are keyed by their numeric LinkedIn job ID (see `src.job_id`), so the same
+    posting reached through differently decorated URLs is deduplicated; links without
+    an ID fall back to the URL itself. In-memory keys are held in compact `JobIdSet`s.
+
+    Writes are write-behind by default: `record_job_status` updates the in-memory sets
+    immediately and queues the record; a background thread flushes the queue to the
+    backend in batches once `flush_max_records` are pending or `flush_interval` seconds
+    have passed. Call `flush()` / `close()` to persist deterministically. A page of jobs
+    can be checked with `lookup_statuses` and recorded with `record_job_statuses`, each a
+    single backend round trip.
     """
     _CACHE_CONFIG: Final[Dict[JobStatus, Tuple[str, str]]] = {
         JobStatus.SUCCESS: ('_success_cache', 'success.json'),
@@ -68,95 +96,193 @@ class JobCache:
         JobStatus.JOB_SCORE: ('_job_score_cache', 'job_score.json'),
         JobStatus.SKIPPED_BLACKLIST: ('_skipped_blacklist_cache', 'skipped_blacklist.json'), # Added
         JobStatus.FAILED_APPLICATION: ('_failed_application_cache', 'failed_application.json'), # Added
+        JobStatus.SKIPPED_LOW_RELEVANCE: ('_skipped_low_relevance_cache', 'skipped_low_relevance.json'),
     }
+    DEFAULT_BACKEND: Final[str] = "sqlite"
+    DEFAULT_FLUSH_MAX_RECORDS: Final[int] = 50
+    DEFAULT_FLUSH_INTERVAL: Final[float] = 2.0 # Seconds
+
+    def __init__(self,
+                 output_directory: Path,
+                 backend: str = DEFAULT_BACKEND,
+                 fsync_policy: str = "interval",
+                 write_behind: bool = True,
+                 flush_max_records: int = DEFAULT_FLUSH_MAX_RECORDS,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Initializes the JobCache.
 
-    def __init__(self, output_directory: Path):
-        """Initializes the JobCache."""
+        Args:
+            output_directory (Path): Directory holding the cache files.
+            backend (str): "sqlite" (default), "journal" (append-only JSONL) or "json" (legacy list files).
+                           The sqlite and journal backends import existing cache files on first use.
+            fsync_policy (str): Journal durability policy: "always", "interval" or "never".
+            write_behind (bool): Buffer writes and flush them on a background thread (default).
+                                 If False, every record is written synchronously.
+            flush_max_records (int): Pending record count that triggers a flush.
+            flush_interval (float): Max seconds a record may stay buffered.
+        """
         logger.debug("Initializing JobCache...")
         if not isinstance(output_directory, Path): raise TypeError("output_directory must be a Path object.")
         self.output_directory: Path = output_directory
         try: self.output_directory.mkdir(parents=True, exist_ok=True)
         except OSError as e: logger.error(f"Failed to create cache directory {self.output_directory}: {e}", exc_info=True); raise RuntimeError(...) from e
         # Initialize all cache sets
-        for status, (attr_name, _) in self._CACHE_CONFIG.items(): setattr(self, attr_name, set())
-        self._load_all_caches()
-        logger.info(f"JobCache initialized. Output directory: {self.output_directory}")
-        for status, (attr_name, _) in self._CACHE_CONFIG.items(): logger.debug(f" - {status.name}: {len(getattr(self, attr_name))} links loaded.")
-
-    def _load_cache_from_json(self, file_name: str) -> Set[str]:
-        """Loads job links from a single JSON file into a set."""
-        file_path = self.output_directory / file_name; link_set: Set[str] = set()
-        if not file_path.exists(): logger.debug(f"Cache file not found: {file_name}"); return link_set
-        try:
-            with file_path.open('r', encoding='utf-8') as f:
-                try: content = f.read().strip(); jobs_data = json.loads(content) if content else []
-                except json.JSONDecodeError: logger.warning(f"Cache file '{file_name}' corrupted/empty."); return link_set
-                if isinstance(jobs_data, list):
-                    count = 0
-                    for job in jobs_data:
-                         if isinstance(job, dict) and 'link' in job and isinstance(job['link'], str): link_set.add(job['link']); count += 1
-                         else: logger.warning(f"Invalid job entry format in {file_name}: {str(job)[:100]}")
-                    logger.debug(f"Loaded {count} links from {file_name}")
-                else: logger.warning(f"Unexpected format in {file_name}. Expected list, found {type(jobs_data)}.")
-        except IOError as e: logger.error(f"IOError reading cache file {file_name}: {e}", exc_info=True)
-        except Exception as e: logger.error(f"Unexpected error reading cache file {file_name}: {e}", exc_info=True)
-        return link_set
+        for status, (attr_name, _) in self._CACHE_CONFIG.items(): setattr(self, attr_name, JobIdSet())
+        legacy_file_names = {status.value: file_name for status, (_, file_name) in self._CACHE_CONFIG.items()}
+        options = {"fsync_policy": fsync_policy} if backend == "journal" else {}
+        self._backend: JobCacheBackend = create_backend(backend, self.output_directory, legacy_file_names, **options)
+        if not self._backend.indexed:
+            self._load_all_caches()
+            for status, (attr_name, _) in self._CACHE_CONFIG.items(): logger.debug(f" - {status.name}: {len(getattr(self, attr_name))} links loaded.")
+        # Write-behind buffer
+        self._pending: List[Tuple[str, Dict]] = []
+        self._pending_cond = threading.Condition()
+        self._write_lock = threading.Lock() # Serializes backend writes (flusher thread vs. explicit flush)
+        self._flush_max_records: int = max(1, flush_max_records)
+        self._flush_interval: float = flush_interval
+        self._write_behind: bool = write_behind
+        self._closed: bool = True
+        self._flusher: Optional[threading.Thread] = None
+        self._reopen()
+        logger.info(f"JobCache initialized ({self._backend.name} backend, write-behind={'on' if write_behind else 'off'}). Output directory: {self.output_directory}")
 
     def _load_all_caches(self):
-        """Loads all configured cache files into their respective in-memory sets."""
-        logger.debug("Loading all cache JSON files...")
-        for status, (attr_name, file_name) in self._CACHE_CONFIG.items():
-            link_set = self._load_cache_from_json(file_name)
-            setattr(self, attr_name, link_set) # Assign loaded set to correct attribute
-
-    def _append_job_to_json(self, job_data: Dict, file_name: str):
-        """Appends a job data dictionary to the specified JSON file (list format)."""
-        file_path = self.output_directory / file_name
-        logger.trace(f"Appending job data to {file_path}")
-        try:
-            existing_data = []
-            if file_path.exists():
-                try:
-                    with file_path.open('r+', encoding='utf-8') as f:
-                        content = f.read().strip()
-                        if content: existing_data = json.loads(content)
-                        if not isinstance(existing_data, list): logger.error(f"Corrupted JSON {file_path}. Overwriting."); existing_data = []
-                        existing_data.append(job_data)
-                        f.seek(0)
-                        json.dump(existing_data, f, indent=4, ensure_ascii=False)
-                        f.truncate()
-                except json.JSONDecodeError: logger.error(f"JSON decode error reading {file_path}. Overwriting."); existing_data = [job_data] # Start new list
-                except IOError as e: logger.error(f"IOError appending {file_name}: {e}", exc_info=True); return # Don't proceed if IO fails
-                except Exception as e: logger.error(f"Error appending {file_name}: {e}", exc_info=True); return
-            # Write new file or overwrite corrupted one
-            if not file_path.exists() or not isinstance(existing_data, list):
-                with file_path.open('w', encoding='utf-8') as f: json.dump([job_data], f, indent=4, ensure_ascii=False)
-                logger.debug(f"Created/Overwrote cache file: {file_name}")
-        except Exception as e: logger.error(f"Failed critical write to {file_name}: {e}", exc_info=True)
+        """Streams all persisted records from the backend into their in-memory sets."""
+        logger.debug(f"Loading job cache from {self._backend.name} backend...")
+        sets_by_value = {status.value: getattr(self, attr_name) for status, (attr_name, _) in self._CACHE_CONFIG.items()}
+        for status_value, link in self._backend.iter_records():
+            link_set = sets_by_value.get(status_value)
+            if link_set is not None: link_set.add(job_cache_key(link))
+            else: logger.warning(f"Ignoring cache record with unknown status '{status_value}'.")
+
+    def _reopen(self):
+        """Starts (or restarts, after `close()`) the write-behind flusher thread."""
+        with self._pending_cond:
+            if not self._closed: return
+            self._closed = False
+            if not self._write_behind: return
+            self._flusher = threading.Thread(target=self._flush_loop, name="JobCacheFlusher", daemon=True)
+            self._flusher.start()
+            atexit.register(self.close) # Safety net; JobManager closes the cache explicitly
+
+    def _flush_loop(self):
+        """Background thread: waits for the size/time threshold, then writes the buffered batch."""
+        while True:
+            with self._pending_cond:
+                if not self._closed and len(self._pending) < self._flush_max_records:
+                    self._pending_cond.wait(timeout=self._flush_interval)
+                if self._closed or self._flusher is not threading.current_thread(): return # close() performs the final flush
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered status records to the backend. Safe to call from any thread."""
+        with self._write_lock:
+            with self._pending_cond: batch, self._pending = self._pending, []
+            if not batch: return
+            logger.trace(f"Flushing {len(batch)} job status record(s) to {self._backend.name} backend.")
+            try: self._backend.append_many(batch)
+            except Exception as e: logger.error(f"Failed to flush {len(batch)} job status record(s): {e}", exc_info=True)
+
+    def close(self):
+        """
+        Stops the flusher thread, flushes pending records and closes the persistence backend. Idempotent.
+        The cache stays usable: lookups reopen the backend and the next record restarts write-behind.
+        """
+        with self._pending_cond:
+            if self._closed: return
+            self._closed = True
+            self._pending_cond.notify_all()
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join(timeout=5)
+            atexit.unregister(self.close)
+        self.flush()
+        self._backend.close()
+
+    def query_history(self, status: Optional[JobStatus] = None, **filters) -> List[Dict]:
+        """
+        Queries recorded status history without loading it into memory (SQLite backend only).
+        Example: `cache.query_history(JobStatus.JOB_SCORE, min_score=7, since="2025-05-01 00:00:00")`.
+        """
+        return self._backend.query_history(status=status.value if status else None, **filters)
+
+    def _contains(self, status: JobStatus, link: Union[str, Job]) -> bool:
+        """Checks the in-memory set first, then the backend index if it has one."""
+        key = link.cache_key if isinstance(link, Job) else job_cache_key(link)
+        if key in getattr(self, self._CACHE_CONFIG[status][0]): return True
+        return self._backend.indexed and self._backend.contains(status.value, key)
 
     def record_job_status(self, job: Job, status: JobStatus):
-        """Records the status of a job in memory and appends to the relevant JSON file."""
+        """Records the status of a job in memory and persists it through the backend."""
+        record = self._status_record(job, status)
+        if record is None: return
+        with self._pending_cond:
+            self._reopen()
+            if self._flusher is not None:
+                self._pending.append(record)
+                if len(self._pending) >= self._flush_max_records: self._pending_cond.notify()
+                return
+        self._backend.append(*record)
+
+    def record_job_statuses(self, records: Iterable[Tuple[Job, JobStatus]]):
+        """
+        Records several (job, status) pairs at once, e.g. the skipped jobs of a result page:
+        the in-memory sets are updated immediately and the records reach the backend as one batch.
+        """
+        batch = [record for record in (self._status_record(job, status) for job, status in records) if record is not None]
+        if not batch: return
+        logger.debug(f"Recording {len(batch)} job status record(s) as one batch.")
+        with self._pending_cond:
+            self._reopen()
+            if self._flusher is not None:
+                self._pending.extend(batch)
+                if len(self._pending) >= self._flush_max_records: self._pending_cond.notify()
+                return
+        self._backend.append_many(batch)
+
+    def _status_record(self, job: Job, status: JobStatus) -> Optional[Tuple[str, Dict]]:
+        """Adds the job to the status's in-memory set and returns the (status value, record) to persist, or None if invalid."""
         if not isinstance(status, JobStatus):
              try: status = JobStatus(status)
-             except ValueError: logger.error(f"Invalid status: {status}."); return
-        if not job or not job.link: logger.error("Invalid job/link for recording status."); return
+             except ValueError: logger.error(f"Invalid status: {status}."); return None
+        if not job or not job.link: logger.error("Invalid job/link for recording status."); return None
         logger.debug(f"Recording status '{status.name}' for job: {job.link}")
-        if status in self._CACHE_CONFIG:
-            attr_name, file_name = self._CACHE_CONFIG[status]
-            cache_set = getattr(self, attr_name, None)
-            if cache_set is None: logger.error(f"Internal cache error: Attr '{attr_name}' not found."); return
-            if job.link not in cache_set: cache_set.add(job.link); logger.trace(f"Link added to in-memory cache: {attr_name}")
-            else: logger.trace(f"Link already in in-memory cache: {attr_name}")
-            job_dict = job.to_dict(exclude_fields={"description"}) # Use helper
-            job_dict["status_recorded_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self._append_job_to_json(job_dict, file_name)
-        else: logger.error(f"Unknown status type '{status}' not configured.")
+        if status not in self._CACHE_CONFIG: logger.error(f"Unknown status type '{status}' not configured."); return None
+        attr_name, _ = self._CACHE_CONFIG[status]
+        cache_set = getattr(self, attr_name, None)
+        if cache_set is None: logger.error(f"Internal cache error: Attr '{attr_name}' not found."); return None
+        if job.cache_key not in cache_set: cache_set.add(job.cache_key); logger.trace(f"Job added to in-memory cache: {attr_name}")
+        else: logger.trace(f"Job already in in-memory cache: {attr_name}")
+        job_dict = job.to_dict(exclude_fields={"description"}) # Use helper
+        job_dict["status_recorded_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return status.value, job_dict
+
+    def lookup_statuses(self, jobs: Iterable[Job], statuses: Iterable[JobStatus]) -> Dict[JobKey, Set[JobStatus]]:
+        """
+        Bulk form of the status checks below: which of `statuses` each job has been recorded with.
+        Checks the in-memory sets, then (indexed backends) the backend with one query for the whole batch.
+
+        Returns:
+            Job cache key -> recorded statuses, for the jobs with at least one of them.
+        """
+        statuses = list(statuses)
+        keys = list(dict.fromkeys(job.cache_key for job in jobs))
+        found: Dict[JobKey, Set[JobStatus]] = {}
+        for status in statuses:
+            in_memory = getattr(self, self._CACHE_CONFIG[status][0])
+            for key in keys:
+                if key in in_memory: found.setdefault(key, set()).add(status)
+        if self._backend.indexed and keys:
+            for status_value, key in self._backend.contains_many([status.value for status in statuses], keys):
+                found.setdefault(key, set()).add(JobStatus(status_value))
+        return found
 
     # --- Status Checking Methods (THESE ARE THE METHODS TO CALL) ---
-    def has_been_scored(self, link: str) -> bool: return link in self._job_score_cache
-    def is_skipped_low_salary(self, link: str) -> bool: return link in self._skipped_low_salary_cache
-    def is_skipped_low_score(self, link: str) -> bool: return link in self._skipped_low_score_cache
-    def is_applied_successfully(self, link: str) -> bool: return link in self._success_cache
-    def has_been_seen(self, link: str) -> bool: return link in self._seen_cache
-    def is_skipped_blacklist(self, link: str) -> bool: return link in self._skipped_blacklist_cache # Added check
-    def has_failed_application(self, link: str) -> bool: return link in self._failed_application_cache # Added check
\ No newline at end of file
+    def has_been_scored(self, link: Union[str, Job]) -> bool: return self._contains(JobStatus.JOB_SCORE, link)
+    def is_skipped_low_salary(self, link: Union[str, Job]) -> bool: return self._contains(JobStatus.SKIPPED_LOW_SALARY, link)
+    def is_skipped_low_score(self, link: Union[str, Job]) -> bool: return self._contains(JobStatus.SKIPPED_LOW_SCORE, link)
+    def is_applied_successfully(self, link: Union[str, Job]) -> bool: return self._contains(JobStatus.SUCCESS, link)
+    def has_been_seen(self, link: Union[str, Job]) -> bool: return self._contains(JobStatus.SEEN, link)
+    def is_skipped_blacklist(self, link: Union[str, Job]) -> bool: return self._contains(JobStatus.SKIPPED_BLACKLIST, link)
+    def has_failed_application(self, link: Union[str, Job]) -> bool: return self._contains(JobStatus.FAILED_APPLICATION, link)
\ No newline at end of file
@@ -0,0 +1,476 @@
+# src/job_cache_backends.py
+"""
+Persistence backends used by `JobCache` to store job status records.
+
+Each backend knows how to persist a new status record and either stream previously
+recorded (status, link) pairs back into memory at startup or, for indexed backends
+(SQLite), answer membership lookups directly. Status values are passed around as
+plain strings (the `JobStatus` enum values) so this module does not depend on `src.job`.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Final, Iterator, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from .job_id import JobKey, extract_linkedin_job_id
+
+
+class JobCacheBackend(ABC):
+    """Abstract persistence strategy for `JobCache`."""
+
+    name: str = "abstract"
+    indexed: bool = False # True if `contains` is a cheap indexed lookup (no need to preload sets)
+
+    def __init__(self, output_directory: Path):
+        self.output_directory: Path = output_directory
+
+    @abstractmethod
+    def iter_records(self) -> Iterator[Tuple[str, str]]:
+        """Yields every persisted (status_value, link) pair."""
+
+    @abstractmethod
+    def append(self, status: str, record: Dict[str, Any]) -> None:
+        """Persists a single status record (a `Job.to_dict()` plus timestamp)."""
+
+    def append_many(self, records: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Persists a batch of (status, record) pairs. Backends override this to write them in one go."""
+        for status, record in records: self.append(status, record)
+
+    def contains(self, status: str, key: JobKey) -> bool:
+        """Indexed membership lookup by job ID (int) or link (str). Only meaningful for backends with `indexed = True`."""
+        raise NotImplementedError(f"The '{self.name}' job cache backend does not support indexed lookups.")
+
+    def contains_many(self, statuses: List[str], keys: List[JobKey]) -> Set[Tuple[str, JobKey]]:
+        """The (status, key) pairs recorded among all combinations of `statuses` and `keys`. Indexed backends only."""
+        return {(status, key) for status in statuses for key in keys if self.contains(status, key)}
+
+    def query_history(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Queries recorded history. Only supported by the SQLite backend."""
+        logger.warning(f"History queries are not supported by the '{self.name}' job cache backend.")
+        return []
+
+    def close(self) -> None:
+        """Releases any open resources. Safe to call more than once."""
+
+
+class JsonListBackend(JobCacheBackend):
+    """
+    Legacy backend: one JSON list file per status, rewritten on every append.
+    Kept for compatibility with existing output folders and external tooling.
+    """
+
+    name = "json"
+
+    def __init__(self, output_directory: Path, file_names: Dict[str, str]):
+        super().__init__(output_directory)
+        self.file_names: Dict[str, str] = file_names # status value -> file name
+
+    def iter_records(self) -> Iterator[Tuple[str, str]]:
+        for status, file_name in self.file_names.items():
+            for job in load_json_list(self.output_directory / file_name):
+                yield status, job['link']
+
+    def append(self, status: str, record: Dict[str, Any]) -> None:
+        file_name = self.file_names.get(status)
+        if not file_name: logger.error(f"No JSON cache file configured for status '{status}'."); return
+        file_path = self.output_directory / file_name
+        logger.trace(f"Appending job data to {file_path}")
+        try:
+            existing_data = []
+            if file_path.exists():
+                try:
+                    with file_path.open('r+', encoding='utf-8') as f:
+                        content = f.read().strip()
+                        if content: existing_data = json.loads(content)
+                        if not isinstance(existing_data, list): logger.error(f"Corrupted JSON {file_path}. Overwriting."); existing_data = []
+                        existing_data.append(record)
+                        f.seek(0)
+                        json.dump(existing_data, f, indent=4, ensure_ascii=False)
+                        f.truncate()
+                except json.JSONDecodeError: logger.error(f"JSON decode error reading {file_path}. Overwriting."); existing_data = None
+                except IOError as e: logger.error(f"IOError appending {file_name}: {e}", exc_info=True); return # Don't proceed if IO fails
+                except Exception as e: logger.error(f"Error appending {file_name}: {e}", exc_info=True); return
+            # Write new file or overwrite corrupted one
+            if not file_path.exists() or existing_data is None:
+                with file_path.open('w', encoding='utf-8') as f: json.dump([record], f, indent=4, ensure_ascii=False)
+                logger.debug(f"Created/Overwrote cache file: {file_name}")
+        except Exception as e: logger.error(f"Failed critical write to {file_name}: {e}", exc_info=True)
+
+
+class JournalBackend(JobCacheBackend):
+    """
+    Append-only JSONL journal: every status change is one line
+    (`{"status": ..., "link": ..., ...}`), so a write costs O(1) regardless of history size.
+
+    Durability is controlled by `fsync_policy`:
+      - "always":   fsync after every record (safest, slowest).
+      - "interval": fsync at most once every `fsync_interval` seconds (default).
+      - "never":    flush to the OS only and let it decide when to hit the disk.
+    Every record is flushed to the OS immediately, so a crash of the bot itself never
+    loses data; the policy only matters for power loss / kernel crashes.
+    """
+
+    name = "journal"
+    JOURNAL_FILE_NAME: Final[str] = "job_status_journal.jsonl"
+    FSYNC_POLICIES: Final[Tuple[str, ...]] = ("always", "interval", "never")
+    DEFAULT_FSYNC_INTERVAL: Final[float] = 1.0
+    MIGRATED_SUFFIX: Final[str] = ".migrated"
+
+    def __init__(self,
+                 output_directory: Path,
+                 legacy_file_names: Optional[Dict[str, str]] = None,
+                 fsync_policy: str = "interval",
+                 fsync_interval: float = DEFAULT_FSYNC_INTERVAL):
+        super().__init__(output_directory)
+        if fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {self.FSYNC_POLICIES}, got '{fsync_policy}'.")
+        self.journal_path: Path = self.output_directory / self.JOURNAL_FILE_NAME
+        self.fsync_policy: str = fsync_policy
+        self.fsync_interval: float = fsync_interval
+        self._last_fsync: float = 0.0
+        self._handle = None
+        if legacy_file_names: self._migrate_json_lists(legacy_file_names)
+
+    def _migrate_json_lists(self, legacy_file_names: Dict[str, str]) -> None:
+        """
+        One-shot migration of legacy `*.json` list files into the journal.
+        Legacy files are renamed to `*.json.migrated` afterwards so the migration
+        never runs twice and the originals remain available for inspection.
+        """
+        legacy_files = {status: self.output_directory / name for status, name in legacy_file_names.items()
+                        if (self.output_directory / name).exists()}
+        if not legacy_files: return
+        logger.info(f"Migrating {len(legacy_files)} legacy JSON cache file(s) into {self.journal_path.name}...")
+        tmp_path = self.journal_path.with_suffix(self.journal_path.suffix + ".tmp")
+        migrated = 0
+        try:
+            with tmp_path.open('w', encoding='utf-8') as out:
+                # Keep any existing journal content first, then legacy entries
+                if self.journal_path.exists():
+                    with self.journal_path.open('r', encoding='utf-8') as existing:
+                        for line in existing: out.write(line if line.endswith('\n') else line + '\n')
+                for status, file_path in legacy_files.items():
+                    for job in load_json_list(file_path):
+                        out.write(_encode_record(status, job)); migrated += 1
+                out.flush(); os.fsync(out.fileno())
+            os.replace(tmp_path, self.journal_path)
+            for file_path in legacy_files.values():
+                file_path.rename(file_path.with_name(file_path.name + self.MIGRATED_SUFFIX))
+            logger.info(f"Migrated {migrated} legacy cache entries into {self.journal_path}. The original files were renamed: "
+                        f"{', '.join(p.name + self.MIGRATED_SUFFIX for p in legacy_files.values())}.")
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy JSON cache files into journal: {e}", exc_info=True)
+            try: tmp_path.unlink(missing_ok=True)
+            except OSError: pass
+            raise RuntimeError(f"Legacy job cache migration failed: {e}") from e
+
+    def iter_records(self) -> Iterator[Tuple[str, str]]:
+        """Streams the journal line by line; torn or corrupted lines are skipped."""
+        for entry in iter_journal_entries(self.journal_path):
+            yield entry['status'], entry['link']
+
+    def append(self, status: str, record: Dict[str, Any]) -> None:
+        try:
+            if self._handle is None: self._handle = self.journal_path.open('a', encoding='utf-8')
+            self._handle.write(_encode_record(status, record))
+            self._handle.flush()
+            self._maybe_fsync()
+        except Exception as e: logger.error(f"Failed to append to journal {self.journal_path.name}: {e}", exc_info=True)
+
+    def append_many(self, records: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Writes the whole batch with a single flush (and at most one fsync)."""
+        if not records: return
+        try:
+            if self._handle is None: self._handle = self.journal_path.open('a', encoding='utf-8')
+            self._handle.write(''.join(_encode_record(status, record) for status, record in records))
+            self._handle.flush()
+            self._maybe_fsync()
+        except Exception as e: logger.error(f"Failed to append {len(records)} record(s) to journal {self.journal_path.name}: {e}", exc_info=True)
+
+    def _maybe_fsync(self, force: bool = False) -> None:
+        if self._handle is None or (self.fsync_policy == "never" and not force): return
+        now = time.monotonic()
+        if force or self.fsync_policy == "always" or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._handle.fileno())
+            self._last_fsync = now
+
+    def close(self) -> None:
+        if self._handle is None: return
+        try: self._handle.flush(); self._maybe_fsync(force=True); self._handle.close()
+        except Exception as e: logger.warning(f"Error closing journal {self.journal_path.name}: {e}")
+        finally: self._handle = None
+
+
+class SqliteBackend(JobCacheBackend):
+    """
+    SQLite backend: a single `job_status` table with one row per (link, status, recorded_at),
+    also indexed by the numeric LinkedIn `job_id` so lookups dedupe across URL variants.
+
+    Membership checks are indexed lookups, so startup cost does not grow with history
+    size and nothing needs to be preloaded into memory. The database runs in WAL mode
+    with a busy timeout so several runs can safely share one output directory.
+    Existing journal / JSON list files are imported once on first use.
+    """
+
+    name = "sqlite"
+    indexed = True
+    DB_FILE_NAME: Final[str] = "job_cache.sqlite3"
+    BUSY_TIMEOUT_SECONDS: Final[float] = 10.0
+    MIGRATED_SUFFIX: Final[str] = ".migrated"
+    MAX_QUERY_KEYS: Final[int] = 500 # Keys per IN (...) lookup, below SQLite's bound parameter limit
+    _SCHEMA: Final[str] = """
+        CREATE TABLE IF NOT EXISTS job_status (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            link        TEXT NOT NULL,
+            status      TEXT NOT NULL,
+            recorded_at TEXT NOT NULL,
+            title       TEXT,
+            company     TEXT,
+            location    TEXT,
+            score       REAL,
+            gpt_salary  REAL,
+            data        TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_job_status_status_link ON job_status (status, link);
+        CREATE INDEX IF NOT EXISTS idx_job_status_link ON job_status (link);
+        CREATE INDEX IF NOT EXISTS idx_job_status_recorded_at ON job_status (recorded_at);
+        CREATE TABLE IF NOT EXISTS legacy_imports (
+            file_name   TEXT NOT NULL,
+            size        INTEGER NOT NULL,
+            mtime_ns    INTEGER NOT NULL,
+            imported_at TEXT NOT NULL,
+            PRIMARY KEY (file_name, size, mtime_ns)
+        );
+    """
+    # Schema migrations, applied in order and tracked with `PRAGMA user_version`.
+    _MIGRATIONS: Final[Tuple[str, ...]] = (
+        """
+        ALTER TABLE job_status ADD COLUMN job_id INTEGER;
+        UPDATE job_status SET job_id = linkedin_job_id(link);
+        CREATE INDEX IF NOT EXISTS idx_job_status_status_job_id ON job_status (status, job_id);
+        """,
+    )
+
+    def __init__(self, output_directory: Path, legacy_file_names: Optional[Dict[str, str]] = None):
+        super().__init__(output_directory)
+        self.db_path: Path = self.output_directory / self.DB_FILE_NAME
+        self._lock = threading.RLock() # One connection shared across threads; serialize access
+        self._conn: Optional[sqlite3.Connection] = self._connect()
+        self._conn.executescript(self._SCHEMA)
+        self._migrate_schema()
+        self._import_legacy_files(legacy_file_names or {})
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.create_function("linkedin_job_id", 1, extract_linkedin_job_id, deterministic=True)
+        return conn
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """The shared connection, reopened on demand after `close()` (the owning JobCache may be used again)."""
+        with self._lock:
+            if self._conn is None: self._conn = self._connect(); logger.debug(f"Reopened {self.db_path.name}.")
+            return self._conn
+
+    def _migrate_schema(self) -> None:
+        """Applies pending schema migrations atomically (safe when several runs start at once)."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._db.execute("PRAGMA user_version").fetchone()[0]
+                for index, script in enumerate(self._MIGRATIONS[version:], start=version + 1):
+                    logger.info(f"Migrating {self.db_path.name} schema to version {index}...")
+                    for statement in filter(None, (part.strip() for part in script.split(';'))): self._db.execute(statement)
+                    self._db.execute(f"PRAGMA user_version = {index}")
+                self._db.execute("COMMIT")
+            except Exception as e:
+                self._db.execute("ROLLBACK")
+                logger.error(f"Failed to migrate {self.db_path.name} schema: {e}", exc_info=True)
+                raise RuntimeError(f"Job cache schema migration failed: {e}") from e
+
+    def _import_legacy_files(self, legacy_file_names: Dict[str, str]) -> None:
+        """
+        One-shot import of the JSONL journal and legacy `*.json` list files.
+
+        Each imported file is recorded in `legacy_imports` (by name, size and mtime) in the
+        import transaction, and files already recorded there are skipped. A concurrent run
+        waiting on the write lock therefore sees the import once it gets the lock, even
+        though the files are only renamed to `*.migrated` after the commit.
+        """
+        journal_path = self.output_directory / JournalBackend.JOURNAL_FILE_NAME
+        sources: List[Tuple[Optional[str], Path]] = [(None, journal_path)] # None: the journal carries its statuses
+        sources += [(status, self.output_directory / name) for status, name in legacy_file_names.items()]
+        if not any(file_path.exists() for _, file_path in sources): return
+        with self._lock:
+            imported, imported_files = 0, []
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                for status, file_path in sources:
+                    try: stat = file_path.stat()
+                    except FileNotFoundError: continue # Absent, or renamed by a run that imported it first
+                    marker = (file_path.name, stat.st_size, stat.st_mtime_ns)
+                    if self._db.execute("SELECT 1 FROM legacy_imports WHERE file_name = ? AND size = ? AND mtime_ns = ?", marker).fetchone():
+                        imported_files.append(file_path); continue # Imported already; only the rename is missing
+                    logger.info(f"Importing legacy job cache file {file_path.name} into {self.db_path.name}...")
+                    entries = iter_journal_entries(file_path) if status is None else load_json_list(file_path)
+                    for entry in entries:
+                        self._insert(entry.pop('status') if status is None else status, entry); imported += 1
+                    self._db.execute("INSERT INTO legacy_imports (file_name, size, mtime_ns, imported_at) VALUES (?, ?, ?, ?)",
+                                     (*marker, time.strftime("%Y-%m-%d %H:%M:%S")))
+                    imported_files.append(file_path)
+                self._db.execute("COMMIT")
+            except Exception as e:
+                self._db.execute("ROLLBACK")
+                logger.error(f"Failed to import legacy job cache files: {e}", exc_info=True)
+                raise RuntimeError(f"Legacy job cache import failed: {e}") from e
+            renamed = []
+            for file_path in imported_files:
+                try: file_path.rename(file_path.with_name(file_path.name + self.MIGRATED_SUFFIX)); renamed.append(file_path.name + self.MIGRATED_SUFFIX)
+                except FileNotFoundError: pass # Renamed by a concurrent run
+        if imported: logger.info(f"Imported {imported} legacy cache entries into {self.db_path}.")
+        if renamed: logger.info(f"The job cache now lives in {self.db_path.name}; the imported files were renamed: {', '.join(renamed)}.")
+
+    def _insert(self, status: str, record: Dict[str, Any]) -> None:
+        recorded_at = record.get('status_recorded_at') or time.strftime("%Y-%m-%d %H:%M:%S")
+        self._db.execute(
+            "INSERT INTO job_status (link, job_id, status, recorded_at, title, company, location, score, gpt_salary, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record['link'], extract_linkedin_job_id(record.get('job_id')) or extract_linkedin_job_id(record['link']), status, recorded_at, record.get('title'), record.get('company'), record.get('location'),
+             _as_float(record.get('score')), _as_float(record.get('gpt_salary')),
+             json.dumps(record, ensure_ascii=False, default=str)),
+        )
+
+    def iter_records(self) -> Iterator[Tuple[str, str]]:
+        with self._lock: rows = self._db.execute("SELECT DISTINCT status, link FROM job_status").fetchall()
+        for row in rows: yield row['status'], row['link']
+
+    def contains(self, status: str, key: JobKey) -> bool:
+        column = "job_id" if isinstance(key, int) else "link"
+        with self._lock:
+            return self._db.execute(f"SELECT 1 FROM job_status WHERE status = ? AND {column} = ? LIMIT 1", (status, key)).fetchone() is not None
+
+    def contains_many(self, statuses: List[str], keys: List[JobKey]) -> Set[Tuple[str, JobKey]]:
+        """Answers a whole page of membership lookups with one indexed query per key kind (job ID / link)."""
+        found: Set[Tuple[str, JobKey]] = set()
+        if not statuses: return found
+        status_marks = ", ".join("?" * len(statuses))
+        with self._lock:
+            for column, values in (("job_id", [k for k in keys if isinstance(k, int)]), ("link", [k for k in keys if not isinstance(k, int)])):
+                for start in range(0, len(values), self.MAX_QUERY_KEYS):
+                    chunk = values[start:start + self.MAX_QUERY_KEYS]
+                    rows = self._db.execute(
+                        f"SELECT DISTINCT status, {column} FROM job_status WHERE status IN ({status_marks}) AND {column} IN ({', '.join('?' * len(chunk))})",
+                        (*statuses, *chunk)).fetchall()
+                    found.update((row[0], row[1]) for row in rows)
+        return found
+
+    def append(self, status: str, record: Dict[str, Any]) -> None:
+        try:
+            with self._lock: self._insert(status, record)
+        except Exception as e: logger.error(f"Failed to insert status '{status}' into {self.db_path.name}: {e}", exc_info=True)
+
+    def append_many(self, records: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Inserts the whole batch in a single transaction."""
+        if not records: return
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                for status, record in records: self._insert(status, record)
+                self._db.execute("COMMIT")
+            except Exception as e:
+                try: self._db.execute("ROLLBACK")
+                except sqlite3.Error: pass
+                logger.error(f"Failed to insert {len(records)} record(s) into {self.db_path.name}: {e}", exc_info=True)
+
+    def query_history(self,
+                      status: Optional[str] = None,
+                      min_score: Optional[float] = None,
+                      since: Optional[str] = None,
+                      company: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns recorded status rows (newest first) matching all given filters, e.g.
+        `query_history(status="job_score", min_score=7, since="2025-01-01 00:00:00")`.
+        `since` is compared against the "%Y-%m-%d %H:%M:%S" `recorded_at` timestamp.
+        """
+        clauses, params = [], []
+        if status is not None: clauses.append("status = ?"); params.append(status)
+        if min_score is not None: clauses.append("score >= ?"); params.append(min_score)
+        if since is not None: clauses.append("recorded_at >= ?"); params.append(since)
+        if company is not None: clauses.append("company = ? COLLATE NOCASE"); params.append(company)
+        sql = "SELECT link, job_id, status, recorded_at, title, company, location, score, gpt_salary FROM job_status"
+        if clauses: sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY recorded_at DESC, id DESC"
+        if limit is not None: sql += " LIMIT ?"; params.append(int(limit))
+        with self._lock: return [dict(row) for row in self._db.execute(sql, params).fetchall()]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None: return
+            try: self._conn.close()
+            except Exception as e: logger.warning(f"Error closing {self.db_path.name}: {e}")
+            finally: self._conn = None
+
+
+# --- Helpers ---
+
+def _encode_record(status: str, record: Dict[str, Any]) -> str:
+    """Serializes a status record as a single compact JSONL line."""
+    return json.dumps({"status": status, **record}, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try: return float(value) if value is not None else None
+    except (TypeError, ValueError): return None
+
+
+def iter_journal_entries(journal_path: Path) -> Iterator[Dict[str, Any]]:
+    """Streams valid entries (dicts with string 'status' and 'link') from a JSONL journal."""
+    if not journal_path.exists(): logger.debug(f"Journal not found: {journal_path.name}"); return
+    skipped = 0
+    try:
+        with journal_path.open('r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line: continue
+                try: entry = json.loads(line)
+                except json.JSONDecodeError: skipped += 1; continue
+                if isinstance(entry, dict) and isinstance(entry.get('status'), str) and isinstance(entry.get('link'), str): yield entry
+                else: skipped += 1
+    except IOError as e: logger.error(f"IOError reading journal {journal_path}: {e}", exc_info=True)
+    if skipped: logger.warning(f"Skipped {skipped} invalid line(s) in {journal_path.name}.")
+
+
+def load_json_list(file_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yields valid job dicts (with a string 'link') from a legacy JSON list file."""
+    if not file_path.exists(): logger.debug(f"Cache file not found: {file_path.name}"); return
+    try:
+        with file_path.open('r', encoding='utf-8') as f:
+            try: content = f.read().strip(); jobs_data = json.loads(content) if content else []
+            except json.JSONDecodeError: logger.warning(f"Cache file '{file_path.name}' corrupted/empty."); return
+    except IOError as e: logger.error(f"IOError reading cache file {file_path.name}: {e}", exc_info=True); return
+    if not isinstance(jobs_data, list): logger.warning(f"Unexpected format in {file_path.name}. Expected list, found {type(jobs_data)}."); return
+    count = 0
+    for job in jobs_data:
+        if isinstance(job, dict) and isinstance(job.get('link'), str): count += 1; yield job
+        else: logger.warning(f"Invalid job entry format in {file_path.name}: {str(job)[:100]}")
+    logger.debug(f"Loaded {count} links from {file_path.name}")
+
+
+def create_backend(kind: str, output_directory: Path, legacy_file_names: Dict[str, str], **options: Any) -> JobCacheBackend:
+    """Builds the backend named `kind` ("sqlite", "journal" or "json")."""
+    kind = (kind or "").lower()
+    if kind == SqliteBackend.name: return SqliteBackend(output_directory, legacy_file_names)
+    if kind == JsonListBackend.name: return JsonListBackend(output_directory, legacy_file_names)
+    if kind == JournalBackend.name: return JournalBackend(output_directory, legacy_file_names, **options)
+    raise ValueError(f"Unknown job cache backend: '{kind}'.")
@@ -0,0 +1,139 @@
+# src/job_evaluation_store.py
+"""
+Persistent store of LLM job evaluations (fit score and salary estimate) across runs.
+
+Evaluations are keyed by the normalized job description hash (or the job ID when
+no description is known), the resume hash and the evaluation prompt version, so a
+re-seen job, or the same posting under a different link, is never re-scored while
+the resume, prompts and model are unchanged. Lookups also match on the numeric
+LinkedIn job ID.
+"""
+
+import atexit
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final, Optional
+
+from loguru import logger
+
+from .job_id import extract_linkedin_job_id
+
+
+@dataclass(frozen=True)
+class JobEvaluation:
+    """A stored evaluation; either value may be missing if it was never computed."""
+    score: Optional[float]
+    gpt_salary: Optional[float]
+
+
+def description_fingerprint(description: Optional[str]) -> Optional[str]:
+    """SHA-256 of the description with case and whitespace normalized, or None if empty."""
+    normalized = re.sub(r"\s+", " ", description or "").strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest() if normalized else None
+
+
+class JobEvaluationStore:
+    """SQLite-backed (job, resume, prompt version) -> score / salary store, safe to share between runs."""
+
+    DB_FILE_NAME: Final[str] = "job_evaluations.sqlite3"
+    BUSY_TIMEOUT_SECONDS: Final[float] = 10.0
+    _SCHEMA: Final[str] = """
+        CREATE TABLE IF NOT EXISTS job_evaluation (
+            eval_key           TEXT NOT NULL,
+            resume_hash        TEXT NOT NULL,
+            prompt_version     TEXT NOT NULL,
+            job_id             INTEGER,
+            link               TEXT,
+            score              REAL,
+            gpt_salary         REAL,
+            salary_expectation REAL,
+            evaluated_at       TEXT NOT NULL,
+            PRIMARY KEY (eval_key, resume_hash, prompt_version)
+        );
+        CREATE INDEX IF NOT EXISTS idx_job_evaluation_job_id ON job_evaluation (job_id, resume_hash, prompt_version);
+    """
+
+    def __init__(self, output_directory: Path):
+        self.db_path: Path = Path(output_directory) / self.DB_FILE_NAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            str(self.db_path), timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        atexit.register(self.close)
+        logger.debug(f"Job evaluation store opened: {self.db_path}")
+
+    @staticmethod
+    def _eval_key(job) -> Optional[str]:
+        fingerprint = description_fingerprint(job.description)
+        if fingerprint: return f"desc:{fingerprint}"
+        job_id = extract_linkedin_job_id(job.job_id) or extract_linkedin_job_id(job.link)
+        if job_id is not None: return f"id:{job_id}"
+        return f"link:{job.link}" if job.link else None
+
+    def get(self, job, resume_hash: str, prompt_version: str,
+            salary_expectation: Optional[float] = None) -> Optional[JobEvaluation]:
+        """
+        Returns the stored evaluation of `job` for this resume and prompt version, or None.
+        The salary estimate is only returned if it was made against the same salary expectation.
+        """
+        eval_key = self._eval_key(job)
+        if eval_key is None: return None
+        job_id = extract_linkedin_job_id(job.job_id) or extract_linkedin_job_id(job.link)
+        try:
+            with self._lock:
+                if self._conn is None: return None
+                row = self._conn.execute(
+                    "SELECT score, gpt_salary, salary_expectation FROM job_evaluation "
+                    "WHERE resume_hash = ? AND prompt_version = ? AND (eval_key = ? OR job_id = ?) "
+                    "ORDER BY eval_key = ? DESC, evaluated_at DESC LIMIT 1",
+                    (resume_hash, prompt_version, eval_key, job_id, eval_key),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Job evaluation lookup failed for {job.link}: {e}")
+            return None
+        if row is None: return None
+        score, gpt_salary, stored_expectation = row
+        if gpt_salary is not None and salary_expectation is not None and stored_expectation != salary_expectation:
+            gpt_salary = None # Estimated against a different expectation
+        if score is None and gpt_salary is None: return None
+        return JobEvaluation(score=score, gpt_salary=gpt_salary)
+
+    def put(self, job, resume_hash: str, prompt_version: str, score: Optional[float] = None,
+            gpt_salary: Optional[float] = None, salary_expectation: Optional[float] = None) -> None:
+        """Stores (or completes) the evaluation of `job`; values passed as None keep what is stored."""
+        eval_key = self._eval_key(job)
+        if eval_key is None or (score is None and gpt_salary is None): return
+        job_id = extract_linkedin_job_id(job.job_id) or extract_linkedin_job_id(job.link)
+        try:
+            with self._lock:
+                if self._conn is None: return
+                self._conn.execute(
+                    "INSERT INTO job_evaluation (eval_key, resume_hash, prompt_version, job_id, link, score, gpt_salary, "
+                    "salary_expectation, evaluated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (eval_key, resume_hash, prompt_version) DO UPDATE SET "
+                    "job_id = COALESCE(excluded.job_id, job_id), link = excluded.link, "
+                    "score = COALESCE(excluded.score, score), "
+                    "gpt_salary = COALESCE(excluded.gpt_salary, gpt_salary), "
+                    "salary_expectation = CASE WHEN excluded.gpt_salary IS NULL THEN salary_expectation ELSE excluded.salary_expectation END, "
+                    "evaluated_at = excluded.evaluated_at",
+                    (eval_key, resume_hash, prompt_version, job_id, job.link, score, gpt_salary,
+                     salary_expectation, time.strftime("%Y-%m-%d %H:%M:%S")),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to store job evaluation for {job.link}: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None: return
+            try: self._conn.close()
+            except Exception as e: logger.warning(f"Error closing {self.db_path.name}: {e}")
+            finally: self._conn = None
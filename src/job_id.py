@@ -0,0 +1,83 @@
+# src/job_id.py
+"""
+LinkedIn job ID normalization and a compact set type for cached job keys.
+
+The same posting appears under different URLs (tracking query params, slugs,
+`currentJobId=` search URLs), so caches key on the numeric job ID whenever one
+can be extracted and fall back to the raw link otherwise.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from typing import Final, Iterator, Optional, Set, Union
+
+JobKey = Union[int, str]
+
+_JOB_ID_PATTERNS: Final = (
+    re.compile(r"/jobs/view/(?:[^/?#]*?-)?(\d+)"), # /jobs/view/123/ and /jobs/view/some-title-123/
+    re.compile(r"[?&](?:currentJobId|jobId)=(\d+)"),
+)
+
+
+def extract_linkedin_job_id(value: Union[str, int, None]) -> Optional[int]:
+    """Returns the numeric LinkedIn job ID from a job URL or raw ID string, or None."""
+    if value is None: return None
+    if isinstance(value, int): return value if value >= 0 else None
+    value = value.strip()
+    if value.isdigit(): return int(value)
+    for pattern in _JOB_ID_PATTERNS:
+        match = pattern.search(value)
+        if match: return int(match.group(1))
+    return None
+
+
+def job_cache_key(link: Union[str, int]) -> JobKey:
+    """Normalizes a job link to its cache key: the numeric job ID if available, else the link itself."""
+    job_id = extract_linkedin_job_id(link)
+    return job_id if job_id is not None else link
+
+
+class JobIdSet:
+    """
+    Memory-compact set of job keys.
+
+    Numeric IDs live in a sorted `array('Q')` (8 bytes per entry, binary-searched)
+    plus a small unsorted delta set that is merged in once it grows past
+    `MERGE_THRESHOLD`. Keys without a numeric ID fall back to a plain string set.
+    """
+
+    MERGE_THRESHOLD: Final[int] = 1024
+
+    def __init__(self):
+        self._ids: array = array('Q')
+        self._delta: Set[int] = set()
+        self._links: Set[str] = set()
+
+    def add(self, key: JobKey) -> None:
+        if isinstance(key, int):
+            if key in self: return
+            self._delta.add(key)
+            if len(self._delta) >= self.MERGE_THRESHOLD: self._merge()
+        else:
+            self._links.add(key)
+
+    def _merge(self) -> None:
+        self._ids = array('Q', merge(self._ids, sorted(self._delta)))
+        self._delta.clear()
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, int):
+            if key in self._delta: return True
+            index = bisect_left(self._ids, key)
+            return index < len(self._ids) and self._ids[index] == key
+        return key in self._links
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._delta) + len(self._links)
+
+    def __iter__(self) -> Iterator[JobKey]:
+        yield from self._ids
+        yield from self._delta
+        yield from self._links
@@ -3,6 +3,7 @@
 Handles the process of iterating through filtered jobs and attempting to apply
 using an Easy Apply handler component.
 """
+import time
 from loguru import logger
 from typing import List, Optional, Any # Ensure Any is imported
 
@@ -11,6 +12,14 @@ try:
     from ..job import Job, JobCache, JobStatus
 except ImportError:
     from src.job import Job, JobCache, JobStatus
+try:
+    from ..job_ranker import JobRelevanceRanker
+except ImportError:
+    from src.job_ranker import JobRelevanceRanker
+try:
+    from ..llm.exceptions import CircuitOpenError
+except ImportError:
+    from src.llm.exceptions import CircuitOpenError
 # Assuming JobFilter definition is here
 from .job_filter import JobFilter
 # We no longer need the specific import/alias for the type hint itself
@@ -27,7 +36,8 @@ class JobApplier:
     (e.g., one designed for LinkedIn Easy Apply).
     """
     # Use Any directly in the type hint for the application_handler
-    def __init__(self, application_handler: Any, cache: Optional[JobCache] = None): 
+    def __init__(self, application_handler: Any, cache: Optional[JobCache] = None,
+                 ranker: Optional[JobRelevanceRanker] = None):
         """
         Initializes the JobApplier.
 
@@ -35,6 +45,8 @@ class JobApplier:
             application_handler (Any): Component for executing application steps.
                                        *Must* have a 'main_job_apply' method.
             cache (Optional[JobCache]): The job cache instance for tracking status.
+            ranker (Optional[JobRelevanceRanker]): Local pre-ranker; if set, only the most relevant
+                                                   jobs of each page reach the handler.
         """
         logger.debug("Initializing JobApplier...")
 
@@ -54,6 +66,7 @@ class JobApplier:
 
         self.application_handler = application_handler
         self.cache: Optional[JobCache] = cache
+        self.ranker: Optional[JobRelevanceRanker] = ranker
         logger.debug("JobApplier initialized successfully.")
 
     def apply_jobs(self, job_list: List[Job], job_filter: JobFilter) -> List[Job]:
@@ -74,24 +87,20 @@ class JobApplier:
         total_jobs = len(job_list)
         logger.info(f"Processing {total_jobs} extracted jobs for application...")
 
-        for i, job in enumerate(job_list):
-            logger.debug(f"--- Processing Job {i+1}/{total_jobs} ---")
-            logger.debug(f"Job Details: Title='{job.title}', Company='{job.company}', Link='{job.link}'")
+        # --- Filtering ---
+        # The whole page is filtered at once; skip statuses are recorded there in one batch
+        try:
+            candidates, _ = job_filter.filter_batch(job_list)
+        except Exception as filter_e:
+            logger.error(f"Batch job filtering failed ({filter_e}), filtering jobs one by one.", exc_info=True)
+            candidates = self._filter_one_by_one(job_list, job_filter)
+        # --- End Filtering ---
 
-            # --- Filtering ---
-            try:
-                if job_filter.must_be_skipped(job):
-                    # Log reason handled within must_be_skipped, status recorded there too (SEEN, SKIPPED_*)
-                    continue # Move to the next job
-            except AttributeError as e:
-                 logger.error(f"AttributeError during job filtering for {job.link}, likely missing method in JobCache used by JobFilter: {e}. Skipping job.")
-                 if self.cache: self.cache.record_job_status(job, JobStatus.SEEN) # Mark as seen anyway
-                 continue
-            except Exception as filter_e:
-                 logger.error(f"Unexpected error during job filtering for {job.link}: {filter_e}. Skipping job.")
-                 if self.cache: self.cache.record_job_status(job, JobStatus.SEEN) # Mark as seen anyway
-                 continue
-            # --- End Filtering ---
+        candidates = self._prerank(candidates)
+
+        for i, job in enumerate(candidates):
+            logger.debug(f"--- Processing Job {i+1}/{len(candidates)} ---")
+            logger.debug(f"Job Details: Title='{job.title}', Company='{job.company}', Link='{job.link}'")
 
             # --- Application Attempt ---
             was_applied = False # Default to false
@@ -117,6 +126,10 @@ class JobApplier:
                          # Otherwise, just mark as seen.
                          self.cache.record_job_status(job, JobStatus.SEEN)
 
+            except CircuitOpenError as e:
+                # The LLM provider is down: not a verdict on the job, so it stays unrecorded for a later search
+                logger.warning(f"LLM circuit open; leaving job {job.link} unrecorded and pausing {e.retry_after_seconds:.0f}s.")
+                time.sleep(e.retry_after_seconds)
             except Exception as e:
                 # Catch errors during the application attempt itself
                 logger.error(f"Application attempt failed for job {job.link} with error: {e}", exc_info=True)
@@ -128,4 +141,40 @@ class JobApplier:
 
         applied_count = len(applied_jobs_list)
         logger.debug(f"Finished processing job list for this page. Successful applications reported by handler: {applied_count}.")
-        return applied_jobs_list
\ No newline at end of file
+        return applied_jobs_list
+
+    def _filter_one_by_one(self, job_list: List[Job], job_filter: JobFilter) -> List[Job]:
+        """Per-job fallback of `JobFilter.filter_batch`; jobs whose check fails are marked seen and skipped."""
+        candidates: List[Job] = []
+        for job in job_list:
+            try:
+                if job_filter.must_be_skipped(job):
+                    # Log reason handled within must_be_skipped, status recorded there too (SEEN, SKIPPED_*)
+                    continue # Move to the next job
+            except AttributeError as e:
+                 logger.error(f"AttributeError during job filtering for {job.link}, likely missing method in JobCache used by JobFilter: {e}. Skipping job.")
+                 if self.cache: self.cache.record_job_status(job, JobStatus.SEEN) # Mark as seen anyway
+                 continue
+            except Exception as filter_e:
+                 logger.error(f"Unexpected error during job filtering for {job.link}: {filter_e}. Skipping job.")
+                 if self.cache: self.cache.record_job_status(job, JobStatus.SEEN) # Mark as seen anyway
+                 continue
+            candidates.append(job)
+        return candidates
+
+    def _prerank(self, jobs: List[Job]) -> List[Job]:
+        """
+        Orders the filtered jobs by local relevance and keeps the configured top fraction.
+        Jobs the ranker rejects are recorded as skipped; deferred jobs (including those below the
+        threshold while the title corpus is still small) are left unrecorded so a later search
+        can still pick them up.
+        """
+        if not self.ranker or not jobs: return jobs
+        try: selected, rejected, _ = self.ranker.select(jobs)
+        except Exception as e:
+            logger.error(f"Job pre-ranking failed, processing all filtered jobs: {e}", exc_info=True)
+            return jobs
+        if self.cache:
+            self.cache.record_job_statuses((job, status) for job in rejected
+                                           for status in (JobStatus.SKIPPED_LOW_RELEVANCE, JobStatus.SEEN))
+        return selected
@@ -27,6 +27,7 @@ except ImportError:
 
 # Navigator needed for scrolling (relative import)
 from .job_navigator import JobNavigator
+from src.job_id import extract_linkedin_job_id
 
 
 class JobExtractor:
@@ -208,10 +209,12 @@ class JobExtractor:
 
     # REMOVED _is_job_tile_loaded method
 
-    def extract_job_information_from_tile(self, job_tile: WebElement) -> Optional[Tuple[str, str, str, str, Optional[str], Optional[str]]]:
+    def extract_job_information_from_tile(self, job_tile: WebElement) -> Optional[Tuple[str, str, str, str, Optional[str], Optional[str], Optional[int]]]:
         """
         Extracts structured job information from a single job tile WebElement
         using BeautifulSoup for faster parsing after getting the innerHTML.
+        Returns (title, company, location, link, apply_method, state, job_id), where
+        job_id is the numeric LinkedIn ID (None if unavailable).
         Returns None if essential information (title, link) cannot be extracted.
         """
         job_id = "unknown"
@@ -349,7 +352,8 @@ class JobExtractor:
             # --- Logging & Return ---
             # Reduce log level for successful extractions to DEBUG or TRACE if INFO is too verbose
             logger.trace(f"Successfully extracted (BS): Title='{job_title}', Company='{company}', Location='{job_location}', Link='{link}', Apply='{apply_method}', State='{job_state}'")
-            return job_title, company, job_location, link, apply_method, job_state
+            numeric_job_id = extract_linkedin_job_id(job_id) or extract_linkedin_job_id(link)
+            return job_title, company, job_location, link, apply_method, job_state, numeric_job_id
 
         except StaleElementReferenceException:
             # This *shouldn't* happen often if we get innerHTML quickly, but handle just in case
@@ -1,15 +1,39 @@
 # src/job_manager/job_filter.py
 """
 Module for filtering Job objects based on defined criteria like blacklists and cache status.
+
+Title, company and description blacklists are matched with one Aho-Corasick
+automaton (see `phrase_matcher.py`), so each text is scanned once for all the
+blacklists that apply to it, however long they are.
 """
+from collections import Counter
 from loguru import logger
-from typing import List, Optional, Set
+from typing import Dict, Final, List, Optional, Tuple
 
 # Ensure correct relative import if job.py is in parent dir
 try:
     from ..job import Job, JobCache, JobStatus # Import JobStatus
 except ImportError:
     from src.job import Job, JobCache, JobStatus
+from .phrase_matcher import PhraseMatch, PhraseMatcher
+
+# Rule tags of the blacklists in the phrase matcher
+TITLE_RULE = "title"
+COMPANY_RULE = "company"
+DESCRIPTION_RULE = "description"
+
+# Statuses recorded in earlier runs that skip a job, checked in order, with their skip reason
+CACHED_SKIP_REASONS: Final[Tuple[Tuple[JobStatus, str], ...]] = (
+    (JobStatus.SEEN, "seen"),
+    (JobStatus.SKIPPED_LOW_SALARY, "low_salary"),
+    (JobStatus.SKIPPED_LOW_SCORE, "low_score"),
+    (JobStatus.SUCCESS, "applied"),
+    (JobStatus.SKIPPED_BLACKLIST, "blacklisted"),
+)
+# Keys of the skip lists returned by `JobFilter.filter_batch`
+SKIP_REASONS: Final[Tuple[str, ...]] = ("invalid",) + tuple(reason for _, reason in CACHED_SKIP_REASONS) + (
+    "job_state", "title_blacklist", "company_blacklist", "description_blacklist", "duplicate",
+)
 
 
 class JobFilter:
@@ -22,165 +46,116 @@ class JobFilter:
                  title_blacklist: Optional[List[str]] = None,
                  company_blacklist: Optional[List[str]] = None,
                  description_blacklist: Optional[List[str]] = None,
-                 cache: Optional[JobCache] = None):
-        """Initializes the JobFilter."""
+                 cache: Optional[JobCache] = None,
+                 word_boundaries: bool = False):
+        """
+        Initializes the JobFilter.
+
+        Args:
+            word_boundaries (bool): Only match blacklist phrases that are not part of a longer word
+                                    (e.g. "Oral" no longer skips "Moral Support Specialist").
+        """
         logger.debug("Initializing JobFilter...")
         self.title_blacklist: List[str] = title_blacklist or []
         self.company_blacklist: List[str] = company_blacklist or []
         self.description_blacklist: List[str] = description_blacklist or []
         if cache and not isinstance(cache, JobCache): raise TypeError("cache must be JobCache or None")
         self.cache: Optional[JobCache] = cache
-        self.title_blacklist_set: Set[str] = {word.lower().strip() for word in self.title_blacklist if word}
-        self.company_blacklist_set: Set[str] = {name.lower().strip() for name in self.company_blacklist if name}
-        self.description_blacklist_lower: List[str] = [crit.lower().strip() for crit in self.description_blacklist if crit]
-        logger.debug(f"JobFilter initialized successfully. Cache {'enabled' if cache else 'disabled'}.")
+        # All blacklists compiled once into one automaton, scanned in a single pass per text
+        self.matcher = PhraseMatcher({
+            TITLE_RULE: self.title_blacklist,
+            COMPANY_RULE: self.company_blacklist,
+            DESCRIPTION_RULE: self.description_blacklist,
+        }, word_boundaries=word_boundaries)
+        self.blacklist_hits: Counter = Counter() # (rule, phrase) -> jobs skipped by it
+        logger.debug(f"JobFilter initialized successfully ({len(self.matcher)} blacklist phrases, word boundaries "
+                     f"{'on' if word_boundaries else 'off'}). Cache {'enabled' if cache else 'disabled'}.")
 
     def must_be_skipped(self, job: Job) -> bool:
-        """Determines if a given job should be skipped based on various criteria."""
+        """Determines if a given job should be skipped based on various criteria (see `filter_batch`)."""
         if not isinstance(job, Job) or not job.link: logger.warning("Invalid Job passed to must_be_skipped."); return True
-        link = job.link
-        logger.debug(f"Filtering job: '{job.title}' at '{job.company}' ({link})")
-
-        # --- Cache Checks (Using EXACT method names from refactored JobCache) ---
-        if self.cache:
-            # Use has_been_seen (renamed from is_in_is_seen)
-            if self.cache.has_been_seen(link):
-                logger.debug(f"Skipping: Job link already seen [{link}]")
-                return True
-            # Use is_skipped_low_salary
-            if self.cache.is_skipped_low_salary(link):
-                logger.debug(f"Skipping: Job previously skipped for low salary [{link}]")
-                self.cache.record_job_status(job, JobStatus.SEEN) # Ensure marked as seen if re-encountered
-                return True
-            # Use is_skipped_low_score
-            if self.cache.is_skipped_low_score(link):
-                logger.debug(f"Skipping: Job previously skipped for low score/description [{link}]")
-                self.cache.record_job_status(job, JobStatus.SEEN)
-                return True
-            # Use is_applied_successfully
-            if self.cache.is_applied_successfully(link):
-                logger.debug(f"Skipping: Job already applied successfully [{link}]")
-                self.cache.record_job_status(job, JobStatus.SEEN)
-                return True
-            # Use is_skipped_blacklist (newly added check)
-            if self.cache.is_skipped_blacklist(link):
-                logger.debug(f"Skipping: Job previously skipped due to blacklist [{link}]")
-                self.cache.record_job_status(job, JobStatus.SEEN)
-                return True
-            
-            # # Use has_failed_application (newly added check)
-            # if self.cache.has_failed_application(link):
-            #     logger.info(f"Skipping: Job previously failed during application [{link}]")
-            #     self.cache.record_job_status(job, JobStatus.SEEN)
-            #     return True
-            
-        # --- End Cache Checks ---
-        if self._is_job_state_invalid(job):
-            logger.debug(f"Skipping: job card shows state '{job.state}' [{job.link}]")
-            if self.cache:
-                # ainda assim marcamos como SEEN para não reprocessar no futuro
-                self.cache.record_job_status(job, JobStatus.SEEN)
-            return True
-        
-        # --- Blacklist Checks ---
-        if self._is_title_blacklisted(job.title):
-            logger.debug(f"Skipping: Title '{job.title}' matches title blacklist [{link}]")
-            if self.cache: self.cache.record_job_status(job, JobStatus.SKIPPED_BLACKLIST); self.cache.record_job_status(job, JobStatus.SEEN)
-            return True
-        if self._is_company_blacklisted(job.company):
-            logger.debug(f"Skipping: Company '{job.company}' matches company blacklist [{link}]")
-            if self.cache: self.cache.record_job_status(job, JobStatus.SKIPPED_BLACKLIST); self.cache.record_job_status(job, JobStatus.SEEN)
-            return True
-        if self._matches_description_blacklist(job):
-            logger.debug(f"Skipping: Job title/description matches description blacklist [{link}]")
-            if self.cache: self.cache.record_job_status(job, JobStatus.SKIPPED_LOW_SCORE); self.cache.record_job_status(job, JobStatus.SEEN) # Keep original status for this
-            return True
-        # --- End Blacklist Checks ---
-
-        # Optional: Filter based on job state/apply method if desired
-        # if self._is_apply_method_not_easy_apply(job): ... return True
-
-        logger.debug(f"Job PASSED filters: '{job.title}' at '{job.company}' [{link}]")
-        return False # Do not skip
+        kept, _ = self.filter_batch([job])
+        return not kept
 
-    # --- Helper methods ---
-    # (Implementations remain the same)
-    def _matches_description_blacklist(self, job: Job) -> bool:
-        """
-        Check if job description or title contains blacklisted phrases.
-        
-        Unlike the other blacklist methods, this one already performs
-        a substring check that works with multi-word phrases, checking
-        if any blacklisted phrase appears within the job description or title.
+    def filter_batch(self, jobs: List[Job]) -> Tuple[List[Job], Dict[str, List[Job]]]:
         """
-        if not self.description_blacklist_lower: return False
-        
-        # Convert job description and title to lowercase for case-insensitive comparison
-        job_description_lower = job.description.lower() if job.description else ""
-        job_title_lower = job.title.lower() if job.title else ""
-        
-        # Check for each blacklisted phrase in both title and description
-        for criteria in self.description_blacklist_lower:
-            if criteria in job_title_lower or criteria in job_description_lower:
-                logger.trace(f"Description blacklist criteria '{criteria}' found: {job.link}")
-                return True
-                
-        return False
-
-    def _is_title_blacklisted(self, title: str) -> bool:
-        """
-        Check if job title contains blacklisted words or phrases.
-        
-        This method performs two types of checks:
-        1. Word-level check: splits title into individual words and checks against blacklist
-        2. Phrase-level check: checks if any complete blacklist phrase appears in the title
+        Filters a whole page of jobs: cache membership is checked for all jobs at once, blacklists
+        are matched per job, and the statuses of the skipped jobs are recorded in one batched write.
+
+        Checks run in order: previous cache statuses (seen, low salary, low score, applied,
+        blacklisted), the state shown on the job card, title/company/description blacklists,
+        and repeats of a job already kept from this page.
+
+        Returns:
+            (kept, skipped): The jobs that passed, in page order, and the skipped jobs by
+            reason (keys of SKIP_REASONS, all present).
         """
-        if not title or not self.title_blacklist_set: return False
-        
-        # Convert title to lowercase for case-insensitive comparison
-        title_lower = title.lower()
-        
-        # Check 1: Word-level comparison (original method)
-        title_words = set(word.strip('.,!?;:') for word in title_lower.split())
-        intersection = title_words.intersection(self.title_blacklist_set)
-        if intersection: 
-            logger.trace(f"Blacklisted title words: {intersection}")
-            return True
-            
-        # Check 2: Phrase-level comparison (for multi-word blacklist items)
-        for phrase in self.title_blacklist:
-            if phrase and phrase.lower() in title_lower:
-                logger.trace(f"Blacklisted phrase found: '{phrase}'")
-                return True
-                
-        return False
-
-    def _is_company_blacklisted(self, company: str) -> bool:
+        skipped: Dict[str, List[Job]] = {reason: [] for reason in SKIP_REASONS}
+        records: List[Tuple[Job, JobStatus]] = []
+        valid = [job for job in jobs if isinstance(job, Job) and job.link]
+        skipped["invalid"] = [job for job in jobs if not (isinstance(job, Job) and job.link)]
+
+        known = self.cache.lookup_statuses(valid, [status for status, _ in CACHED_SKIP_REASONS]) if self.cache and valid else {}
+        kept: List[Job] = []
+        kept_keys = set()
+        for job in valid:
+            statuses = known.get(job.cache_key, ())
+            reason = next((reason for status, reason in CACHED_SKIP_REASONS if status in statuses), None)
+            if reason is not None:
+                if reason != "seen": records.append((job, JobStatus.SEEN)) # Ensure marked as seen if re-encountered
+            elif self._is_job_state_invalid(job):
+                reason = "job_state"
+                records.append((job, JobStatus.SEEN)) # ainda assim marcamos como SEEN para não reprocessar no futuro
+            elif (match := self._blacklist_match(job)) is not None:
+                reason = f"{match.rule}_blacklist"
+                # Description matches keep their original status
+                status = JobStatus.SKIPPED_LOW_SCORE if match.rule == DESCRIPTION_RULE else JobStatus.SKIPPED_BLACKLIST
+                records += [(job, status), (job, JobStatus.SEEN)]
+            elif job.cache_key in kept_keys:
+                reason = "duplicate"
+            if reason is None:
+                kept.append(job)
+                kept_keys.add(job.cache_key)
+                logger.debug(f"Job PASSED filters: '{job.title}' at '{job.company}' [{job.link}]")
+                continue
+            skipped[reason].append(job)
+            logger.debug(f"Skipping ({reason}): '{job.title}' at '{job.company}' [{job.link}]")
+
+        if self.cache and records: self.cache.record_job_statuses(records)
+        if skipped["invalid"]: logger.warning(f"{len(skipped['invalid'])} invalid job(s) skipped by the filter.")
+        if len(jobs) > 1:
+            counts = ", ".join(f"{reason} {len(group)}" for reason, group in skipped.items() if group)
+            logger.info(f"Filtered {len(jobs)} job(s): {len(kept)} kept{f', skipped: {counts}' if counts else ''}.")
+        return kept, skipped
+
+    def blacklist_stats(self) -> List[Tuple[str, str, int]]:
+        """(rule, phrase, jobs skipped) of every blacklist phrase that matched, most frequent first."""
+        return [(rule, phrase, count) for (rule, phrase), count in self.blacklist_hits.most_common()]
+
+    def log_blacklist_stats(self) -> None:
+        """Logs which blacklist phrases skipped jobs this run."""
+        stats = self.blacklist_stats()
+        if not stats: return
+        logger.info(f"Blacklist matches: {', '.join(f'{rule} {phrase!r} x{count}' for rule, phrase, count in stats)}")
+
+    # --- Helper methods ---
+    def _blacklist_match(self, job: Job) -> Optional[PhraseMatch]:
         """
-        Check if company matches any blacklisted company names.
-        
-        This method performs two types of checks:
-        1. Exact match: checks if the company name exactly matches a blacklisted company
-        2. Phrase-level check: checks if any blacklisted company name appears within the company name
+        The blacklist phrase that skips `job`, counted in `blacklist_hits`, or None. Blacklists
+        decide in order: title, company, then description phrases in the title or description.
+
+        The title is scanned once for the title and description rules, the company once, and
+        the description (the long text) only if nothing matched before it.
         """
-        if not company or not self.company_blacklist_set: return False
-        
-        # Convert company name to lowercase for case-insensitive comparison
-        company_lower = company.strip().lower()
-        
-        # Check 1: Exact match (original method)
-        is_blacklisted = company_lower in self.company_blacklist_set
-        if is_blacklisted: 
-            logger.trace(f"Company '{company_lower}' exactly matches blacklist.")
-            return True
-            
-        # Check 2: Phrase-level comparison (for multi-word blacklist items)
-        for name in self.company_blacklist:
-            if name and name.lower() in company_lower:
-                logger.trace(f"Blacklisted company phrase found: '{name}' in '{company}'")
-                return True
-                
-        return False
-    
+        title_matches = self.matcher.first_per_rule(job.title, (TITLE_RULE, DESCRIPTION_RULE))
+        match = (title_matches.get(TITLE_RULE)
+                 or self.matcher.first_per_rule(job.company, (COMPANY_RULE,)).get(COMPANY_RULE)
+                 or title_matches.get(DESCRIPTION_RULE)
+                 or self.matcher.first_per_rule(job.description, (DESCRIPTION_RULE,)).get(DESCRIPTION_RULE))
+        if match:
+            self.blacklist_hits[(match.rule, match.phrase)] += 1
+            logger.trace(f"Blacklisted {match.rule} phrase '{match.phrase}' found in '{job.title}' at '{job.company}'")
+        return match
+
     def _is_job_state_invalid(self, job: Job) -> bool:
         return bool(job.state) and job.state.lower() in self.INVALID_STATES
@@ -6,6 +6,7 @@ Coordinates navigation, extraction, filtering, and application steps.
 Requires configuration and dependencies (WebDriver, LLMProcessor, ResumeManager)
 to be set via its `configure` and `set_llm_processor` methods.
 """
+import signal
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
@@ -18,6 +19,8 @@ from selenium.webdriver.common.by import By # For page load check
 
 # Internal components
 from src.job import Job, JobCache # Assuming these are defined correctly
+from src.job_application_profile import JobApplicationProfile
+from src.job_ranker import JobRelevanceRanker
 from src.llm import LLMProcessor # For type hinting
 from src.resume_manager import ResumeManager # For type hinting
 from .environment_keys import EnvironmentKeys
@@ -69,6 +72,8 @@ class JobManager:
         self.parameters: Optional[Dict[str, Any]] = None
         self.job_filter: Optional[JobFilter] = None
         self.job_applier: Optional[JobApplier] = None
+        self.job_ranker: Optional[JobRelevanceRanker] = None
+        self.job_application_profile: Optional[JobApplicationProfile] = None # Seeds the answer bank
         self.cache: Optional[JobCache] = None
         self.output_file_directory: Optional[Path] = None
 
@@ -88,6 +93,13 @@ class JobManager:
         logger.info("LLM Processor set for JobManager.")
         # Note: LLM Processor is passed to EasyApplyHandler during start_processing
 
+    def set_job_application_profile(self, job_application_profile: JobApplicationProfile):
+        """Sets the job application profile whose answers seed the answer bank at startup."""
+        if not isinstance(job_application_profile, JobApplicationProfile):
+             raise TypeError("job_application_profile must be an instance of JobApplicationProfile")
+        self.job_application_profile = job_application_profile
+        logger.info("Job application profile set for JobManager.")
+
     def configure(self, parameters: Dict[str, Any], resume_manager: ResumeManager):
         """
         Configures the JobManager with application parameters, resume manager,
@@ -111,7 +123,12 @@ class JobManager:
 
         # Initialize Cache
         try:
-             self.cache = JobCache(self.output_file_directory)
+             self.cache = JobCache(
+                 self.output_file_directory,
+                 backend=parameters.get("job_cache_backend", JobCache.DEFAULT_BACKEND),
+                 fsync_policy=parameters.get("job_cache_fsync", "interval"),
+                 write_behind=parameters.get("job_cache_write_behind", True),
+             )
              logger.info(f"JobCache initialized for directory: {self.output_file_directory}")
         except Exception as e:
              logger.error(f"Failed to initialize JobCache: {e}", exc_info=True)
@@ -123,10 +140,15 @@ class JobManager:
             title_blacklist=parameters.get("title_blacklist", []),
             company_blacklist=parameters.get("company_blacklist", []),
             description_blacklist=parameters.get("description_blacklist", []),
-            cache=self.cache
+            cache=self.cache,
+            word_boundaries=bool(parameters.get("blacklist_word_boundaries", False)),
         )
         logger.info("JobFilter initialized.")
 
+        # Initialize the optional local pre-ranker (config 'job_prerank')
+        try: self.job_ranker = JobRelevanceRanker.from_config(parameters, resume_manager.get_plain_text_content())
+        except Exception as e: logger.error(f"Failed to initialize job pre-ranking, continuing without it: {e}"); self.job_ranker = None
+
         # Extract other parameters if needed directly by JobManager
         # self.apply_once_at_company = parameters.get("apply_once_at_company", False)
         # self.min_applicants = parameters.get("job_applicants_threshold", {}).get("min_applicants", 0)
@@ -162,9 +184,11 @@ class JobManager:
                 # old_answers_set=self.set_old_answers, # Pass if needed, else remove
                 llm_processor=self.llm_processor,
                 cache=self.cache,
+                relevance_ranker=self.job_ranker,
             )
-            self.job_applier = JobApplier(application_handler, self.cache)
+            self.job_applier = JobApplier(application_handler, self.cache, ranker=self.job_ranker)
             logger.info("JobApplier and EasyApplyHandler initialized.")
+            application_handler.warm_up_answers(self.job_application_profile) # Common questions answered before the first form
         except Exception as e:
              logger.error(f"Failed to initialize EasyApplyHandler or JobApplier: {e}", exc_info=True)
              raise RuntimeError(f"Failed to initialize application components: {e}") from e
@@ -184,6 +208,22 @@ class JobManager:
              logger.warning("No searches defined in configuration. Job processing will not run.")
              return
 
+        previous_sigterm_handler = self._install_sigterm_handler()
+        try:
+             total_applied_count = self._process_searches(searches, base_search_url_params)
+        finally:
+             self.cache.close() # Flush buffered status records and release the backend
+             self.llm_processor.close() # Cancel salary estimates still in flight and stop their thread
+             self.job_applier.application_handler.close() # Checkpoint the evaluation store's WAL
+             self.job_filter.log_blacklist_stats()
+             if previous_sigterm_handler is not None: signal.signal(signal.SIGTERM, previous_sigterm_handler)
+
+        # End of search loop
+        logger.success(f"Job processing workflow completed. Total application attempts initiated: {total_applied_count}")
+
+
+    def _process_searches(self, searches: List[Dict[str, Any]], base_search_url_params: str) -> int:
+        """Runs every configured search/term/page and returns the number of application attempts."""
         total_applied_count = 0
         for search_index, search in enumerate(searches):
             search_location = search.get('location', 'UNKNOWN_LOCATION')
@@ -242,7 +282,7 @@ class JobManager:
                          if job_data_tuple:
                               try:
                                    # Unpack tuple matching the EXTRACTOR'S return signature
-                                   j_title, j_company, j_location, j_link, j_apply, j_state = job_data_tuple
+                                   j_title, j_company, j_location, j_link, j_apply, j_state, j_id = job_data_tuple
                                    # Create Job object - description will be added later by EasyApplyHandler
                                    job = Job(
                                         title=j_title,
@@ -251,6 +291,7 @@ class JobManager:
                                         link=j_link,
                                         apply_method=j_apply,
                                         state=j_state,
+                                        job_id=j_id,
                                         # description remains default "" or None here
                                         search_term=search_term,
                                         search_country=search_location
@@ -290,12 +331,24 @@ class JobManager:
             # End of term loop for the current search
             logger.info(f"Finished processing all terms for location '{search_location}'.")
 
-        # End of search loop
-        logger.success(f"Job processing workflow completed. Total application attempts initiated: {total_applied_count}")
+        return total_applied_count
 
 
     # --- Helper Methods ---
 
+    def _install_sigterm_handler(self):
+        """
+        Turns SIGTERM into a SystemExit so the `finally` in `start_processing` flushes the
+        job cache before the process exits. Returns the previous handler (None if not installed).
+        """
+        def _on_sigterm(signum, frame):
+            logger.warning("SIGTERM received. Flushing job cache and stopping...")
+            raise SystemExit(128 + signum)
+        try: return signal.signal(signal.SIGTERM, _on_sigterm)
+        except ValueError: # Not in the main thread
+            logger.debug("Not running in main thread; SIGTERM handler not installed.")
+            return None
+
     def _construct_base_search_url_params(self, parameters: Dict[str, Any]) -> str:
         """Constructs the base parameter string for LinkedIn job search URLs."""
         logger.debug("Constructing base search URL parameters from config...")
@@ -0,0 +1,127 @@
+# src/job_manager/phrase_matcher.py
+"""
+Aho-Corasick automaton for finding many blacklist phrases in one pass over a text.
+
+All phrases (of every blacklist) are compiled once into a trie with failure links,
+each tagged with the rule it belongs to (e.g. "title", "company", "description").
+Scanning a text is then a single linear pass, regardless of the number of
+phrases, and reports every (rule, phrase) found. Matching is case-insensitive.
+
+With word boundaries, a phrase only matches where it is not part of a longer word:
+"oral" then matches "Oral Surgeon" but not "Moral Support". Boundaries are only
+required at phrase edges that are word characters, so "c++" or ".net" still match.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PhraseMatch:
+    """A blacklist phrase found in a text."""
+    rule: str # Tag of the list the phrase belongs to
+    phrase: str # Phrase as configured
+    start: int # Offsets in the lowercased text
+    end: int
+
+
+class PhraseMatcher:
+    """Multi-phrase, case-insensitive matcher compiled once from tagged phrase lists."""
+
+    def __init__(self, rules: Dict[str, Iterable[str]], word_boundaries: bool = False):
+        """
+        Args:
+            rules: Rule tag -> phrases. Phrases are stripped; empty ones are ignored.
+            word_boundaries: Only match phrases that are not part of a longer word.
+        """
+        self.word_boundaries = word_boundaries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]] # Pattern ids ending at each state, failure chain included
+        self._patterns: List[Tuple[str, str, int]] = [] # (rule, phrase, length of the lowercased phrase)
+        self.rules: Dict[str, int] = {} # Rule tag -> number of phrases
+
+        seen = set()
+        for rule, phrases in rules.items():
+            self.rules.setdefault(rule, 0)
+            for phrase in phrases or []:
+                phrase = str(phrase or "").strip()
+                lowered = phrase.lower()
+                if not lowered or (rule, lowered) in seen: continue
+                seen.add((rule, lowered))
+                self._insert(lowered, len(self._patterns))
+                self._patterns.append((rule, phrase, len(lowered)))
+                self.rules[rule] += 1
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _insert(self, phrase: str, pattern_id: int) -> None:
+        state = 0
+        for char in phrase:
+            following = self._goto[state].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = following
+        self._outputs[state].append(pattern_id)
+
+    def _link(self) -> None:
+        """Computes failure links breadth-first and merges the outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]: fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(char, 0)
+                self._outputs[following] = self._outputs[following] + self._outputs[self._fail[following]]
+
+    @staticmethod
+    def _is_bounded(text: str, start: int, end: int) -> bool:
+        """True if the match is not glued to word characters at its word-character edges."""
+        if text[start].isalnum() and start > 0 and text[start - 1].isalnum(): return False
+        if text[end - 1].isalnum() and end < len(text) and text[end].isalnum(): return False
+        return True
+
+    def finditer(self, text: Optional[str], rules: Optional[Collection[str]] = None) -> Iterator[PhraseMatch]:
+        """
+        Yields the phrases found in `text` in order of their end offset, optionally only those
+        of the given rules. Lazy, so callers that only need the first match stop the scan early.
+        """
+        if not text or not self._patterns: return
+        lowered = text.lower()
+        goto, fail, outputs, patterns = self._goto, self._fail, self._outputs, self._patterns
+        state = 0
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]: state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in outputs[state]:
+                rule, phrase, length = patterns[pattern_id]
+                if rules is not None and rule not in rules: continue
+                start, end = position + 1 - length, position + 1
+                if self.word_boundaries and not self._is_bounded(lowered, start, end): continue
+                yield PhraseMatch(rule, phrase, start, end)
+
+    def first(self, text: Optional[str], rules: Optional[Collection[str]] = None) -> Optional[PhraseMatch]:
+        """The first phrase found in `text` (of the given rules), or None."""
+        return next(self.finditer(text, rules), None)
+
+    def first_per_rule(self, text: Optional[str], rules: Collection[str]) -> Dict[str, PhraseMatch]:
+        """
+        The first phrase of each of `rules` found in `text`, from a single scan that stops once
+        every rule has matched. Rules without phrases are left out.
+        """
+        wanted = {rule for rule in rules if self.rules.get(rule)}
+        found: Dict[str, PhraseMatch] = {}
+        if not wanted: return found
+        for match in self.finditer(text, wanted):
+            found.setdefault(match.rule, match)
+            if len(found) == len(wanted): break
+        return found
@@ -0,0 +1,200 @@
+# src/job_ranker.py
+"""
+Cheap local relevance scoring of jobs against the resume, run before LLM scoring.
+
+Each job text (title, or title plus description) is treated as a query against
+the resume: every distinct job term is weighted by its IDF across the jobs seen
+so far this run, and credited by how strongly the resume mentions it, with
+BM25-style saturation. The relevance is the credited share of the job's IDF mass:
+
+    relevance = sum(idf(t) * tf_resume(t) / (tf_resume(t) + k)) / sum(idf(t))
+
+It is 0 when the resume shares no terms with the job and approaches 1 when it
+covers every distinctive term. Scoring a page of jobs is a single NumPy
+matrix-vector product.
+
+Title IDF is seeded with the whole page before any title is judged, but a single
+page is still a small corpus: until `min_title_documents` titles have been counted,
+titles below the threshold are only deferred (left unrecorded), not rejected.
+Descriptions are only known one at a time, after a job is opened, so the description
+check does not reject anything until `min_description_documents` descriptions have
+been counted: with fewer, every term looks equally rare and relevance is unreliable.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Final, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+_TOKEN_PATTERN: Final = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]") # Keeps c++, c#, node.js
+_STOPWORDS: Final[frozenset] = frozenset("""
+    a an and are as at be been but by can for from has have he her his i if in into is it its me my of on or our
+    she so that the their them they this to was we were what when where which who will with you your us all any
+    able about also other such than then there these those through up over more most very would should could
+    etc per via within without across de la le el en y e o da do das dos""".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens without stopwords or trailing punctuation."""
+    return [token for token in _TOKEN_PATTERN.findall((text or "").lower()) if token not in _STOPWORDS]
+
+
+class _DocumentFrequencies:
+    """Running document frequencies of one field (titles or descriptions) over the jobs seen this run."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.documents = 0
+        self._seen: Set[str] = set() # Job links already counted
+
+    def add(self, key: str, terms: Set[str]) -> None:
+        if key in self._seen: return
+        self._seen.add(key)
+        self.counts.update(terms)
+        self.documents += 1
+
+    def idf(self, terms: List[str]) -> np.ndarray:
+        df = np.fromiter((self.counts[t] for t in terms), dtype=np.float64, count=len(terms))
+        return np.log1p((max(self.documents, 1) - df + 0.5) / (df + 0.5))
+
+
+class JobRelevanceRanker:
+    """Scores jobs against the resume and decides which ones are worth an LLM evaluation."""
+
+    DEFAULT_SATURATION: Final[float] = 0.5 # k: a single resume mention gives 2/3 credit, three give 6/7
+    DEFAULT_MIN_TITLE_DOCUMENTS: Final[int] = 50
+    DEFAULT_MIN_DESCRIPTION_DOCUMENTS: Final[int] = 20
+
+    def __init__(self,
+                 resume_text: str,
+                 min_title_relevance: float = 0.0,
+                 min_description_relevance: float = 0.0,
+                 top_fraction: float = 1.0,
+                 saturation: float = DEFAULT_SATURATION,
+                 min_title_documents: int = DEFAULT_MIN_TITLE_DOCUMENTS,
+                 min_description_documents: int = DEFAULT_MIN_DESCRIPTION_DOCUMENTS):
+        """
+        Args:
+            resume_text: Plain text resume (as used in the LLM prompts).
+            min_title_relevance: Jobs whose title scores below this are rejected before being opened.
+            min_description_relevance: Jobs whose title + description scores below this are rejected
+                                       before the LLM evaluation.
+            top_fraction: Share (0-1] of each page's remaining jobs, best first, that are processed.
+            saturation: BM25-style k for resume term frequencies.
+            min_title_documents: Titles to count before `min_title_relevance` can reject a job;
+                                 earlier jobs below it are deferred instead.
+            min_description_documents: Descriptions to count before `min_description_relevance` can
+                                       reject a job; earlier jobs go on to the LLM evaluation.
+
+        Raises:
+            ValueError: If the resume has no usable terms or a parameter is out of range.
+        """
+        self._resume_tf: Counter = Counter(tokenize(resume_text))
+        if not self._resume_tf: raise ValueError("Resume text has no usable terms for relevance ranking.")
+        if not 0.0 < top_fraction <= 1.0: raise ValueError("top_fraction must be in (0, 1].")
+        if min_title_documents < 1: raise ValueError("min_title_documents must be at least 1.")
+        if min_description_documents < 1: raise ValueError("min_description_documents must be at least 1.")
+        self.min_title_relevance = min_title_relevance
+        self.min_description_relevance = min_description_relevance
+        self.top_fraction = top_fraction
+        self.saturation = saturation
+        self.min_title_documents = min_title_documents
+        self.min_description_documents = min_description_documents
+        self._title_df = _DocumentFrequencies()
+        self._description_df = _DocumentFrequencies()
+        logger.info(f"JobRelevanceRanker initialized ({len(self._resume_tf)} resume terms, min title relevance "
+                    f"{min_title_relevance}, min description relevance {min_description_relevance}, top fraction {top_fraction}).")
+
+    @classmethod
+    def from_config(cls, parameters: Dict[str, Any], resume_text: str) -> Optional["JobRelevanceRanker"]:
+        """Builds the ranker from the optional `job_prerank` config section, or returns None if disabled."""
+        settings = parameters.get("job_prerank") or {}
+        if not isinstance(settings, dict) or not settings.get("enabled", False): return None
+        try:
+            return cls(resume_text,
+                       min_title_relevance=float(settings.get("min_title_relevance", 0.0)),
+                       min_description_relevance=float(settings.get("min_description_relevance", 0.0)),
+                       top_fraction=float(settings.get("top_fraction", 1.0)),
+                       min_title_documents=int(settings.get("min_title_documents", cls.DEFAULT_MIN_TITLE_DOCUMENTS)),
+                       min_description_documents=int(settings.get("min_description_documents",
+                                                                  cls.DEFAULT_MIN_DESCRIPTION_DOCUMENTS)))
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid 'job_prerank' configuration, local pre-ranking disabled: {e}")
+            return None
+
+    def _relevance(self, documents: List[Set[str]], frequencies: _DocumentFrequencies) -> np.ndarray:
+        """Relevance of each term set against the resume, computed for the whole batch at once."""
+        scores = np.zeros(len(documents), dtype=np.float64)
+        vocabulary: Dict[str, int] = {}
+        for terms in documents:
+            for term in terms: vocabulary.setdefault(term, len(vocabulary))
+        if not vocabulary: return scores
+
+        terms = list(vocabulary)
+        resume_tf = np.fromiter((self._resume_tf.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+        credit = resume_tf / (resume_tf + self.saturation) # 0 for terms missing from the resume
+        idf = frequencies.idf(terms)
+
+        incidence = np.zeros((len(documents), len(terms)), dtype=np.float64)
+        rows = np.repeat(np.arange(len(documents)), [len(d) for d in documents])
+        cols = np.fromiter((vocabulary[t] for d in documents for t in d), dtype=np.intp, count=len(rows))
+        incidence[rows, cols] = 1.0
+
+        weights = incidence * idf # Job term IDF mass per document
+        totals = weights.sum(axis=1)
+        np.divide(weights @ credit, totals, out=scores, where=totals > 0)
+        return scores
+
+    def title_relevance(self, jobs: List[Any]) -> np.ndarray:
+        """Relevance (0-1) of each job's title, updating the running title IDF with these jobs."""
+        documents = [set(tokenize(job.title)) for job in jobs]
+        for job, terms in zip(jobs, documents): self._title_df.add(job.link, terms)
+        return self._relevance(documents, self._title_df)
+
+    def description_relevance(self, job: Any) -> float:
+        """Relevance (0-1) of the job's title and description, updating the running description IDF."""
+        terms = set(tokenize(f"{job.title or ''} {job.description or ''}"))
+        self._description_df.add(job.link, terms)
+        return float(self._relevance([terms], self._description_df)[0])
+
+    def select(self, jobs: List[Any]) -> Tuple[List[Any], List[Any], List[Any]]:
+        """
+        Pre-ranks a page of jobs by title relevance.
+
+        Returns:
+            (selected, rejected, deferred): `selected` keeps the best `top_fraction` of the jobs at or
+            above `min_title_relevance`, best first; `rejected` scored below the threshold; `deferred`
+            passed it but fell outside the top fraction, or scored below it while fewer than
+            `min_title_documents` titles have been counted.
+        """
+        if not jobs: return [], [], []
+        scores = self.title_relevance(jobs)
+        order = np.argsort(-scores, kind="stable")
+        passing = [i for i in order if scores[i] >= self.min_title_relevance]
+        failing = [i for i in range(len(jobs)) if scores[i] < self.min_title_relevance]
+        keep = max(1, int(np.ceil(len(passing) * self.top_fraction))) if passing else 0
+        selected = [jobs[i] for i in passing[:keep]]
+        deferred = [jobs[i] for i in passing[keep:]]
+        rejected = [jobs[i] for i in failing]
+        for i in order: logger.trace(f"Title relevance {scores[i]:.2f}: '{jobs[i].title}'")
+        if self._title_df.documents < self.min_title_documents:
+            logger.debug(f"Title relevance threshold not applied yet ({self._title_df.documents}/{self.min_title_documents} titles counted).")
+            deferred, rejected = deferred + rejected, []
+        logger.info(f"Pre-ranking: {len(selected)} job(s) selected, {len(rejected)} below title relevance "
+                    f"{self.min_title_relevance}, {len(deferred)} deferred.")
+        return selected, rejected, deferred
+
+    def is_relevant(self, job: Any) -> bool:
+        """
+        True if the job's title + description reach `min_description_relevance`, or if fewer than
+        `min_description_documents` descriptions have been counted to judge it.
+        """
+        relevance = self.description_relevance(job)
+        if self._description_df.documents < self.min_description_documents:
+            logger.debug(f"Description relevance {relevance:.2f} for '{job.title}' not used yet "
+                         f"({self._description_df.documents}/{self.min_description_documents} descriptions counted).")
+            return True
+        logger.debug(f"Description relevance {relevance:.2f} for '{job.title}' (min {self.min_description_relevance}).")
+        return relevance >= self.min_description_relevance
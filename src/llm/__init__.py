@@ -8,23 +8,45 @@ Exports the main components for easy access.
 from .llm_processor import LLMProcessor
 from .llm_manager import setup_llm_processor
 from .interaction_logger import LoggingModelWrapper, log_interaction
+from .response_cache import LLMResponseCache
+from .circuit_breaker import CircuitBreaker
+from .token_budget import TokenBudget, TokenCounter
+from .rate_limiter import RateLimiter, InProcessRateLimiter, FileLockRateLimiter, RedisRateLimiter, create_rate_limiter
+from .prompt_registry import PromptRegistry, get_prompt_registry
+from .metrics import LLMMetricsLedger, get_metrics_ledger, task_scope
 from .adapter import AIAdapter, model_factory
-from .models import AIModel # Export base class maybe?
-from .exceptions import LLMError, APIKeyNotFoundError, ModelNotFoundError, ConfigurationError, LoggingError, LLMInvocationError, LLMParsingError
+from .models import AIModel, RoutingModel, HedgedModel # Export base class maybe?
+from .exceptions import LLMError, APIKeyNotFoundError, ModelNotFoundError, ConfigurationError, LoggingError, LLMInvocationError, LLMParsingError, CircuitOpenError
 
 __all__ = [
     # Core Processor & Setup
     'LLMProcessor',
     'setup_llm_processor',
+    'PromptRegistry',
+    'get_prompt_registry',
 
     # Logging & Wrapping
     'LoggingModelWrapper',
     'log_interaction', # Allow manual logging if needed
+    'LLMResponseCache',
+    'RateLimiter',
+    'InProcessRateLimiter',
+    'FileLockRateLimiter',
+    'RedisRateLimiter',
+    'create_rate_limiter',
+    'CircuitBreaker',
+    'TokenBudget',
+    'TokenCounter',
+    'LLMMetricsLedger',
+    'get_metrics_ledger',
+    'task_scope',
 
     # Lower-level components (optional to export all)
     'AIAdapter',
     'model_factory',
     'AIModel',
+    'RoutingModel',
+    'HedgedModel',
 
     # Exceptions
     'LLMError',
@@ -34,6 +56,7 @@ __all__ = [
     'LoggingError',
     'LLMInvocationError',
     'LLMParsingError',
+    'CircuitOpenError',
 ]
 
 # Configure Loguru logger for the LLM module if needed centrally
@@ -26,7 +26,7 @@ class AIAdapter:
     """
     Adapter class that wraps a specific AIModel instance.
 
-    It delegates the `invoke` call to the underlying model instance.
+    It delegates the `invoke` / `ainvoke` calls to the underlying model instance.
     This provides a consistent interface regardless of the chosen LLM provider.
     """
 
@@ -72,6 +72,28 @@ class AIAdapter:
             # Wrap in a standard error type
             raise LLMInvocationError(f"Adapter failed to invoke model {self._model.get_model_name()}: {e}") from e
 
+    async def ainvoke(self, prompt: any) -> any:
+        """
+        Asynchronously invokes the underlying AI model with the given prompt.
+
+        Args:
+            prompt (any): The input prompt suitable for the underlying model's ainvoke method.
+
+        Returns:
+            any: The response from the AI model (structure depends on the model).
+
+        Raises:
+            LLMInvocationError: If the underlying model invocation fails.
+        """
+        logger.debug(f"AIAdapter async invoking underlying model: {self._model.__class__.__name__}")
+        try:
+            return await self._model.ainvoke(prompt)
+        except LLMInvocationError:
+             raise
+        except Exception as e:
+            logger.error(f"Unexpected error during AIAdapter ainvoke for {self._model.__class__.__name__}: {e}", exc_info=True)
+            raise LLMInvocationError(f"Adapter failed to async invoke model {self._model.get_model_name()}: {e}") from e
+
     @property
     def model(self) -> AIModel:
         """Provides access to the underlying AIModel instance."""
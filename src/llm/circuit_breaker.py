@@ -0,0 +1,107 @@
+# src/llm/circuit_breaker.py
+"""
+Circuit breaker for LLM calls.
+
+After `failure_threshold` consecutive failures the circuit opens and calls fail
+immediately with `CircuitOpenError` instead of each waiting out the client
+timeout. After `reset_timeout_seconds` the circuit is half-open: one probe call
+is let through, closing the circuit on success and re-opening it on failure.
+
+Configured via `LLM_CIRCUIT_BREAKER_FAILURES` (0 disables it) and
+`LLM_CIRCUIT_BREAKER_RESET_SECONDS`.
+"""
+
+import threading
+import time
+from typing import Final, Optional
+
+from loguru import logger
+
+from .config import get_llm_config_value
+from .exceptions import CircuitOpenError
+
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open circuit breaker."""
+
+    CLOSED: Final[str] = "closed"
+    OPEN: Final[str] = "open"
+    HALF_OPEN: Final[str] = "half_open"
+
+    DEFAULT_FAILURE_THRESHOLD: Final[int] = 5
+    DEFAULT_RESET_TIMEOUT_SECONDS: Final[float] = 60.0
+
+    def __init__(self, name: str, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout_seconds: float = DEFAULT_RESET_TIMEOUT_SECONDS):
+        """
+        Args:
+            name: Label used in logs and errors (usually the model name).
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout_seconds: How long the circuit stays open before a probe is allowed.
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None # Set while a half-open probe is in flight
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, name: str) -> Optional["CircuitBreaker"]:
+        """Builds a breaker from `LLM_CIRCUIT_BREAKER_*`, or returns None if disabled."""
+        try:
+            failures = int(get_llm_config_value("circuit_breaker_failures", cls.DEFAULT_FAILURE_THRESHOLD))
+            reset = float(get_llm_config_value("circuit_breaker_reset_seconds", cls.DEFAULT_RESET_TIMEOUT_SECONDS))
+        except ValueError as e:
+            logger.error(f"Invalid LLM circuit breaker configuration, circuit breaker disabled: {e}")
+            return None
+        return cls(name, failures, reset) if failures > 0 else None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        Admits a call or rejects it.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe already in flight.
+        """
+        with self._lock:
+            if self._state == self.CLOSED: return
+            now = time.monotonic()
+            remaining = self.reset_timeout_seconds - (now - self._opened_at)
+            if self._state == self.OPEN and remaining <= 0:
+                self._state = self.HALF_OPEN
+                self._probe_started = None
+            # A probe whose outcome was never recorded (e.g. a cancelled task) stops blocking after the timeout
+            probe_stale = self._probe_started is not None and now - self._probe_started >= self.reset_timeout_seconds
+            if self._state == self.HALF_OPEN and (self._probe_started is None or probe_stale):
+                self._probe_started = now
+                logger.info(f"Circuit '{self.name}' half-open: sending a probe call.")
+                return
+        raise CircuitOpenError(f"Circuit for {self.name} is open; retry in {max(0.0, remaining):.0f}s.", max(0.0, remaining))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED: logger.info(f"Circuit '{self.name}' closed after a successful call.")
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._probe_started = None
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit '{self.name}' opened after {self._consecutive_failures} consecutive failures; "
+                                   f"failing fast for {self.reset_timeout_seconds:.0f}s.")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
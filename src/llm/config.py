@@ -11,7 +11,7 @@ from pathlib import Path
 # Or use environment variables for more flexibility
 PROJECT_ROOT = Path(__file__).parent.parent.parent # Adjust as needed
 DATA_OUTPUT_DIR = PROJECT_ROOT / "data_folder" / "output"
-LOG_FILE_NAME = "llm_interactions.json"
+LOG_FILE_NAME = "llm_interactions.jsonl" # JSONL; large prompt texts go to llm_interactions.blobs.jsonl
 
 # Ensure the output directory exists
 DATA_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
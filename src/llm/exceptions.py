@@ -29,4 +29,9 @@ class ConfigurationError(LLMError):
 
 class LoggingError(LLMError):
     """Raised for errors during LLM interaction logging."""
-    pass
\ No newline at end of file
+    pass
+class CircuitOpenError(LLMInvocationError):
+    """Raised without calling the model while its circuit breaker is open."""
+    def __init__(self, message: str, retry_after_seconds: float = 0.0):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds # Until the breaker lets a probe call through
@@ -0,0 +1,204 @@
+# src/llm/interaction_log_writer.py
+"""
+Background writer for the LLM interaction log.
+
+Entries are queued by the calling thread and built, serialized and written by a
+single daemon thread, so JSON encoding and disk I/O stay off the LLM hot path.
+
+The log is compact JSONL (one entry per line). Large prompt texts, which repeat
+across calls (the resume/job context prefix), are stored once per log segment in
+a sibling blob file keyed by SHA-256, and entries reference them as
+`{"blob": "<sha256>"}`. Both files rotate together by size, so every rotated
+segment stays self-contained:
+
+    llm_interactions.jsonl          llm_interactions.blobs.jsonl
+    llm_interactions.jsonl.1        llm_interactions.blobs.jsonl.1
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, Optional, Set, Union
+
+from loguru import logger
+
+from .config import get_llm_config_value
+
+
+class InteractionLogWriter:
+    """Queue-fed JSONL writer with content-addressed prompt deduplication and size-based rotation."""
+
+    DEFAULT_MAX_BYTES: Final[int] = 20 * 1024 * 1024
+    DEFAULT_BACKUP_COUNT: Final[int] = 5
+    BLOB_MIN_CHARS: Final[int] = 512 # Shorter texts are kept inline
+    FLUSH_TIMEOUT: Final[float] = 10.0 # Seconds
+
+    def __init__(self,
+                 log_file_path: Union[str, Path],
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT,
+                 blob_min_chars: int = BLOB_MIN_CHARS):
+        """
+        Args:
+            log_file_path: Path of the JSONL log. The blob file is created next to it.
+            max_bytes: Rotate once the log reaches this size (0 disables rotation).
+            backup_count: Number of rotated segments to keep.
+            blob_min_chars: Prompt texts at least this long are stored as blobs.
+        """
+        self.log_file_path = Path(log_file_path)
+        self.blob_file_path = self.log_file_path.with_name(
+            f"{self.log_file_path.stem}.blobs{self.log_file_path.suffix or '.jsonl'}")
+        self.max_bytes = max_bytes
+        self.backup_count = max(0, backup_count)
+        self.blob_min_chars = blob_min_chars
+
+        self._queue: "queue.Queue[Optional[Callable[[], Optional[Dict[str, Any]]]]]" = queue.Queue()
+        self._known_blobs: Set[str] = set()
+        self._closed = False
+        self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._load_known_blobs()
+
+        self._thread = threading.Thread(target=self._run, name="InteractionLogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, build_entry: Callable[[], Optional[Dict[str, Any]]]) -> None:
+        """Queues an entry builder; it is called on the writer thread. Returns immediately."""
+        if self._closed or not self._thread.is_alive():
+            logger.warning("Interaction log writer is closed; dropping log entry.")
+            return
+        self._queue.put(build_entry)
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """
+        Blocks until every queued entry has been written, at most `timeout` seconds.
+        Returns False if entries are still queued, e.g. because the writer thread has died.
+        """
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._thread.is_alive():
+                    logger.warning(f"Interaction log flush gave up with {self._queue.unfinished_tasks} entries unwritten "
+                                   f"(writer thread {'alive' if self._thread.is_alive() else 'stopped'}).")
+                    return False
+                self._queue.all_tasks_done.wait(min(remaining, 0.1)) # Re-check the thread periodically
+        return True
+
+    def close(self) -> None:
+        """Writes the remaining entries and stops the writer thread. Idempotent."""
+        if self._closed: return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+    # --- Writer thread ---
+
+    def _run(self) -> None:
+        log_file = blob_file = None
+        try:
+            log_file, blob_file = self._open_files()
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None: return
+                    self._write(item, log_file, blob_file)
+                    if self._queue.empty(): # Flush once per burst rather than per entry
+                        blob_file.flush(); log_file.flush()
+                    if self.max_bytes and log_file.tell() >= self.max_bytes:
+                        log_file.close(); blob_file.close()
+                        self._rotate()
+                        log_file, blob_file = self._open_files()
+                finally:
+                    self._queue.task_done()
+        except Exception as e:
+            logger.error(f"Interaction log writer stopped: {e}", exc_info=True)
+        finally:
+            for f in (blob_file, log_file):
+                try:
+                    if f: f.close()
+                except Exception as e: logger.warning(f"Error closing interaction log file: {e}")
+
+    def _write(self, build_entry: Callable[[], Optional[Dict[str, Any]]], log_file, blob_file) -> None:
+        try:
+            entry = build_entry()
+            if entry is None: return
+            prompts = entry.get("prompts")
+            if isinstance(prompts, dict):
+                entry["prompts"] = {key: self._dedupe(text, blob_file) for key, text in prompts.items()}
+            log_file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write LLM interaction log entry: {e}", exc_info=True)
+
+    def _dedupe(self, text: Any, blob_file) -> Any:
+        """Returns `text` inline, or a blob reference after storing it once in the blob file."""
+        if not isinstance(text, str) or len(text) < self.blob_min_chars: return text
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if digest not in self._known_blobs:
+            blob_file.write(json.dumps({"sha256": digest, "text": text}, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._known_blobs.add(digest)
+        return {"blob": digest}
+
+    def _open_files(self):
+        return (open(self.log_file_path, "a", encoding="utf-8"),
+                open(self.blob_file_path, "a", encoding="utf-8"))
+
+    def _rotate(self) -> None:
+        """Shifts both files to `.1`, `.2`, ... (dropping the oldest) and starts a fresh segment."""
+        for path in (self.log_file_path, self.blob_file_path):
+            if self.backup_count == 0:
+                path.unlink(missing_ok=True)
+                continue
+            oldest = path.with_name(f"{path.name}.{self.backup_count}")
+            oldest.unlink(missing_ok=True)
+            for index in range(self.backup_count - 1, 0, -1):
+                source = path.with_name(f"{path.name}.{index}")
+                if source.exists(): os.replace(source, path.with_name(f"{path.name}.{index + 1}"))
+            if path.exists(): os.replace(path, path.with_name(f"{path.name}.1"))
+        self._known_blobs.clear() # Blobs are scoped to a segment
+        logger.info(f"Rotated LLM interaction log {self.log_file_path}")
+
+    def _load_known_blobs(self) -> None:
+        """Remembers the blobs already stored in the current segment so they are not written again."""
+        if not self.blob_file_path.exists(): return
+        try:
+            with open(self.blob_file_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try: self._known_blobs.add(json.loads(line)["sha256"])
+                    except (ValueError, KeyError, TypeError): continue # Skip a torn trailing line
+        except OSError as e:
+            logger.warning(f"Could not read interaction log blobs from {self.blob_file_path}: {e}")
+
+
+_writers: Dict[str, InteractionLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _int_setting(key: str, default: int) -> int:
+    """Integer LLM config value, or `default` (with a warning) if it is not a valid integer."""
+    value = get_llm_config_value(key, default)
+    try: return int(value)
+    except (TypeError, ValueError): logger.warning(f"Invalid LLM_{key.upper()} value {value!r}; using {default}."); return default
+
+
+def get_interaction_log_writer(log_file_path: Union[str, Path]) -> InteractionLogWriter:
+    """
+    Returns the shared writer for a log path, creating it on first use (or if its thread has died).
+    `LLM_LOG_MAX_BYTES` and `LLM_LOG_BACKUP_COUNT` tune rotation; they are parsed once per writer.
+    """
+    key = str(Path(log_file_path).resolve())
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed or not writer._thread.is_alive():
+            writer = InteractionLogWriter(
+                log_file_path,
+                max_bytes=_int_setting("log_max_bytes", InteractionLogWriter.DEFAULT_MAX_BYTES),
+                backup_count=_int_setting("log_backup_count", InteractionLogWriter.DEFAULT_BACKUP_COUNT),
+            )
+            _writers[key] = writer
+        return writer
@@ -6,10 +6,11 @@ Provides a wrapper class (`LoggingModelWrapper`) to automatically log interactio
 when an AI model is invoked, and helper functions for parsing and formatting log data.
 """
 
-import json
+import asyncio
 import time
 import traceback
 from datetime import datetime
+from functools import partial
 from typing import Dict, List, Union, Optional, Any, Final
 
 import httpx # For specific error handling
@@ -17,11 +18,16 @@ from loguru import logger
 from langchain_core.messages import BaseMessage, AIMessage
 from langchain_core.prompt_values import StringPromptValue, ChatPromptValue
 
-from .models import AIModel
+from .models import AIModel, HedgedModel
 from .utils.pricing import get_model_pricing
 from .utils.helpers import parse_prompts_for_logging, format_datetime
 from .config import LLM_LOG_FILE_PATH # Use configured path
+from .interaction_log_writer import get_interaction_log_writer
+from .metrics import current_llm_task, get_metrics_ledger
 from .exceptions import LoggingError, LLMParsingError, LLMInvocationError
+from .response_cache import LLMResponseCache
+from .rate_limiter import RateLimiter, estimate_prompt_tokens
+from .circuit_breaker import CircuitBreaker
 
 
 # --- Logging Function ---
@@ -33,10 +39,17 @@ def log_interaction(
     end_time: datetime,
     prompts: Union[List[BaseMessage], StringPromptValue, ChatPromptValue, Dict, str],
     parsed_response: Dict[str, Any],
-    log_file_path: str = LLM_LOG_FILE_PATH
+    log_file_path: str = LLM_LOG_FILE_PATH,
+    cache_hit: bool = False,
+    task: Optional[str] = None
 ) -> None:
     """
-    Logs the details of a single LLM interaction to a JSON file.
+    Logs the details of a single LLM interaction to the JSONL interaction log.
+
+    The interaction is priced and recorded in the metrics ledger right away, so
+    `snapshot()` covers every completed call. Only the entry itself is queued: it is
+    built, serialized and written by the log's background writer (see
+    `interaction_log_writer`), off the caller's thread.
 
     Args:
         model_name (str): The name of the AI model used.
@@ -46,86 +59,135 @@ def log_interaction(
         parsed_response (Dict[str, Any]): The parsed response from the AI model,
                                            expected to contain 'content', 'response_metadata',
                                            and 'usage_metadata'.
-        log_file_path (str): The path to the JSON log file.
+        log_file_path (str): The path to the JSONL log file.
+        cache_hit (bool): True if the response was served from the local response cache.
+                          Such interactions are logged with zero cost.
+        task (Optional[str]): The prompt task of the call; defaults to the caller's current task.
     """
-    logger.debug(f"Attempting to log interaction for model: {model_name}")
-
+    task = task or current_llm_task() # Captured here: context variables do not reach the writer thread
     try:
-        # 1. Parse Prompts
-        parsed_prompts = parse_prompts_for_logging(prompts)
-
-        # 2. Extract Response Details
-        response_content = parsed_response.get("content", "N/A")
-        response_metadata = parsed_response.get("response_metadata", {})
-        usage_metadata = parsed_response.get("usage_metadata", {})
-        response_id = parsed_response.get("id", "N/A") # Get response ID if available
-
-        # Ensure model name from response metadata is used if available, otherwise use the passed one
-        logged_model_name = response_metadata.get("model_name") or model_name
-        if not logged_model_name or logged_model_name == "unknown_model":
-             logger.warning(f"Model name for logging is missing or unknown. Using passed name: {model_name}")
-             logged_model_name = model_name
-
-
-        # 3. Extract Token Usage
-        input_tokens = usage_metadata.get("input_tokens", 0)
-        output_tokens = usage_metadata.get("output_tokens", 0)
-        total_tokens = usage_metadata.get("total_tokens", input_tokens + output_tokens) # Calculate if not present
-
-        # Log a warning if token data seems incomplete or estimated
-        if not usage_metadata or not all(k in usage_metadata for k in ["input_tokens", "output_tokens", "total_tokens"]):
-             logger.warning(f"Incomplete or estimated token usage for model {logged_model_name}. Logged values: In={input_tokens}, Out={output_tokens}, Total={total_tokens}")
-
+        usage = _price_interaction(model_name, parsed_response, cache_hit)
+        get_metrics_ledger().record(
+            model=usage["model_name"], task=task, duration_seconds=(end_time - start_time).total_seconds(),
+            input_tokens=usage["input_tokens"], output_tokens=usage["output_tokens"],
+            cache_read_tokens=usage["cache_read_tokens"], cost_usd=usage["total_cost"], cache_hit=cache_hit,
+            error=bool((parsed_response.get("response_metadata") or {}).get("error")),
+        )
+    except Exception as e:
+        logger.error(f"Failed to price LLM interaction: {e}", exc_info=True)
+        return # Logging failure shouldn't stop the main flow
+
+    get_interaction_log_writer(log_file_path).submit(partial(
+        _build_log_entry,
+        start_time=start_time,
+        end_time=end_time,
+        prompts=prompts,
+        parsed_response=parsed_response,
+        usage=usage,
+        cache_hit=cache_hit,
+        logged_at=datetime.utcnow(),
+        task=task,
+    ))
+
+
+def _price_interaction(model_name: str, parsed_response: Dict[str, Any], cache_hit: bool) -> Dict[str, Any]:
+    """Extracts the token usage of an interaction and prices it (zero cost for cache hits)."""
+    response_metadata = parsed_response.get("response_metadata") or {}
+    usage_metadata = parsed_response.get("usage_metadata") or {}
+
+    # Ensure model name from response metadata is used if available, otherwise use the passed one
+    logged_model_name = response_metadata.get("model_name") or model_name
+    if not logged_model_name or logged_model_name == "unknown_model":
+         logger.warning(f"Model name for logging is missing or unknown. Using passed name: {model_name}")
+         logged_model_name = model_name
+
+    input_tokens = usage_metadata.get("input_tokens", 0)
+    output_tokens = usage_metadata.get("output_tokens", 0)
+    total_tokens = usage_metadata.get("total_tokens", input_tokens + output_tokens) # Calculate if not present
+    # Provider prefix caching: input_tokens includes the cached portions (LangChain convention)
+    input_details = usage_metadata.get("input_token_details") or {}
+    cache_read_tokens = input_details.get("cache_read", 0) or 0
+    cache_write_tokens = input_details.get("cache_creation", 0) or 0
+    uncached_input_tokens = max(0, input_tokens - cache_read_tokens - cache_write_tokens)
+
+    # Log a warning if token data seems incomplete or estimated
+    if not cache_hit and (not usage_metadata or not all(k in usage_metadata for k in ["input_tokens", "output_tokens", "total_tokens"])):
+         logger.warning(f"Incomplete or estimated token usage for model {logged_model_name}. Logged values: In={input_tokens}, Out={output_tokens}, Total={total_tokens}")
+
+    pricing = get_model_pricing(logged_model_name)
+    input_cost = 0.0 if cache_hit else (
+        uncached_input_tokens * pricing.get("input_token_price", 0.0)
+        + cache_read_tokens * pricing.get("cached_input_token_price", 0.0)
+        + cache_write_tokens * pricing.get("cache_write_input_token_price", 0.0)
+    )
+    output_cost = 0.0 if cache_hit else output_tokens * pricing.get("output_token_price", 0.0)
+    return {
+        "model_name": logged_model_name,
+        "input_tokens": input_tokens,
+        "cache_read_tokens": cache_read_tokens,
+        "cache_write_tokens": cache_write_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": total_tokens,
+        "input_cost": input_cost,
+        "output_cost": output_cost,
+        "total_cost": input_cost + output_cost,
+        "pricing": pricing,
+    }
 
-        # 4. Calculate Cost
-        pricing = get_model_pricing(logged_model_name)
-        input_cost = input_tokens * pricing.get("input_token_price", 0.0)
-        output_cost = output_tokens * pricing.get("output_token_price", 0.0)
-        total_cost = input_cost + output_cost
 
-        # 5. Calculate Duration
-        duration = (end_time - start_time).total_seconds()
+def _build_log_entry(
+    *,
+    start_time: datetime,
+    end_time: datetime,
+    prompts: Union[List[BaseMessage], StringPromptValue, ChatPromptValue, Dict, str],
+    parsed_response: Dict[str, Any],
+    usage: Dict[str, Any],
+    cache_hit: bool,
+    logged_at: datetime,
+    task: str
+) -> Optional[Dict[str, Any]]:
+    """Builds the log entry for a priced interaction (runs on the writer thread). Returns None on failure."""
+    logger.debug(f"Building interaction log entry for model: {usage['model_name']}")
 
-        # 6. Format Log Entry
+    try:
         log_entry = {
-            "model_used": logged_model_name,
-            "request_id": response_id, # Include if available
-            "timestamp_utc": format_datetime(datetime.utcnow()), # Log UTC time
+            "model_used": usage["model_name"],
+            "task": task,
+            "request_id": parsed_response.get("id", "N/A"), # Include if available
+            "timestamp_utc": format_datetime(logged_at), # Log UTC time
             "start_time_local": format_datetime(start_time),
             "end_time_local": format_datetime(end_time),
-            "duration_seconds": round(duration, 3),
-            "prompts": parsed_prompts,
-            "response": response_content,
+            "duration_seconds": round((end_time - start_time).total_seconds(), 3),
+            "cache_hit": cache_hit,
+            "prompts": parse_prompts_for_logging(prompts),
+            "response": parsed_response.get("content", "N/A"),
             "token_usage": {
-                "input": input_tokens,
-                "output": output_tokens,
-                "total": total_tokens,
+                "input": usage["input_tokens"],
+                "input_cache_read": usage["cache_read_tokens"],
+                "input_cache_write": usage["cache_write_tokens"],
+                "output": usage["output_tokens"],
+                "total": usage["total_tokens"],
             },
             "cost_usd": {
-                "input": round(input_cost, 8),
-                "output": round(output_cost, 8),
-                "total": round(total_cost, 8),
-                "pricing_used": pricing # Log the pricing rates applied
+                "input": round(usage["input_cost"], 8),
+                "output": round(usage["output_cost"], 8),
+                "total": round(usage["total_cost"], 8),
+                "pricing_used": usage["pricing"] # Log the pricing rates applied
             },
-            "response_metadata": response_metadata, # Include full metadata for debugging
+            "response_metadata": parsed_response.get("response_metadata", {}), # Include full metadata for debugging
         }
 
-        # 7. Write to Log File
-        log_entry_json = json.dumps(log_entry, ensure_ascii=False, indent=4)
-        with open(log_file_path, "a", encoding="utf-8") as f:
-            f.write(log_entry_json + ",\n") # Append comma for valid JSON array (manually close array bracket externally if needed)
-
-        logger.debug(f"Successfully logged interaction to {log_file_path}")
+        return log_entry
 
     except Exception as e:
         logger.error(f"Failed to log LLM interaction: {e}", exc_info=True)
         # Do not raise LoggingError by default, as logging failure shouldn't stop the main flow
-        # However, specific handling might be needed depending on requirements.
+        return None
 
 
 # --- Parsing Helper ---
 
-def _parse_llm_result(llm_result: Any, model_instance: AIModel) -> Dict[str, Any]:
+def _parse_llm_result(llm_result: Any, model_instance: AIModel, fallback_model_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Parses the raw result from an AIModel's invoke method into a standardized dictionary.
 
@@ -136,6 +198,7 @@ def _parse_llm_result(llm_result: Any, model_instance: AIModel) -> Dict[str, Any
     Args:
         llm_result (Any): The raw response from the AI model's invoke method.
         model_instance (AIModel): The AIModel instance that produced the result (used for model name fallback).
+        fallback_model_name (Optional[str]): Model name to use instead of the instance's pricing name.
 
     Returns:
         Dict[str, Any]: A dictionary with keys 'content', 'response_metadata', 'usage_metadata', 'id'.
@@ -150,7 +213,7 @@ def _parse_llm_result(llm_result: Any, model_instance: AIModel) -> Dict[str, Any
         "usage_metadata": {},
         "id": None,
     }
-    model_name_fallback = model_instance.get_pricing_model_name() # Use pricing name for consistency
+    model_name_fallback = fallback_model_name or model_instance.get_pricing_model_name() # Use pricing name for consistency
 
     try:
         if isinstance(llm_result, AIMessage):
@@ -173,6 +236,8 @@ def _parse_llm_result(llm_result: Any, model_instance: AIModel) -> Dict[str, Any
                      "output_tokens": token_usage.get("completion_tokens", 0),
                      "total_tokens": token_usage.get("total_tokens", 0),
                  }
+                 cached_tokens = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+                 if cached_tokens: parsed_data["usage_metadata"]["input_token_details"] = {"cache_read": cached_tokens}
                  # Calculate total if missing
                  if parsed_data["usage_metadata"]["total_tokens"] == 0:
                       parsed_data["usage_metadata"]["total_tokens"] = parsed_data["usage_metadata"]["input_tokens"] + parsed_data["usage_metadata"]["output_tokens"]
@@ -244,23 +309,38 @@ class LoggingModelWrapper:
     A wrapper around an AIModel instance that automatically logs interactions.
 
     Handles invocation, response parsing, error handling (including retries for
-    rate limits), and triggers the logging function.
+    rate limits), and triggers the logging function. With a `RateLimiter`, calls are
+    paced before they are sent; 429 retries remain as a fallback. With a `CircuitBreaker`,
+    calls fail fast with `CircuitOpenError` while the model keeps failing.
     """
     DEFAULT_RETRY_WAIT_SECONDS: Final[int] = 30
     MAX_RETRIES: Final[int] = 3 # Max retries for rate limit errors
 
-    def __init__(self, model_instance: AIModel, log_file_path: str = LLM_LOG_FILE_PATH):
+    def __init__(self, model_instance: AIModel, log_file_path: str = LLM_LOG_FILE_PATH,
+                 response_cache: Optional[LLMResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
         """
         Initializes the wrapper.
 
         Args:
             model_instance (AIModel): The concrete AIModel instance to wrap.
-            log_file_path (str): Path to the JSON file for logging interactions.
+            log_file_path (str): Path to the JSONL file for logging interactions.
+            response_cache (Optional[LLMResponseCache]): Optional on-disk response cache. Identical
+                                                         requests are then served locally.
+            rate_limiter (Optional[RateLimiter]): Optional shared limiter; each call waits for
+                                                  request and token budget before it is sent.
+            circuit_breaker (Optional[CircuitBreaker]): Optional breaker; opens after repeated failures.
         """
         if not isinstance(model_instance, AIModel):
             raise TypeError(f"model_instance must be an instance of AIModel, not {type(model_instance)}")
         self.model = model_instance
         self.log_file_path = log_file_path
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        if isinstance(model_instance, HedgedModel): # Losing hedge requests are billed too
+            model_instance.discarded_response_handler = self._log_discarded_response
         logger.info(f"LoggingModelWrapper initialized for model: {self.model.get_model_name()}")
         logger.info(f"LLM interactions will be logged to: {self.log_file_path}")
 
@@ -282,131 +362,237 @@ class LoggingModelWrapper:
             LLMParsingError: If the response cannot be parsed.
             Exception: For other unexpected errors.
         """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.make_key(self.model.get_model_name(), prompts, getattr(self.model, 'temperature', None))
+            cached = self._serve_from_cache(cache_key, prompts)
+            if cached is not None: return cached
+
         retries = 0
         last_exception = None
+        reserved_tokens = estimate_prompt_tokens(prompts) if self.rate_limiter is not None else 0
 
         while retries <= self.MAX_RETRIES:
+            if self.circuit_breaker is not None: self.circuit_breaker.before_call() # Raises CircuitOpenError
+            if self.rate_limiter is not None: self.rate_limiter.acquire(reserved_tokens)
             start_time = datetime.now()
             try:
                 logger.debug(f"Wrapper invoking model (Attempt {retries + 1}/{self.MAX_RETRIES + 1})")
                 raw_response = self.model.invoke(prompts)
-                end_time = datetime.now()
-                logger.debug("Model invocation successful.")
-
-                # Parse the raw response
-                try:
-                    parsed_response = _parse_llm_result(raw_response, self.model)
-                except LLMParsingError as parse_error:
-                    logger.error(f"Failed to parse LLM response: {parse_error}", exc_info=True)
-                    # Log the attempt with parsing failure
-                    log_interaction(
-                        model_name=self.model.get_pricing_model_name(),
-                        start_time=start_time,
-                        end_time=end_time,
-                        prompts=prompts,
-                        parsed_response={"content": f"PARSING_ERROR: {parse_error}", "usage_metadata": {}, "response_metadata": {"error": str(parse_error)}},
-                        log_file_path=self.log_file_path
-                    )
-                    raise # Re-raise the parsing error to the caller
-
-                # Log the successful interaction
-                log_interaction(
-                    model_name=self.model.get_pricing_model_name(), # Use pricing name for logging cost
-                    start_time=start_time,
-                    end_time=end_time,
-                    prompts=prompts,
-                    parsed_response=parsed_response,
-                    log_file_path=self.log_file_path
-                )
-
-                # Return a useful representation - AIMessage if possible, else content string
-                # Check if original response was AIMessage to preserve type if needed downstream
-                if isinstance(raw_response, AIMessage):
-                    # Update content if parsing modified it (e.g., fallback)
-                    # Be careful here, modifying the original AIMessage might have side effects
-                    # Consider returning the parsed dict or a new AIMessage
-                     # Return original AIMessage, assuming parsing mainly extracts data for logging
-                    return raw_response
-                    # Or return a new one based on parsed data:
-                    # return AIMessage(content=parsed_response["content"], id=parsed_response["id"], response_metadata=parsed_response["response_metadata"], usage_metadata=parsed_response["usage_metadata"])
-
-                elif isinstance(parsed_response.get("content"), str):
-                    return parsed_response["content"] # Return string content if that's all we have
-                else:
-                     # Should not happen if parsing works correctly
-                     logger.error("Parsed content is not string, returning raw response.")
-                     return raw_response # Fallback
-
-
+                self._record_call_outcome(True)
+                return self._complete_invocation(raw_response, prompts, start_time, cache_key, reserved_tokens)
             except httpx.HTTPStatusError as e:
+                self._record_call_outcome(e.response.status_code == 429) # A 429 still means the provider is up
+                if self.rate_limiter is not None: self.rate_limiter.release(reserved_tokens) # Re-reserved by the next attempt
                 last_exception = e
-                if e.response.status_code == 429: # Rate limit error
-                    retries += 1
-                    if retries > self.MAX_RETRIES:
-                         logger.error(f"Rate limit exceeded after {self.MAX_RETRIES} retries. Giving up.")
-                         raise LLMInvocationError(f"Rate limit hit and max retries exceeded for {self.model.get_model_name()}") from e
-
-                    # Determine wait time from headers
-                    retry_after_sec = e.response.headers.get('retry-after')
-                    retry_after_ms = e.response.headers.get('retry-after-ms')
-                    wait_time = self.DEFAULT_RETRY_WAIT_SECONDS # Default wait
-
-                    if retry_after_sec and retry_after_sec.isdigit():
-                        wait_time = int(retry_after_sec)
-                        logger.warning(f"Rate limit hit (429). Retrying after {wait_time} seconds (from 'retry-after' header). Attempt {retries}/{self.MAX_RETRIES}.")
-                    elif retry_after_ms and retry_after_ms.isdigit():
-                        wait_time = max(1, int(retry_after_ms) // 1000) # Convert ms to sec, ensure at least 1s
-                        logger.warning(f"Rate limit hit (429). Retrying after {wait_time} seconds (from 'retry-after-ms' header). Attempt {retries}/{self.MAX_RETRIES}.")
-                    else:
-                        # Apply exponential backoff for default wait? e.g., wait_time = DEFAULT_RETRY_WAIT_SECONDS * (2 ** (retries - 1))
-                        wait_time = self.DEFAULT_RETRY_WAIT_SECONDS
-                        logger.warning(f"Rate limit hit (429). 'retry-after' headers not found/invalid. Retrying after default {wait_time} seconds. Attempt {retries}/{self.MAX_RETRIES}.")
-
-                    time.sleep(wait_time)
-                    continue # Go to next iteration of the while loop
-
-                else:
-                    # Other HTTP errors are likely not recoverable by retry
-                    logger.error(f"HTTP error encountered: {e.response.status_code} - {e.response.text[:200]}...")
-                    raise LLMInvocationError(f"HTTP error {e.response.status_code} invoking {self.model.get_model_name()}") from e
-
-            except LLMInvocationError as e: # Catch errors raised by model.invoke()
-                last_exception = e
-                logger.error(f"LLM invocation failed: {e}", exc_info=True)
-                # Potentially add retries for transient network errors? For now, fail fast.
-                # Log the failed attempt before raising
-                log_interaction(
-                    model_name=self.model.get_pricing_model_name(),
-                    start_time=start_time,
-                    end_time=datetime.now(),
-                    prompts=prompts,
-                    parsed_response={"content": f"INVOCATION_ERROR: {e}", "usage_metadata": {}, "response_metadata": {"error": str(e)}},
-                    log_file_path=self.log_file_path
-                )
-                raise # Re-raise the original invocation error
-
-            except Exception as e: # Catch any other unexpected errors
-                last_exception = e
-                logger.critical(f"Unexpected error during model invocation or logging: {e}", exc_info=True)
-                # Log the failed attempt if possible
-                try:
-                    log_interaction(
-                        model_name=self.model.get_pricing_model_name(),
-                        start_time=start_time,
-                        end_time=datetime.now(),
-                        prompts=prompts,
-                        parsed_response={"content": f"UNEXPECTED_ERROR: {e}", "usage_metadata": {}, "response_metadata": {"error": str(e), "traceback": traceback.format_exc()}},
-                        log_file_path=self.log_file_path
-                    )
-                except Exception as log_err:
-                     logger.error(f"Additionally failed to log the unexpected error: {log_err}")
-
-                raise LLMInvocationError(f"Unexpected error invoking model: {e}") from e # Wrap in standard error type
+                retries += 1
+                time.sleep(self._rate_limit_wait_seconds(e, retries)) # Raises if not retriable
+            except LLMParsingError:
+                raise # Already logged by _complete_invocation
+            except Exception as e:
+                self._record_call_outcome(False)
+                if self.rate_limiter is not None: self.rate_limiter.release(reserved_tokens)
+                self._handle_invocation_failure(e, prompts, start_time)
 
         # This point should only be reached if MAX_RETRIES is exceeded for a retriable error
         logger.error(f"Model invocation failed after {self.MAX_RETRIES + 1} attempts. Last error: {last_exception}")
         raise LLMInvocationError(f"Model invocation failed after maximum retries. Last error: {last_exception}") from last_exception
 
+    async def ainvoke(self, prompts: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]) -> Any:
+        """
+        Asynchronous counterpart of `invoke`: awaits the model's `ainvoke` and backs off on
+        rate limits with `asyncio.sleep`, so many requests can be in flight on one event loop.
+
+        Args:
+            prompts: The prompts to send to the model (various formats accepted).
+
+        Returns:
+            AIMessage or str: Same as `invoke`.
+
+        Raises:
+            LLMInvocationError: If the model invocation fails after retries.
+            LLMParsingError: If the response cannot be parsed.
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.make_key(self.model.get_model_name(), prompts, getattr(self.model, 'temperature', None))
+            cached = self._serve_from_cache(cache_key, prompts)
+            if cached is not None: return cached
+
+        retries = 0
+        last_exception = None
+        reserved_tokens = estimate_prompt_tokens(prompts) if self.rate_limiter is not None else 0
+
+        while retries <= self.MAX_RETRIES:
+            if self.circuit_breaker is not None: self.circuit_breaker.before_call()
+            if self.rate_limiter is not None: await self.rate_limiter.aacquire(reserved_tokens)
+            start_time = datetime.now()
+            try:
+                logger.debug(f"Wrapper async invoking model (Attempt {retries + 1}/{self.MAX_RETRIES + 1})")
+                raw_response = await self.model.ainvoke(prompts)
+                self._record_call_outcome(True)
+                return self._complete_invocation(raw_response, prompts, start_time, cache_key, reserved_tokens)
+            except httpx.HTTPStatusError as e:
+                self._record_call_outcome(e.response.status_code == 429) # A 429 still means the provider is up
+                if self.rate_limiter is not None: self.rate_limiter.release(reserved_tokens) # Re-reserved by the next attempt
+                last_exception = e
+                retries += 1
+                await asyncio.sleep(self._rate_limit_wait_seconds(e, retries)) # Raises if not retriable
+            except LLMParsingError:
+                raise
+            except asyncio.CancelledError:
+                raise # Never swallow task cancellation
+            except Exception as e:
+                self._record_call_outcome(False)
+                if self.rate_limiter is not None: self.rate_limiter.release(reserved_tokens)
+                self._handle_invocation_failure(e, prompts, start_time)
+
+        logger.error(f"Async model invocation failed after {self.MAX_RETRIES + 1} attempts. Last error: {last_exception}")
+        raise LLMInvocationError(f"Model invocation failed after maximum retries. Last error: {last_exception}") from last_exception
+
+    def _complete_invocation(self, raw_response: Any, prompts: Any, start_time: datetime, cache_key: Optional[str],
+                             reserved_tokens: int = 0) -> Any:
+        """Parses and logs a raw model response, stores it in the response cache and returns the caller-facing value."""
+        end_time = datetime.now()
+        logger.debug("Model invocation successful.")
+
+        # Parse the raw response
+        try:
+            parsed_response = _parse_llm_result(raw_response, self.model)
+        except LLMParsingError as parse_error:
+            logger.error(f"Failed to parse LLM response: {parse_error}", exc_info=True)
+            # Log the attempt with parsing failure
+            log_interaction(
+                model_name=self.model.get_pricing_model_name(),
+                start_time=start_time,
+                end_time=end_time,
+                prompts=prompts,
+                parsed_response={"content": f"PARSING_ERROR: {parse_error}", "usage_metadata": {}, "response_metadata": {"error": str(parse_error)}},
+                log_file_path=self.log_file_path
+            )
+            raise # Re-raise the parsing error to the caller
+
+        # Log the successful interaction
+        log_interaction(
+            model_name=self.model.get_pricing_model_name(), # Use pricing name for logging cost
+            start_time=start_time,
+            end_time=end_time,
+            prompts=prompts,
+            parsed_response=parsed_response,
+            log_file_path=self.log_file_path
+        )
+        if self.rate_limiter is not None:
+            usage = parsed_response.get("usage_metadata") or {}
+            actual_tokens = usage.get("total_tokens") or (usage.get("input_tokens", 0) + usage.get("output_tokens", 0))
+            if actual_tokens: self.rate_limiter.record_usage(reserved_tokens, int(actual_tokens))
+        if cache_key is not None: self.response_cache.put(cache_key, self.model.get_model_name(), parsed_response)
+
+        # Return a useful representation - AIMessage if possible, else content string
+        # Return original AIMessage, assuming parsing mainly extracts data for logging
+        if isinstance(raw_response, AIMessage):
+            return raw_response
+        elif isinstance(parsed_response.get("content"), str):
+            return parsed_response["content"] # Return string content if that's all we have
+        else:
+             # Should not happen if parsing works correctly
+             logger.error("Parsed content is not string, returning raw response.")
+             return raw_response # Fallback
+
+    def _log_discarded_response(self, raw_response: Any, prompts: Any, pricing_model_name: str, task: str,
+                                start_time: datetime, end_time: datetime) -> None:
+        """Logs the response of a losing hedge request under the model that served it (see `HedgedModel`)."""
+        parsed_response = _parse_llm_result(raw_response, self.model, fallback_model_name=pricing_model_name)
+        parsed_response["response_metadata"] = {**parsed_response["response_metadata"], "hedge_discarded": True}
+        log_interaction(
+            model_name=pricing_model_name,
+            start_time=start_time,
+            end_time=end_time,
+            prompts=prompts,
+            parsed_response=parsed_response,
+            log_file_path=self.log_file_path,
+            task=task
+        )
+
+    def _record_call_outcome(self, ok: bool) -> None:
+        if self.circuit_breaker is None: return
+        if ok: self.circuit_breaker.record_success()
+        else: self.circuit_breaker.record_failure()
+
+    def _rate_limit_wait_seconds(self, error: httpx.HTTPStatusError, retries: int) -> int:
+        """
+        Returns how long to wait before retry number `retries` after an HTTP error.
+
+        Raises:
+            LLMInvocationError: If the error is not a rate limit (429) or retries are exhausted.
+        """
+        if error.response.status_code != 429:
+            # Other HTTP errors are likely not recoverable by retry
+            logger.error(f"HTTP error encountered: {error.response.status_code} - {error.response.text[:200]}...")
+            raise LLMInvocationError(f"HTTP error {error.response.status_code} invoking {self.model.get_model_name()}") from error
+        if retries > self.MAX_RETRIES:
+            logger.error(f"Rate limit exceeded after {self.MAX_RETRIES} retries. Giving up.")
+            raise LLMInvocationError(f"Rate limit hit and max retries exceeded for {self.model.get_model_name()}") from error
+
+        # Determine wait time from headers
+        retry_after_sec = error.response.headers.get('retry-after')
+        retry_after_ms = error.response.headers.get('retry-after-ms')
+        if retry_after_sec and retry_after_sec.isdigit():
+            wait_time = int(retry_after_sec)
+            logger.warning(f"Rate limit hit (429). Retrying after {wait_time} seconds (from 'retry-after' header). Attempt {retries}/{self.MAX_RETRIES}.")
+        elif retry_after_ms and retry_after_ms.isdigit():
+            wait_time = max(1, int(retry_after_ms) // 1000) # Convert ms to sec, ensure at least 1s
+            logger.warning(f"Rate limit hit (429). Retrying after {wait_time} seconds (from 'retry-after-ms' header). Attempt {retries}/{self.MAX_RETRIES}.")
+        else:
+            wait_time = self.DEFAULT_RETRY_WAIT_SECONDS
+            logger.warning(f"Rate limit hit (429). 'retry-after' headers not found/invalid. Retrying after default {wait_time} seconds. Attempt {retries}/{self.MAX_RETRIES}.")
+        return wait_time
+
+    def _handle_invocation_failure(self, error: Exception, prompts: Any, start_time: datetime) -> None:
+        """Logs a failed (non rate-limit) invocation and raises it as an LLMInvocationError."""
+        if isinstance(error, LLMInvocationError): # Errors raised by model.invoke() / ainvoke()
+            logger.error(f"LLM invocation failed: {error}", exc_info=True)
+            # Potentially add retries for transient network errors? For now, fail fast.
+            log_interaction(
+                model_name=self.model.get_pricing_model_name(),
+                start_time=start_time,
+                end_time=datetime.now(),
+                prompts=prompts,
+                parsed_response={"content": f"INVOCATION_ERROR: {error}", "usage_metadata": {}, "response_metadata": {"error": str(error)}},
+                log_file_path=self.log_file_path
+            )
+            raise error # Re-raise the original invocation error
+
+        logger.critical(f"Unexpected error during model invocation or logging: {error}", exc_info=True)
+        try:
+            log_interaction(
+                model_name=self.model.get_pricing_model_name(),
+                start_time=start_time,
+                end_time=datetime.now(),
+                prompts=prompts,
+                parsed_response={"content": f"UNEXPECTED_ERROR: {error}", "usage_metadata": {}, "response_metadata": {"error": str(error), "traceback": traceback.format_exc()}},
+                log_file_path=self.log_file_path
+            )
+        except Exception as log_err:
+             logger.error(f"Additionally failed to log the unexpected error: {log_err}")
+        raise LLMInvocationError(f"Unexpected error invoking model: {error}") from error # Wrap in standard error type
+
+    def _serve_from_cache(self, cache_key: str, prompts: Any) -> Optional[AIMessage]:
+        """Returns the cached response as an AIMessage (logged as a zero-cost interaction), or None on a miss."""
+        start_time = datetime.now()
+        cached = self.response_cache.get(cache_key)
+        if cached is None: return None
+        logger.debug(f"LLM response cache hit ({cache_key[:12]}...) for model {self.model.get_model_name()}.")
+        log_interaction(
+            model_name=self.model.get_pricing_model_name(),
+            start_time=start_time,
+            end_time=datetime.now(),
+            prompts=prompts,
+            parsed_response=cached,
+            log_file_path=self.log_file_path,
+            cache_hit=True
+        )
+        return AIMessage(content=cached["content"], id=cached["id"], response_metadata=cached["response_metadata"])
+
     def __call__(self, prompts: Union[List[Dict[str, str]], List[BaseMessage]]) -> AIMessage:
         """
         Makes the wrapper callable, primarily for compatibility with chains expecting
@@ -16,9 +16,18 @@ from loguru import logger
 # Assuming LLMProcessor is the refactored version of LLMProcessor
 from .llm_processor import LLMProcessor
 from .adapter import AIAdapter, model_factory
+from .models import AIModel, RoutingModel, HedgedModel, RateLimitedModel
+from .models.hedged_model import DEFAULT_HEDGED_TASKS
 from .interaction_logger import LoggingModelWrapper
+from .response_cache import LLMResponseCache
+from .rate_limiter import create_rate_limiter
+from .circuit_breaker import CircuitBreaker
+from .prompt_registry import get_prompt_registry
+from .token_budget import TokenBudget
+from src.resume_index import ResumeSectionIndex
+from .metrics import start_metrics_summary_from_config
 from .exceptions import APIKeyNotFoundError, ConfigurationError, LLMError
-from .config import DATA_OUTPUT_DIR, LLM_LOG_FILE_PATH # Import central config path
+from .config import DATA_OUTPUT_DIR, LLM_LOG_FILE_PATH, get_llm_config_value # Import central config path
 
 # Load environment variables from .env file if present
 # Best practice: Load early in the application entry point, but including here for module self-containment example.
@@ -70,11 +79,105 @@ def get_api_key(llm_provider_type: str) -> Optional[str]:
         return api_key
 
 
+def rate_limited(model: AIModel, provider: str, api_key: Optional[str]) -> AIModel:
+    """Wraps a provider model in its provider's rate limiter, or returns it as is if no limit is set."""
+    rate_limiter = create_rate_limiter(provider, api_key)
+    return RateLimitedModel(model, rate_limiter) if rate_limiter is not None else model
+
+
+def create_routing_model(router_config: Dict, primary_model: AIModel) -> RoutingModel:
+    """
+    Builds a RoutingModel from the optional `llm_router` section of the application config.
+
+    Expected structure (the model from `llm_model_type`/`llm_model` is always available as "primary"):
+
+        llm_router:
+          models:
+            fast: {llm_model_type: openai, llm_model: gpt-4o-mini}
+            strong: {llm_model_type: claude, llm_model: claude-3-5-sonnet-latest}
+          routes:                      # Prompt name -> models in preference order
+            numeric_question: [fast, primary]
+            cover_letter: [strong, primary]
+            default: [primary, fast]
+          max_cost_per_call_usd: 0.02  # Optional
+          latency_slo_seconds: 20      # Optional
+          max_error_rate: 0.5          # Optional
+
+    Each routed model is paced by its own provider's rate limiter (see `rate_limited`).
+
+    Raises:
+        ConfigurationError: If the section is malformed.
+        APIKeyNotFoundError: If a routed provider's API key is missing.
+    """
+    if not isinstance(router_config, dict) or not isinstance(router_config.get('models', {}), dict):
+        raise ConfigurationError("'llm_router' must be a mapping with a 'models' mapping.")
+
+    models: Dict[str, AIModel] = {"primary": primary_model}
+    for name, model_config in router_config.get('models', {}).items():
+        if not isinstance(model_config, dict) or not model_config.get('llm_model_type') or not model_config.get('llm_model'):
+            raise ConfigurationError(f"llm_router model '{name}' needs 'llm_model_type' and 'llm_model'.")
+        api_key = get_api_key(model_config['llm_model_type'])
+        models[name] = rate_limited(model_factory(config=model_config, api_key=api_key), model_config['llm_model_type'], api_key)
+
+    try:
+        max_cost = router_config.get('max_cost_per_call_usd')
+        latency_slo = router_config.get('latency_slo_seconds')
+        router = RoutingModel(
+            models=models,
+            routes=router_config.get('routes'),
+            max_cost_per_call_usd=float(max_cost) if max_cost is not None else None,
+            max_error_rate=float(router_config.get('max_error_rate', 0.5)),
+            latency_slo_seconds=float(latency_slo) if latency_slo is not None else None,
+        )
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ConfigurationError(f"Invalid 'llm_router' configuration: {e}") from e
+    logger.info(f"LLM routing enabled across models: {', '.join(f'{n}={m.get_model_name()}' for n, m in models.items())}")
+    return router
+
+
+def create_hedged_model(hedge_config: Dict, primary_model: AIModel) -> HedgedModel:
+    """
+    Builds a HedgedModel from the optional `llm_hedge` section of the application config.
+
+    Expected structure:
+
+        llm_hedge:
+          llm_model_type: openai         # Secondary model receiving the hedge requests
+          llm_model: gpt-4o-mini
+          percentile: 95                 # Optional: hedge after the primary's p95 latency per task
+          default_delay_seconds: 8       # Optional: delay until enough latency samples exist
+          tasks: [simple_question, numeric_question, options]  # Optional: prompts to hedge
+
+    Hedge requests are paced by the secondary provider's rate limiter (see `rate_limited`).
+
+    Raises:
+        ConfigurationError: If the section is malformed.
+        APIKeyNotFoundError: If the secondary provider's API key is missing.
+    """
+    if not isinstance(hedge_config, dict) or not hedge_config.get('llm_model_type') or not hedge_config.get('llm_model'):
+        raise ConfigurationError("'llm_hedge' needs 'llm_model_type' and 'llm_model'.")
+    api_key = get_api_key(hedge_config['llm_model_type'])
+    secondary = rate_limited(model_factory(config=hedge_config, api_key=api_key), hedge_config['llm_model_type'], api_key)
+    try:
+        hedged = HedgedModel(
+            primary=primary_model,
+            secondary=secondary,
+            tasks=hedge_config.get('tasks', DEFAULT_HEDGED_TASKS),
+            percentile=float(hedge_config.get('percentile', 95)),
+            default_delay_seconds=float(hedge_config.get('default_delay_seconds', 8)),
+            min_delay_seconds=float(hedge_config.get('min_delay_seconds', 1)),
+        )
+    except (TypeError, ValueError) as e:
+        raise ConfigurationError(f"Invalid 'llm_hedge' configuration: {e}") from e
+    logger.info(f"LLM hedged requests enabled with secondary model {secondary.get_model_name()}.")
+    return hedged
+
+
 def setup_llm_processor(
     app_config: Dict,
     resume_manager,
     salary_expectations: Optional[float] = None,
-    min_score_to_apply: Optional[float] = None
+    min_score_to_apply: Optional[float] = None,
 ) -> LLMProcessor:
     """
     Sets up and returns an initialized LLMProcessor instance.
@@ -82,8 +185,10 @@ def setup_llm_processor(
     This function handles:
     1. Extracting LLM configuration from the main application config.
     2. Retrieving the necessary API key.
-    3. Creating the specific AIModel instance using the factory.
-    4. Wrapping the model instance with the logging wrapper.
+    3. Creating the specific AIModel instance using the factory (wrapped in a RoutingModel
+       when an `llm_router` section is configured, and in a HedgedModel with `llm_hedge`).
+    4. Wrapping the model instance with the logging wrapper. Rate limiting happens in the wrapper,
+       or per provider model (`rate_limited`) when routing or hedging combines several providers.
     5. Initializing and returning the LLMProcessor with dependencies injected.
 
     Args:
@@ -125,6 +230,13 @@ def setup_llm_processor(
     # model_factory can raise ModelNotFoundError, ConfigurationError, LLMInvocationError
     try:
         ai_model_instance = model_factory(config=llm_config, api_key=api_key)
+        multi_provider = bool(app_config.get('llm_router') or app_config.get('llm_hedge'))
+        if multi_provider: # Each provider model is limited on its own; the wrapper can't tell which one served
+            ai_model_instance = rate_limited(ai_model_instance, llm_config['llm_model_type'], api_key)
+        if app_config.get('llm_router'):
+            ai_model_instance = create_routing_model(app_config['llm_router'], ai_model_instance)
+        if app_config.get('llm_hedge'):
+            ai_model_instance = create_hedged_model(app_config['llm_hedge'], ai_model_instance)
     except LLMError as e: # Catch specific LLM errors from factory/init
         logger.error(f"Failed to create AI model instance: {e}", exc_info=True)
         raise # Re-raise the specific error
@@ -139,7 +251,12 @@ def setup_llm_processor(
         LLM_LOG_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
         logged_model_wrapper = LoggingModelWrapper(
             model_instance=ai_model_instance,
-            log_file_path=str(LLM_LOG_FILE_PATH) # Pass path as string
+            log_file_path=str(LLM_LOG_FILE_PATH), # Pass path as string
+            response_cache=LLMResponseCache.from_config(), # None unless LLM_RESPONSE_CACHE is enabled
+            # None unless LLM_RATE_LIMIT_RPM / LLM_RATE_LIMIT_TPM are set, or limited per provider model
+            rate_limiter=None if multi_provider else create_rate_limiter(llm_config['llm_model_type'], api_key),
+            # Fails fast after repeated failures; LLM_CIRCUIT_BREAKER_FAILURES=0 disables it
+            circuit_breaker=CircuitBreaker.from_config(ai_model_instance.get_model_name())
         )
     except (TypeError, Exception) as e:
         logger.error(f"Failed to initialize LoggingModelWrapper: {e}", exc_info=True)
@@ -150,16 +267,28 @@ def setup_llm_processor(
     try:
         # Get plain text content that was already extracted from HTML
         plain_text_content = resume_manager.get_plain_text_content()
+        try: resume_top_k = int(get_llm_config_value("resume_top_k", ResumeSectionIndex.DEFAULT_TOP_K))
+        except ValueError: logger.error("Invalid LLM_RESUME_TOP_K, using the default."); resume_top_k = ResumeSectionIndex.DEFAULT_TOP_K
+        try: request_timeout = float(get_llm_config_value("request_timeout_seconds", LLMProcessor.DEFAULT_REQUEST_TIMEOUT_SECONDS))
+        except ValueError: logger.error("Invalid LLM_REQUEST_TIMEOUT_SECONDS, using the default."); request_timeout = LLMProcessor.DEFAULT_REQUEST_TIMEOUT_SECONDS
         
         # Initialize LLMProcessor with the plain text content
         llm_processor = LLMProcessor(
             llm_wrapper=logged_model_wrapper,
             resume_content=plain_text_content,  # Now using plain text extracted by ResumeManager
             salary_expectations=salary_expectations,
-            min_score_to_apply=min_score_to_apply
+            min_score_to_apply=min_score_to_apply,
+            # None unless LLM_TOKEN_BUDGET / LLM_TOKEN_BUDGET_<TASK> are set
+            token_budget=TokenBudget.from_config(llm_config['llm_model_type'], llm_config['llm_model'],
+                                                 get_prompt_registry().names),
+            # Short questions get only the relevant resume sections; LLM_RESUME_TOP_K=0 disables it
+            resume_index=getattr(resume_manager, "section_index", None),
+            resume_top_k=resume_top_k,
+            request_timeout_seconds=request_timeout # Bounds the wait for background salary estimates
             # Pass other necessary configs if needed
         )
         logger.info("LLM Processor setup complete.")
+        start_metrics_summary_from_config() # Periodic usage summary if LLM_METRICS_SUMMARY_INTERVAL is set
         return llm_processor
     except (TypeError, ValueError, Exception) as e:
          logger.error(f"Failed to initialize LLMProcessor: {e}", exc_info=True)
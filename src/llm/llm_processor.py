@@ -10,27 +10,31 @@ It utilizes predefined prompt templates and helper functions.
 
 import re
 import json
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import AIMessage # Import for type hinting
+from langchain_core.messages import AIMessage, BaseMessage # Import for type hinting
 
 from loguru import logger
 
-# Assuming strings are now better organized, perhaps in a dedicated prompts module
-import src.llm.prompts as prompt_strings # Or from .prompts import ...
 from src.job import Job # Assuming Job class definition exists
+from src.resume_index import ResumeSectionIndex
 
 # Import the wrapper and utilities
 from .interaction_logger import LoggingModelWrapper
+from .prompt_registry import PromptRegistry, get_prompt_registry
+from .token_budget import TokenBudget
+from .metrics import task_scope
 from .utils.helpers import (
     find_best_match,
-    preprocess_template_string,
     extract_number_from_string,
     format_datetime
 )
-from .exceptions import LLMError, LLMInvocationError, LLMParsingError, ConfigurationError
+from .exceptions import LLMError, LLMInvocationError, LLMParsingError, ConfigurationError, CircuitOpenError
 from app_config import SALARY_EXPECTATIONS, MIN_SCORE_APPLY, TRYING_DEBUG
 
 # Conditional assignment based on debug flag (this logic might belong higher up in app setup)
@@ -49,11 +53,24 @@ class LLMProcessor:
     Uses prompt templates and context (resume, job details) to generate answers,
     evaluations, and other required text, leveraging an underlying LLM wrapper
     that handles invocation, logging, and basic error handling.
+
+    Job-scoped derivations (keywords, tailored summary, cover letter, fit score and
+    salary estimate) are memoized per job, so retried form steps and the resume and
+    cover letter uploads never pay for the same call twice. The memo is cleared when
+    `set_current_job` switches to another job or the resume changes.
+
+    With a `ResumeSectionIndex`, short-answer questions (simple, numeric, options) are
+    sent only the resume sections relevant to the question instead of the full resume.
+
+    With a `TokenBudget`, prompts over their task's token budget are compressed
+    (job description boilerplate removed, resume reduced to the relevant sections).
     """
 
     # Default character limit for simple answers, can be overridden
     DEFAULT_ANSWER_CHAR_LIMIT = 140
     HEADLINE_CHAR_LIMIT = 124 # Specific limit for headline field
+    BATCH_MIN_QUESTIONS = 2 # Below this a batched form-step call saves nothing
+    DEFAULT_REQUEST_TIMEOUT_SECONDS = 60.0 # Longest a single LLM request is expected to take
 
     def __init__(
         self,
@@ -61,6 +78,11 @@ class LLMProcessor:
         resume_content: str,
         salary_expectations: Optional[float] = None,
         min_score_to_apply: Optional[float] = None,
+        prompt_registry: Optional[PromptRegistry] = None,
+        token_budget: Optional[TokenBudget] = None,
+        resume_index: Optional[ResumeSectionIndex] = None,
+        resume_top_k: int = ResumeSectionIndex.DEFAULT_TOP_K,
+        request_timeout_seconds: float = DEFAULT_REQUEST_TIMEOUT_SECONDS,
         # Add other dependencies like job_application_profile if needed
         # job_application_profile: Optional[Any] = None
     ):
@@ -72,6 +94,14 @@ class LLMProcessor:
             resume_content (str): The plain text content of the resume (already extracted from HTML).
             salary_expectations (Optional[float]): User's target salary. Defaults to a predefined value.
             min_score_to_apply (Optional[float]): Minimum job score threshold. Defaults to a predefined value.
+            prompt_registry (Optional[PromptRegistry]): Precompiled prompts. Defaults to the shared registry,
+                                                        compiled (and validated) on first use.
+            token_budget (Optional[TokenBudget]): Per-task prompt token budgets. None sends prompts uncompressed.
+            resume_index (Optional[ResumeSectionIndex]): Section index of `resume_content`. None (or a
+                                                         `resume_top_k` of 0) sends the full resume with every question.
+            resume_top_k (int): Resume sections/bullets retrieved per question.
+            request_timeout_seconds (float): Longest a single LLM request is expected to take. Bounds
+                                             the wait for the background salary estimate.
             # job_application_profile (Optional[Any]): User's application profile data.
         """
         if not isinstance(llm_wrapper, LoggingModelWrapper):
@@ -80,6 +110,11 @@ class LLMProcessor:
              raise ValueError("resume_content must be a non-empty string")
 
         self.llm = llm_wrapper # The logging wrapper instance
+        self.prompts = prompt_registry or get_prompt_registry() # Fails here on malformed templates
+        self.token_budget = token_budget
+        self.resume_index = resume_index if resume_top_k > 0 else None
+        self.resume_top_k = resume_top_k
+        self.request_timeout_seconds = request_timeout_seconds
         self._raw_resume = resume_content # Store the plain text resume
         self.formatted_resume = self._format_resume_with_date(self._raw_resume) # Pre-format resume with date
         self.salary_expectations = salary_expectations if salary_expectations is not None else EFFECTIVE_SALARY_EXPECTATIONS
@@ -87,6 +122,14 @@ class LLMProcessor:
         # self.job_application_profile = job_application_profile
 
         self.current_job: Optional[Job] = None # Holds the job currently being processed
+        # Answers primed by `prefetch_form_answers`, keyed by (kind, lowercased question)
+        self._prefetched_answers: Dict[Tuple[str, str], str] = {}
+        # Event loop thread running the salary estimates of evaluate_job_fit_and_salary, started lazily
+        self._evaluation_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._evaluation_thread: Optional[threading.Thread] = None
+        # Job-scoped LLM derivations (keywords, summary, cover letter, score, salary), keyed by (job link, derivation, *args)
+        self._job_derivations: Dict[Tuple[Any, ...], Any] = {}
+        self._derivations_lock = threading.Lock() # Salary estimates are remembered from the evaluation loop thread
 
         logger.info("LLMProcessor initialized.")
         logger.info(f"Salary Expectation set to: {self.salary_expectations}")
@@ -116,10 +159,13 @@ class LLMProcessor:
         else:
              return f"{date_line}{resume_summary}"
 
-    def update_resume_content(self, new_resume_content: str):
-         """Updates the processor's resume content and its formatted version.
+    def update_resume_content(self, new_resume_content: str, resume_index: Optional[ResumeSectionIndex] = None):
+         """Updates the processor's resume content, its formatted version and its section index.
          
-         The input should be plain text (already extracted from HTML if necessary).
+         The input should be plain text (already extracted from HTML if necessary). Pass the
+         section index of the new resume (`ResumeManager.section_index` after `load_resume()`)
+         to keep retrieving relevant sections; without one, the full resume is sent with every
+         question, as the previous index no longer matches.
          """
          if not isinstance(new_resume_content, str) or not new_resume_content:
               logger.error("Attempted to update resume with invalid content.")
@@ -127,6 +173,10 @@ class LLMProcessor:
          
          self._raw_resume = new_resume_content
          self.formatted_resume = self._format_resume_with_date(self._raw_resume)
+         with self._derivations_lock: self._job_derivations.clear() # Derived from the previous resume
+         self.resume_index = resume_index if self.resume_top_k > 0 else None
+         if resume_index is None and self.resume_top_k > 0:
+              logger.warning("Resume updated without a section index; questions will use the full resume.")
          logger.info("LLMProcessor resume content updated.")
 
 
@@ -150,41 +200,56 @@ class LLMProcessor:
             logger.error(f"Job object is missing essential attributes: {', '.join(missing_attrs)}")
             raise ValueError(f"Job object is missing essential attributes: {', '.join(missing_attrs)}")
 
-        self.current_job = job
+        with self._derivations_lock:
+            if self.current_job is not None and self.current_job.link != job.link:
+                self._prefetched_answers.clear() # Primed answers belong to the previous job's form
+                self._job_derivations.clear()
+            self.current_job = job
         logger.debug(f"Current job set to: {job.title} at {job.company}")
 
 
-    def _create_prompt_template(self, template_string: str) -> ChatPromptTemplate:
-        """
-        Creates a LangChain ChatPromptTemplate from a preprocessed template string.
+    def _derivation_key(self, derivation: str, *args: Any) -> Tuple[Any, ...]:
+        """Memo key of a job-scoped derivation for the current job."""
+        return (self.current_job.link, derivation) + args
 
-        Args:
-            template_string (str): The raw template string.
+    def _recall(self, key: Tuple[Any, ...]) -> Any:
+        """Returns the memoized result of a job-scoped derivation, or None if there is none."""
+        with self._derivations_lock: return self._job_derivations.get(key)
 
-        Returns:
-            ChatPromptTemplate: The created prompt template instance.
+    def _remember(self, key: Tuple[Any, ...], value: Any) -> Any:
+        """
+        Memoizes the result of a successful job-scoped LLM derivation and returns it. A result
+        finishing after the context moved to another job (a late salary estimate) is not kept.
+        """
+        with self._derivations_lock:
+            if self.current_job is not None and key[0] == self.current_job.link: self._job_derivations[key] = value
+            else: logger.debug(f"Not memoizing '{key[1]}' of {key[0]}: the current job has changed.")
+        return value
 
-        Raises:
-            ValueError: If the template string is invalid.
+
+    def evaluation_fingerprint(self) -> Tuple[str, str]:
         """
-        processed_template = preprocess_template_string(template_string)
-        if not processed_template:
-             raise ValueError("Cannot create prompt template from empty string.")
-        try:
-            prompt = ChatPromptTemplate.from_template(processed_template)
-            # logger.debug("ChatPromptTemplate created successfully.") # Can be verbose
-            return prompt
-        except Exception as e: # Catch potential errors from LangChain template creation
-            logger.error(f"Error creating ChatPromptTemplate: {e}", exc_info=True)
-            raise ValueError(f"Failed to create prompt template: {e}") from e
+        Returns (resume hash, prompt version) identifying the inputs of the job evaluation
+        prompts, for stores that keep scores and salary estimates across runs. The prompt
+        version covers the evaluation templates and the model.
+        """
+        resume_hash = hashlib.sha256(self._raw_resume.encode("utf-8")).hexdigest()[:16]
+        prompt_version = f"{self.prompts.fingerprint('evaluate_job', 'estimate_salary')}:{self.llm.model.get_model_name()}"
+        return resume_hash, prompt_version
+
+    def memoized_evaluation(self) -> Tuple[Optional[float], Optional[float]]:
+        """Returns the (fit score, salary estimate) of the current job from successful LLM calls only."""
+        if not self.current_job: return None, None
+        return (self._recall(self._derivation_key("evaluate_job")),
+                self._recall(self._derivation_key("estimate_salary", self.salary_expectations)))
 
 
-    def _execute_llm_call(self, prompt_template_str: str, context: Dict[str, Any]) -> str:
+    def _execute_llm_call(self, prompt_name: str, context: Dict[str, Any]) -> str:
         """
-        Helper method to format a prompt, invoke the LLM, and return the string content.
+        Helper method to format a registered prompt, invoke the LLM, and return the string content.
 
         Args:
-            prompt_template_str (str): The raw string for the prompt template.
+            prompt_name (str): The task name of the prompt in the `PromptRegistry` (e.g. "evaluate_job").
             context (Dict[str, Any]): Dictionary containing values to format the template.
 
         Returns:
@@ -193,40 +258,160 @@ class LLMProcessor:
         Raises:
             LLMInvocationError: If the LLM call fails.
             LLMParsingError: If the response cannot be parsed.
-            ValueError: If template creation fails or context is invalid.
+            ValueError: If the context is missing variables required by the prompt.
         """
-        try:
-            prompt_template = self._create_prompt_template(prompt_template_str)
-            # Format the prompt using the provided context
-            # LangChain's format_prompt().to_messages() or format() handles this
-            # For simplicity, let's assume the wrapper's invoke handles formatted strings or message lists.
-            # If the wrapper expects a specific format (e.g., message list), adjust here.
-            # Example: formatted_input = prompt_template.format_prompt(**context).to_messages()
-            # For now, assume invoke handles raw string from format:
-            formatted_prompt = prompt_template.format(**context)
-            logger.debug(f"Formatted prompt: {formatted_prompt[:200]}...") # Log start of prompt
-
-        except (ValueError, KeyError) as e:
-            logger.error(f"Error formatting prompt template: {e}. Context: {context.keys()}", exc_info=True)
-            raise ValueError(f"Failed to format prompt: {e}") from e
-
+        formatted_prompt = self._format_prompt(prompt_name, context)
         # Invoke the LLM via the wrapper
         # The wrapper handles logging, retries, and basic parsing.
         # It might return AIMessage or str.
-        response = self.llm.invoke(formatted_prompt) # Pass the formatted prompt
+        with task_scope(prompt_name): # Labels the call in logs and the metrics ledger
+            return self._response_text(self.llm.invoke(formatted_prompt))
+
+
+    async def _aexecute_llm_call(self, prompt_name: str, context: Dict[str, Any]) -> str:
+        """Asynchronous counterpart of `_execute_llm_call`, awaiting the wrapper's `ainvoke`."""
+        formatted_prompt = self._format_prompt(prompt_name, context)
+        with task_scope(prompt_name):
+            return self._response_text(await self.llm.ainvoke(formatted_prompt))
+
 
-        # Extract string content from the response
+    def _format_prompt(self, prompt_name: str, context: Dict[str, Any]) -> Union[str, List[BaseMessage]]:
+        """
+        Formats a precompiled prompt with `context`. Raises ValueError on failure.
+
+        Prompts with a cacheable context prefix are returned as a [SystemMessage(prefix),
+        HumanMessage(task)] list so the prefix can be cached by the provider; others as a string.
+        Prompts over their token budget are compressed first.
+        """
+        try:
+            if self.token_budget:
+                formatted_prompt = self.token_budget.fit(prompt_name, context, lambda c: self.prompts.format(prompt_name, c),
+                                                         self.resume_index)
+            else:
+                formatted_prompt = self.prompts.format(prompt_name, context)
+        except (ValueError, KeyError) as e:
+            logger.error(f"Error formatting prompt '{prompt_name}': {e}. Context: {context.keys()}")
+            raise ValueError(f"Failed to format prompt: {e}") from e
+        preview = formatted_prompt if isinstance(formatted_prompt, str) else formatted_prompt[-1].content
+        logger.debug(f"Formatted prompt '{prompt_name}': {preview[:200]}...") # Log start of task prompt
+        return formatted_prompt
+
+
+    def _prefix_context(self) -> Dict[str, Any]:
+        """Returns the variables of the cacheable context prefixes for the current resume and job."""
+        context = {"resume": self.formatted_resume}
+        if self.current_job:
+            context.update({
+                "location": self.current_job.location,
+                "job_title": self.current_job.title,
+                "job_salary": self.current_job.salary or "Not Specified",
+                "job_description": self.current_job.description,
+            })
+        return context
+
+
+    def _question_resume(self, question: str) -> str:
+        """The resume (with current date) reduced to the sections relevant to `question`, if indexed."""
+        if not self.resume_index: return self.formatted_resume
+        relevant = self.resume_index.relevant_text(question, self.resume_top_k)
+        if not relevant: return self.formatted_resume # Nothing matched; the answer may need the whole resume
+        return self._format_resume_with_date(relevant)
+
+
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        """Extracts the string content from a wrapper response (AIMessage or str)."""
         if isinstance(response, AIMessage):
             return response.content
         elif isinstance(response, str):
             return response
         else:
             logger.error(f"LLM call returned unexpected type: {type(response)}. Returning empty string.")
-            # Or raise an error depending on desired strictness
-            # raise LLMParsingError(f"Unexpected response type from LLM wrapper: {type(response)}")
             return ""
 
 
+    def prefetch_form_answers(self, questions: List[Dict[str, Any]]) -> int:
+        """
+        Answers all questions of a form step with a single LLM call and primes the results,
+        so the subsequent `answer_question_*` calls for those questions return immediately.
+
+        Args:
+            questions (List[Dict[str, Any]]): Entries with 'question', 'type' ('text', 'numeric',
+                                              'options' or 'date') and optional 'options' / 'max_chars'.
+
+        Returns:
+            int: The number of answers primed. 0 if the call or parsing failed (callers then
+                 fall back to per-question calls).
+
+        Raises:
+            LLMError: If the job context is not set.
+            CircuitOpenError: If the model's circuit breaker is open (no answer is made up).
+        """
+        if not self.current_job:
+            raise LLMError("Job context not set. Call set_current_job() first.")
+        if not questions: return 0
+
+        logger.info(f"Answering {len(questions)} form questions with one batched LLM call.")
+        answers = self._batched_answers("batch_questions", questions)
+        primed = 0
+        for entry, answer in zip(questions, answers):
+            if answer is None: continue
+            self._prefetched_answers[(entry["type"], entry["question"].strip().lower())] = answer
+            primed += 1
+        logger.info(f"Primed {primed}/{len(questions)} batched form answers.")
+        return primed
+
+    def answer_general_questions(self, questions: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Answers job-independent screening questions (e.g. years of experience, English level)
+        from the resume alone, with a single LLM call. No job context is needed.
+
+        Args:
+            questions (List[Dict[str, Any]]): Entries as for `prefetch_form_answers`.
+
+        Returns:
+            List[Optional[str]]: The answer to each question, in order; None where the LLM gave
+                                 none. All None if the call or parsing failed.
+        """
+        if not questions: return []
+        logger.info(f"Answering {len(questions)} general questions with one batched LLM call.")
+        return self._batched_answers("general_questions", questions)
+
+    def _batched_answers(self, prompt_name: str, questions: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Sends numbered questions through a batched prompt and returns the answers in order (None on failure)."""
+        numbered = [{"id": str(i), **q} for i, q in enumerate(questions, start=1)]
+        context = {
+            **self._prefix_context(),
+            "limit_caractere": self.DEFAULT_ANSWER_CHAR_LIMIT,
+            "today_date": format_datetime(datetime.now(), "%Y-%m-%d"),
+            "questions_json": json.dumps(numbered, ensure_ascii=False, indent=2),
+        }
+
+        try:
+            response = self._execute_llm_call(prompt_name, context)
+            match = re.search(r"\{.*\}", response, re.DOTALL)
+            answers = json.loads(match.group(0)) if match else None
+            if not isinstance(answers, dict):
+                logger.warning(f"Batched answer response is not a JSON object: '{response[:200]}'")
+                return [None] * len(questions)
+        except CircuitOpenError:
+            raise # The provider is down: typing a fallback answer could submit a wrong form
+        except (LLMInvocationError, LLMParsingError, ValueError) as e: # json.JSONDecodeError is a ValueError
+            logger.warning(f"Batched question answering ({prompt_name}) failed: {e}")
+            return [None] * len(questions)
+
+        results: List[Optional[str]] = []
+        for entry in numbered:
+            answer = answers.get(entry["id"])
+            results.append(None if answer is None or str(answer).strip() == "" else str(answer).strip())
+        return results
+
+    def _take_prefetched_answer(self, kind: str, question: str) -> Optional[str]:
+        """Pops a primed batched answer (each is used once, so re-asked questions are regenerated)."""
+        answer = self._prefetched_answers.pop((kind, question.strip().lower()), None)
+        if answer is not None: logger.debug(f"Using batched answer for '{question}': '{answer[:50]}'")
+        return answer
+
     def answer_question_simple(self, question: str, character_limit: int = DEFAULT_ANSWER_CHAR_LIMIT) -> str:
         """
         Answers a simple question based on the current job context and resume.
@@ -241,6 +426,7 @@ class LLMProcessor:
         Raises:
             LLMError: If the LLM call fails or the job context is not set.
             ValueError: If the question is empty.
+            CircuitOpenError: If the model's circuit breaker is open (no answer is made up).
         """
         if not question:
             raise ValueError("Question cannot be empty.")
@@ -256,21 +442,20 @@ class LLMProcessor:
         )
         logger.debug(f"Using effective character limit: {effective_limit}")
 
+        prefetched = self._take_prefetched_answer("text", question)
+        if prefetched is not None:
+            return prefetched if len(prefetched) <= effective_limit else prefetched[:effective_limit - 3] + "..."
+
         # Prepare context for the prompt template
         context = {
-            "location": self.current_job.location,
+            **self._prefix_context(), # Job details for the cacheable prefix
+            "relevant_resume": self._question_resume(question), # Only the relevant resume sections
             "limit_caractere": effective_limit, # Ensure template uses this name
-            "job_title": self.current_job.title,
-            "job_salary": self.current_job.salary or "Not Specified",
-            "job_description": self.current_job.description,
-            "resume": self.formatted_resume, # Use resume with current date
             "question": question,
         }
 
         try:
-            # Use the appropriate template from prompt_strings
-            template = prompt_strings.simple_question_template # Assuming template name
-            answer = self._execute_llm_call(template, context)
+            answer = self._execute_llm_call("simple_question", context)
             logger.debug(f"Raw answer for '{question}': {answer}")
 
             # Post-processing: Ensure within character limit and strip whitespace
@@ -281,6 +466,8 @@ class LLMProcessor:
 
             return answer
 
+        except CircuitOpenError:
+            raise # The provider is down: typing a fallback answer could submit a wrong form
         except (LLMInvocationError, LLMParsingError, ValueError) as e:
             logger.error(f"Error answering simple question '{question}': {e}", exc_info=True)
             raise LLMError(f"Failed to answer simple question: {e}") from e
@@ -302,21 +489,25 @@ class LLMProcessor:
         Raises:
             ValueError: If the question is empty.
             LLMError: For LLM or processing errors.
+            CircuitOpenError: If the model's circuit breaker is open (no answer is made up).
         """
         if not question:
             raise ValueError("Question cannot be empty.")
 
         logger.info(f"Answering numeric question: '{question}'")
 
+        prefetched = self._take_prefetched_answer("numeric", question)
+        if prefetched is not None and (number := extract_number_from_string(prefetched)) is not None:
+            return number
+
         context = {
-            "resume_summary": self.formatted_resume, # Use formatted resume
+            "relevant_resume": self._question_resume(question), # Only the relevant resume sections
             "question": question,
         }
 
         try:
              # Assuming a template designed for numeric extraction exists
-            template = prompt_strings.numeric_question_template
-            raw_output = self._execute_llm_call(template, context)
+            raw_output = self._execute_llm_call("numeric_question", context)
             logger.debug(f"Raw output for numeric question '{question}': {raw_output}")
 
             # Extract the number using the utility function
@@ -329,6 +520,8 @@ class LLMProcessor:
             logger.info(f"Extracted number {extracted_number} for question: '{question}'")
             return extracted_number
 
+        except CircuitOpenError:
+            raise # The provider is down: typing a fallback answer could submit a wrong form
         except (LLMInvocationError, LLMParsingError, ValueError) as e:
             logger.error(f"Error answering numeric question '{question}': {e}", exc_info=True)
             # Decide whether to raise or return None. Returning None for now.
@@ -352,6 +545,7 @@ class LLMProcessor:
         Raises:
             ValueError: If the question or options are invalid.
             LLMError: For LLM or processing errors.
+            CircuitOpenError: If the model's circuit breaker is open (no answer is made up).
         """
         if not question:
             raise ValueError("Question cannot be empty.")
@@ -361,16 +555,20 @@ class LLMProcessor:
         logger.info(f"Answering question from options: '{question}'")
         logger.debug(f"Available options: {options}")
 
+        prefetched = self._take_prefetched_answer("options", question)
+        if prefetched is not None and (best_match := find_best_match(prefetched, options)) is not None:
+            logger.info(f"Selected option '{best_match}' for question: '{question}' (batched)")
+            return best_match
+
         options_str = ", ".join(f"'{opt}'" for opt in options) # Format for prompt clarity
         context = {
-            "resume": self.formatted_resume, # Use formatted resume
+            "relevant_resume": self._question_resume(question), # Only the relevant resume sections
             "question": question,
             "options": options_str,
         }
 
         try:
-            template = prompt_strings.options_template # Assuming template name
-            llm_suggestion = self._execute_llm_call(template, context)
+            llm_suggestion = self._execute_llm_call("options", context)
             logger.debug(f"LLM suggested answer for '{question}': '{llm_suggestion}'")
 
             # Find the best match from the original options list using Levenshtein distance
@@ -383,6 +581,8 @@ class LLMProcessor:
             logger.info(f"Selected option '{best_match}' for question: '{question}'")
             return best_match
 
+        except CircuitOpenError:
+            raise # The provider is down: typing a fallback answer could submit a wrong form
         except (LLMInvocationError, LLMParsingError, ValueError, TypeError) as e: # Added TypeError for find_best_match
             logger.error(f"Error answering question from options '{question}': {e}", exc_info=True)
             return None # Return None on error
@@ -404,11 +604,17 @@ class LLMProcessor:
         Raises:
             ValueError: If the question is empty.
             LLMError: For LLM or processing errors.
+            CircuitOpenError: If the model's circuit breaker is open (no answer is made up).
         """
         if not question:
             raise ValueError("Question cannot be empty.")
 
         logger.info(f"Answering date question: '{question}'")
+
+        prefetched = self._take_prefetched_answer("date", question)
+        if prefetched is not None:
+            try: return datetime.strptime(prefetched, "%Y-%m-%d")
+            except ValueError: logger.warning(f"Batched date answer '{prefetched}' is not YYYY-MM-DD. Querying individually.")
         today_date_str = format_datetime(datetime.now(), "%Y-%m-%d")
 
         context = {
@@ -421,8 +627,7 @@ class LLMProcessor:
         }
 
         try:
-            template = prompt_strings.date_question_template # Assuming template name
-            date_str_output = self._execute_llm_call(template, context)
+            date_str_output = self._execute_llm_call("date_question", context)
             logger.debug(f"Raw date output for '{question}': {date_str_output}")
 
             # Attempt to parse the date string (expecting YYYY-MM-DD format from template)
@@ -431,6 +636,8 @@ class LLMProcessor:
             logger.info(f"Parsed date {format_datetime(parsed_date, '%Y-%m-%d')} for question: '{question}'")
             return parsed_date
 
+        except CircuitOpenError:
+            raise # The provider is down: typing a fallback answer could submit a wrong form
         except ValueError as ve: # Catch parsing errors specifically
             logger.error(f"Failed to parse date string '{date_str_output}' from LLM: {ve}")
             return None # Return None if parsing fails
@@ -450,100 +657,184 @@ class LLMProcessor:
 
         Raises:
             LLMError: If the job context is not set.
+            CircuitOpenError: If the model's circuit breaker is open (no verdict on the job).
         """
         if not self.current_job:
             raise LLMError("Job context not set. Call set_current_job() first.")
 
+        key = self._derivation_key("evaluate_job")
+        if (memoized := self._recall(key)) is not None: return memoized
+
         logger.debug(f"Evaluating job fit for: {self.current_job.title}")
+        try:
+            response = self._execute_llm_call("evaluate_job", self._prefix_context())
+            return self._remember(key, self._parse_job_fit_score(response))
+        except CircuitOpenError:
+            raise # The provider is down, which says nothing about the job; the caller skips it unrecorded
+        except (LLMInvocationError, LLMParsingError, ValueError) as e:
+            logger.error(f"Error evaluating job fit: {e}", exc_info=True)
+            return 0.1 # Return default low score on error
+        except Exception as e:
+            logger.critical(f"Unexpected error evaluating job fit: {e}", exc_info=True)
+            return 0.1
 
-        context = {
-            "location": self.current_job.location,
-            "job_title": self.current_job.title,
-            "job_salary": self.current_job.salary or "Not Specified",
-            "job_description": self.current_job.description,
-            "resume_summary": self.formatted_resume, # Use formatted resume
-        }
 
-        try:
-            template = prompt_strings.evaluate_job_template # Assuming template name
-            response = self._execute_llm_call(template, context)
-            logger.debug(f"Raw evaluation score response: {response}")
-
-            # Enhanced score extraction: find float or int, handle ranges maybe
-            match = re.search(r"\b(\d+(\.\d+)?)\b", response) # Find first number (int or float)
-            if match:
-                score = float(match.group(1))
-                # Clamp score between 0 and 10
-                score = max(0.0, min(10.0, score))
-                logger.debug(f"Extracted job fit score: {score:.2f}")
-                return round(score, 2)
-            else:
-                logger.warning(f"Could not extract a valid score from response: '{response}'. Returning default low score.")
-                return 0.1 # Default low score if extraction fails
+    async def aevaluate_job_fit(self) -> float:
+        """Asynchronous counterpart of `evaluate_job_fit`."""
+        if not self.current_job:
+            raise LLMError("Job context not set. Call set_current_job() first.")
+
+        key = self._derivation_key("evaluate_job")
+        if (memoized := self._recall(key)) is not None: return memoized
 
+        logger.debug(f"Evaluating job fit (async) for: {self.current_job.title}")
+        try:
+            response = await self._aexecute_llm_call("evaluate_job", self._prefix_context())
+            return self._remember(key, self._parse_job_fit_score(response))
+        except CircuitOpenError:
+            raise # The provider is down, which says nothing about the job; the caller skips it unrecorded
         except (LLMInvocationError, LLMParsingError, ValueError) as e:
             logger.error(f"Error evaluating job fit: {e}", exc_info=True)
-            return 0.1 # Return default low score on error
+            return 0.1
         except Exception as e:
             logger.critical(f"Unexpected error evaluating job fit: {e}", exc_info=True)
             return 0.1
 
 
-    def estimate_salary(self) -> float:
+    @staticmethod
+    def _parse_job_fit_score(response: str) -> float:
+        """Extracts the 0-10 score from the evaluation response (0.1 if none is found)."""
+        logger.debug(f"Raw evaluation score response: {response}")
+        # Enhanced score extraction: find float or int, handle ranges maybe
+        match = re.search(r"\b(\d+(\.\d+)?)\b", response) # Find first number (int or float)
+        if match:
+            score = float(match.group(1))
+            # Clamp score between 0 and 10
+            score = max(0.0, min(10.0, score))
+            logger.debug(f"Extracted job fit score: {score:.2f}")
+            return round(score, 2)
+        logger.warning(f"Could not extract a valid score from response: '{response}'. Returning default low score.")
+        return 0.1 # Default low score if extraction fails
+
+
+    def evaluate_job_fit_and_salary(self, min_score: Optional[float] = None) -> Tuple[float, Optional[float]]:
         """
-        Estimates the likely annual salary for the candidate for the current job.
+        Runs `evaluate_job_fit` and `estimate_salary` concurrently for the current job.
+
+        Both calls depend only on the resume and the job description, so issuing them
+        in parallel roughly halves the pre-apply decision latency. The salary estimate
+        runs as a task on the processor's background event loop, so if the score comes
+        back below `min_score` it is cancelled even while in flight, and None is returned
+        in its place. If the estimate does not arrive within `request_timeout_seconds` of the
+        score, the loop is presumed hung: it is stopped and the salary is estimated on the
+        calling thread instead. Call `close()` to stop the loop.
+
+        Args:
+            min_score (Optional[float]): Score threshold for keeping the salary estimate.
+                                         Defaults to the processor's `min_score_to_apply`.
 
         Returns:
-            float: The estimated annual salary in USD. Returns 0.1 on error.
+            Tuple[float, Optional[float]]: The job fit score and the estimated salary
+                                           (None when short-circuited by a low score).
 
         Raises:
             LLMError: If the job context is not set.
         """
         if not self.current_job:
             raise LLMError("Job context not set. Call set_current_job() first.")
+        threshold = self.min_score_to_apply if min_score is None else min_score
+
+        salary_future = asyncio.run_coroutine_threadsafe(self.aestimate_salary(), self._background_loop())
+        try: score = self.evaluate_job_fit() # Run the score on the calling thread; it decides whether the salary matters
+        except BaseException: salary_future.cancel(); raise
+
+        if score < threshold:
+            salary_future.cancel() # Cancels the task on the loop, aborting a request in flight
+            logger.debug(f"Job score {score:.2f} below {threshold}; cancelled salary estimate.")
+            return score, None
+        try: return score, salary_future.result(timeout=self.request_timeout_seconds)
+        except FuturesTimeoutError:
+            logger.warning(f"Background salary estimate took over {self.request_timeout_seconds}s; estimating it directly.")
+            salary_future.cancel()
+            self.close() # A new loop is started on demand
+            return score, self.estimate_salary()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop of the evaluation thread, started on first use."""
+        if self._evaluation_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="LLMEvaluation", daemon=True)
+            thread.start()
+            self._evaluation_loop, self._evaluation_thread = loop, thread
+        return self._evaluation_loop
+
+    def close(self) -> None:
+        """
+        Cancels salary estimates still running and stops the background evaluation loop.
+        Idempotent; a later `evaluate_job_fit_and_salary` starts a new loop.
+        """
+        loop, thread = self._evaluation_loop, self._evaluation_thread
+        if loop is None: return
+        self._evaluation_loop = self._evaluation_thread = None
 
-        logger.info(f"Estimating salary for: {self.current_job.title}")
+        async def cancel_pending():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks: task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Include salary expectation in the resume context for the prompt
-        salary_expectation_line = f"Candidate's desired salary (USD annual): {self.salary_expectations}\n"
-        resume_with_salary = f"{salary_expectation_line}{self.formatted_resume}"
+        try: asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout=5)
+        except Exception as e: logger.warning(f"Could not cancel pending LLM evaluations: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive(): loop.close()
+        logger.debug("LLMProcessor evaluation loop stopped.")
 
-        context = {
-            "location": self.current_job.location,
-            "job_title": self.current_job.title,
-            "job_salary": self.current_job.salary or "Not Specified", # Salary mentioned in JD
-            "job_description": self.current_job.description,
-            "resume_summary": resume_with_salary, # Use resume including salary expectation
-        }
 
+    async def aevaluate_job_fit_and_salary(self, min_score: Optional[float] = None) -> Tuple[float, Optional[float]]:
+        """
+        Asynchronous counterpart of `evaluate_job_fit_and_salary`: both requests run as tasks
+        on the current event loop and the salary task is cancelled on a low score.
+        """
+        if not self.current_job:
+            raise LLMError("Job context not set. Call set_current_job() first.")
+        threshold = self.min_score_to_apply if min_score is None else min_score
+
+        salary_task = asyncio.create_task(self.aestimate_salary())
         try:
-            template = prompt_strings.estimate_salary_template # Assuming template name
-            response = self._execute_llm_call(template, context)
-            logger.debug(f"Raw salary estimation response: {response}")
+            score = await self.aevaluate_job_fit()
+        except BaseException:
+            salary_task.cancel()
+            raise
+        if score < threshold:
+            salary_task.cancel()
+            logger.debug(f"Job score {score:.2f} below {threshold}; cancelled salary estimate.")
+            return score, None
+        return score, await salary_task
 
-            # Extract number - more robustly handle currency symbols, commas, ranges
-            # Remove common currency symbols and commas
-            cleaned_response = re.sub(r"[$,]", "", response)
-             # Look for numbers, potentially separated by 'to' or '-' for ranges
-            numbers = re.findall(r"\b\d+(?:\.\d+)?\b", cleaned_response) # Find potential numbers
 
-            if not numbers:
-                 logger.warning(f"Could not extract any numeric value from salary estimation: '{response}'. Returning default.")
-                 return 0.1
+    def estimate_salary(self) -> float:
+        """
+        Estimates the likely annual salary for the candidate for the current job.
 
-            # If multiple numbers found (likely a range), take the highest
-            float_numbers = [float(n) for n in numbers]
-            estimated_salary = max(float_numbers)
+        Returns:
+            float: The estimated annual salary in USD. Returns 0.1 on error.
 
-            # Basic sanity check (e.g., salary > 1000?)
-            if estimated_salary < 1000:
-                 logger.warning(f"Extracted salary {estimated_salary} seems unusually low. Check LLM response or prompt.")
-                 # Return default or the low value depending on desired behavior
-                 return 0.1 # Default low value
+        Raises:
+            LLMError: If the job context is not set.
+            CircuitOpenError: If the model's circuit breaker is open (no verdict on the job).
+        """
+        if not self.current_job:
+            raise LLMError("Job context not set. Call set_current_job() first.")
 
-            logger.info(f"Estimated salary: {estimated_salary:.2f} USD")
-            return round(estimated_salary, 2)
+        key = self._derivation_key("estimate_salary", self.salary_expectations)
+        if (memoized := self._recall(key)) is not None: return memoized
 
+        logger.info(f"Estimating salary for: {self.current_job.title}")
+        try:
+            response = self._execute_llm_call("estimate_salary", self._salary_context())
+            return self._remember(key, self._parse_salary_estimate(response))
+        except CircuitOpenError:
+            raise # The provider is down, which says nothing about the job; the caller skips it unrecorded
         except (LLMInvocationError, LLMParsingError, ValueError) as e:
             logger.error(f"Error estimating salary: {e}", exc_info=True)
             return 0.1 # Return default low value on error
@@ -551,6 +842,57 @@ class LLMProcessor:
             logger.critical(f"Unexpected error estimating salary: {e}", exc_info=True)
             return 0.1
 
+
+    async def aestimate_salary(self) -> float:
+        """Asynchronous counterpart of `estimate_salary`."""
+        if not self.current_job:
+            raise LLMError("Job context not set. Call set_current_job() first.")
+
+        key = self._derivation_key("estimate_salary", self.salary_expectations)
+        if (memoized := self._recall(key)) is not None: return memoized
+
+        logger.info(f"Estimating salary (async) for: {self.current_job.title}")
+        try:
+            response = await self._aexecute_llm_call("estimate_salary", self._salary_context())
+            return self._remember(key, self._parse_salary_estimate(response))
+        except CircuitOpenError:
+            raise # The provider is down, which says nothing about the job; the caller skips it unrecorded
+        except (LLMInvocationError, LLMParsingError, ValueError) as e:
+            logger.error(f"Error estimating salary: {e}", exc_info=True)
+            return 0.1
+        except Exception as e:
+            logger.critical(f"Unexpected error estimating salary: {e}", exc_info=True)
+            return 0.1
+
+
+    def _salary_context(self) -> Dict[str, Any]:
+        # The salary expectation goes in the task part, keeping the cacheable prefix identical across tasks
+        return {**self._prefix_context(), "salary_expectation": self.salary_expectations}
+
+
+    @staticmethod
+    def _parse_salary_estimate(response: str) -> float:
+        """Extracts the annual salary from the estimation response (0.1 if none is usable)."""
+        logger.debug(f"Raw salary estimation response: {response}")
+        # Remove common currency symbols and commas, then look for numbers (ranges separated by 'to' or '-')
+        cleaned_response = re.sub(r"[$,]", "", response)
+        numbers = re.findall(r"\b\d+(?:\.\d+)?\b", cleaned_response)
+        if not numbers:
+             logger.warning(f"Could not extract any numeric value from salary estimation: '{response}'. Returning default.")
+             return 0.1
+
+        # If multiple numbers found (likely a range), take the highest
+        estimated_salary = max(float(n) for n in numbers)
+
+        # Basic sanity check (e.g., salary > 1000?)
+        if estimated_salary < 1000:
+             logger.warning(f"Extracted salary {estimated_salary} seems unusually low. Check LLM response or prompt.")
+             return 0.1 # Default low value
+
+        logger.info(f"Estimated salary: {estimated_salary:.2f} USD")
+        return round(estimated_salary, 2)
+
+
     def extract_keywords_from_job_description(self) -> List[str]:
         """
         Extracts key terms from the current job's description using the LLM.
@@ -560,17 +902,22 @@ class LLMProcessor:
 
         Raises:
             LLMError: If the job context is not set.
+            CircuitOpenError: If the model's circuit breaker is open (no fallback document is used).
         """
         if not self.current_job or not self.current_job.description:
             raise LLMError("Job context or description not set. Call set_current_job() first.")
 
+        key = self._derivation_key("extract_keywords")
+        if (memoized := self._recall(key)) is not None:
+            logger.debug("Reusing keywords already extracted for this job.")
+            return list(memoized)
+
         logger.info("Extracting keywords from job description...")
 
         context = {"job_description": self.current_job.description}
 
         try:
-            template = prompt_strings.extract_keywords_template # Assuming template name
-            response = self._execute_llm_call(template, context)
+            response = self._execute_llm_call("extract_keywords", context)
             logger.debug(f"Raw keyword extraction response: {response}")
 
             # Attempt to parse the response as a JSON list (as requested by the template)
@@ -582,7 +929,7 @@ class LLMProcessor:
                     keywords = json.loads(keywords_str)
                     if isinstance(keywords, list) and all(isinstance(kw, str) for kw in keywords):
                         logger.info(f"Successfully extracted {len(keywords)} keywords.")
-                        return keywords
+                        return list(self._remember(key, keywords))
                     else:
                          logger.warning(f"Parsed JSON is not a list of strings: {keywords_str}")
                 else:
@@ -596,11 +943,13 @@ class LLMProcessor:
                      keywords = [kw.strip() for kw in response.split(',') if kw.strip()] # Split by comma
                 if keywords:
                      logger.info(f"Extracted {len(keywords)} keywords using fallback method.")
-                     return keywords
+                     return list(self._remember(key, keywords))
 
             logger.warning("Failed to extract keywords using primary and fallback methods.")
             return [] # Return empty list if extraction fails
 
+        except CircuitOpenError:
+            raise # The provider is down: uploading a fallback document would weaken the application
         except (LLMInvocationError, LLMParsingError, ValueError) as e:
             logger.error(f"Error extracting keywords: {e}", exc_info=True)
             return [] # Return empty list on error
@@ -621,6 +970,7 @@ class LLMProcessor:
         Raises:
             LLMError: If the job context is not set.
             ValueError: If the keywords list is empty.
+            CircuitOpenError: If the model's circuit breaker is open (no fallback document is used).
         """
         if not self.current_job:
             raise LLMError("Job context not set. Call set_current_job() first.")
@@ -630,28 +980,28 @@ class LLMProcessor:
              # raise ValueError("Keywords list cannot be empty for generating tailored summary.")
              return self.formatted_resume # Return original as fallback
 
-        logger.info("Generating tailored resume summary based on keywords...")
         keywords_str = ', '.join(keywords)
+        key = self._derivation_key("tailored_summary", keywords_str)
+        if (memoized := self._recall(key)) is not None: return memoized
+
+        logger.info("Generating tailored resume summary based on keywords...")
 
         context = {
-            "resume_summary": self._raw_resume, # Provide the original base resume for context
-            "resume": self.formatted_resume, # Provide formatted one too if template needs date etc.
+            **self._prefix_context(), # Resume and job details
             "keywords_str": keywords_str,
-             # Add job context if template requires it
-            "job_title": self.current_job.title,
-            "job_description": self.current_job.description,
         }
 
         try:
-            template = prompt_strings.tailored_summary_template # Assuming template name
-            tailored_summary = self._execute_llm_call(template, context)
+            tailored_summary = self._execute_llm_call("tailored_summary", context)
             logger.info("Tailored summary generated successfully.")
             logger.debug(f"Tailored Summary: {tailored_summary[:200]}...")
 
             # Add date back to the tailored summary if needed downstream
             # return self._format_resume_with_date(tailored_summary.strip())
-            return tailored_summary.strip() # Return without date for direct use?
+            return self._remember(key, tailored_summary.strip()) # Return without date for direct use?
 
+        except CircuitOpenError:
+            raise # The provider is down: uploading a fallback document would weaken the application
         except (LLMInvocationError, LLMParsingError, ValueError) as e:
             logger.error(f"Error generating tailored summary: {e}", exc_info=True)
             return self.formatted_resume # Return original formatted resume on error
@@ -671,6 +1021,7 @@ class LLMProcessor:
 
         Raises:
             LLMError: If the job context is not set.
+            CircuitOpenError: If the model's circuit breaker is open (no fallback document is used).
         """
         if not self.current_job:
             raise LLMError("Job context not set. Call set_current_job() first.")
@@ -678,25 +1029,26 @@ class LLMProcessor:
         # if not keywords:
         #     raise ValueError("Keywords list cannot be empty for generating cover letter.")
 
-        logger.info("Generating tailored cover letter...")
         keywords_str = ', '.join(keywords) if keywords else "Not available"
+        key = self._derivation_key("cover_letter", keywords_str)
+        if (memoized := self._recall(key)) is not None: return memoized
+
+        logger.info("Generating tailored cover letter...")
 
         context = {
-            "job_description": self.current_job.description,
-            "resume": self.formatted_resume, # Use resume with date
+            **self._prefix_context(), # Resume (with date) and job details
             "keywords_str": keywords_str,
-             # Add more context if needed (company name, job title explicitly)
-            "job_title": self.current_job.title,
             "company_name": self.current_job.company,
         }
 
         try:
-            template = prompt_strings.cover_letter_template # Assuming template name
-            cover_letter = self._execute_llm_call(template, context)
+            cover_letter = self._execute_llm_call("cover_letter", context)
             logger.info("Cover letter generated successfully.")
             logger.debug(f"Generated Cover Letter: {cover_letter[:200]}...")
-            return cover_letter.strip()
+            return self._remember(key, cover_letter.strip())
 
+        except CircuitOpenError:
+            raise # The provider is down: uploading a fallback document would weaken the application
         except (LLMInvocationError, LLMParsingError, ValueError) as e:
             logger.error(f"Error generating cover letter: {e}", exc_info=True)
             return "" # Return empty string on error
@@ -716,6 +1068,7 @@ class LLMProcessor:
 
         Raises:
             ValueError: If the phrase is empty.
+            CircuitOpenError: If the model's circuit breaker is open (no fallback document is used).
         """
         if not phrase:
             raise ValueError("Phrase cannot be empty.")
@@ -746,8 +1099,7 @@ class LLMProcessor:
         context = {"phrase": phrase}
 
         try:
-            template = prompt_strings.resume_or_cover_template # Assuming template name
-            response = self._execute_llm_call(template, context)
+            response = self._execute_llm_call("resume_or_cover", context)
             logger.debug(f"LLM response for resume/cover check: '{response}'")
 
             response_lower = response.lower().strip()
@@ -759,6 +1111,8 @@ class LLMProcessor:
                 logger.warning(f"LLM response '{response}' unclear for resume/cover check. Defaulting to 'resume'.")
                 return "resume" # Default if LLM is ambiguous
 
+        except CircuitOpenError:
+            raise # The provider is down: guessing could upload the wrong document
         except (LLMInvocationError, LLMParsingError, ValueError) as e:
             logger.error(f"LLM error checking resume/cover phrase '{phrase}': {e}", exc_info=True)
             return "resume" # Default to resume on error
@@ -0,0 +1,225 @@
+# src/llm/metrics.py
+"""
+In-process cost and latency ledger for LLM calls.
+
+Every logged interaction is recorded against its model and task (the prompt name,
+e.g. "evaluate_job" or "simple_question"; see `task_scope`). The ledger keeps call,
+error and cache-hit counters, token totals, USD spend and a fixed-bucket latency
+histogram per (model, task), and exposes them via `snapshot()` and a formatted
+`summary()`, optionally logged periodically.
+
+Set `LLM_METRICS_SUMMARY_INTERVAL` (seconds) to log the summary periodically.
+"""
+
+import atexit
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Final, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from .config import get_llm_config_value
+
+UNKNOWN_TASK: Final[str] = "unknown"
+
+_current_task: ContextVar[str] = ContextVar("llm_task", default=UNKNOWN_TASK)
+
+
+def current_llm_task() -> str:
+    """Returns the task name of the LLM call being made in the current context."""
+    return _current_task.get()
+
+
+@contextmanager
+def task_scope(task: str) -> Iterator[None]:
+    """Labels the LLM calls made inside the block (including awaited tasks and `to_thread` calls)."""
+    token = _current_task.set(task)
+    try: yield
+    finally: _current_task.reset(token)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are interpolated within a bucket."""
+
+    # Upper bounds in seconds; the last bucket is open-ended
+    BOUNDS: Final[Tuple[float, ...]] = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0,
+                                        7.5, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0)
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max: self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Returns the estimated `q`-th percentile (0-100) in seconds, 0.0 if empty."""
+        if not self.count: return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count: continue
+            if seen + bucket_count >= rank:
+                lower = self.BOUNDS[index - 1] if index > 0 else 0.0
+                upper = self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+                fraction = (rank - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            seen += bucket_count
+        return self.max
+
+
+@dataclass
+class CallStats:
+    """Aggregated counters for one (model, task) pair."""
+    calls: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "input_tokens": self.input_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_seconds": {
+                "mean": round(self.latency.total / self.latency.count, 3) if self.latency.count else 0.0,
+                "p50": round(self.latency.percentile(50), 3),
+                "p95": round(self.latency.percentile(95), 3),
+                "p99": round(self.latency.percentile(99), 3),
+                "max": round(self.latency.max, 3),
+            },
+        }
+
+
+class LLMMetricsLedger:
+    """Thread-safe per-(model, task) ledger of LLM call counts, tokens, spend and latency."""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], CallStats] = {}
+        self._lock = threading.Lock()
+        self._summary_thread: Optional[threading.Thread] = None
+        self._summary_stop = threading.Event()
+
+    def record(self, *, model: str, task: str, duration_seconds: float, input_tokens: int = 0,
+               output_tokens: int = 0, cache_read_tokens: int = 0, cost_usd: float = 0.0,
+               cache_hit: bool = False, error: bool = False) -> None:
+        """Adds one interaction to the ledger."""
+        with self._lock:
+            stats = self._stats.get((model, task))
+            if stats is None: stats = self._stats[(model, task)] = CallStats()
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.cache_hits += int(cache_hit)
+            stats.input_tokens += input_tokens
+            stats.cache_read_tokens += cache_read_tokens
+            stats.output_tokens += output_tokens
+            stats.cost_usd += cost_usd
+            stats.latency.observe(duration_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the aggregated metrics:
+        {"by_model_task": [{"model", "task", ...stats}], "by_task": {...}, "by_model": {...}, "total": {...}}.
+        """
+        with self._lock:
+            items = [(model, task, stats.as_dict(), stats) for (model, task), stats in self._stats.items()]
+            by_task: Dict[str, CallStats] = {}
+            by_model: Dict[str, CallStats] = {}
+            total = CallStats()
+            for model, task, _, stats in items:
+                for bucket in (by_task.setdefault(task, CallStats()), by_model.setdefault(model, CallStats()), total):
+                    _merge_into(bucket, stats)
+        return {
+            "by_model_task": sorted(({"model": model, "task": task, **data} for model, task, data, _ in items),
+                                    key=lambda row: row["cost_usd"], reverse=True),
+            "by_task": {task: stats.as_dict() for task, stats in by_task.items()},
+            "by_model": {model: stats.as_dict() for model, stats in by_model.items()},
+            "total": total.as_dict(),
+        }
+
+    def summary(self) -> str:
+        """Returns a table of the per-(model, task) metrics, most expensive first."""
+        snapshot = self.snapshot()
+        rows = snapshot["by_model_task"]
+        if not rows: return "No LLM calls recorded."
+        lines = [f"{'model':<28} {'task':<18} {'calls':>6} {'err':>4} {'hit':>4} {'in_tok':>9} {'out_tok':>8} "
+                 f"{'cost_usd':>10} {'p50':>7} {'p95':>7} {'p99':>7}"]
+        for row in rows + [{"model": "TOTAL", "task": "", **snapshot["total"]}]:
+            latency = row["latency_seconds"]
+            lines.append(f"{row['model'][:28]:<28} {row['task'][:18]:<18} {row['calls']:>6} {row['errors']:>4} "
+                         f"{row['cache_hits']:>4} {row['input_tokens']:>9} {row['output_tokens']:>8} {row['cost_usd']:>10.4f} "
+                         f"{latency['p50']:>7.2f} {latency['p95']:>7.2f} {latency['p99']:>7.2f}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock: self._stats.clear()
+
+    def start_periodic_summary(self, interval_seconds: float) -> None:
+        """Logs `summary()` every `interval_seconds` on a daemon thread (no-op if already running)."""
+        if interval_seconds <= 0 or (self._summary_thread and self._summary_thread.is_alive()): return
+        self._summary_stop.clear()
+
+        def _loop() -> None:
+            while not self._summary_stop.wait(interval_seconds):
+                logger.info(f"LLM usage summary:\n{self.summary()}")
+
+        self._summary_thread = threading.Thread(target=_loop, name="LLMMetricsSummary", daemon=True)
+        self._summary_thread.start()
+        logger.info(f"LLM usage summary will be logged every {interval_seconds:.0f}s.")
+
+    def stop_periodic_summary(self) -> None:
+        self._summary_stop.set()
+
+
+def _merge_into(target: CallStats, source: CallStats) -> None:
+    target.calls += source.calls
+    target.errors += source.errors
+    target.cache_hits += source.cache_hits
+    target.input_tokens += source.input_tokens
+    target.cache_read_tokens += source.cache_read_tokens
+    target.output_tokens += source.output_tokens
+    target.cost_usd += source.cost_usd
+    target.latency.counts = [a + b for a, b in zip(target.latency.counts, source.latency.counts)]
+    target.latency.count += source.latency.count
+    target.latency.total += source.latency.total
+    target.latency.max = max(target.latency.max, source.latency.max)
+
+
+_ledger = LLMMetricsLedger()
+
+
+def get_metrics_ledger() -> LLMMetricsLedger:
+    """Returns the process-wide metrics ledger."""
+    return _ledger
+
+
+def start_metrics_summary_from_config() -> None:
+    """Starts the periodic summary if `LLM_METRICS_SUMMARY_INTERVAL` is set to a positive number of seconds."""
+    try: interval = float(get_llm_config_value("metrics_summary_interval", 0) or 0)
+    except ValueError:
+        logger.warning("Invalid LLM_METRICS_SUMMARY_INTERVAL; periodic LLM usage summary disabled.")
+        return
+    _ledger.start_periodic_summary(interval)
+
+
+@atexit.register
+def _log_final_summary() -> None:
+    if _ledger.snapshot()["total"]["calls"]:
+        logger.info(f"LLM usage summary (final):\n{_ledger.summary()}")
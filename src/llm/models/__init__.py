@@ -4,7 +4,8 @@ Models package initialization.
 
 Exports the base AIModel class and all concrete model implementations
 for different LLM providers (OpenAI, Anthropic Claude, Google Gemini,
-Ollama, Hugging Face).
+Ollama, Hugging Face), plus the task-based `RoutingModel`, the latency-hedging `HedgedModel` and
+the per-provider `RateLimitedModel` used inside them.
 """
 
 # Base class
@@ -16,6 +17,9 @@ from .claude_model import ClaudeModel
 from .ollama_model import OllamaModel
 from .gemini_model import GeminiModel
 from .huggingface_model import HuggingFaceModel
+from .router_model import RoutingModel
+from .hedged_model import HedgedModel
+from .rate_limited_model import RateLimitedModel
 
 # Define what gets imported when using 'from src.llm.models import *'
 # Also useful for static analysis tools.
@@ -28,4 +32,7 @@ __all__ = [
     'OllamaModel',
     'GeminiModel',
     'HuggingFaceModel',
+    'RoutingModel',
+    'HedgedModel',
+    'RateLimitedModel',
 ]
\ No newline at end of file
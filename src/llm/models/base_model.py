@@ -3,9 +3,10 @@
 Defines the Abstract Base Class (ABC) for all AI model interactions.
 
 This ensures a consistent interface for different LLM providers, handling
-common initialization attributes and defining the core `invoke` method signature.
+common initialization attributes and defining the core `invoke` / `ainvoke` method signatures.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Union, List, Dict, Optional
 
@@ -131,6 +132,28 @@ class AIModel(ABC):
         """
         pass
 
+    async def ainvoke(
+        self,
+        prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
+    ) -> Any:
+        """
+        Asynchronous counterpart of `invoke`.
+
+        Providers with a native async client override this to await LangChain's `ainvoke`.
+        The default runs the blocking `invoke` in a worker thread so every model can be
+        awaited, at the cost of one thread per in-flight request.
+
+        Args:
+            prompt: The input prompt, in any of the formats accepted by `invoke`.
+
+        Returns:
+            Any: The raw response object from the underlying model's invocation.
+
+        Raises:
+            LLMInvocationError: If the API call fails.
+        """
+        return await asyncio.to_thread(self.invoke, prompt)
+
     def get_model_name(self) -> str:
         """Returns the configured model name used for initialization."""
         return self.model_name
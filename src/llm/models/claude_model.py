@@ -9,7 +9,7 @@ from typing import Any, Union, List, Dict, Optional
 from loguru import logger
 # Ensure necessary LangChain components are imported
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import BaseMessage # For type hint
+from langchain_core.messages import BaseMessage, SystemMessage # For type hint and cache markers
 from langchain_core.prompt_values import ChatPromptValue # For type hint
 # Import custom exceptions and base class
 from .base_model import AIModel, LLMInvocationError, ConfigurationError
@@ -78,6 +78,24 @@ class ClaudeModel(AIModel):
             raise LLMInvocationError(f"Failed to initialize Anthropic client: {e}") from e
 
 
+    @staticmethod
+    def _with_cache_control(
+        prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
+    ) -> Union[str, List[Dict[str, str]], List[BaseMessage]]:
+        """
+        Marks a leading system message (the resume/job context prefix built by `LLMProcessor`)
+        with an ephemeral `cache_control` breakpoint so Anthropic caches it across requests.
+        Other prompt shapes are returned unchanged.
+        """
+        messages = prompt.to_messages() if isinstance(prompt, ChatPromptValue) else prompt
+        if not isinstance(messages, list) or not messages: return prompt
+        first = messages[0]
+        if isinstance(first, SystemMessage) and isinstance(first.content, str):
+            marked = SystemMessage(content=[{"type": "text", "text": first.content, "cache_control": {"type": "ephemeral"}}])
+            return [marked, *messages[1:]]
+        return messages
+
+
     def invoke(
         self,
         prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
@@ -99,7 +117,7 @@ class ClaudeModel(AIModel):
 
         logger.debug(f"Invoking Claude model '{self.model_name}' via LangChain wrapper.")
         try:
-            response = self._model_instance.invoke(prompt)
+            response = self._model_instance.invoke(self._with_cache_control(prompt))
             logger.debug(f"Received response from Claude model '{self.model_name}'. Type: {type(response)}")
             if hasattr(response, 'usage_metadata') and response.usage_metadata:
                  logger.trace(f"Claude Usage Metadata received: {response.usage_metadata}")
@@ -108,4 +126,33 @@ class ClaudeModel(AIModel):
         # except AuthenticationError as e: ...
         except Exception as e:
             logger.error(f"Error invoking Claude model '{self.model_name}': {e}", exc_info=True)
-            raise LLMInvocationError(f"Anthropic API call failed: {e}") from e
\ No newline at end of file
+            raise LLMInvocationError(f"Anthropic API call failed: {e}") from e
+
+
+    async def ainvoke(
+        self,
+        prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
+    ) -> Any:
+        """
+        Asynchronously invokes the Claude model via `ChatAnthropic.ainvoke()`.
+
+        Args:
+            prompt: The input prompt (string, message dict list, BaseMessage list, or ChatPromptValue).
+
+        Returns:
+            Any: The raw response, typically an `AIMessage` object.
+
+        Raises:
+            LLMInvocationError: If the API call fails.
+        """
+        if self._model_instance is None:
+             raise LLMInvocationError("Model instance is not initialized.")
+
+        logger.debug(f"Async invoking Claude model '{self.model_name}' via LangChain wrapper.")
+        try:
+            response = await self._model_instance.ainvoke(self._with_cache_control(prompt))
+            logger.debug(f"Received async response from Claude model '{self.model_name}'. Type: {type(response)}")
+            return response
+        except Exception as e:
+            logger.error(f"Error async invoking Claude model '{self.model_name}': {e}", exc_info=True)
+            raise LLMInvocationError(f"Anthropic API call failed: {e}") from e
@@ -2,6 +2,10 @@
 """
 Concrete implementation of the AIModel interface for Google Gemini models.
 Uses the `langchain-google-genai` package.
+
+Gemini caches repeated request prefixes implicitly, so no explicit marker is sent:
+prompts built with a cacheable context prefix lead with the same system message,
+and the cached token counts Gemini reports are priced by `utils.pricing`.
 """
 
 from typing import Any, Union, List, Dict, Optional
@@ -118,4 +122,33 @@ class GeminiModel(AIModel):
             logger.error(f"Error invoking Gemini model '{self.model_name}': {e}", exc_info=True)
             # Log specific details if available from Google errors
             # if hasattr(e, 'message'): logger.error(f"Google API Error Message: {e.message}")
-            raise LLMInvocationError(f"Google GenAI API call failed: {e}") from e
\ No newline at end of file
+            raise LLMInvocationError(f"Google GenAI API call failed: {e}") from e
+
+
+    async def ainvoke(
+        self,
+        prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
+    ) -> Any:
+        """
+        Asynchronously invokes the Gemini model via `ChatGoogleGenerativeAI.ainvoke()`.
+
+        Args:
+            prompt: The input prompt (string, message dict list, BaseMessage list, or ChatPromptValue).
+
+        Returns:
+            Any: The raw response, typically an `AIMessage` object.
+
+        Raises:
+            LLMInvocationError: If the API call fails.
+        """
+        if self._model_instance is None:
+             raise LLMInvocationError("Model instance is not initialized.")
+
+        logger.debug(f"Async invoking Gemini model '{self.model_name}' via LangChain wrapper.")
+        try:
+            response = await self._model_instance.ainvoke(prompt)
+            logger.debug(f"Received async response from Gemini model '{self.model_name}'. Type: {type(response)}")
+            return response
+        except Exception as e:
+            logger.error(f"Error async invoking Gemini model '{self.model_name}': {e}", exc_info=True)
+            raise LLMInvocationError(f"Google GenAI API call failed: {e}") from e
@@ -0,0 +1,205 @@
+# src/llm/models/hedged_model.py
+"""
+AIModel that hedges slow calls with a duplicate request to a secondary model.
+
+For hedged tasks (by default the form-field answers), the primary model is
+called first. If it has not answered after its recent p95 latency for that
+task, the same prompt is sent to the secondary model and whichever answers
+first is used. This bounds tail latency at the cost of a few duplicate calls
+(about 5% at p95). Until enough latency samples exist, a fixed delay is used.
+
+In the synchronous path the losing call cannot be cancelled and finishes in
+the background. The provider bills it all the same, so once it finishes its
+response is handed to `discarded_response_handler` (set by `LoggingModelWrapper`),
+which logs it and records it in the metrics ledger. In the async path the losing
+call is cancelled, and only a loser that had already answered is recorded.
+
+Hedged calls run in a worker thread or task with a copy of the caller's context,
+so a wrapped model that records which model served the call (`RoutingModel`)
+does so out of the caller's sight. Each call therefore returns the pricing model
+name read inside its own context, and that name is what `get_pricing_model_name`
+reports to the caller.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
+from contextvars import ContextVar, copy_context
+from datetime import datetime
+from typing import Any, Callable, Dict, Final, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from .base_model import AIModel
+from ..metrics import LatencyHistogram, current_llm_task
+
+DEFAULT_HEDGED_TASKS: Final[tuple] = ("simple_question", "numeric_question", "options", "date_question",
+                                      "batch_questions", "resume_or_cover")
+
+
+class HedgedModel(AIModel):
+    """Calls `primary`, and `secondary` as well if `primary` is slower than its recent percentile."""
+
+    MIN_SAMPLES: Final[int] = 20 # Latency samples needed before the percentile replaces the default delay
+    MAX_WORKERS: Final[int] = 8
+
+    def __init__(self,
+                 primary: AIModel,
+                 secondary: AIModel,
+                 tasks: Optional[Iterable[str]] = DEFAULT_HEDGED_TASKS,
+                 percentile: float = 95.0,
+                 default_delay_seconds: float = 8.0,
+                 min_delay_seconds: float = 1.0):
+        """
+        Args:
+            primary: Model serving every call.
+            secondary: Model receiving the hedge request.
+            tasks: Prompt names to hedge; None hedges every task.
+            percentile: Primary latency percentile (per task) after which the hedge is sent.
+            default_delay_seconds: Hedge delay while a task has fewer than MIN_SAMPLES samples.
+            min_delay_seconds: Lower bound for the hedge delay.
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.tasks = frozenset(tasks) if tasks is not None else None
+        self.percentile = percentile
+        self.default_delay_seconds = default_delay_seconds
+        self.min_delay_seconds = min_delay_seconds
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self._latency_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Pricing model name of the answer used, when it was served in another context; None defers to the primary
+        self._served: ContextVar[Optional[str]] = ContextVar(f"hedged_model_{id(self)}", default=None)
+        # Receives (response, prompt, pricing model name, task, start, end) of answers not used; None drops them
+        self.discarded_response_handler: Optional[Callable[[Any, Any, str, str, datetime, datetime], None]] = None
+        super().__init__(model_name=f"hedged({primary.get_model_name()}, {secondary.get_model_name()})",
+                         temperature=primary.temperature)
+
+    def _initialize_model(self) -> Any:
+        return self.primary # Both models are already initialized
+
+    def hedge_delay(self, task: str) -> float:
+        """Seconds to wait for the primary before sending the hedge request for `task`."""
+        with self._latency_lock:
+            histogram = self._latency.get(task)
+            if histogram is None or histogram.count < self.MIN_SAMPLES: return self.default_delay_seconds
+            return max(self.min_delay_seconds, histogram.percentile(self.percentile))
+
+    def _observe(self, task: str, seconds: float) -> None:
+        with self._latency_lock:
+            histogram = self._latency.get(task)
+            if histogram is None: histogram = self._latency[task] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def _should_hedge(self, task: str) -> bool:
+        return self.tasks is None or task in self.tasks
+
+    @staticmethod
+    def _served_call(model: AIModel, prompt: Any) -> Tuple[Any, str]:
+        """Calls `model` and reads its pricing name in the same (worker) context."""
+        response = model.invoke(prompt)
+        return response, model.get_pricing_model_name()
+
+    def _timed_primary(self, prompt: Any, task: str) -> Tuple[Any, str]:
+        start = time.monotonic()
+        result = self._served_call(self.primary, prompt)
+        self._observe(task, time.monotonic() - start) # Recorded even if the hedge won, to keep the tail honest
+        return result
+
+    def _use(self, result: Tuple[Any, str]) -> Any:
+        response, pricing_model_name = result
+        self._served.set(pricing_model_name)
+        return response
+
+    def _discard(self, result: Tuple[Any, str], prompt: Any, task: str, start_time: datetime) -> None:
+        """Hands a losing call's response to `discarded_response_handler`: it was paid for but not used."""
+        if self.discarded_response_handler is None: return
+        response, pricing_model_name = result
+        try: self.discarded_response_handler(response, prompt, pricing_model_name, task, start_time, datetime.now())
+        except Exception as e: logger.error(f"Failed to record the discarded hedge response of {pricing_model_name}: {e}")
+
+    def _discard_when_done(self, future: Future, prompt: Any, task: str, start_time: datetime) -> None:
+        """Done-callback of a losing call in the synchronous path; failed calls are not billed."""
+        if future.cancelled() or future.exception() is not None: return
+        self._discard(future.result(), prompt, task, start_time)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="LLMHedge")
+            return self._executor
+
+    def invoke(self, prompt: Any) -> Any:
+        task = current_llm_task()
+        self._served.set(None)
+        if not self._should_hedge(task): return self.primary.invoke(prompt) # Served in this context
+
+        delay = self.hedge_delay(task)
+        start_times = {}
+        primary_future = self._pool().submit(copy_context().run, self._timed_primary, prompt, task)
+        start_times[primary_future] = datetime.now()
+        try: return self._use(primary_future.result(timeout=delay))
+        except FuturesTimeoutError: pass
+
+        logger.info(f"Primary model slower than {delay:.1f}s for task '{task}'; hedging with {self.secondary.get_model_name()}.")
+        secondary_future = self._pool().submit(copy_context().run, self._served_call, self.secondary, prompt)
+        start_times[secondary_future] = datetime.now()
+        pending = {primary_future, secondary_future}
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    continue
+                for loser in (done | pending) - {future}: # Runs now if the loser already finished
+                    loser.add_done_callback(lambda f: self._discard_when_done(f, prompt, task, start_times[f]))
+                return self._use(future.result())
+        raise last_error
+
+    async def ainvoke(self, prompt: Any) -> Any:
+        task = current_llm_task()
+        self._served.set(None)
+        if not self._should_hedge(task): return await self.primary.ainvoke(prompt) # Served in this context
+
+        async def served_call(model: AIModel) -> Tuple[Any, str]:
+            response = await model.ainvoke(prompt)
+            return response, model.get_pricing_model_name() # Read in the task's own context
+
+        async def timed_primary() -> Tuple[Any, str]:
+            start = time.monotonic()
+            result = await served_call(self.primary)
+            self._observe(task, time.monotonic() - start)
+            return result
+
+        delay = self.hedge_delay(task)
+        primary_task = asyncio.ensure_future(timed_primary())
+        start_times = {primary_task: datetime.now()}
+        pending = {primary_task}
+        last_error: Optional[BaseException] = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done: return self._use(primary_task.result())
+
+            logger.info(f"Primary model slower than {delay:.1f}s for task '{task}'; hedging with {self.secondary.get_model_name()}.")
+            secondary_task = asyncio.ensure_future(served_call(self.secondary))
+            start_times[secondary_task] = datetime.now()
+            pending.add(secondary_task)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    if finished.exception() is not None:
+                        last_error = finished.exception()
+                        continue
+                    for loser in done - {finished}: # Both answered in the same round: the other was paid for too
+                        if loser.exception() is None: self._discard(loser.result(), prompt, task, start_times[loser])
+                    return self._use(finished.result())
+            raise last_error
+        finally:
+            for unfinished in pending: unfinished.cancel() # The losing request, or both if we were cancelled
+
+    def get_pricing_model_name(self) -> str:
+        """Prices and logs each call under the model whose answer was used."""
+        return self._served.get() or self.primary.get_pricing_model_name()
@@ -114,6 +114,32 @@ class HuggingFaceModel(AIModel):
             raise LLMInvocationError(f"Failed to initialize HuggingFace client: {e}") from e
 
 
+    def _prepare_prompt(
+        self,
+        prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
+    ) -> Any:
+        """Adapts the prompt to the initialized client (HuggingFaceEndpoint only accepts strings)."""
+        # Adapt prompt format if necessary, especially if using HuggingFaceEndpoint directly
+        if not isinstance(self._model_instance, ChatHuggingFace) and not isinstance(prompt, str):
+             logger.warning(f"HuggingFaceEndpoint expects string prompt, received {type(prompt)}. Joining message contents.")
+             # Convert complex prompt types to string for basic LLM interface. All messages are kept,
+             # since prompts with a cacheable prefix put the resume/job context in a leading system message.
+             if isinstance(prompt, (list, ChatPromptValue)):
+                 messages = prompt.messages if isinstance(prompt, ChatPromptValue) else prompt
+                 contents = []
+                 for msg in messages:
+                      if isinstance(msg, BaseMessage): contents.append(str(msg.content))
+                      elif isinstance(msg, dict): contents.append(str(msg.get("content", msg)))
+                      else: contents.append(str(msg))
+                 prompt_input = "\n\n".join(contents) if contents else str(prompt)
+             else:
+                  prompt_input = str(prompt) # Fallback conversion
+        else:
+             # If it's ChatHuggingFace or prompt is already string, use as is
+             prompt_input = prompt
+        return prompt_input
+
+
     def invoke(
         self,
         prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
@@ -139,29 +165,7 @@ class HuggingFaceModel(AIModel):
 
         logger.debug(f"Invoking HuggingFace model '{self.model_name}' via LangChain {type(self._model_instance).__name__}.")
 
-        # Adapt prompt format if necessary, especially if using HuggingFaceEndpoint directly
-        if not isinstance(self._model_instance, ChatHuggingFace) and not isinstance(prompt, str):
-             logger.warning(f"HuggingFaceEndpoint expects string prompt, received {type(prompt)}. Using content of first message or converting.")
-             # Convert complex prompt types to string for basic LLM interface
-             if isinstance(prompt, (list, ChatPromptValue)):
-                 first_msg = None
-                 if isinstance(prompt, ChatPromptValue) and hasattr(prompt, 'messages'):
-                      first_msg = prompt.messages[0] if prompt.messages else None
-                 elif isinstance(prompt, list) and prompt:
-                      first_msg = prompt[0]
-
-                 if isinstance(first_msg, BaseMessage):
-                      prompt_input = first_msg.content
-                 elif isinstance(first_msg, dict):
-                      prompt_input = first_msg.get("content", str(first_msg))
-                 else:
-                      prompt_input = str(prompt) # Fallback conversion
-             else:
-                  prompt_input = str(prompt) # Fallback conversion
-        else:
-             # If it's ChatHuggingFace or prompt is already string, use as is
-             prompt_input = prompt
-
+        prompt_input = self._prepare_prompt(prompt)
 
         try:
             response = self._model_instance.invoke(prompt_input)
@@ -174,4 +178,34 @@ class HuggingFaceModel(AIModel):
             return response
         except Exception as e:
             logger.error(f"Error invoking HuggingFace model '{self.model_name}': {e}", exc_info=True)
-            raise LLMInvocationError(f"HuggingFace API call failed for repo '{self.model_name}': {e}") from e
\ No newline at end of file
+            raise LLMInvocationError(f"HuggingFace API call failed for repo '{self.model_name}': {e}") from e
+
+
+    async def ainvoke(
+        self,
+        prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
+    ) -> Any:
+        """
+        Asynchronously invokes the Hugging Face model via the LangChain client's `ainvoke()`.
+
+        Args:
+            prompt: The input prompt (string, message dict list, BaseMessage list, or ChatPromptValue).
+
+        Returns:
+            Any: The raw response, an `AIMessage` or a string depending on the client type.
+
+        Raises:
+            LLMInvocationError: If the API call fails.
+        """
+        if self._model_instance is None:
+             raise LLMInvocationError("Model instance is not initialized.")
+
+        logger.debug(f"Async invoking HuggingFace model '{self.model_name}' via LangChain {type(self._model_instance).__name__}.")
+        prompt_input = self._prepare_prompt(prompt)
+        try:
+            response = await self._model_instance.ainvoke(prompt_input)
+            logger.debug(f"Received async response from HuggingFace model '{self.model_name}'. Type: {type(response)}")
+            return response
+        except Exception as e:
+            logger.error(f"Error async invoking HuggingFace model '{self.model_name}': {e}", exc_info=True)
+            raise LLMInvocationError(f"HuggingFace API call failed for repo '{self.model_name}': {e}") from e
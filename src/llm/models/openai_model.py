@@ -130,4 +130,33 @@ class OpenAIModel(AIModel):
             # Catch other potential errors from LangChain or underlying httpx calls
             logger.error(f"Error invoking OpenAI model '{self.model_name}': {e}", exc_info=True)
             # Wrap in standard error type
-            raise LLMInvocationError(f"OpenAI API call failed: {e}") from e
\ No newline at end of file
+            raise LLMInvocationError(f"OpenAI API call failed: {e}") from e
+
+
+    async def ainvoke(
+        self,
+        prompt: Union[str, List[Dict[str, str]], List[BaseMessage], ChatPromptValue]
+    ) -> Any:
+        """
+        Asynchronously invokes the OpenAI model via `ChatOpenAI.ainvoke()`.
+
+        Args:
+            prompt: The input prompt (string, message dict list, BaseMessage list, or ChatPromptValue).
+
+        Returns:
+            Any: The raw response, typically an `AIMessage` object.
+
+        Raises:
+            LLMInvocationError: If the API call fails.
+        """
+        if self._model_instance is None:
+             raise LLMInvocationError("Model instance is not initialized.")
+
+        logger.debug(f"Async invoking OpenAI model '{self.model_name}' via LangChain wrapper.")
+        try:
+            response = await self._model_instance.ainvoke(prompt)
+            logger.debug(f"Received async response from OpenAI model '{self.model_name}'. Type: {type(response)}")
+            return response
+        except Exception as e:
+            logger.error(f"Error async invoking OpenAI model '{self.model_name}': {e}", exc_info=True)
+            raise LLMInvocationError(f"OpenAI API call failed: {e}") from e
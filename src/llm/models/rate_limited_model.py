@@ -0,0 +1,57 @@
+# src/llm/models/rate_limited_model.py
+"""
+AIModel that paces calls to one provider model with that provider's rate limiter.
+
+`RoutingModel` and `HedgedModel` combine models of different providers behind a
+single `LoggingModelWrapper`, so a limiter on the wrapper would charge every call
+to the primary provider's budget, whichever model served it, and would not see
+hedge duplicates at all. Wrapping each provider model in a `RateLimitedModel`
+instead charges every request (hedges included) to the bucket of the provider
+that receives it.
+"""
+
+from typing import Any
+
+from .base_model import AIModel
+from ..rate_limiter import RateLimiter, estimate_prompt_tokens
+
+
+def _total_tokens(response: Any) -> int:
+    """Total tokens reported by a response's usage metadata, or 0 if it has none."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    if not isinstance(usage, dict): return 0
+    return int(usage.get("total_tokens") or (usage.get("input_tokens", 0) + usage.get("output_tokens", 0)) or 0)
+
+
+class RateLimitedModel(AIModel):
+    """Reserves request and token budget with `rate_limiter` before every call to `model`."""
+
+    def __init__(self, model: AIModel, rate_limiter: RateLimiter):
+        self.model = model
+        self.rate_limiter = rate_limiter
+        super().__init__(model_name=model.get_model_name(), temperature=model.temperature)
+
+    def _initialize_model(self) -> Any:
+        return self.model # Already initialized
+
+    def _settle(self, reserved_tokens: int, response: Any) -> Any:
+        actual_tokens = _total_tokens(response)
+        if actual_tokens: self.rate_limiter.record_usage(reserved_tokens, actual_tokens)
+        return response
+
+    def invoke(self, prompt: Any) -> Any:
+        reserved_tokens = estimate_prompt_tokens(prompt)
+        self.rate_limiter.acquire(reserved_tokens)
+        try: response = self.model.invoke(prompt)
+        except BaseException: self.rate_limiter.release(reserved_tokens); raise
+        return self._settle(reserved_tokens, response)
+
+    async def ainvoke(self, prompt: Any) -> Any:
+        reserved_tokens = estimate_prompt_tokens(prompt)
+        await self.rate_limiter.aacquire(reserved_tokens)
+        try: response = await self.model.ainvoke(prompt)
+        except BaseException: self.rate_limiter.release(reserved_tokens); raise # Includes cancelled hedge losers
+        return self._settle(reserved_tokens, response)
+
+    def get_pricing_model_name(self) -> str:
+        return self.model.get_pricing_model_name()
@@ -0,0 +1,178 @@
+# src/llm/models/router_model.py
+"""
+AIModel that routes each call to one of several provider models by task.
+
+The task is the prompt name of the call being made (see `metrics.task_scope`), so
+cheap, fast models can serve short answers ("numeric_question", "options") while
+stronger ones write cover letters. For every call the router:
+
+1. Takes the task's candidate list (or the "default" route), in preference order.
+2. Drops candidates whose estimated cost exceeds the per-call ceiling, if set
+   (the cheapest is kept if all of them exceed it).
+3. Moves candidates that are degraded (recent error rate or mean latency above
+   the limits) behind the healthy ones.
+4. Tries them in that order, failing over to the next one on any error.
+
+Health is a rolling window of recent calls per model, so a degraded model is
+retried automatically once its bad samples age out.
+"""
+
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Final, List, Mapping, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from .base_model import AIModel
+from ..exceptions import ConfigurationError
+from ..metrics import current_llm_task
+from ..rate_limiter import EXPECTED_OUTPUT_TOKENS, estimate_prompt_tokens
+from ..utils.pricing import get_model_pricing
+
+DEFAULT_ROUTE: Final[str] = "default"
+
+
+class RouteHealth:
+    """Rolling window of (timestamp, success, latency) samples for one routed model."""
+
+    def __init__(self, window_seconds: float, max_samples: int = 50):
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, bool, float]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, ok: bool, latency_seconds: float) -> None:
+        with self._lock: self._samples.append((time.monotonic(), ok, latency_seconds))
+
+    def stats(self) -> Tuple[int, float, float]:
+        """Returns (sample count, error rate, mean latency of successful calls) over the window."""
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff: self._samples.popleft()
+            samples = list(self._samples)
+        if not samples: return 0, 0.0, 0.0
+        latencies = [latency for _, ok, latency in samples if ok]
+        error_rate = 1.0 - len(latencies) / len(samples)
+        return len(samples), error_rate, (sum(latencies) / len(latencies) if latencies else 0.0)
+
+
+class RoutingModel(AIModel):
+    """Dispatches calls to provider models by task, with cost, latency and error-aware failover."""
+
+    MIN_SAMPLES: Final[int] = 3 # Samples needed before a model can be judged degraded
+
+    def __init__(self,
+                 models: Mapping[str, AIModel],
+                 routes: Optional[Mapping[str, Sequence[str]]] = None,
+                 max_cost_per_call_usd: Optional[float] = None,
+                 max_error_rate: float = 0.5,
+                 latency_slo_seconds: Optional[float] = None,
+                 health_window_seconds: float = 300.0):
+        """
+        Args:
+            models: Route name -> model instance (e.g. {"fast": OpenAIModel(...), "strong": ClaudeModel(...)}).
+            routes: Task name -> model names in preference order. The "default" route serves other
+                    tasks and defaults to every model in the order given.
+            max_cost_per_call_usd: Skip models whose estimated cost for a call exceeds this.
+            max_error_rate: Models with a higher recent error rate are tried last.
+            latency_slo_seconds: Models with a higher recent mean latency are tried last.
+            health_window_seconds: How long call samples count towards a model's health.
+
+        Raises:
+            ConfigurationError: If no models are given or a route names an unknown model.
+        """
+        if not models:
+            raise ConfigurationError("RoutingModel requires at least one model.")
+        self.models: Dict[str, AIModel] = dict(models)
+        self.routes: Dict[str, List[str]] = {task: list(names) for task, names in (routes or {}).items()}
+        self.routes.setdefault(DEFAULT_ROUTE, list(self.models))
+        for task, names in self.routes.items():
+            unknown = [name for name in names if name not in self.models]
+            if unknown or not names:
+                raise ConfigurationError(f"Route '{task}' must list configured models; unknown: {unknown or 'empty route'}")
+        self.max_cost_per_call_usd = max_cost_per_call_usd
+        self.max_error_rate = max_error_rate
+        self.latency_slo_seconds = latency_slo_seconds
+        self._health: Dict[str, RouteHealth] = {name: RouteHealth(health_window_seconds) for name in self.models}
+        self._served: ContextVar[Optional[str]] = ContextVar(f"routed_model_{id(self)}", default=None)
+        super().__init__(model_name=f"router({', '.join(self.models)})")
+
+    def _initialize_model(self) -> Any:
+        return self.models # The routed models are already initialized
+
+    def _plan(self, prompt: Any) -> List[str]:
+        """Returns the model names to try for the current task, best first."""
+        task = current_llm_task()
+        candidates = self.routes.get(task) or self.routes[DEFAULT_ROUTE]
+
+        if self.max_cost_per_call_usd is not None:
+            costs = {name: self.estimate_cost(name, prompt) for name in candidates}
+            affordable = [name for name in candidates if costs[name] <= self.max_cost_per_call_usd]
+            if not affordable:
+                cheapest = min(candidates, key=costs.get)
+                logger.warning(f"No model for task '{task}' fits the ${self.max_cost_per_call_usd} cost ceiling; "
+                               f"using the cheapest, '{cheapest}' (est. ${costs[cheapest]:.5f}).")
+                affordable = [cheapest]
+            candidates = affordable
+
+        # Stable sort: healthy models first, preference order kept within each group
+        return sorted(candidates, key=self._is_degraded)
+
+    def _is_degraded(self, name: str) -> bool:
+        samples, error_rate, mean_latency = self._health[name].stats()
+        if samples < self.MIN_SAMPLES: return False
+        return error_rate > self.max_error_rate or bool(self.latency_slo_seconds and mean_latency > self.latency_slo_seconds)
+
+    def estimate_cost(self, name: str, prompt: Any) -> float:
+        """Estimated USD cost of sending `prompt` to the model routed as `name`."""
+        pricing = get_model_pricing(self.models[name].get_pricing_model_name())
+        input_tokens = estimate_prompt_tokens(prompt, expected_output_tokens=0)
+        return input_tokens * pricing["input_token_price"] + EXPECTED_OUTPUT_TOKENS * pricing["output_token_price"]
+
+    def invoke(self, prompt: Any) -> Any:
+        last_error: Optional[Exception] = None
+        for name in self._plan(prompt):
+            self._served.set(name)
+            start = time.monotonic()
+            try: response = self.models[name].invoke(prompt)
+            except Exception as e:
+                self._health[name].record(False, time.monotonic() - start)
+                logger.warning(f"Routed model '{name}' failed for task '{current_llm_task()}': {e}. Failing over.")
+                last_error = e
+                continue
+            self._health[name].record(True, time.monotonic() - start)
+            return response
+        raise last_error # Re-raised as-is so the wrapper can still handle 429s
+
+    async def ainvoke(self, prompt: Any) -> Any:
+        last_error: Optional[Exception] = None
+        for name in self._plan(prompt):
+            self._served.set(name)
+            start = time.monotonic()
+            try: response = await self.models[name].ainvoke(prompt)
+            except Exception as e:
+                self._health[name].record(False, time.monotonic() - start)
+                logger.warning(f"Routed model '{name}' failed for task '{current_llm_task()}': {e}. Failing over.")
+                last_error = e
+                continue
+            self._health[name].record(True, time.monotonic() - start)
+            return response
+        raise last_error
+
+    def served_model(self) -> AIModel:
+        """The model that served (or last attempted) the most recent call in this context."""
+        return self.models.get(self._served.get()) or next(iter(self.models.values()))
+
+    def get_pricing_model_name(self) -> str:
+        """Prices and logs each call under the model that actually served it."""
+        return self.served_model().get_pricing_model_name()
+
+    def health(self) -> Dict[str, Dict[str, float]]:
+        """Returns the recent sample count, error rate and mean latency of every routed model."""
+        report = {}
+        for name, health in self._health.items():
+            samples, error_rate, mean_latency = health.stats()
+            report[name] = {"samples": samples, "error_rate": round(error_rate, 3),
+                            "mean_latency_seconds": round(mean_latency, 3), "degraded": self._is_degraded(name)}
+        return report
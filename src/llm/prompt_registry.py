@@ -0,0 +1,166 @@
+# src/llm/prompt_registry.py
+"""
+Registry of precompiled prompt templates.
+
+Each task prompt from `prompts.py` (optionally paired with a cacheable context
+prefix) is dedented, parsed and checked against its declared input variables
+once, when the registry is built. Formatting is then a plain `str.format_map`
+over the precompiled text, and a malformed template or a variable mismatch fails
+at startup instead of in the middle of an application.
+
+The task name (e.g. "evaluate_job") identifies the prompt everywhere else, such
+as in interaction logs and metrics.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+
+from loguru import logger
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from . import prompts as prompt_strings
+from .exceptions import ConfigurationError
+from .utils.helpers import preprocess_template_string
+
+
+@dataclass(frozen=True)
+class PromptSpec:
+    """Declares a task prompt: its template, optional cacheable prefix and expected variables."""
+    template: str
+    variables: Tuple[str, ...]
+    prefix: Optional[str] = None
+
+
+# Variables of the context prefixes (see prompts.py)
+_RESUME_VARS: Tuple[str, ...] = ("resume",)
+_JOB_VARS: Tuple[str, ...] = ("job_title", "location", "job_salary", "job_description")
+_RESUME_AND_JOB_VARS: Tuple[str, ...] = _RESUME_VARS + _JOB_VARS
+
+DEFAULT_PROMPT_SPECS: Dict[str, PromptSpec] = {
+    "evaluate_job": PromptSpec(prompt_strings.evaluate_job_template, _RESUME_AND_JOB_VARS,
+                               prompt_strings.resume_and_job_context_prefix),
+    "estimate_salary": PromptSpec(prompt_strings.estimate_salary_template, _RESUME_AND_JOB_VARS + ("salary_expectation",),
+                                  prompt_strings.resume_and_job_context_prefix),
+    "simple_question": PromptSpec(prompt_strings.simple_question_template,
+                                  _JOB_VARS + ("relevant_resume", "limit_caractere", "question"),
+                                  prompt_strings.job_context_prefix),
+    "numeric_question": PromptSpec(prompt_strings.numeric_question_template, ("relevant_resume", "question")),
+    "options": PromptSpec(prompt_strings.options_template, ("relevant_resume", "question", "options")),
+    "batch_questions": PromptSpec(prompt_strings.batch_questions_template,
+                                  _RESUME_AND_JOB_VARS + ("limit_caractere", "today_date", "questions_json"),
+                                  prompt_strings.resume_and_job_context_prefix),
+    "general_questions": PromptSpec(prompt_strings.general_questions_template,
+                                    _RESUME_VARS + ("limit_caractere", "today_date", "questions_json"),
+                                    prompt_strings.resume_context_prefix),
+    "tailored_summary": PromptSpec(prompt_strings.tailored_summary_template, _RESUME_AND_JOB_VARS + ("keywords_str",),
+                                   prompt_strings.resume_and_job_context_prefix),
+    "cover_letter": PromptSpec(prompt_strings.cover_letter_template, _RESUME_AND_JOB_VARS + ("keywords_str",),
+                               prompt_strings.resume_and_job_context_prefix),
+    "extract_keywords": PromptSpec(prompt_strings.extract_keywords_template, ("job_description",)),
+    "date_question": PromptSpec(prompt_strings.date_question_template, ("question", "today_date")),
+    "resume_or_cover": PromptSpec(prompt_strings.resume_or_cover_template, ("phrase",)),
+}
+
+
+def _template_variables(text: str) -> FrozenSet[str]:
+    """Returns the replacement field names of a format string. Raises ValueError if it is malformed."""
+    names = set()
+    for _, field_name, format_spec, _ in Formatter().parse(text):
+        if field_name is None: continue
+        if not field_name.isidentifier():
+            raise ValueError(f"unsupported replacement field '{{{field_name}}}'")
+        if format_spec and "{" in format_spec:
+            raise ValueError(f"nested replacement field in '{{{field_name}:{format_spec}}}'")
+        names.add(field_name)
+    return frozenset(names)
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """A validated, dedented prompt ready for fast formatting."""
+    name: str
+    text: str
+    prefix: Optional[str]
+    variables: FrozenSet[str]
+
+    def format(self, context: Mapping[str, Any]) -> Union[str, List[BaseMessage]]:
+        """
+        Formats the prompt with `context` (extra keys are ignored).
+
+        Returns a string, or [SystemMessage(prefix), HumanMessage(task)] for prompts with a
+        cacheable prefix.
+
+        Raises:
+            ValueError: If `context` is missing any of the prompt's variables.
+        """
+        missing = self.variables.difference(context)
+        if missing:
+            raise ValueError(f"Prompt '{self.name}' is missing context variables: {', '.join(sorted(missing))}")
+        if self.prefix is None:
+            return self.text.format_map(context)
+        return [SystemMessage(content=self.prefix.format_map(context)), HumanMessage(content=self.text.format_map(context))]
+
+
+class PromptRegistry:
+    """Compiles task prompts once and formats them by task name."""
+
+    def __init__(self, specs: Mapping[str, PromptSpec] = DEFAULT_PROMPT_SPECS):
+        """
+        Args:
+            specs: Task name -> prompt declaration.
+
+        Raises:
+            ConfigurationError: If any template is malformed or its variables differ from the declaration.
+        """
+        self._prompts: Dict[str, CompiledPrompt] = {name: self._compile(name, spec) for name, spec in specs.items()}
+        logger.debug(f"Compiled {len(self._prompts)} prompt templates.")
+
+    @staticmethod
+    def _compile(name: str, spec: PromptSpec) -> CompiledPrompt:
+        text = preprocess_template_string(spec.template)
+        prefix = preprocess_template_string(spec.prefix) if spec.prefix is not None else None
+        if not text:
+            raise ConfigurationError(f"Prompt template '{name}' is empty.")
+        try:
+            found = _template_variables(text) | (_template_variables(prefix) if prefix is not None else frozenset())
+        except ValueError as e:
+            raise ConfigurationError(f"Prompt template '{name}' is malformed: {e}") from e
+        declared = frozenset(spec.variables)
+        if found != declared:
+            details = []
+            if found - declared: details.append(f"undeclared {sorted(found - declared)}")
+            if declared - found: details.append(f"unused {sorted(declared - found)}")
+            raise ConfigurationError(f"Prompt template '{name}' variables do not match its declaration: {'; '.join(details)}")
+        return CompiledPrompt(name=name, text=text, prefix=prefix, variables=found)
+
+    def get(self, name: str) -> CompiledPrompt:
+        try: return self._prompts[name]
+        except KeyError: raise KeyError(f"Unknown prompt '{name}'. Known prompts: {', '.join(sorted(self._prompts))}") from None
+
+    def format(self, name: str, context: Mapping[str, Any]) -> Union[str, List[BaseMessage]]:
+        """Formats the prompt registered under `name` (see `CompiledPrompt.format`)."""
+        return self.get(name).format(context)
+
+    def fingerprint(self, *names: str) -> str:
+        """Short hash of the named prompts' compiled text, usable as a prompt version for cached results."""
+        digest = hashlib.sha256()
+        for name in names:
+            prompt = self.get(name)
+            digest.update(f"{name}\0{prompt.prefix or ''}\0{prompt.text}\0".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._prompts
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._prompts)
+
+
+@lru_cache(maxsize=1)
+def get_prompt_registry() -> PromptRegistry:
+    """Returns the process-wide registry of the default prompts, compiling it on first use."""
+    return PromptRegistry()
@@ -1,63 +1,69 @@
 # src/llm/prompts.py
-evaluate_job_template = """
-You are a Human Resources expert specializing in evaluating job applications for the {location} job market. Your task is to assess the compatibility between the following job description and a provided resume.
-Return only a score from 0 to 10 representing the candidate's likelihood of securing the position, with 0 being the lowest probability and 10 being the highest.
-The assessment should consider HR-specific criteria for the {location} job market, including skills, experience, education, and any other relevant criteria mentioned in the job description.
+"""
+Prompt templates for the LLM tasks.
+
+Templates that reason over the resume are split in two parts: a stable context
+prefix (`resume_context_prefix` / `resume_and_job_context_prefix`), sent as the
+system message, and the task template below it, sent as the human message. The
+prefix is byte-identical across tasks for the same job, so provider-side prefix
+caching (Anthropic `cache_control`, OpenAI automatic prefix caching, Gemini
+implicit caching) can reuse it instead of re-reading the resume on every call.
+Keep per-task wording and variables out of the prefix.
+
+The short form-question prompts only get the resume sections relevant to the
+question (`relevant_resume`), which differ per question, so those sections go in
+the task template: `simple_question` keeps the job-only `job_context_prefix`, and
+`numeric_question` / `options` have no prefix.
+"""
+
+resume_context_prefix = """
+My Resume:
+({resume})
+"""
 
+job_context_prefix = """
 Job Title:
 ({job_title})
 
+Job Location:
+({location})
+
 Job Salary:
 ({job_salary})
 
 Job Description:
 ({job_description})
+"""
 
-My Resume:
-({resume_summary})
+resume_and_job_context_prefix = resume_context_prefix + job_context_prefix
+
+evaluate_job_template = """
+You are a Human Resources expert specializing in evaluating job applications for the {location} job market. Your task is to assess the compatibility between the job description and my resume above.
+Return only a score from 0 to 10 representing the candidate's likelihood of securing the position, with 0 being the lowest probability and 10 being the highest.
+The assessment should consider HR-specific criteria for the {location} job market, including skills, experience, education, and any other relevant criteria mentioned in the job description.
 
 Score (0 to 10):
 """
 
 estimate_salary_template = """
 You are a Human Resources expert specializing in evaluating job applications for the {location} job market.
-Given the job description and the candidate's resume below, estimate the annual salary in US dollars that the employer is likely to offer to this candidate.
+Given the job description and my resume above, estimate the annual salary in US dollars that the employer is likely to offer to this candidate.
+Candidate's desired salary (USD annual): {salary_expectation}
 Provide your answer as a single number, representing the annual salary in US dollars, without any additional text, units, currency symbols, or ranges.
 If the salary is given as a range, return only the highest value in the range. Do not include any explanations.
 
-Job Title:
-({job_title})
-
-Job Salary:
-({job_salary})
-
-Job Description:
-({job_description})
-
-My Resume:
-({resume_summary})
-
 Estimated annual Salary (in US dollars):
 """
 
 simple_question_template = """
-You are an AI assistant specializing in human resources and knowledgeable about the {location} job market. Your role is to help me secure a job by answering questions related to my resume and a job description. Follow these rules:
+My Resume:
+({relevant_resume})
+
+You are an AI assistant specializing in human resources and knowledgeable about the {location} job market. Your role is to help me secure a job by answering questions related to my resume and the job description above. Follow these rules:
 - Answer questions directly.
 - Keep the answer under {limit_caractere} characters.
 - If not sure, provide an approximate answer.
 
-Job Title:
-({job_title})
-
-Job Salary:
-({job_salary})
-
-Job Description:
-({job_description})
-
-Resume:
-({resume})
-
 Question:
 ({question})
 
@@ -65,11 +71,11 @@ Answer:
 """
 
 numeric_question_template = """
-You are an expert in extracting information from resume data.
-Given the following resume summary and a question, please determine the most appropriate numeric answer.
+My Resume:
+({relevant_resume})
 
-Resume Summary:
-{resume_summary}
+You are an expert in extracting information from resume data.
+Given my resume above and the following question, please determine the most appropriate numeric answer.
 
 Question: {question}
 
@@ -88,17 +94,11 @@ Keywords:
 """
 
 tailored_summary_template = """
-Using the following resume, resume summary, and keywords extracted from a job description,
+Using my resume above and the following keywords extracted from the job description,
 create a concise and professional tailored resume summary that highlights the most relevant skills and experiences
 to increase the likelihood of passing through HR evaluation systems. Ensure the summary is truthful
 and only includes information provided. Incorporate the keywords appropriately without fabricating or exaggerating any information.
 
-Old Resume Summary:
-({resume_summary})
-
-Resume:
-({resume})
-
 Keywords:
 ({keywords_str})
 
@@ -106,16 +106,10 @@ Please provide the tailored resume summary below without any headings or labels:
 """
 
 cover_letter_template = """
-Using the following job description, resume, and keywords, compose a concise and professional cover letter that emphasizes the most relevant skills and experiences.
+Using the job description and my resume above, and the following keywords, compose a concise and professional cover letter that emphasizes the most relevant skills and experiences.
 Ensure the cover letter is truthful and only includes information provided. Incorporate the keywords appropriately without fabricating or exaggerating any information.
 The cover letter should not exceed 300 words and should be written in paragraph form.
 
-Job Description:
-({job_description})
-
-Resume:
-({resume})
-
 Keywords:
 ({keywords_str})
 
@@ -131,7 +125,11 @@ Do not provide any additional information or explanations.
 phrase: {phrase}
 """
 
-options_template = """The following is a resume and an answered question about the resume, the answer is one of the options.
+options_template = """
+My Resume:
+({relevant_resume})
+
+The above is my resume. Answer the following question about it; the answer is one of the options.
 
 ## Rules
 - Never choose the default/placeholder option, examples are: 'Select an option', 'None', 'Choose from the options below', etc.
@@ -146,11 +144,6 @@ Options: [1-2, 3-5, 6-10, 10+]
 
 -----
 
-## My resume:
-```
-{resume}
-```
-
 ## Question:
 {question}
 
@@ -178,4 +171,32 @@ Do not include any additional text or explanation—only provide the date in YYY
 Question: "{question}"
 
 Date:
-"""
\ No newline at end of file
+"""
+
+batch_questions_template = """
+You are an AI assistant specializing in human resources and knowledgeable about the {location} job market. You are filling out a job application form on my behalf. Answer every question below based on my resume and the job description above. Follow these rules:
+- Answer each question directly. If not sure, provide an approximate answer.
+- "text" questions: keep the answer under the question's max_chars (default {limit_caractere} characters).
+- "numeric" questions: answer with a single whole number only.
+- "options" questions: answer with exactly one of the listed options, copied verbatim. Never choose a placeholder option.
+- "date" questions: answer with a date formatted as YYYY-MM-DD. Today's date is {today_date}.
+
+Questions (JSON list):
+{questions_json}
+
+Return only a JSON object mapping each question id to its answer, for example {{"1": "Yes", "2": "5"}}. Do not include any additional text or explanation.
+"""
+
+general_questions_template = """
+You are an AI assistant specializing in human resources. You are preparing answers to screening questions that many job application forms ask, on my behalf. Answer every question below based on my resume above; the answers must hold for any job, so do not assume a particular employer or role. Follow these rules:
+- Answer each question directly. If not sure, provide an approximate answer.
+- "text" questions: keep the answer under the question's max_chars (default {limit_caractere} characters).
+- "numeric" questions: answer with a single whole number only.
+- "options" questions: answer with exactly one of the listed options, copied verbatim. Never choose a placeholder option.
+- "date" questions: answer with a date formatted as YYYY-MM-DD. Today's date is {today_date}.
+
+Questions (JSON list):
+{questions_json}
+
+Return only a JSON object mapping each question id to its answer, for example {{"1": "Yes", "2": "5"}}. Do not include any additional text or explanation.
+"""
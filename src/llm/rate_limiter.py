@@ -0,0 +1,292 @@
+# src/llm/rate_limiter.py
+"""
+Proactive token-bucket rate limiting for LLM providers.
+
+Each provider/API key gets two buckets refilled continuously: requests per minute
+and tokens per minute. A call reserves one request plus its estimated tokens
+before it is sent, waiting until both buckets can cover it, and the estimate is
+corrected with the actual usage afterwards. Requests are thus paced instead of
+failing with 429s and backing off.
+
+Backends share the same bucket semantics:
+- "memory": in-process (threads of one CLI run).
+- "file":   state in a small JSON file guarded by `fcntl.flock` (processes on one host).
+- "redis":  atomic Lua script (processes across hosts, e.g. Celery workers).
+
+Configured via `LLM_RATE_LIMIT_RPM` / `LLM_RATE_LIMIT_TPM` (or per provider, e.g.
+`LLM_RATE_LIMIT_OPENAI_RPM`), `LLM_RATE_LIMIT_BACKEND` and `LLM_RATE_LIMIT_REDIS_URL`.
+Limiting is off unless a limit is set.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Final, Optional, Tuple, Union
+
+from loguru import logger
+
+from .config import DATA_OUTPUT_DIR, get_llm_config_value
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+
+BucketState = Tuple[float, float, float] # (request tokens, token tokens, last refill timestamp)
+
+CHARS_PER_TOKEN: Final[int] = 4
+EXPECTED_OUTPUT_TOKENS: Final[int] = 256 # Reserved for the completion until the real usage is known
+
+_limiters: Dict[str, "RateLimiter"] = {} # Limiter name -> instance, so models sharing a provider/key share buckets
+_limiters_lock = threading.Lock()
+
+
+def estimate_prompt_tokens(prompts: Any, expected_output_tokens: int = EXPECTED_OUTPUT_TOKENS) -> int:
+    """Rough token estimate for a call (prompt characters / 4 plus the expected completion)."""
+    if isinstance(prompts, str): chars = len(prompts)
+    elif isinstance(prompts, (list, tuple)):
+        chars = sum(len(str(getattr(p, "content", None) or (p.get("content", "") if isinstance(p, dict) else p)))
+                    for p in prompts)
+    else: chars = len(str(getattr(prompts, "to_string", lambda: prompts)()))
+    return chars // CHARS_PER_TOKEN + expected_output_tokens
+
+
+def _take(state: Optional[BucketState], now: float, rpm: float, tpm: float,
+          request_cost: float, token_cost: float) -> Tuple[BucketState, float]:
+    """
+    Refills the buckets to `now` and takes the cost if both can cover it.
+    Returns the new state and the seconds to wait before retrying (0.0 if taken).
+    A limit of 0 disables that bucket.
+    """
+    requests, tokens, updated = state if state is not None else (rpm, tpm, now)
+    elapsed = max(0.0, now - updated)
+    requests = min(rpm, requests + elapsed * rpm / 60.0)
+    tokens = min(tpm, tokens + elapsed * tpm / 60.0)
+    token_cost = min(token_cost, tpm) # A single call larger than the bucket only waits for a full bucket
+
+    wait = 0.0
+    if rpm > 0 and requests < request_cost: wait = (request_cost - requests) * 60.0 / rpm
+    if tpm > 0 and tokens < token_cost: wait = max(wait, (token_cost - tokens) * 60.0 / tpm)
+    if wait <= 0.0:
+        requests -= request_cost if rpm > 0 else 0.0
+        tokens -= token_cost if tpm > 0 else 0.0
+    return (requests, tokens, now), wait
+
+
+def _adjust(state: Optional[BucketState], now: float, rpm: float, tpm: float, token_delta: float) -> BucketState:
+    """Debits (positive) or credits (negative) `token_delta` tokens after the actual usage is known."""
+    state, _ = _take(state, now, rpm, tpm, 0.0, 0.0)
+    requests, tokens, updated = state
+    if tpm > 0: tokens = max(-tpm, min(tpm, tokens - token_delta))
+    return (requests, tokens, updated)
+
+
+class RateLimiter(ABC):
+    """Token-bucket limiter over requests/min and tokens/min. Subclasses provide the shared state."""
+
+    MAX_SINGLE_WAIT_SECONDS: Final[float] = 30.0 # Re-check at least this often while waiting
+
+    def __init__(self, name: str, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        """
+        Args:
+            name: Bucket identity (provider and API key fingerprint).
+            requests_per_minute: Request limit; 0 disables it.
+            tokens_per_minute: Token limit (input + output); 0 disables it.
+        """
+        self.name = name
+        self.rpm = max(0.0, float(requests_per_minute))
+        self.tpm = max(0.0, float(tokens_per_minute))
+
+    @abstractmethod
+    def _try_acquire(self, request_cost: float, token_cost: float) -> float:
+        """Atomically takes the cost if available; returns seconds to wait otherwise (0.0 if taken)."""
+
+    @abstractmethod
+    def _apply_adjustment(self, token_delta: float) -> None:
+        """Atomically applies a token correction (see `_adjust`)."""
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Blocks until one request and `tokens` tokens are available. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(1.0, float(tokens))
+            if wait <= 0.0: break
+            wait = min(wait, self.MAX_SINGLE_WAIT_SECONDS)
+            if waited == 0.0: logger.info(f"Rate limit '{self.name}': pacing request for {wait:.1f}s.")
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Asynchronous `acquire`: waits with `asyncio.sleep`, leaving the event loop free."""
+        waited = 0.0
+        while True:
+            # The backends block only briefly (a lock, a file lock or one Redis round trip)
+            wait = self._try_acquire(1.0, float(tokens))
+            if wait <= 0.0: break
+            wait = min(wait, self.MAX_SINGLE_WAIT_SECONDS)
+            if waited == 0.0: logger.info(f"Rate limit '{self.name}': pacing request for {wait:.1f}s.")
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+    def release(self, reserved_tokens: int) -> None:
+        """Returns the tokens reserved for an attempt that failed (e.g. with a 429) before being served."""
+        self.record_usage(reserved_tokens, 0)
+
+    def record_usage(self, reserved_tokens: int, actual_tokens: int) -> None:
+        """Corrects the token bucket once the real usage of a call is known."""
+        if self.tpm <= 0 or actual_tokens == reserved_tokens: return
+        try: self._apply_adjustment(float(actual_tokens - reserved_tokens))
+        except Exception as e: logger.warning(f"Rate limit '{self.name}': failed to record usage: {e}")
+
+
+class InProcessRateLimiter(RateLimiter):
+    """Buckets held in memory; shared by the threads of one process."""
+
+    def __init__(self, name: str, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        super().__init__(name, requests_per_minute, tokens_per_minute)
+        self._state: Optional[BucketState] = None
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, request_cost: float, token_cost: float) -> float:
+        with self._lock:
+            self._state, wait = _take(self._state, time.monotonic(), self.rpm, self.tpm, request_cost, token_cost)
+            return wait
+
+    def _apply_adjustment(self, token_delta: float) -> None:
+        with self._lock:
+            self._state = _adjust(self._state, time.monotonic(), self.rpm, self.tpm, token_delta)
+
+
+class FileLockRateLimiter(RateLimiter):
+    """Buckets stored in a JSON file and updated under an exclusive `flock`; shared by processes on one host."""
+
+    def __init__(self, name: str, requests_per_minute: float = 0, tokens_per_minute: float = 0,
+                 state_dir: Union[str, Path] = DATA_OUTPUT_DIR / "rate_limits"):
+        if fcntl is None:
+            raise RuntimeError("FileLockRateLimiter requires fcntl (POSIX).")
+        super().__init__(name, requests_per_minute, tokens_per_minute)
+        self.state_path = Path(state_dir) / f"{name.replace(':', '_')}.json"
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock() # flock is per open file description; serialize this process's threads too
+
+    def _update(self, apply) -> Any:
+        with self._lock, open(self.state_path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try: state = tuple(json.loads(raw)) if raw else None
+                except (ValueError, TypeError): state = None # Corrupt state only resets the buckets
+                new_state, result = apply(state, time.time()) # Wall clock: shared across processes
+                f.seek(0); f.truncate()
+                f.write(json.dumps(new_state))
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _try_acquire(self, request_cost: float, token_cost: float) -> float:
+        return self._update(lambda state, now: _take(state, now, self.rpm, self.tpm, request_cost, token_cost))
+
+    def _apply_adjustment(self, token_delta: float) -> None:
+        self._update(lambda state, now: (_adjust(state, now, self.rpm, self.tpm, token_delta), None))
+
+
+class RedisRateLimiter(RateLimiter):
+    """Buckets stored in a Redis hash and updated by an atomic Lua script using the server clock."""
+
+    _TAKE_SCRIPT: Final[str] = """
+        local rpm, tpm = tonumber(ARGV[1]), tonumber(ARGV[2])
+        local request_cost, token_cost, token_delta = tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5])
+        local t = redis.call('TIME')
+        local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+        local s = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'updated')
+        local requests, tokens, updated = tonumber(s[1]) or rpm, tonumber(s[2]) or tpm, tonumber(s[3]) or now
+        local elapsed = math.max(0, now - updated)
+        requests = math.min(rpm, requests + elapsed * rpm / 60)
+        tokens = math.min(tpm, tokens + elapsed * tpm / 60)
+        token_cost = math.min(token_cost, tpm)
+        local wait = 0
+        if rpm > 0 and requests < request_cost then wait = (request_cost - requests) * 60 / rpm end
+        if tpm > 0 and tokens < token_cost then wait = math.max(wait, (token_cost - tokens) * 60 / tpm) end
+        if wait <= 0 then
+            if rpm > 0 then requests = requests - request_cost end
+            if tpm > 0 then tokens = tokens - token_cost end
+        end
+        -- Usage corrections apply even while the bucket is in debt, as in _adjust
+        if tpm > 0 and token_delta ~= 0 then tokens = math.max(-tpm, math.min(tpm, tokens - token_delta)) end
+        redis.call('HSET', KEYS[1], 'requests', requests, 'tokens', tokens, 'updated', now)
+        redis.call('EXPIRE', KEYS[1], 300)
+        return tostring(wait)
+    """
+
+    def __init__(self, name: str, requests_per_minute: float = 0, tokens_per_minute: float = 0,
+                 redis_client: Any = None, redis_url: Optional[str] = None):
+        """
+        Args:
+            redis_client: An existing `redis.Redis` client (e.g. the web app's `redis_client`).
+            redis_url: Used to create a client when `redis_client` is not given.
+        """
+        super().__init__(name, requests_per_minute, tokens_per_minute)
+        if redis_client is None:
+            import redis # Optional dependency, only needed for this backend
+            redis_client = redis.Redis.from_url(redis_url or "redis://localhost:6379/0")
+        self._redis = redis_client
+        self._key = f"llm_rate_limit:{name}"
+        self._script = self._redis.register_script(self._TAKE_SCRIPT)
+
+    def _try_acquire(self, request_cost: float, token_cost: float) -> float:
+        return float(self._script(keys=[self._key], args=[self.rpm, self.tpm, request_cost, token_cost, 0]))
+
+    def _apply_adjustment(self, token_delta: float) -> None:
+        self._script(keys=[self._key], args=[self.rpm, self.tpm, 0, 0, token_delta])
+
+
+def create_rate_limiter(provider: str, api_key: Optional[str] = None) -> Optional[RateLimiter]:
+    """
+    Builds the configured limiter for a provider, or returns None if no limit is set.
+
+    Limits come from `LLM_RATE_LIMIT_<PROVIDER>_RPM` / `_TPM`, falling back to
+    `LLM_RATE_LIMIT_RPM` / `LLM_RATE_LIMIT_TPM`. Buckets are scoped to the provider and
+    a fingerprint of the API key, so runs sharing a key share a budget; within a run, models of
+    the same provider and key get the same limiter instance. The "redis" backend connects to
+    `LLM_RATE_LIMIT_REDIS_URL`.
+    """
+    provider = (provider or "default").lower()
+    try:
+        rpm = float(get_llm_config_value(f"rate_limit_{provider}_rpm", get_llm_config_value("rate_limit_rpm", 0)) or 0)
+        tpm = float(get_llm_config_value(f"rate_limit_{provider}_tpm", get_llm_config_value("rate_limit_tpm", 0)) or 0)
+    except ValueError as e:
+        logger.error(f"Invalid LLM rate limit configuration, rate limiting disabled: {e}")
+        return None
+    if rpm <= 0 and tpm <= 0: return None
+
+    fingerprint = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+    name = f"{provider}:{fingerprint}"
+    with _limiters_lock:
+        if name not in _limiters: _limiters[name] = _build_rate_limiter(provider, name, rpm, tpm)
+        return _limiters[name]
+
+
+def _build_rate_limiter(provider: str, name: str, rpm: float, tpm: float) -> RateLimiter:
+    backend = str(get_llm_config_value("rate_limit_backend", "memory")).lower()
+    try:
+        if backend == "redis":
+            limiter = RedisRateLimiter(name, rpm, tpm, redis_url=get_llm_config_value("rate_limit_redis_url"))
+        elif backend == "file":
+            limiter = FileLockRateLimiter(name, rpm, tpm)
+        else:
+            if backend != "memory": logger.warning(f"Unknown LLM_RATE_LIMIT_BACKEND '{backend}', using 'memory'.")
+            limiter = InProcessRateLimiter(name, rpm, tpm)
+    except Exception as e:
+        logger.error(f"Failed to set up '{backend}' rate limiter, falling back to in-process limiting: {e}")
+        limiter = InProcessRateLimiter(name, rpm, tpm)
+    logger.info(f"LLM rate limiting enabled for {provider} ({type(limiter).__name__}): "
+                f"{rpm:g} requests/min, {tpm:g} tokens/min (0 = unlimited).")
+    return limiter
@@ -0,0 +1,159 @@
+# src/llm/response_cache.py
+"""
+Content-addressed, on-disk cache for LLM responses.
+
+Responses are keyed by a SHA-256 of (model name, temperature, formatted prompt), so
+byte-identical requests (e.g. the same screening question against the same resume)
+are answered locally instead of hitting the provider again. Entries expire after a
+TTL and the store is bounded by a least-recently-used eviction policy.
+
+The "today date:" line that LLMProcessor prepends to the resume is left out of the
+key, so entries keep matching across days for their whole TTL. Prompts whose answer
+depends on the date (date questions, batched form answers) state it in their own
+text ("Today's date is ..."), so those stay keyed per day.
+
+The cache is opt-in: set `LLM_RESPONSE_CACHE=true` (see `config.get_llm_config_value`).
+`LLM_RESPONSE_CACHE_TTL` (seconds) and `LLM_RESPONSE_CACHE_MAX_ENTRIES` tune it.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Union
+
+from loguru import logger
+from langchain_core.messages import BaseMessage
+from langchain_core.prompt_values import StringPromptValue, ChatPromptValue
+
+from .config import DATA_OUTPUT_DIR, get_llm_config_value
+from .token_budget import RESUME_DATE_LINE
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL expiry and size-bounded LRU eviction."""
+
+    FILE_NAME: Final[str] = "llm_response_cache.sqlite3"
+    DEFAULT_TTL_SECONDS: Final[int] = 7 * 24 * 3600 # One week
+    DEFAULT_MAX_ENTRIES: Final[int] = 5000
+    _SCHEMA: Final[str] = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key              TEXT PRIMARY KEY,
+            model_name       TEXT NOT NULL,
+            created_at       REAL NOT NULL,
+            last_access      REAL NOT NULL,
+            content          TEXT NOT NULL,
+            response_metadata TEXT,
+            usage_metadata   TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+    """
+
+    def __init__(self,
+                 db_path: Union[str, Path] = DATA_OUTPUT_DIR / FILE_NAME,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            db_path: Location of the SQLite cache file.
+            ttl_seconds: Entries older than this are treated as misses and deleted.
+            max_entries: Upper bound on stored entries; least recently used entries are evicted.
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+        logger.info(f"LLM response cache enabled at {self.db_path} (ttl={ttl_seconds}s, max_entries={self.max_entries}).")
+
+    @classmethod
+    def from_config(cls) -> Optional["LLMResponseCache"]:
+        """Builds the cache if enabled via `LLM_RESPONSE_CACHE`, else returns None."""
+        enabled = str(get_llm_config_value("response_cache", "false")).strip().lower() in ("1", "true", "yes", "on")
+        if not enabled: return None
+        try:
+            return cls(ttl_seconds=int(get_llm_config_value("response_cache_ttl", cls.DEFAULT_TTL_SECONDS)),
+                       max_entries=int(get_llm_config_value("response_cache_max_entries", cls.DEFAULT_MAX_ENTRIES)))
+        except Exception as e:
+            logger.error(f"Failed to initialize LLM response cache, continuing without it: {e}", exc_info=True)
+            return None
+
+    @staticmethod
+    def make_key(model_name: str, prompts: Any, temperature: Optional[float]) -> str:
+        """Returns the content address for a request."""
+        payload = json.dumps({"model": model_name, "temperature": temperature, "prompt": _normalize_prompts(prompts)},
+                             ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached parsed response (`content`, `response_metadata`, `usage_metadata`) or None."""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT created_at, content, response_metadata, usage_metadata FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None: return None
+                if now - row[0] > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            return {"content": row[1],
+                    "response_metadata": json.loads(row[2]) if row[2] else {},
+                    "usage_metadata": json.loads(row[3]) if row[3] else {},
+                    "id": f"cache_{key[:16]}"}
+        except Exception as e:
+            logger.warning(f"LLM response cache lookup failed: {e}")
+            return None
+
+    def put(self, key: str, model_name: str, parsed_response: Dict[str, Any]) -> None:
+        """Stores a parsed response and evicts least recently used entries beyond `max_entries`."""
+        content = parsed_response.get("content")
+        if not isinstance(content, str) or not content: return
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model_name, created_at, last_access, content, response_metadata, usage_metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, model_name, now, now, content,
+                     json.dumps(parsed_response.get("response_metadata") or {}, default=str),
+                     json.dumps(parsed_response.get("usage_metadata") or {}, default=str)),
+                )
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except Exception as e:
+            logger.warning(f"Failed to store LLM response in cache: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            try: self._conn.close()
+            except Exception as e: logger.warning(f"Error closing LLM response cache: {e}")
+
+
+def _normalize_prompts(prompts: Any) -> Union[str, List[Dict[str, Any]]]:
+    """Converts the accepted prompt formats into a stable JSON-serializable structure."""
+    if isinstance(prompts, str): return _without_date_line(prompts)
+    if isinstance(prompts, StringPromptValue): return _without_date_line(prompts.text)
+    if isinstance(prompts, ChatPromptValue): prompts = prompts.messages
+    if isinstance(prompts, dict): prompts = prompts.get('messages', [prompts])
+    if isinstance(prompts, list):
+        normalized = []
+        for message in prompts:
+            if isinstance(message, BaseMessage): normalized.append({"role": message.type, "content": _without_date_line(message.content)})
+            elif isinstance(message, dict): normalized.append({"role": message.get("role"), "content": _without_date_line(message.get("content"))})
+            else: normalized.append({"role": None, "content": _without_date_line(str(message))})
+        return normalized
+    return _without_date_line(str(prompts))
+
+
+def _without_date_line(content: Any) -> Any:
+    """Drops the resume's "today date:" line from text content (see module docstring)."""
+    return RESUME_DATE_LINE.sub("", content) if isinstance(content, str) else content
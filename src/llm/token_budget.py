@@ -0,0 +1,287 @@
+# src/llm/token_budget.py
+"""
+Per-task prompt token budgets with deterministic prompt compression.
+
+Tokens are counted per provider: with `tiktoken` for OpenAI models when it is
+installed, otherwise with a characters-per-token ratio for the provider. When a
+formatted prompt exceeds its task's budget, the variable context is compressed in
+stages, stopping as soon as the prompt fits:
+
+1. Whitespace in the resume and job description is collapsed.
+2. Boilerplate paragraphs (EEO and accommodation statements, privacy and agency
+   notices, LinkedIn hashtags) and repeated paragraphs are dropped from the job
+   description. A paragraph only counts as boilerplate if most of its sentences
+   are, or if it closes the description and has several boilerplate sentences, so
+   a passing mention inside the job content is kept.
+3. Only the resume sections most relevant to the question (or to the job, for
+   job-level prompts) are kept, in their original order, within the tokens left.
+   With a `ResumeSectionIndex` of the resume, its sections and bullets are used;
+   otherwise the plain text is split into sections here.
+
+Every stage is deterministic, so a compressed prompt is identical across calls and
+still hits the response cache. Question prompts carry their resume sections in the
+task message (`relevant_resume`), so compressing them leaves the cacheable prefix
+intact; compressing the resume of job-level prompts does change it, which is the
+price of fitting the budget.
+
+Configured via `LLM_TOKEN_BUDGET` (all tasks) and `LLM_TOKEN_BUDGET_<TASK>` (e.g.
+`LLM_TOKEN_BUDGET_NUMERIC_QUESTION`); 0 or unset disables the budget.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Dict, Final, Iterable, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from .config import get_llm_config_value
+from src.resume_index import ResumeSectionIndex
+
+try:
+    import tiktoken
+except ImportError: # Optional: exact counts for OpenAI models
+    tiktoken = None
+
+# Average characters per token by provider, used without an exact tokenizer
+CHARS_PER_TOKEN_BY_PROVIDER: Final[Dict[str, float]] = {
+    "openai": 4.0,
+    "claude": 3.5,
+    "gemini": 4.0,
+    "huggingface": 3.5,
+    "ollama": 3.5,
+}
+DEFAULT_CHARS_PER_TOKEN: Final[float] = 3.5 # Errs on the side of over-counting
+TOKENS_PER_MESSAGE: Final[int] = 4 # Role and delimiter overhead of a chat message
+
+SECTION_MAX_CHARS: Final[int] = 800 # Longer resume sections are split at sentence boundaries
+OMISSION_MARKER: Final[str] = "[...]"
+BOILERPLATE_SENTENCE_SHARE: Final[float] = 0.5 # Share of boilerplate sentences that makes a paragraph boilerplate
+TRAILING_BOILERPLATE_SENTENCES: Final[int] = 2 # Boilerplate sentences that make a closing paragraph boilerplate
+
+_BOILERPLATE_PATTERN: Final = re.compile("|".join([
+    r"equal (employment )?opportunit", r"\beeo\b", r"affirmative action", r"without regard to",
+    r"protected (veteran|class|characteristic)", r"reasonable accommodation", r"e-verify", r"know your rights",
+    r"privacy (notice|policy|statement)", r"data protection", r"unsolicited (resumes?|cvs?|applications?)",
+    r"(recruitment|recruiting|staffing) agenc", r"^\s*#li-", r"igualdade de oportunidades",
+]), re.IGNORECASE | re.MULTILINE)
+_SECTION_BREAK: Final = re.compile(r"\n\s*\n|\n(?=\s*(?:#{1,6}\s|-{3,}|[A-Z][A-Za-z /&]{2,40}:?\s*\n))")
+_SENTENCE_END: Final = re.compile(r"(?<=[.!?;])\s+|\s+(?=[•▪●])")
+_WORD: Final = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+RESUME_DATE_LINE: Final = re.compile(r"today date: [^\n]*\n") # Prepended to the resume by LLMProcessor
+
+
+class TokenCounter:
+    """Counts prompt tokens the way a given provider (approximately) does."""
+
+    def __init__(self, provider: str, model_name: Optional[str] = None):
+        self.provider = (provider or "").lower()
+        self.chars_per_token = CHARS_PER_TOKEN_BY_PROVIDER.get(self.provider, DEFAULT_CHARS_PER_TOKEN)
+        self._encoding = None
+        if self.provider == "openai" and tiktoken is not None:
+            try: self._encoding = tiktoken.encoding_for_model(model_name or "")
+            except KeyError: self._encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e: logger.warning(f"tiktoken unavailable for '{model_name}', estimating tokens: {e}")
+
+    def count(self, text: str) -> int:
+        if not text: return 0
+        if self._encoding is not None: return len(self._encoding.encode(text, disallowed_special=()))
+        return int(len(text) / self.chars_per_token) + 1
+
+    def count_prompt(self, prompt: Any) -> int:
+        """Tokens of a formatted prompt: a string or a list of chat messages."""
+        if isinstance(prompt, str): return self.count(prompt)
+        if isinstance(prompt, (list, tuple)):
+            return sum(self.count(str(getattr(message, "content", message))) + TOKENS_PER_MESSAGE for message in prompt)
+        return self.count(str(prompt))
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapses runs of spaces and blank lines and strips every line."""
+    lines = [re.sub(r"[ \t ]+", " ", line).strip() for line in (text or "").splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _is_boilerplate(paragraph: str, trailing: bool = False) -> bool:
+    """
+    True if at least BOILERPLATE_SENTENCE_SHARE of the paragraph's sentences (or lines) are boilerplate,
+    or, for a `trailing` paragraph, at least TRAILING_BOILERPLATE_SENTENCES of them.
+    """
+    sentences = [s for line in paragraph.splitlines() for s in _SENTENCE_END.split(line) if s.strip()]
+    matching = sum(1 for sentence in sentences if _BOILERPLATE_PATTERN.search(sentence))
+    if trailing and matching >= TRAILING_BOILERPLATE_SENTENCES: return True
+    return bool(sentences) and matching >= BOILERPLATE_SENTENCE_SHARE * len(sentences)
+
+
+@lru_cache(maxsize=32)
+def strip_boilerplate(description: str) -> str:
+    """
+    Drops boilerplate and repeated paragraphs from a job description (whitespace normalized).
+    Boilerplate paragraphs are those made up mostly of boilerplate sentences; in the closing run
+    of boilerplate paragraphs (the usual EEO/privacy section), several boilerplate sentences suffice.
+    A description without blank-line paragraphs, or one that is nothing but boilerplate, is
+    returned unchanged.
+    """
+    text = normalize_whitespace(description)
+    paragraphs = text.split("\n\n")
+    if len(paragraphs) < 2: return text
+    trailing_start = len(paragraphs)
+    while trailing_start > 1 and _is_boilerplate(paragraphs[trailing_start - 1], trailing=True): trailing_start -= 1
+    kept, seen = [], set()
+    for index, paragraph in enumerate(paragraphs):
+        key = paragraph.lower()
+        if key in seen or index >= trailing_start or _is_boilerplate(paragraph): continue
+        seen.add(key)
+        kept.append(paragraph)
+    return "\n\n".join(kept) if kept else text
+
+
+@lru_cache(maxsize=8)
+def split_sections(text: str, max_chars: int = SECTION_MAX_CHARS) -> Tuple[str, ...]:
+    """
+    Splits a resume into sections at blank lines and heading-like lines; sections longer
+    than `max_chars` (e.g. a resume extracted from HTML as one line) are split into
+    sentence chunks of up to `max_chars`.
+    """
+    sections: List[str] = []
+    for block in _SECTION_BREAK.split(normalize_whitespace(text)):
+        block = block.strip()
+        if not block: continue
+        if len(block) <= max_chars:
+            sections.append(block)
+            continue
+        chunk = ""
+        for sentence in _SENTENCE_END.split(block):
+            if chunk and len(chunk) + len(sentence) + 1 > max_chars:
+                sections.append(chunk)
+                chunk = ""
+            chunk = f"{chunk} {sentence}" if chunk else sentence
+        if chunk: sections.append(chunk)
+    return tuple(sections)
+
+
+def _terms(text: str) -> Counter:
+    return Counter(_WORD.findall((text or "").lower()))
+
+
+def select_sections(sections: Tuple[str, ...], query: str, max_tokens: int, counter: TokenCounter,
+                    keep_first: bool = True) -> str:
+    """
+    Keeps the sections most relevant to `query` that fit in `max_tokens`, in their original order,
+    marking omitted runs with OMISSION_MARKER. Relevance is the number of query term occurrences,
+    weighted by how rare each term is across the sections. The first section (the resume header)
+    is always kept when `keep_first` is set.
+    """
+    if not sections: return ""
+    query_terms = set(_terms(query))
+    section_terms = [_terms(section) for section in sections]
+    document_frequency = Counter(term for terms in section_terms for term in query_terms.intersection(terms))
+    def relevance(index: int) -> float:
+        terms = section_terms[index]
+        return sum(min(terms[t], 3) / document_frequency[t] for t in query_terms if t in terms)
+
+    chosen = {0} if keep_first else set()
+    used = counter.count(sections[0]) if keep_first else 0
+    for index in sorted(range(len(sections)), key=lambda i: (-relevance(i), i)):
+        if index in chosen: continue
+        cost = counter.count(sections[index])
+        if used + cost > max_tokens: continue # A shorter, less relevant section may still fit
+        chosen.add(index)
+        used += cost
+
+    parts, previous = [], -1
+    for index in sorted(chosen):
+        if index != previous + 1: parts.append(OMISSION_MARKER)
+        parts.append(sections[index])
+        previous = index
+    if previous != len(sections) - 1: parts.append(OMISSION_MARKER)
+    return "\n".join(parts)
+
+
+class TokenBudget:
+    """Fits formatted prompts into per-task token budgets by compressing their context."""
+
+    QUESTION_KEYS: Final[Tuple[str, ...]] = ("question", "options", "questions_json", "phrase", "keywords_str")
+    JOB_KEYS: Final[Tuple[str, ...]] = ("job_title", "job_description")
+    RESUME_KEYS: Final[Tuple[str, ...]] = ("relevant_resume", "resume") # Compressed resume variable, by preference
+
+    def __init__(self, counter: TokenCounter, budgets: Optional[Mapping[str, int]] = None,
+                 default_budget: Optional[int] = None):
+        """
+        Args:
+            counter: Token counter for the configured provider.
+            budgets: Task (prompt name) -> max prompt tokens.
+            default_budget: Budget of tasks not in `budgets`; None leaves them unbounded.
+        """
+        self.counter = counter
+        self.budgets: Dict[str, int] = dict(budgets or {})
+        self.default_budget = default_budget
+
+    @classmethod
+    def from_config(cls, provider: str, model_name: Optional[str], tasks: Iterable[str]) -> Optional["TokenBudget"]:
+        """Builds the budget from `LLM_TOKEN_BUDGET[_<TASK>]`, or returns None if no budget is set."""
+        try:
+            default_budget = int(get_llm_config_value("token_budget", 0) or 0)
+            budgets = {task: int(get_llm_config_value(f"token_budget_{task}", 0) or 0) for task in tasks}
+        except ValueError as e:
+            logger.error(f"Invalid LLM token budget configuration, token budgets disabled: {e}")
+            return None
+        budgets = {task: budget for task, budget in budgets.items() if budget > 0}
+        if default_budget <= 0 and not budgets: return None
+        logger.info(f"LLM token budgets: default {default_budget or 'unbounded'}, per task {budgets or 'none'}.")
+        return cls(TokenCounter(provider, model_name), budgets, default_budget if default_budget > 0 else None)
+
+    def budget_for(self, task: str) -> Optional[int]:
+        return self.budgets.get(task, self.default_budget)
+
+    def _query(self, context: Mapping[str, Any]) -> str:
+        """Text the resume sections are ranked against: the question if there is one, else the job."""
+        question = " ".join(str(context[key]) for key in self.QUESTION_KEYS if context.get(key))
+        return question or " ".join(str(context[key]) for key in self.JOB_KEYS if context.get(key))
+
+    def fit(self, task: str, context: Dict[str, Any], render: Callable[[Mapping[str, Any]], Any],
+            resume_index: Optional[ResumeSectionIndex] = None) -> Any:
+        """
+        Renders the prompt for `task` with `context`, compressing the resume and job description
+        (see module docstring) until it fits the task's budget. Returns the rendered prompt, which
+        may still exceed the budget if the fixed template text alone does. `resume_index` is the
+        section index of the resume in `context`, if there is one.
+        """
+        prompt = render(context)
+        budget = self.budget_for(task)
+        if budget is None: return prompt
+        tokens = self.counter.count_prompt(prompt)
+        if tokens <= budget: return prompt
+        original_tokens = tokens
+
+        context = dict(context)
+        stages = (
+            ("whitespace", lambda c: {k: normalize_whitespace(c[k]) for k in self.RESUME_KEYS + ("job_description",) if c.get(k)}),
+            ("boilerplate", lambda c: {"job_description": strip_boilerplate(c["job_description"])} if c.get("job_description") else {}),
+            ("resume sections", lambda c: self._select_resume(c, tokens, budget, resume_index)),
+        )
+        for stage, compress in stages:
+            changes = compress(context)
+            if not changes or all(context[k] == v for k, v in changes.items()): continue
+            context.update(changes)
+            prompt = render(context)
+            tokens = self.counter.count_prompt(prompt)
+            logger.debug(f"Prompt '{task}' after {stage} compression: {tokens} tokens (budget {budget}).")
+            if tokens <= budget: break
+
+        log = logger.debug if tokens <= budget else logger.warning
+        log(f"Prompt '{task}' compressed from {original_tokens} to {tokens} tokens (budget {budget}).")
+        return prompt
+
+    def _select_resume(self, context: Dict[str, Any], tokens: int, budget: int,
+                       resume_index: Optional[ResumeSectionIndex] = None) -> Dict[str, str]:
+        key = next((key for key in self.RESUME_KEYS if context.get(key)), None)
+        if key is None: return {}
+        resume = context[key]
+        available = max(budget - (tokens - self.counter.count(resume)), 0)
+        if resume_index is None:
+            return {key: select_sections(split_sections(resume), self._query(context), available, self.counter)}
+        date_line = RESUME_DATE_LINE.match(resume)
+        date_line = date_line.group(0) if date_line else ""
+        selected = resume_index.select_within(self._query(context), available - self.counter.count(date_line), self.counter.count)
+        return {key: date_line + selected}
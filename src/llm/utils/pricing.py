@@ -14,7 +14,7 @@ Note: Prices are subject to change by the providers. Last check suggested around
 All prices are in USD per 1,000,000 tokens unless otherwise specified.
 """
 
-from typing import Dict, Final
+from typing import Dict, Final, Tuple
 from loguru import logger
 
 # --- Constants for Default Pricing ---
@@ -22,6 +22,22 @@ from loguru import logger
 DEFAULT_INPUT_TOKEN_PRICE: Final[float] = 0.15 / 1_000_000  # $0.15 per 1M input tokens
 DEFAULT_OUTPUT_TOKEN_PRICE: Final[float] = 0.60 / 1_000_000 # $0.60 per 1M output tokens
 
+# --- Prompt Caching Multipliers ---
+# Provider prefix caching bills cache reads (and, for Anthropic, cache writes) at a multiple of the
+# base input price. Keyed by model-name prefix; the longest matching prefix wins. Entries in
+# MODEL_PRICING may override with explicit "cached_input_token_price" / "cache_write_input_token_price".
+# Structure: { "model_prefix": (cache_read_multiplier, cache_write_multiplier) }
+CACHE_PRICE_MULTIPLIERS: Final[Dict[str, Tuple[float, float]]] = {
+    "claude": (0.10, 1.25),   # Anthropic: reads at 10%, 5-minute cache writes at 125%
+    "gemini": (0.25, 1.00),   # Google: implicit cache hits at 25%
+    "gpt-4.1": (0.25, 1.00),  # OpenAI: automatic prefix caching, 75% discount
+    "o3": (0.25, 1.00),
+    "o4": (0.25, 1.00),
+    "gpt-4o": (0.50, 1.00),   # OpenAI: automatic prefix caching, 50% discount
+    "o1": (0.50, 1.00),
+}
+DEFAULT_CACHE_PRICE_MULTIPLIERS: Final[Tuple[float, float]] = (0.50, 1.00)
+
 # --- Model Pricing Dictionary ---
 # Keys should be the exact model names used in API calls or configuration.
 # Structure: { "model_name": {"input_token_price": float, "output_token_price": float} }
@@ -167,7 +183,7 @@ MODEL_PRICING: Final[Dict[str, Dict[str, float]]] = {
 
 def get_model_pricing(model_name: str) -> Dict[str, float]:
     """
-    Retrieves the input and output token pricing for a given model name.
+    Retrieves the token pricing for a given model name.
 
     Performs case-insensitive matching and checks if the provided name starts
     with a known base model name. Falls back to default prices if no match is found.
@@ -176,8 +192,27 @@ def get_model_pricing(model_name: str) -> Dict[str, float]:
         model_name (str): The name of the LLM (e.g., "gpt-4o", "claude-3-5-sonnet-20240620").
 
     Returns:
-        Dict[str, float]: A dictionary containing 'input_token_price' and 'output_token_price'.
+        Dict[str, float]: A dictionary containing 'input_token_price', 'output_token_price',
+                          'cached_input_token_price' (prefix cache reads) and
+                          'cache_write_input_token_price' (prefix cache writes).
     """
+    prices = dict(_lookup_base_pricing(model_name))
+    read_multiplier, write_multiplier = _cache_price_multipliers(model_name)
+    prices.setdefault("cached_input_token_price", prices["input_token_price"] * read_multiplier)
+    prices.setdefault("cache_write_input_token_price", prices["input_token_price"] * write_multiplier)
+    return prices
+
+
+def _cache_price_multipliers(model_name: str) -> Tuple[float, float]:
+    """Returns the (cache read, cache write) multipliers of the base input price for a model."""
+    name = (model_name or "").lower()
+    for prefix in sorted(CACHE_PRICE_MULTIPLIERS, key=len, reverse=True):
+        if name.startswith(prefix): return CACHE_PRICE_MULTIPLIERS[prefix]
+    return DEFAULT_CACHE_PRICE_MULTIPLIERS
+
+
+def _lookup_base_pricing(model_name: str) -> Dict[str, float]:
+    """Returns the base input/output pricing entry for a model name (see `get_model_pricing`)."""
     if not model_name or not isinstance(model_name, str):
         logger.warning("Invalid model name provided for pricing lookup. Using default pricing.")
         return {
@@ -0,0 +1,190 @@
+# src/resume_index.py
+"""
+Section/bullet index of the HTML resume for retrieving the parts relevant to a question.
+
+At load time the resume is split into chunks along its HTML structure: headings
+start sections, list items become bullets, and the text lines preceding a list
+(e.g. "Senior Engineer | Acme | 2019 - 2023") become the entry header of the
+bullets below it. Chunks are indexed with BM25 over their own text plus their
+section and entry header, so a bullet mentioning Kubernetes is found together
+with the dates of the job it belongs to.
+
+The resume header (name, title, contact) and the private context
+are always included in the retrieved text, which keeps the resume's structure:
+
+    ## Experience
+    Senior Engineer | Acme | 2019 - 2023
+    - Ran Kubernetes clusters for 40 services
+"""
+
+import html
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Final, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from .job_ranker import tokenize
+
+_BLOCK_TAG: Final = re.compile(r"</?(?:p|div|section|article|header|footer|ul|ol|table|tr|td|th|dl|dt|dd|br|hr)\b[^>]*>", re.IGNORECASE)
+_HEADING_OPEN: Final = re.compile(r"<h([1-6])\b[^>]*>", re.IGNORECASE)
+_HEADING_CLOSE: Final = re.compile(r"</h[1-6]\s*>", re.IGNORECASE)
+_ITEM_OPEN: Final = re.compile(r"<li\b[^>]*>", re.IGNORECASE)
+_HEADING_MARK: Final[str] = "\x01"
+_ITEM_MARK: Final[str] = "\x02"
+
+
+@dataclass(frozen=True)
+class ResumeChunk:
+    """One retrievable piece of the resume."""
+    text: str
+    section: Optional[str] = None # Heading the chunk is under (None before the first heading)
+    entry: Optional[str] = None # Entry header of a bullet (e.g. role, company and dates)
+    is_bullet: bool = False
+    always: bool = False # Included in every retrieval (resume header, private context)
+
+
+def _html_lines(html_content: str) -> List[str]:
+    """Body text as lines, with headings (_HEADING_MARK + level) and list items (_ITEM_MARK) marked."""
+    body_match = re.search(r"<body[^>]*>(.*?)</body>", html_content, re.DOTALL | re.IGNORECASE)
+    body = body_match.group(1) if body_match else html_content
+    body = re.sub(r"<(style|script)[^>]*>.*?</\1>", "", body, flags=re.DOTALL | re.IGNORECASE)
+    body = _HEADING_OPEN.sub(lambda m: f"\n{_HEADING_MARK}{m.group(1)}", body) # Mark followed by the level
+    body = _HEADING_CLOSE.sub("\n", body)
+    body = _ITEM_OPEN.sub(f"\n{_ITEM_MARK}", body)
+    body = _BLOCK_TAG.sub("\n", body)
+    body = html.unescape(re.sub(r"<[^>]+>", " ", body))
+    lines = (re.sub(r"\s+", " ", line).strip() for line in body.split("\n"))
+    return [line for line in lines if re.sub(f"^{_HEADING_MARK}[1-6]|^{_ITEM_MARK}", "", line).strip()]
+
+
+def split_html_resume(html_content: str) -> List[ResumeChunk]:
+    """
+    Splits an HTML resume into header, section text, entry header and bullet chunks.
+    The header is the text before the first heading, or under it if it is an <h1> (the name).
+    """
+    chunks: List[ResumeChunk] = []
+    section: Optional[str] = None
+    in_header = True
+    entry: Optional[str] = None
+    pending: List[str] = [] # Plain lines not yet emitted
+    after_bullet = False
+
+    def flush() -> Optional[str]:
+        if not pending: return None
+        text = " | ".join(pending)
+        chunks.append(ResumeChunk(text=text, section=section, always=in_header))
+        pending.clear()
+        return text
+
+    for line in _html_lines(html_content):
+        if line.startswith(_HEADING_MARK):
+            flush()
+            level, title = line[1:2], line[2:].strip()
+            in_header = in_header and section is None and level == "1"
+            section, entry, after_bullet = title, None, False
+        elif line.startswith(_ITEM_MARK):
+            entry = flush() or entry # Lines right above a list head its bullets
+            chunks.append(ResumeChunk(text=line.strip(f" {_ITEM_MARK}"), section=section, entry=entry,
+                                      is_bullet=True, always=in_header))
+            after_bullet = True
+        else:
+            if after_bullet: entry, after_bullet = None, False # A new entry starts after a list
+            pending.append(line)
+    flush()
+    return chunks
+
+
+class ResumeSectionIndex:
+    """BM25 index over resume chunks, returning the relevant chunks as structured text."""
+
+    K1: Final[float] = 1.2
+    B: Final[float] = 0.75
+    DEFAULT_TOP_K: Final[int] = 8
+
+    def __init__(self, chunks: List[ResumeChunk]):
+        self.chunks = chunks
+        self._terms: List[Counter] = [Counter(tokenize(" ".join(filter(None, (c.section, c.entry, c.text))))) for c in chunks]
+        self._lengths = [sum(terms.values()) for terms in self._terms]
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        document_frequency = Counter(term for terms in self._terms for term in terms)
+        n = len(chunks)
+        self._idf: Dict[str, float] = {t: math.log1p((n - df + 0.5) / (df + 0.5)) for t, df in document_frequency.items()}
+
+    @classmethod
+    def from_html(cls, html_content: str, private_context: str = "") -> Optional["ResumeSectionIndex"]:
+        """
+        Builds the index of an HTML resume, with the private context as an always-included section.
+        Returns None if the resume has too little structure (no headings or bullets) to index.
+        """
+        chunks = split_html_resume(html_content)
+        if not any(c.section for c in chunks) or sum(not c.always for c in chunks) < 3:
+            logger.warning("Resume HTML has too little structure for a section index; prompts will use the full resume.")
+            return None
+        if private_context:
+            chunks.append(ResumeChunk(text=private_context, section="Informações adicionais", always=True))
+        return cls(chunks)
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> List[Tuple[int, float]]:
+        """Returns up to `top_k` (chunk index, score) pairs matching `query`, best first."""
+        query_terms = set(tokenize(query))
+        scores = []
+        for index, terms in enumerate(self._terms):
+            if self.chunks[index].always: continue
+            score = 0.0
+            for term in query_terms.intersection(terms):
+                tf = terms[term]
+                norm = self.K1 * (1 - self.B + self.B * self._lengths[index] / (self._average_length or 1.0))
+                score += self._idf[term] * tf * (self.K1 + 1) / (tf + norm)
+            if score > 0: scores.append((index, score))
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores[:top_k]
+
+    def relevant_text(self, query: str, top_k: int = DEFAULT_TOP_K) -> Optional[str]:
+        """
+        The always-included chunks plus the `top_k` chunks most relevant to `query` (and the entry
+        headers of selected bullets), rendered in resume order. None if nothing matches the query.
+        """
+        hits = self.search(query, top_k)
+        if not hits: return None
+        selected = {index for index, _ in hits} | {i for i, c in enumerate(self.chunks) if c.always}
+        entries = {self.chunks[index].entry for index in selected if self.chunks[index].is_bullet}
+        selected |= {i for i, c in enumerate(self.chunks) if not c.is_bullet and c.text in entries}
+        return self.render(sorted(selected))
+
+    def select_within(self, query: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+        """
+        The always-included chunks plus as many other chunks as fit in `max_tokens`, taken by
+        relevance to `query` and then in resume order (bullets with their entry header), rendered
+        in resume order. Used to fit a prompt's token budget.
+        """
+        selected: Set[int] = {i for i, c in enumerate(self.chunks) if c.always}
+        headers = {c.text: i for i, c in enumerate(self.chunks) if not c.is_bullet}
+        ranked = [index for index, _ in self.search(query, len(self.chunks))]
+        ranked += [i for i in range(len(self.chunks)) if i not in set(ranked)]
+        for index in ranked:
+            if index in selected: continue
+            candidate = selected | {index}
+            chunk = self.chunks[index]
+            if chunk.is_bullet and chunk.entry in headers: candidate.add(headers[chunk.entry])
+            if count_tokens(self.render(sorted(candidate))) <= max_tokens: selected = candidate # Else a shorter one may fit
+        return self.render(sorted(selected))
+
+    def render(self, indices: List[int]) -> str:
+        lines: List[str] = []
+        section, entry = None, None
+        for index in indices:
+            chunk = self.chunks[index]
+            if chunk.section != section:
+                section, entry = chunk.section, None
+                if section: lines.append(f"## {section}")
+            if chunk.is_bullet:
+                if chunk.entry and chunk.entry != entry: lines.append(chunk.entry)
+                entry = chunk.entry
+                lines.append(f"- {chunk.text}")
+            elif chunk.text != entry:
+                lines.append(chunk.text)
+                entry = chunk.text
+        return "\n".join(lines)
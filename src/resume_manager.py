@@ -5,6 +5,8 @@ from loguru import logger
 from typing import Optional, Tuple
 import yaml
 
+from .resume_index import ResumeSectionIndex
+
 
 class ResumeNotFoundError(FileNotFoundError):
     """Custom exception raised when the resume file is not found."""
@@ -19,6 +21,8 @@ class ResumeManager:
         resume_path (Optional[Path]): Path to the user-provided resume file.
         default_html_resume (Path): Path to the default HTML resume file.
         resume_content (Optional[Path]): Path to the loaded resume file.
+        section_index (Optional[ResumeSectionIndex]): Section/bullet index of the resume, used to send
+                                                      only the relevant parts with short questions.
     """
 
     def __init__(self, default_html_resume: Path,
@@ -35,6 +39,7 @@ class ResumeManager:
         self.html_resume_path = default_html_resume
         self.resume_content: Optional[Path] = None
         self.plain_text_content: Optional[str] = None
+        self.section_index: Optional[ResumeSectionIndex] = None
         self.private_context: dict = {}
         self._load_private_context(private_context_path)
         self.load_resume()
@@ -85,7 +90,7 @@ class ResumeManager:
     
     def load_resume(self):
         """
-        Loads the HTML resume file and extracts its plain text content.
+        Loads the HTML resume file, extracts its plain text content and indexes its sections.
 
         Raises:
             ResumeNotFoundError: If the HTML resume file does not exist.
@@ -103,6 +108,12 @@ class ResumeManager:
             except Exception as e:
                 logger.error(f"Error extracting text from HTML resume: {e}")
                 raise ResumeNotFoundError(f"Failed to extract text from HTML resume: {e}")
+            try:
+                self.section_index = ResumeSectionIndex.from_html(html_content, self._format_private_context())
+                if self.section_index: logger.info(f"Indexed {len(self.section_index.chunks)} resume sections/bullets.")
+            except Exception as e:
+                logger.warning(f"Failed to index resume sections, prompts will use the full resume: {e}")
+                self.section_index = None
                 
             logger.info(f"Successfully loaded HTML resume from: {self.resume_content}")
         else:
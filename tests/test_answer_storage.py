@@ -0,0 +1,51 @@
+# tests/test_answer_storage.py
+"""JSONL answer bank: legacy import, deduplication and reloading."""
+
+import json
+
+from src.easy_apply.answer_storage import AnswerStorage
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def test_imports_legacy_json_once_without_duplicates(tmp_path):
+    legacy = [
+        {"type": "text", "question": "Years of Python experience?", "answer": "7"},
+        {"type": "text", "question": "  years of python EXPERIENCE?  ", "answer": "8"}, # Same question after sanitizing
+        {"type": "radio", "question": "Years of Python experience?", "answer": "Yes"},
+        {"type": "text", "question": "", "answer": "dropped"},
+        {"question": "missing type", "answer": "dropped"},
+    ]
+    (tmp_path / "answers.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    storage = AnswerStorage(tmp_path)
+    assert [(item["type"], item["answer"]) for item in _lines(tmp_path / "answers.jsonl")] == [("text", "7"), ("radio", "Yes")]
+    assert storage.get_stored_answer("Years of Python experience?", "text") == "7"
+    assert (tmp_path / "answers.json").exists() # Left in place
+
+    (tmp_path / "answers.json").write_text(json.dumps([{"type": "text", "question": "New?", "answer": "x"}]), encoding="utf-8")
+    assert AnswerStorage(tmp_path).get_stored_answer("New?", "text") is None # Not imported again
+
+
+def test_save_question_appends_once_per_question_and_type(tmp_path):
+    storage = AnswerStorage(tmp_path)
+    storage.save_question({"type": "text", "question": "Notice period?", "answer": "30 days"})
+    storage.save_question({"type": "text", "question": "NOTICE period?\n", "answer": "60 days"})
+    storage.save_question({"type": "dropdown", "question": "Notice period?", "answer": "1 month"})
+    storage.save_question({"type": "text", "question": "incomplete"})
+
+    assert len(_lines(tmp_path / "answers.jsonl")) == 2
+    assert storage.get_existing_answer("notice period?", "text") == "30 days"
+    assert AnswerStorage(tmp_path).get_stored_answer("Notice period?", "dropdown") == "1 month"
+
+
+def test_load_skips_torn_lines_and_terminates_them(tmp_path):
+    answers = tmp_path / "answers.jsonl"
+    answers.write_text(json.dumps({"type": "text", "question": "city?", "answer": "Lisbon"}) + "\n" + '{"type": "text", "quest',
+                       encoding="utf-8")
+    storage = AnswerStorage(tmp_path)
+    assert storage.get_stored_answer("City?", "text") == "Lisbon"
+    storage.save_question({"type": "text", "question": "Country?", "answer": "Portugal"})
+    assert AnswerStorage(tmp_path).get_stored_answer("country?", "text") == "Portugal"
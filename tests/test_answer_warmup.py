@@ -0,0 +1,51 @@
+# tests/test_answer_warmup.py
+"""LLM warm-up of the answer bank: rejected answers are recorded once and never served."""
+
+import json
+
+from src.easy_apply.answer_storage import AnswerStorage
+from src.easy_apply.answer_warmup import LLM_WARMUP_QUESTIONS, LLM_WARMUP_REJECTED_SOURCE, warm_up_answer_bank
+
+ANSWERS = {
+    "How many years of work experience do you have?": "About 7 years",
+    "What is your level of proficiency in English?": "Fluent", # Not one of the options
+    "What is the highest level of education you have completed?": "master's degree",
+    "Have you completed the following level of education: Bachelor's Degree?": "Yes",
+    "Are you currently employed?": None,
+    "How did you hear about this job?": "LinkedIn",
+}
+
+
+class FakeProcessor:
+    def __init__(self):
+        self.asked = []
+
+    def answer_general_questions(self, questions):
+        self.asked.append([q["question"] for q in questions])
+        return [ANSWERS[q["question"]] for q in questions]
+
+
+def test_rejected_answers_are_recorded_and_not_asked_again(tmp_path):
+    processor = FakeProcessor()
+    assert warm_up_answer_bank(AnswerStorage(tmp_path), llm_processor=processor) == (0, 6)
+    assert processor.asked == [[question for question, _, _ in LLM_WARMUP_QUESTIONS]]
+
+    storage = AnswerStorage(tmp_path)
+    assert storage.get_stored_answer("How many years of work experience do you have?", "numeric") == "7"
+    assert storage.get_stored_answer("What is the highest level of education you have completed?", "dropdown") == "Master's Degree"
+    for question, field_type in (("What is your level of proficiency in English?", "radio"), ("Are you currently employed?", "dropdown")):
+        assert storage.was_rejected(question, field_type)
+        assert storage.get_stored_answer(question, field_type) is None
+        assert storage.get_existing_answer(question, field_type) is None
+    lines = (tmp_path / "answers.jsonl").read_text(encoding="utf-8").splitlines()
+    assert sum(json.loads(line).get("source") == LLM_WARMUP_REJECTED_SOURCE for line in lines) == 4
+
+    assert warm_up_answer_bank(storage, llm_processor=processor) == (0, 0)
+    assert len(processor.asked) == 1 # Nothing re-sent
+
+
+def test_real_answer_can_still_be_saved_after_a_rejection(tmp_path):
+    warm_up_answer_bank(AnswerStorage(tmp_path), llm_processor=FakeProcessor())
+    storage = AnswerStorage(tmp_path)
+    storage.save_question({"type": "radio", "question": "Are you currently employed?", "answer": "Yes"})
+    assert AnswerStorage(tmp_path).get_existing_answer("Are you currently employed?", "radio") == "Yes"
@@ -0,0 +1,44 @@
+# tests/test_file_uploader.py
+"""FileUploader: an open LLM circuit stops the application instead of uploading fallback documents."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.easy_apply.file_uploader import FileUploader
+from src.job import Job
+from src.llm.exceptions import CircuitOpenError
+
+
+def _uploader() -> FileUploader:
+    uploader = FileUploader.__new__(FileUploader) # Skips the WebDriver and template checks
+    uploader.driver = MagicMock()
+    uploader.default_resume_path = None
+    uploader.user_resume_html_template = "<body>{summary}</body>"
+    uploader.llm_processor = MagicMock()
+    uploader.llm_processor.extract_keywords_from_job_description.side_effect = CircuitOpenError("circuit open")
+    return uploader
+
+
+JOB = Job(title="Engineer", company="Acme", location="Remote", link="https://www.linkedin.com/jobs/view/1/", description="Python")
+
+
+@pytest.mark.parametrize("upload", [
+    lambda uploader, file_input: uploader._handle_resume_upload(file_input, JOB),
+    lambda uploader, file_input: uploader._handle_cover_letter_upload(file_input, JOB),
+])
+def test_open_circuit_propagates_out_of_document_generation(upload):
+    uploader, file_input = _uploader(), MagicMock()
+    with pytest.raises(CircuitOpenError):
+        upload(uploader, file_input)
+    file_input.send_keys.assert_not_called()
+
+
+def test_open_circuit_propagates_out_of_upload_field_handling():
+    uploader = _uploader()
+    uploader.llm_processor.check_resume_or_cover.side_effect = CircuitOpenError("circuit open")
+    uploader._get_field_label = lambda file_input: "Attach file"
+    section = MagicMock()
+    section.find_elements.return_value = [MagicMock()]
+    with pytest.raises(CircuitOpenError):
+        uploader.handle_upload_fields(section, JOB)
@@ -0,0 +1,101 @@
+# tests/test_hedged_model.py
+"""HedgedModel over RoutingModel: calls are priced under the routed model that served them."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.llm.interaction_logger import LoggingModelWrapper
+from src.llm.metrics import task_scope
+from src.llm.models.base_model import AIModel
+from src.llm.models.hedged_model import HedgedModel
+from src.llm.models.router_model import RoutingModel
+
+
+class FakeModel(AIModel):
+    """Answers with its own name after `delay` seconds, or raises if `fails`."""
+
+    def __init__(self, name: str, delay: float = 0.0, fails: bool = False):
+        self.delay = delay
+        self.fails = fails
+        super().__init__(model_name=name)
+
+    def _initialize_model(self):
+        return object()
+
+    def invoke(self, prompt):
+        time.sleep(self.delay)
+        if self.fails: raise RuntimeError(f"{self.model_name} is down")
+        return self.model_name
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        if self.fails: raise RuntimeError(f"{self.model_name} is down")
+        return self.model_name
+
+
+def hedged_router(first: FakeModel, second: FakeModel, secondary: FakeModel, delay: float = 5.0) -> HedgedModel:
+    router = RoutingModel({"first": first, "second": second})
+    return HedgedModel(router, secondary, tasks=None, default_delay_seconds=delay, min_delay_seconds=0.0)
+
+
+def test_failover_inside_hedge_is_priced_under_serving_model():
+    model = hedged_router(FakeModel("first", fails=True), FakeModel("second"), FakeModel("secondary"))
+    with task_scope("numeric_question"):
+        assert model.invoke("prompt") == "second"
+        assert model.get_pricing_model_name() == "second"
+
+
+def test_winning_hedge_is_priced_under_secondary():
+    model = hedged_router(FakeModel("first", delay=0.5), FakeModel("second"), FakeModel("secondary"), delay=0.01)
+    with task_scope("numeric_question"):
+        assert model.invoke("prompt") == "secondary"
+        assert model.get_pricing_model_name() == "secondary"
+
+
+def test_unhedged_task_keeps_router_attribution():
+    router = RoutingModel({"first": FakeModel("first", fails=True), "second": FakeModel("second")})
+    model = HedgedModel(router, FakeModel("secondary"), tasks=["options"])
+    with task_scope("cover_letter"):
+        assert model.invoke("prompt") == "second"
+        assert model.get_pricing_model_name() == "second"
+
+
+@pytest.mark.parametrize("first_delay, hedge_delay, expected", [(0.0, 5.0, "second"), (0.5, 0.01, "secondary")])
+def test_async_hedge_over_router_pricing(first_delay, hedge_delay, expected):
+    first = FakeModel("first", delay=first_delay, fails=first_delay == 0.0)
+    second = FakeModel("second", delay=first_delay)
+    model = hedged_router(first, second, FakeModel("secondary"), delay=hedge_delay)
+
+    async def call():
+        with task_scope("numeric_question"):
+            return await model.ainvoke("prompt"), model.get_pricing_model_name()
+
+    assert asyncio.run(call()) == (expected, expected)
+
+
+def test_losing_sync_hedge_is_handed_over_once_it_finishes(tmp_path):
+    model = HedgedModel(FakeModel("primary", delay=0.3), FakeModel("secondary"), tasks=None,
+                        default_delay_seconds=0.01, min_delay_seconds=0.0)
+    LoggingModelWrapper(model, log_file_path=str(tmp_path / "llm.jsonl"))
+    assert model.discarded_response_handler is not None # Installed by the wrapper
+    discarded = []
+    model.discarded_response_handler = lambda response, prompt, name, task, start, end: discarded.append((response, name, task))
+
+    with task_scope("numeric_question"):
+        assert model.invoke("prompt") == "secondary"
+    assert discarded == []
+    time.sleep(0.5)
+    assert discarded == [("primary", "primary", "numeric_question")]
+
+
+def test_failed_loser_is_not_handed_over():
+    model = HedgedModel(FakeModel("primary", delay=0.2, fails=True), FakeModel("secondary"), tasks=None,
+                        default_delay_seconds=0.01, min_delay_seconds=0.0)
+    discarded = []
+    model.discarded_response_handler = lambda *args: discarded.append(args)
+    with task_scope("options"):
+        assert model.invoke("prompt") == "secondary"
+    time.sleep(0.4)
+    assert discarded == []
@@ -0,0 +1,38 @@
+# tests/test_interaction_log_writer.py
+"""Background interaction log writer: flushing, a dead writer thread and rotation settings."""
+
+import json
+import time
+
+from src.llm import interaction_log_writer
+from src.llm.interaction_log_writer import InteractionLogWriter, get_interaction_log_writer
+
+
+def test_flush_writes_queued_entries(tmp_path):
+    writer = InteractionLogWriter(tmp_path / "log.jsonl")
+    writer.submit(lambda: {"model": "m", "prompts": {"prompt_1": "short"}})
+    assert writer.flush(timeout=5)
+    assert json.loads((tmp_path / "log.jsonl").read_text())["model"] == "m"
+    writer.close()
+
+
+def test_flush_returns_when_writer_thread_died(tmp_path, monkeypatch):
+    def fail_open(self): raise OSError("disk gone")
+    monkeypatch.setattr(InteractionLogWriter, "_open_files", fail_open)
+    writer = InteractionLogWriter(tmp_path / "log.jsonl")
+    writer._thread.join(timeout=5)
+    writer._queue.put(lambda: {"model": "m"}) # Queued before the writer noticed, never consumed
+    started = time.monotonic()
+    assert writer.flush(timeout=30) is False
+    assert time.monotonic() - started < 5
+    writer.submit(lambda: {"model": "m"}) # Dropped, not queued
+    assert writer._queue.qsize() == 1
+
+
+def test_invalid_max_bytes_falls_back_to_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_LOG_MAX_BYTES", "20MB")
+    monkeypatch.setattr(interaction_log_writer, "_writers", {})
+    writer = get_interaction_log_writer(tmp_path / "log.jsonl")
+    assert writer.max_bytes == InteractionLogWriter.DEFAULT_MAX_BYTES
+    assert get_interaction_log_writer(tmp_path / "log.jsonl") is writer
+    writer.close()
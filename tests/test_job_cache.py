@@ -0,0 +1,121 @@
+# tests/test_job_cache.py
+"""JobCache persistence through its backends: round trips, migrations and use after close()."""
+
+import json
+import sqlite3
+
+import pytest
+from loguru import logger
+
+from src.job import Job, JobCache, JobStatus
+from src.job_cache_backends import JournalBackend, SqliteBackend
+
+
+def _job(job_id: int) -> Job:
+    return Job(title="Engineer", company="Acme", location="Remote", link=f"https://www.linkedin.com/jobs/view/{job_id}/")
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "journal"])
+@pytest.mark.parametrize("write_behind", [True, False])
+def test_cache_is_usable_after_close(tmp_path, backend, write_behind):
+    cache = JobCache(tmp_path, backend=backend, write_behind=write_behind)
+    cache.record_job_status(_job(1), JobStatus.SEEN)
+    cache.close()
+
+    assert cache.has_been_seen(_job(1).link)
+    assert cache.lookup_statuses([_job(1)], [JobStatus.SEEN]) == {1: {JobStatus.SEEN}}
+    cache.record_job_status(_job(2), JobStatus.SUCCESS)
+    cache.record_job_statuses([(_job(3), JobStatus.SKIPPED_LOW_SCORE)])
+    cache.close()
+    cache.close() # Idempotent
+
+    reloaded = JobCache(tmp_path, backend=backend, write_behind=False)
+    assert reloaded.has_been_seen(_job(1))
+    assert reloaded.is_applied_successfully(_job(2))
+    assert reloaded.is_skipped_low_score(_job(3))
+    reloaded.close()
+
+
+def test_query_history_after_close(tmp_path):
+    cache = JobCache(tmp_path)
+    cache.record_job_status(_job(1), JobStatus.SEEN)
+    cache.close()
+    assert [row["job_id"] for row in cache.query_history(JobStatus.SEEN)] == [1]
+    cache.close()
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "journal", "json"])
+def test_round_trip_dedupes_url_variants(tmp_path, backend):
+    cache = JobCache(tmp_path, backend=backend)
+    cache.record_job_statuses([(_job(1), JobStatus.SEEN), (_job(2), JobStatus.SKIPPED_BLACKLIST)])
+    cache.close()
+
+    reloaded = JobCache(tmp_path, backend=backend, write_behind=False)
+    assert reloaded.has_been_seen("https://www.linkedin.com/jobs/search/?currentJobId=1&keywords=python")
+    assert reloaded.is_skipped_blacklist("https://www.linkedin.com/jobs/view/engineer-at-acme-2/?trk=abc")
+    assert not reloaded.has_been_seen(_job(2))
+    reloaded.close()
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "journal"])
+def test_legacy_json_lists_are_migrated_once(tmp_path, backend):
+    (tmp_path / "seen.json").write_text(json.dumps([{"link": _job(1).link}, {"link": "https://example.com/job"}]), encoding="utf-8")
+    (tmp_path / "success.json").write_text(json.dumps([{"link": _job(2).link, "title": "Engineer"}]), encoding="utf-8")
+
+    messages = []
+    sink = logger.add(messages.append, level="INFO", format="{message}")
+    try: cache = JobCache(tmp_path, backend=backend, write_behind=False)
+    finally: logger.remove(sink)
+    assert cache.has_been_seen(_job(1)) and cache.has_been_seen("https://example.com/job")
+    assert cache.is_applied_successfully(_job(2))
+    cache.close()
+    assert not (tmp_path / "seen.json").exists() and (tmp_path / "seen.json.migrated").exists()
+    assert any("seen.json.migrated" in message for message in messages) # Users can see where their cache went
+
+    reloaded = JobCache(tmp_path, backend=backend, write_behind=False)
+    assert reloaded.is_applied_successfully(_job(2))
+    reloaded.close()
+    if backend == "sqlite": # Imported exactly once
+        backend = SqliteBackend(tmp_path)
+        assert len(backend.query_history(status="success")) == 1
+        backend.close()
+
+
+def test_sqlite_imports_the_journal(tmp_path):
+    journal = JobCache(tmp_path, backend="journal", write_behind=False)
+    journal.record_job_status(_job(1), JobStatus.JOB_SCORE)
+    journal.close()
+
+    cache = JobCache(tmp_path)
+    assert cache.has_been_scored(_job(1))
+    assert (tmp_path / (JournalBackend.JOURNAL_FILE_NAME + ".migrated")).exists()
+    cache.close()
+
+
+def test_sqlite_schema_migration_backfills_job_ids(tmp_path):
+    with sqlite3.connect(tmp_path / SqliteBackend.DB_FILE_NAME) as conn: # Version 0 schema, without job_id
+        conn.executescript(SqliteBackend._SCHEMA)
+        conn.execute("INSERT INTO job_status (link, status, recorded_at) VALUES (?, 'seen', '2025-01-01 00:00:00')",
+                     ("https://www.linkedin.com/jobs/view/some-title-42/?trk=x",))
+    conn.close()
+
+    cache = JobCache(tmp_path, write_behind=False)
+    assert cache.has_been_seen(_job(42))
+    assert [row["job_id"] for row in cache.query_history(JobStatus.SEEN)] == [42]
+    cache.close()
+    with sqlite3.connect(tmp_path / SqliteBackend.DB_FILE_NAME) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(SqliteBackend._MIGRATIONS)
+    conn.close()
+
+
+def test_sqlite_skips_legacy_files_imported_by_a_concurrent_run(tmp_path):
+    seen = tmp_path / "seen.json"
+    seen.write_text(json.dumps([{"link": _job(1).link}]), encoding="utf-8")
+    SqliteBackend(tmp_path, {"seen": "seen.json"}).close()
+    # A second run that took the write lock after the first committed but before it renamed the file
+    (tmp_path / "seen.json.migrated").replace(seen) # Keeps size and mtime
+
+    backend = SqliteBackend(tmp_path, {"seen": "seen.json"})
+    assert len(backend.query_history(status="seen")) == 1
+    assert not seen.exists()
+    backend.close()
@@ -0,0 +1,55 @@
+# tests/test_job_evaluation_store.py
+"""JobEvaluationStore: evaluations reused across runs, keyed by job, resume and prompt version."""
+
+from src.job import Job
+from src.job_evaluation_store import JobEvaluation, JobEvaluationStore
+
+RESUME, PROMPTS = "resume-hash", "prompts-v1"
+
+
+def _job(job_id: int, description: str = "Build payment APIs in Python.") -> Job:
+    return Job(title="Engineer", company="Acme", location="Remote",
+               link=f"https://www.linkedin.com/jobs/view/{job_id}/", description=description)
+
+
+def test_round_trip_across_runs(tmp_path):
+    store = JobEvaluationStore(tmp_path)
+    store.put(_job(1), RESUME, PROMPTS, score=7.5)
+    store.put(_job(1), RESUME, PROMPTS, gpt_salary=90000.0, salary_expectation=85000.0) # Completes the row
+    store.close()
+
+    reopened = JobEvaluationStore(tmp_path)
+    assert reopened.get(_job(1), RESUME, PROMPTS, salary_expectation=85000.0) == JobEvaluation(score=7.5, gpt_salary=90000.0)
+    reopened.close()
+
+
+def test_same_description_under_another_link_is_reused(tmp_path):
+    store = JobEvaluationStore(tmp_path)
+    store.put(_job(1), RESUME, PROMPTS, score=7.5)
+    assert store.get(_job(2, description="  BUILD payment APIs\nin Python. "), RESUME, PROMPTS).score == 7.5
+    store.close()
+
+
+def test_lookup_falls_back_to_the_job_id(tmp_path):
+    store = JobEvaluationStore(tmp_path)
+    store.put(_job(1), RESUME, PROMPTS, score=7.5)
+    assert store.get(_job(1, description="Edited description"), RESUME, PROMPTS).score == 7.5
+    store.close()
+
+
+def test_other_resume_prompt_version_or_expectation_miss(tmp_path):
+    store = JobEvaluationStore(tmp_path)
+    store.put(_job(1), RESUME, PROMPTS, score=7.5, gpt_salary=90000.0, salary_expectation=85000.0)
+    assert store.get(_job(1), "other-resume", PROMPTS) is None
+    assert store.get(_job(1), RESUME, "prompts-v2") is None
+    assert store.get(_job(1), RESUME, PROMPTS, salary_expectation=120000.0) == JobEvaluation(score=7.5, gpt_salary=None)
+    assert store.get(_job(3, description="Run Kubernetes clusters."), RESUME, PROMPTS) is None
+    store.close()
+
+
+def test_use_after_close_is_a_no_op(tmp_path):
+    store = JobEvaluationStore(tmp_path)
+    store.close()
+    store.put(_job(1), RESUME, PROMPTS, score=7.5)
+    assert store.get(_job(1), RESUME, PROMPTS) is None
+    store.close() # Idempotent
@@ -0,0 +1,90 @@
+# tests/test_job_filter.py
+"""Batch filtering matches the per-job filter, including the statuses it records."""
+
+import pytest
+
+from src.job import Job, JobCache, JobStatus
+from src.job_manager.job_filter import SKIP_REASONS, JobFilter
+
+STATUSES = list(JobStatus)
+
+
+def _job(job_id, title="Python Developer", company="Acme", description="Build APIs.", state=None):
+    return Job(title=title, company=company, location="Remote", link=f"https://www.linkedin.com/jobs/view/{job_id}/",
+               description=description, state=state)
+
+
+def _page():
+    return [
+        _job(1),
+        _job(2, title="Sales Manager"),
+        _job(3, company="Evil Corp"),
+        _job(4, description="Security clearance required."),
+        _job(5, state="Applied"),
+        _job(6), # Seen in an earlier run
+        _job(7), # Applied in an earlier run
+        _job(8, title="Moral Support Specialist"),
+        _job(9, title="Backend Engineer"),
+    ]
+
+
+def _filter(tmp_path, name):
+    cache = JobCache(tmp_path / name, write_behind=False)
+    cache.record_job_status(_job(6), JobStatus.SEEN)
+    cache.record_job_status(_job(7), JobStatus.SUCCESS)
+    job_filter = JobFilter(title_blacklist=["sales", "oral"], company_blacklist=["evil corp"],
+                           description_blacklist=["security clearance"], cache=cache, word_boundaries=True)
+    return job_filter, cache
+
+
+def test_filter_batch_matches_per_job_filtering(tmp_path):
+    batch_filter, batch_cache = _filter(tmp_path, "batch")
+    single_filter, single_cache = _filter(tmp_path, "single")
+
+    kept, skipped = batch_filter.filter_batch(_page())
+    kept_one_by_one = [job for job in _page() if not single_filter.must_be_skipped(job)]
+
+    assert [job.job_id for job in kept] == [job.job_id for job in kept_one_by_one] == [1, 8, 9]
+    assert set(skipped) == set(SKIP_REASONS)
+    assert {reason: [job.job_id for job in jobs] for reason, jobs in skipped.items() if jobs} == {
+        "seen": [6], "applied": [7], "job_state": [5],
+        "title_blacklist": [2], "company_blacklist": [3], "description_blacklist": [4],
+    }
+    page = _page()
+    assert batch_cache.lookup_statuses(page, STATUSES) == single_cache.lookup_statuses(page, STATUSES)
+    assert batch_filter.blacklist_stats() == single_filter.blacklist_stats()
+
+
+def test_filter_batch_skips_repeats_and_invalid_jobs(tmp_path):
+    job_filter, _ = _filter(tmp_path, "cache")
+    repeat = Job(title="Python Developer", company="Acme", location="Remote",
+                 link="https://www.linkedin.com/jobs/view/python-developer-1/?trk=x")
+    kept, skipped = job_filter.filter_batch([_job(1), repeat, "not a job"])
+    assert [job.link for job in kept] == [_job(1).link]
+    assert skipped["duplicate"] == [repeat]
+    assert skipped["invalid"] == ["not a job"]
+
+
+@pytest.mark.parametrize("job", [_job(6), _job(2, title="Inside Sales")])
+def test_must_be_skipped_marks_skipped_jobs_seen(tmp_path, job):
+    job_filter, cache = _filter(tmp_path, "cache")
+    assert job_filter.must_be_skipped(job)
+    assert cache.has_been_seen(job)
+
+
+@pytest.mark.parametrize("job, scanned, reason", [
+    (_job(1, title="Sales Manager"), ["Sales Manager"], "title_blacklist"),
+    (_job(2, title="Security Clearance Analyst"), ["Security Clearance Analyst", "Acme"], "description_blacklist"),
+    (_job(3, description="Security clearance required."), ["Python Developer", "Acme", "Security clearance required."],
+     "description_blacklist"),
+])
+def test_each_text_is_scanned_once_for_all_its_blacklists(tmp_path, job, scanned, reason):
+    job_filter, _ = _filter(tmp_path, "cache")
+    texts = []
+    scan = job_filter.matcher.finditer
+    job_filter.matcher.finditer = lambda text, rules=None: texts.append(text) or scan(text, rules)
+
+    _, skipped = job_filter.filter_batch([job])
+    assert skipped[reason] == [job]
+    assert texts == scanned
+    assert sum(count for _, _, count in job_filter.blacklist_stats()) == 1
@@ -0,0 +1,42 @@
+# tests/test_job_id.py
+"""LinkedIn job ID extraction and the compact job key set."""
+
+import pytest
+
+from src.job_id import JobIdSet, extract_linkedin_job_id, job_cache_key
+
+
+@pytest.mark.parametrize("value", [
+    "https://www.linkedin.com/jobs/view/3912345678/",
+    "https://www.linkedin.com/jobs/view/3912345678/?refId=abc&trackingId=xyz",
+    "https://www.linkedin.com/jobs/view/senior-python-developer-at-acme-3912345678",
+    "https://www.linkedin.com/jobs/search/?currentJobId=3912345678&keywords=python",
+    "https://www.linkedin.com/jobs/collections/recommended/?jobId=3912345678",
+    " 3912345678 ",
+    3912345678,
+])
+def test_extracts_the_same_id_from_every_url_variant(value):
+    assert extract_linkedin_job_id(value) == 3912345678
+
+
+@pytest.mark.parametrize("value", [None, "", "https://example.com/careers/42", "https://www.linkedin.com/jobs/search/?keywords=python", -1])
+def test_returns_none_without_an_id(value):
+    assert extract_linkedin_job_id(value) is None
+
+
+def test_cache_key_falls_back_to_the_link():
+    assert job_cache_key("https://www.linkedin.com/jobs/view/123/?ref=x") == 123
+    assert job_cache_key("https://example.com/careers/python") == "https://example.com/careers/python"
+
+
+def test_job_id_set_membership_across_merges():
+    keys = JobIdSet()
+    ids = list(range(10_000, 10_000 + 3 * JobIdSet.MERGE_THRESHOLD, 3))
+    for job_id in reversed(ids): keys.add(job_id)
+    keys.add(ids[0]) # Duplicate
+    keys.add("https://example.com/job")
+    assert len(keys) == len(ids) + 1
+    assert all(job_id in keys for job_id in ids)
+    assert ids[0] + 1 not in keys and 1 not in keys
+    assert "https://example.com/job" in keys and "https://example.com/other" not in keys
+    assert sorted(k for k in keys if isinstance(k, int)) == ids
@@ -0,0 +1,39 @@
+# tests/test_job_ranker.py
+"""Title pre-ranking: rejections wait for a minimum title corpus."""
+
+from types import SimpleNamespace
+
+from src.job_ranker import JobRelevanceRanker
+
+RESUME = "Senior Python developer. Python, Django, PostgreSQL, AWS, backend APIs."
+
+
+def _jobs(titles, page):
+    return [SimpleNamespace(title=title, link=f"https://example.com/{page}/{i}") for i, title in enumerate(titles)]
+
+
+def test_low_titles_are_deferred_until_enough_titles_are_counted():
+    ranker = JobRelevanceRanker(RESUME, min_title_relevance=0.3, min_title_documents=4)
+    selected, rejected, deferred = ranker.select(_jobs(["Python Developer", "Pastry Chef", "Truck Driver"], 1))
+    assert [job.title for job in selected] == ["Python Developer"]
+    assert rejected == []
+    assert sorted(job.title for job in deferred) == ["Pastry Chef", "Truck Driver"]
+
+    selected, rejected, deferred = ranker.select(_jobs(["Django Backend Engineer", "Florist"], 2))
+    assert [job.title for job in selected] == ["Django Backend Engineer"]
+    assert [job.title for job in rejected] == ["Florist"]
+    assert deferred == []
+
+
+def test_repeated_links_do_not_grow_the_title_corpus():
+    ranker = JobRelevanceRanker(RESUME, min_title_relevance=0.3, min_title_documents=3)
+    jobs = _jobs(["Python Developer", "Pastry Chef"], 1)
+    ranker.select(jobs)
+    _, rejected, deferred = ranker.select(jobs)
+    assert rejected == [] and [job.title for job in deferred] == ["Pastry Chef"]
+
+
+def test_from_config_reads_min_title_documents():
+    ranker = JobRelevanceRanker.from_config({"job_prerank": {"enabled": True, "min_title_documents": 7}}, RESUME)
+    assert ranker.min_title_documents == 7
+    assert JobRelevanceRanker.from_config({"job_prerank": {"enabled": True, "min_title_documents": 0}}, RESUME) is None
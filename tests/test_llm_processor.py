@@ -0,0 +1,295 @@
+# tests/test_llm_processor.py
+"""LLMProcessor: resume updates, batched form answers and async / concurrent job evaluation."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.job import Job
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.exceptions import CircuitOpenError
+from src.llm import interaction_logger
+from src.llm.interaction_logger import LoggingModelWrapper
+from src.llm.llm_processor import LLMProcessor
+from src.llm.metrics import LLMMetricsLedger
+from src.llm.models.base_model import AIModel
+from src.resume_index import ResumeSectionIndex
+
+RESUME_HTML = """<body><h1>Ana Silva</h1><p>Backend Engineer</p>
+<h2>Experience</h2><p>Senior Engineer | Acme | 2019 - 2023</p>
+<ul><li>Ran Kubernetes clusters for 40 services</li><li>Built payment APIs in Python</li></ul>
+<h2>Education</h2><ul><li>BSc Computer Science</li></ul></body>"""
+
+
+@pytest.fixture(autouse=True)
+def _isolated_ledger(monkeypatch):
+    """Keeps the scripted calls out of the process-wide metrics ledger."""
+    ledger = LLMMetricsLedger()
+    monkeypatch.setattr(interaction_logger, "get_metrics_ledger", lambda: ledger)
+
+
+class FakeModel(AIModel):
+    """Returns the scripted responses in order; any further call fails the test."""
+
+    def __init__(self, responses=()):
+        super().__init__(model_name="fake")
+        self.responses = list(responses)
+        self.prompts = []
+
+    def _initialize_model(self):
+        return object()
+
+    def invoke(self, prompt):
+        if not self.responses: raise AssertionError("No LLM call expected")
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+class AsyncFakeModel(FakeModel):
+    """Serves only `ainvoke`; the first call is rate limited (429, retry immediately)."""
+
+    def __init__(self, responses=()):
+        super().__init__(responses)
+        self.attempts = 0
+
+    def invoke(self, prompt):
+        raise AssertionError("The async path must not block on invoke")
+
+    async def ainvoke(self, prompt):
+        self.attempts += 1
+        if self.attempts == 1:
+            request = httpx.Request("POST", "https://api.example.com/v1/chat")
+            raise httpx.HTTPStatusError("rate limited", request=request,
+                                        response=httpx.Response(429, headers={"retry-after": "0"}, request=request))
+        return super().invoke(prompt)
+
+
+def _processor(tmp_path, responses=(), **kwargs) -> LLMProcessor:
+    wrapper = LoggingModelWrapper(FakeModel(responses), log_file_path=str(tmp_path / "llm.jsonl"))
+    return LLMProcessor(wrapper, "Ana Silva, Backend Engineer", **kwargs)
+
+
+def _job(number: int = 1) -> Job:
+    return Job(title="Engineer", company="Acme", location="Remote",
+               link=f"https://www.linkedin.com/jobs/view/{number}/", description="Python and Kubernetes")
+
+
+def test_update_resume_content_uses_the_new_index(tmp_path):
+    index = ResumeSectionIndex.from_html(RESUME_HTML)
+    processor = _processor(tmp_path, resume_index=index)
+    new_index = ResumeSectionIndex.from_html(RESUME_HTML.replace("Kubernetes", "Terraform"))
+
+    processor.update_resume_content("Ana Silva, Platform Engineer", resume_index=new_index)
+    assert processor.resume_index is new_index
+    assert processor.formatted_resume.endswith("Ana Silva, Platform Engineer")
+    assert "Terraform" in processor.resume_index.relevant_text("Terraform experience?")
+
+
+def test_update_resume_content_without_index_sends_full_resume(tmp_path):
+    processor = _processor(tmp_path, resume_index=ResumeSectionIndex.from_html(RESUME_HTML))
+    processor.update_resume_content("Ana Silva, Platform Engineer")
+    assert processor.resume_index is None
+
+
+def test_update_resume_content_respects_disabled_retrieval(tmp_path):
+    processor = _processor(tmp_path, resume_top_k=0)
+    processor.update_resume_content("Ana Silva, Platform Engineer", resume_index=ResumeSectionIndex.from_html(RESUME_HTML))
+    assert processor.resume_index is None
+
+
+def _evaluating_processor(tmp_path, score: float, salary_delay: float, **kwargs):
+    processor = _processor(tmp_path, **kwargs)
+    processor.set_current_job(Job(title="Engineer", company="Acme", location="Remote",
+                                  link="https://www.linkedin.com/jobs/view/1/", description="Python"))
+    calls = {"salary_finished": False, "salary_cancelled": False}
+
+    async def estimate_salary():
+        try: await asyncio.sleep(salary_delay)
+        except asyncio.CancelledError: calls["salary_cancelled"] = True; raise
+        calls["salary_finished"] = True
+        return 90000.0
+
+    processor.aestimate_salary = estimate_salary
+    processor.evaluate_job_fit = lambda: score
+    return processor, calls
+
+
+def test_low_score_cancels_salary_estimate_in_flight(tmp_path):
+    processor, calls = _evaluating_processor(tmp_path, score=2.0, salary_delay=10.0)
+    started = time.monotonic()
+    assert processor.evaluate_job_fit_and_salary(min_score=7) == (2.0, None)
+    time.sleep(0.1)
+    assert calls == {"salary_finished": False, "salary_cancelled": True}
+    assert time.monotonic() - started < 5
+    processor.close()
+
+
+def test_high_score_waits_for_salary_and_close_stops_the_loop(tmp_path):
+    processor, calls = _evaluating_processor(tmp_path, score=8.0, salary_delay=0.01)
+    assert processor.evaluate_job_fit_and_salary(min_score=7) == (8.0, 90000.0)
+    thread = processor._evaluation_thread
+    processor.close()
+    processor.close() # Idempotent
+    assert not thread.is_alive()
+    assert processor.evaluate_job_fit_and_salary(min_score=7) == (8.0, 90000.0) # Loop restarts on demand
+    processor.close()
+
+
+def test_stalled_background_salary_estimate_is_made_directly(tmp_path):
+    processor, calls = _evaluating_processor(tmp_path, score=8.0, salary_delay=10.0, request_timeout_seconds=0.1)
+    processor.estimate_salary = lambda: 70000.0
+    started = time.monotonic()
+    assert processor.evaluate_job_fit_and_salary(min_score=7) == (8.0, 70000.0)
+    assert time.monotonic() - started < 5
+    assert calls["salary_cancelled"] and processor._evaluation_loop is None # The stalled loop was stopped
+
+
+def test_close_cancels_pending_salary_estimates(tmp_path):
+    processor, calls = _evaluating_processor(tmp_path, score=8.0, salary_delay=10.0)
+    future = asyncio.run_coroutine_threadsafe(processor.aestimate_salary(), processor._background_loop())
+    time.sleep(0.05)
+    processor.close()
+    assert future.cancelled() and calls["salary_cancelled"]
+
+
+@pytest.mark.parametrize("answer", [
+    lambda p: p.answer_question_simple("Why Acme?"),
+    lambda p: p.answer_question_numeric("Years of Python?"),
+    lambda p: p.answer_question_from_options("Remote?", ["Yes", "No"]),
+    lambda p: p.answer_question_date("Start date?"),
+    lambda p: p.prefetch_form_answers([{"question": "Years of Python?", "type": "numeric"}]),
+    lambda p: p.extract_keywords_from_job_description(),
+    lambda p: p.generate_tailored_summary(["Python"]),
+    lambda p: p.generate_cover_letter(["Python"]),
+    lambda p: p.check_resume_or_cover("Attach file"),
+])
+def test_open_circuit_propagates_instead_of_a_fallback_answer(tmp_path, answer):
+    breaker = CircuitBreaker("fake", failure_threshold=1, reset_timeout_seconds=60)
+    breaker.record_failure()
+    wrapper = LoggingModelWrapper(FakeModel(), log_file_path=str(tmp_path / "llm.jsonl"), circuit_breaker=breaker)
+    processor = LLMProcessor(wrapper, "Ana Silva, Backend Engineer")
+    processor.set_current_job(Job(title="Engineer", company="Acme", location="Remote",
+                                  link="https://www.linkedin.com/jobs/view/1/", description="Python"))
+    with pytest.raises(CircuitOpenError):
+        answer(processor)
+
+
+def test_late_salary_estimate_of_previous_job_is_not_memoized(tmp_path):
+    processor = _processor(tmp_path)
+    first = Job(title="Engineer", company="Acme", location="Remote", link="https://www.linkedin.com/jobs/view/1/", description="Python")
+    second = Job(title="Engineer", company="Beta", location="Remote", link="https://www.linkedin.com/jobs/view/2/", description="Go")
+    processor.set_current_job(first)
+    key = processor._derivation_key("estimate_salary", processor.salary_expectations) # Taken when the estimate starts
+
+    processor.set_current_job(second) # The estimate finishes after the context moved on
+    assert processor._remember(key, 90000.0) == 90000.0
+    assert key not in processor._job_derivations
+    assert processor.memoized_evaluation() == (None, None)
+
+    processor._remember(processor._derivation_key("estimate_salary", processor.salary_expectations), 80000.0)
+    assert processor.memoized_evaluation() == (None, 80000.0)
+
+
+FORM_QUESTIONS = [
+    {"question": "Why Acme?", "type": "text", "max_chars": 140},
+    {"question": "Years of Python?", "type": "numeric"},
+    {"question": "Remote?", "type": "options", "options": ["Yes", "No"]},
+    {"question": "Start date?", "type": "date"},
+]
+
+
+def test_prefetched_form_answers_are_used_once_without_further_calls(tmp_path):
+    batched = '{"1": "I like payments.", "2": "6 years", "3": "yes", "4": "2026-11-02"}'
+    processor = _processor(tmp_path, responses=[batched, "7"])
+    processor.set_current_job(_job())
+
+    assert processor.prefetch_form_answers(FORM_QUESTIONS) == 4
+    assert processor.answer_question_simple("why acme? ") == "I like payments."
+    assert processor.answer_question_numeric("Years of Python?") == 6
+    assert processor.answer_question_from_options("Remote?", ["Yes", "No"]) == "Yes"
+    assert processor.answer_question_date("Start date?").strftime("%Y-%m-%d") == "2026-11-02"
+    assert len(processor.llm.model.prompts) == 1
+
+    assert processor.answer_question_numeric("Years of Python?") == 7 # Re-asked: regenerated
+    assert len(processor.llm.model.prompts) == 2
+
+
+def test_unparsable_batch_primes_nothing(tmp_path):
+    processor = _processor(tmp_path, responses=["Sorry, I cannot help with that."])
+    processor.set_current_job(_job())
+    assert processor.prefetch_form_answers(FORM_QUESTIONS) == 0
+    assert processor._prefetched_answers == {}
+
+
+def test_blank_batched_answers_are_not_primed(tmp_path):
+    processor = _processor(tmp_path, responses=['{"1": "  ", "2": "6"}'])
+    processor.set_current_job(_job())
+    assert processor.prefetch_form_answers(FORM_QUESTIONS[:3]) == 1
+    assert list(processor._prefetched_answers) == [("numeric", "years of python?")]
+
+
+def test_primed_answers_are_dropped_when_the_job_changes(tmp_path):
+    processor = _processor(tmp_path, responses=['{"1": "6"}'])
+    processor.set_current_job(_job(1))
+    assert processor.prefetch_form_answers(FORM_QUESTIONS[1:2]) == 1
+    processor.set_current_job(_job(2))
+    assert processor._prefetched_answers == {}
+
+
+def test_default_ainvoke_runs_the_blocking_invoke():
+    assert asyncio.run(FakeModel(["7"]).ainvoke("Years of Python?")) == "7"
+
+
+def test_async_evaluation_awaits_the_model_and_retries_rate_limits(tmp_path):
+    model = AsyncFakeModel(["Score: 8.5"])
+    processor = LLMProcessor(LoggingModelWrapper(model, log_file_path=str(tmp_path / "llm.jsonl")), "Ana Silva, Backend Engineer")
+    processor.set_current_job(_job())
+    assert asyncio.run(processor.aevaluate_job_fit()) == 8.5
+    assert model.attempts == 2
+    assert asyncio.run(processor.aevaluate_job_fit()) == 8.5 # Memoized: no further call
+    assert model.attempts == 2
+
+
+def test_job_prompts_share_a_byte_identical_context_prefix(tmp_path):
+    processor = _processor(tmp_path, responses=["8", "95000"], salary_expectations=123456)
+    processor.set_current_job(_job())
+    processor.evaluate_job_fit()
+    processor.estimate_salary()
+
+    (evaluate_prefix, evaluate_task), (salary_prefix, salary_task) = processor.llm.model.prompts
+    assert evaluate_prefix.type == salary_prefix.type == "system"
+    assert evaluate_prefix.content == salary_prefix.content
+    assert "Ana Silva" in evaluate_prefix.content and "Python and Kubernetes" in evaluate_prefix.content
+    assert "123456" in salary_task.content and "123456" not in salary_prefix.content # Task variables stay out of the prefix
+
+
+def test_job_derivations_are_computed_once_per_job(tmp_path):
+    processor = _processor(tmp_path, responses=['["Python", "Kubernetes"]', "Tailored summary", '["Go"]'])
+    processor.set_current_job(_job(1))
+
+    keywords = processor.extract_keywords_from_job_description()
+    keywords.append("Mutated by the caller")
+    assert processor.extract_keywords_from_job_description() == ["Python", "Kubernetes"]
+    assert processor.generate_tailored_summary(["Python", "Kubernetes"]) == "Tailored summary"
+    assert processor.generate_tailored_summary(["Python", "Kubernetes"]) == "Tailored summary"
+    assert len(processor.llm.model.prompts) == 2
+
+    processor.set_current_job(_job(1)) # Same posting again: the memo is kept
+    assert processor.extract_keywords_from_job_description() == ["Python", "Kubernetes"]
+    processor.set_current_job(_job(2))
+    assert processor.extract_keywords_from_job_description() == ["Go"]
+    assert len(processor.llm.model.prompts) == 3
+
+
+def test_failed_derivations_and_resume_changes_are_not_served_from_the_memo(tmp_path):
+    processor = _processor(tmp_path, responses=["I cannot tell.", '["Python"]', "Score: 6", "Score: 9"])
+    processor.set_current_job(_job())
+    assert processor.extract_keywords_from_job_description() == []
+    assert processor.extract_keywords_from_job_description() == ["Python"] # The failure was retried
+
+    assert processor.evaluate_job_fit() == 6.0
+    processor.update_resume_content("Ana Silva, Platform Engineer")
+    assert processor.evaluate_job_fit() == 9.0 # Scored again against the new resume
+
@@ -0,0 +1,65 @@
+# tests/test_metrics.py
+"""LLM metrics ledger: aggregation, latency percentiles and recording from log_interaction."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.llm import interaction_logger
+from src.llm.interaction_log_writer import InteractionLogWriter
+from src.llm.metrics import LatencyHistogram, LLMMetricsLedger, current_llm_task, task_scope
+
+
+def test_histogram_percentiles_interpolate_within_buckets():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(95) == 0.0
+    for seconds in [0.2] * 90 + [4.0] * 10: histogram.observe(seconds)
+    assert 0.1 < histogram.percentile(50) <= 0.25
+    assert 3.0 < histogram.percentile(95) <= 4.0 # Capped at the observed maximum
+    assert histogram.percentile(100) == 4.0
+
+
+def test_snapshot_aggregates_by_model_and_task():
+    ledger = LLMMetricsLedger()
+    for _ in range(19): ledger.record(model="gpt-4o-mini", task="options", duration_seconds=0.4, input_tokens=100, output_tokens=5, cost_usd=0.001)
+    ledger.record(model="gpt-4o-mini", task="options", duration_seconds=12.0, error=True)
+    ledger.record(model="gpt-4o", task="evaluate_job", duration_seconds=2.0, input_tokens=1000, cost_usd=0.05, cache_hit=True)
+
+    snapshot = ledger.snapshot()
+    options = snapshot["by_task"]["options"]
+    assert (options["calls"], options["errors"], options["input_tokens"]) == (20, 1, 1900)
+    assert options["latency_seconds"]["p50"] <= 0.5
+    assert 10.0 < options["latency_seconds"]["p99"] <= 12.0
+    assert options["latency_seconds"]["max"] == 12.0
+    assert snapshot["by_model"]["gpt-4o"]["cache_hits"] == 1
+    assert snapshot["total"]["calls"] == 21 and snapshot["total"]["cost_usd"] == pytest.approx(0.069)
+    assert [row["model"] for row in snapshot["by_model_task"]] == ["gpt-4o", "gpt-4o-mini"] # Most expensive first
+
+    ledger.reset()
+    assert ledger.snapshot()["total"]["calls"] == 0 and ledger.summary() == "No LLM calls recorded."
+
+
+def test_task_scope_labels_and_restores():
+    with task_scope("numeric_question"):
+        assert current_llm_task() == "numeric_question"
+    assert current_llm_task() == "unknown"
+
+
+def test_log_interaction_records_before_the_entry_is_written(tmp_path, monkeypatch):
+    ledger = LLMMetricsLedger()
+    closed_writer = InteractionLogWriter(tmp_path / "llm.jsonl")
+    closed_writer.close() # Drops every entry
+    monkeypatch.setattr(interaction_logger, "get_metrics_ledger", lambda: ledger)
+    monkeypatch.setattr(interaction_logger, "get_interaction_log_writer", lambda path: closed_writer)
+
+    start = datetime.now()
+    with task_scope("simple_question"):
+        interaction_logger.log_interaction(
+            model_name="gpt-4o-mini", start_time=start, end_time=start + timedelta(seconds=1.5), prompts="Why Acme?",
+            parsed_response={"content": "Because", "response_metadata": {},
+                             "usage_metadata": {"input_tokens": 40, "output_tokens": 10, "total_tokens": 50}},
+            log_file_path=str(tmp_path / "llm.jsonl"))
+
+    row, = ledger.snapshot()["by_model_task"]
+    assert (row["model"], row["task"], row["input_tokens"], row["output_tokens"]) == ("gpt-4o-mini", "simple_question", 40, 10)
+    assert row["latency_seconds"]["max"] == 1.5
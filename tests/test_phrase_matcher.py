@@ -0,0 +1,54 @@
+# tests/test_phrase_matcher.py
+"""Aho-Corasick blacklist matching, with and without word boundaries."""
+
+from src.job_manager.phrase_matcher import PhraseMatch, PhraseMatcher
+
+
+def _phrases(matcher, text, rules=None):
+    return [(match.rule, match.phrase) for match in matcher.finditer(text, rules)]
+
+
+def test_finds_overlapping_phrases_of_every_rule_case_insensitively():
+    matcher = PhraseMatcher({"title": ["Senior", "nior dev"], "company": ["ACME"]})
+    assert _phrases(matcher, "SENIOR Developer at acme") == [("title", "Senior"), ("title", "nior dev"), ("company", "ACME")]
+    assert _phrases(matcher, "Senior Developer at Acme", rules=("company",)) == [("company", "ACME")]
+
+
+def test_match_offsets_point_into_the_text():
+    match = PhraseMatcher({"title": ["python"]}).first("Senior Python Dev")
+    assert match == PhraseMatch("title", "python", 7, 13)
+
+
+def test_substring_matches_without_word_boundaries():
+    assert PhraseMatcher({"title": ["oral"]}).first("Moral Support Specialist") is not None
+
+
+def test_word_boundaries_reject_matches_inside_words():
+    matcher = PhraseMatcher({"title": ["oral", "java"]}, word_boundaries=True)
+    assert matcher.first("Moral Support Specialist") is None
+    assert matcher.first("JavaScript Engineer") is None
+    assert _phrases(matcher, "Oral Surgeon") == [("title", "oral")]
+    assert _phrases(matcher, "Java/Kotlin Engineer") == [("title", "java")]
+
+
+def test_word_boundaries_only_apply_to_word_character_edges():
+    matcher = PhraseMatcher({"title": ["c++", ".net", "c#"]}, word_boundaries=True)
+    assert _phrases(matcher, "C++ Developer") == [("title", "c++")]
+    assert _phrases(matcher, "ASP.NET Engineer") == [("title", ".net")]
+    assert _phrases(matcher, "C# dev") == [("title", "c#")]
+    assert matcher.first("Abc++ tooling") is None
+
+
+def test_empty_and_duplicate_phrases_are_ignored():
+    matcher = PhraseMatcher({"title": ["", "  ", "Sales", "sales "], "company": ["sales"]})
+    assert len(matcher) == 2
+    assert matcher.rules == {"title": 1, "company": 1}
+    assert matcher.first(None) is None and matcher.first("") is None
+
+
+def test_first_per_rule_stops_once_every_rule_matched():
+    matcher = PhraseMatcher({"title": ["sales", "manager"], "description": ["manager"], "company": []})
+    found = matcher.first_per_rule("Sales Manager, Inside Sales", ("title", "description", "company"))
+    assert {rule: (match.phrase, match.start) for rule, match in found.items()} == {
+        "title": ("sales", 0), "description": ("manager", 6)}
+    assert matcher.first_per_rule("Sales Manager", ("company",)) == {} # No phrases: no scan
@@ -0,0 +1,36 @@
+# tests/test_prompt_caching.py
+"""Provider prefix caching: Claude cache breakpoints and pricing of cached input tokens."""
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.llm.interaction_logger import _price_interaction
+from src.llm.models.claude_model import ClaudeModel
+from src.llm.utils.pricing import get_model_pricing
+
+
+def test_claude_marks_the_context_prefix_as_a_cache_breakpoint():
+    prompt = [SystemMessage(content="Resume: Ana Silva"), HumanMessage(content="Evaluate the job.")]
+    marked, task = ClaudeModel._with_cache_control(prompt)
+    assert marked.content == [{"type": "text", "text": "Resume: Ana Silva", "cache_control": {"type": "ephemeral"}}]
+    assert task is prompt[1]
+    assert prompt[0].content == "Resume: Ana Silva" # The caller's messages are not modified
+    assert ClaudeModel._with_cache_control("Evaluate the job.") == "Evaluate the job."
+
+
+def test_cache_prices_derive_from_the_provider_multipliers():
+    pricing = get_model_pricing("gpt-4o-mini")
+    assert pricing["cached_input_token_price"] == pytest.approx(pricing["input_token_price"] * 0.5)
+    assert pricing["cache_write_input_token_price"] == pytest.approx(pricing["input_token_price"])
+
+
+def test_cached_input_tokens_are_billed_at_the_cache_read_price():
+    pricing = get_model_pricing("gpt-4o-mini")
+    usage = _price_interaction("gpt-4o-mini", {
+        "response_metadata": {},
+        "usage_metadata": {"input_tokens": 1000, "output_tokens": 10, "total_tokens": 1010,
+                           "input_token_details": {"cache_read": 800}},
+    }, cache_hit=False)
+    assert usage["cache_read_tokens"] == 800
+    assert usage["total_cost"] == pytest.approx(200 * pricing["input_token_price"] + 800 * pricing["cached_input_token_price"]
+                                                + 10 * pricing["output_token_price"])
@@ -0,0 +1,54 @@
+# tests/test_prompt_registry.py
+"""PromptRegistry: startup validation, formatting and prompt fingerprints."""
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.llm.exceptions import ConfigurationError
+from src.llm.prompt_registry import DEFAULT_PROMPT_SPECS, PromptRegistry, PromptSpec
+
+
+def test_default_prompts_compile():
+    registry = PromptRegistry()
+    assert set(registry.names) == set(DEFAULT_PROMPT_SPECS)
+    assert "evaluate_job" in registry and "unknown" not in registry
+
+
+def test_formats_plain_and_prefixed_prompts():
+    registry = PromptRegistry({
+        "plain": PromptSpec("""
+            Answer: {question}""", ("question",)),
+        "prefixed": PromptSpec("Task: {question}", ("resume", "question"), prefix="Resume: {resume}"),
+    })
+    assert registry.format("plain", {"question": "Why Acme?", "unused": 1}) == "Answer: Why Acme?"
+    prefix, task = registry.format("prefixed", {"resume": "Ana Silva", "question": "Why Acme?"})
+    assert isinstance(prefix, SystemMessage) and prefix.content == "Resume: Ana Silva"
+    assert isinstance(task, HumanMessage) and task.content == "Task: Why Acme?"
+
+
+def test_missing_context_variables_raise_value_error():
+    registry = PromptRegistry({"prefixed": PromptSpec("Task: {question}", ("resume", "question"), prefix="Resume: {resume}")})
+    with pytest.raises(ValueError, match="resume"):
+        registry.format("prefixed", {"question": "Why Acme?"})
+    with pytest.raises(KeyError, match="Unknown prompt"):
+        registry.format("missing", {})
+
+
+@pytest.mark.parametrize("spec, message", [
+    (PromptSpec("Answer: {question}", ("question", "resume")), "unused"),
+    (PromptSpec("Answer: {question} {options}", ("question",)), "undeclared"),
+    (PromptSpec("Answer: {question", ("question",)), "malformed"),
+    (PromptSpec("Answer: {items[0]}", ("items",)), "malformed"),
+    (PromptSpec("   ", ()), "empty"),
+])
+def test_invalid_templates_fail_at_startup(spec, message):
+    with pytest.raises(ConfigurationError, match=message):
+        PromptRegistry({"broken": spec})
+
+
+def test_fingerprint_changes_with_the_template_text():
+    def fingerprint(template: str) -> str:
+        return PromptRegistry({"evaluate_job": PromptSpec(template, ("resume",))}).fingerprint("evaluate_job")
+
+    assert fingerprint("Score: {resume}") == fingerprint("Score: {resume}")
+    assert fingerprint("Score: {resume}") != fingerprint("Score 0-10: {resume}")
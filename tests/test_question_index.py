@@ -0,0 +1,62 @@
+# tests/test_question_index.py
+"""QuestionSimilarityIndex: rephrased questions reuse answers; different questions never do."""
+
+import pytest
+
+from src.easy_apply.question_index import QuestionSimilarityIndex, question_regions, question_subject
+
+YES_NO = ["Yes", "No"]
+
+
+def index_of(*entries):
+    index = QuestionSimilarityIndex()
+    for question, question_type, answer in entries: index.add(question, question_type, answer)
+    return index
+
+
+def test_rephrased_question_reuses_answer():
+    index = index_of(("how many years of work experience do you have with python?", "numeric", "5"))
+    match = index.lookup("years of python experience?", "numeric")
+    assert match is not None and match[0] == "5"
+
+
+def test_answer_must_be_a_current_option():
+    index = index_of(("are you willing to relocate?", "radio", "Yes"))
+    assert index.lookup("are you willing to relocate?", "radio", ["Sim", "Não"]) is None
+    assert index.lookup("are you willing to relocate?", "radio", ["yes", "no"])[0] == "yes"
+
+
+def test_other_field_type_does_not_match():
+    index = index_of(("are you willing to relocate?", "radio", "Yes"))
+    assert index.lookup("are you willing to relocate?", "textbox") is None
+
+
+@pytest.mark.parametrize("stored, asked, question_type", [
+    ("years with python?", "years with java?", "numeric"),
+    ("do you have a disability?", "do you have no disability?", "radio"),
+    ("are you willing to relocate?", "are you unwilling to relocate?", "radio"),
+    ("do you have experience with python?", "do you have experience with python 2?", "radio"),
+    ("do you consent to a background check?", "do you not consent to a background check?", "radio"),
+    ("are you comfortable commuting?", "aren't you comfortable commuting?", "radio"),
+    ("will you now or in the future require sponsorship for employment visa status?",
+     "will you now or in the future require sponsorship for employment visa status in canada?", "radio"),
+    ("are you legally authorized to work in canada?", "are you legally authorized to work in the united states?", "radio"),
+])
+def test_different_meaning_is_not_reused(stored, asked, question_type):
+    index = index_of((stored, question_type, "No"))
+    assert index.lookup(asked, question_type, YES_NO if question_type == "radio" else None) is None
+
+
+def test_negation_is_part_of_the_subject():
+    assert question_subject("Do you have no disability?") != question_subject("Do you have a disability?")
+
+
+@pytest.mark.parametrize("question, regions", [
+    ("Are you authorized to work in the U.S.?", {"us"}),
+    ("Do you require H-1B sponsorship?", {"us"}),
+    ("Why do you want to join us?", set()),
+    ("Do you need a visa for the European Union?", {"eu"}),
+    ("Can you work in Canada or the United Kingdom?", {"canada", "uk"}),
+])
+def test_question_regions(question, regions):
+    assert question_regions(question) == frozenset(regions)
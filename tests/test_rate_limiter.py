@@ -0,0 +1,84 @@
+# tests/test_rate_limiter.py
+"""Token-bucket math shared by the rate limiter backends."""
+
+import pytest
+
+from src.llm.rate_limiter import InProcessRateLimiter, _adjust, _take, estimate_prompt_tokens
+
+
+def test_take_from_full_bucket():
+    state, wait = _take(None, 100.0, 60, 1000, 1, 200)
+    assert wait == 0.0
+    assert state == (59, 800, 100.0)
+
+
+def test_take_waits_for_refill_without_taking():
+    state, _ = _take(None, 0.0, 60, 1000, 1, 1000)
+    state, wait = _take(state, 0.0, 60, 1000, 1, 500)
+    assert wait == pytest.approx(30.0) # 500 tokens at 1000/min
+    assert state[1] == 0 # Nothing taken
+
+
+def test_refill_is_capped_at_the_limit():
+    state, _ = _take(None, 0.0, 60, 1000, 1, 1000)
+    state, wait = _take(state, 600.0, 60, 1000, 0, 0)
+    assert wait == 0.0 and state[:2] == (60, 1000)
+
+
+def test_call_larger_than_bucket_waits_for_a_full_bucket_only():
+    _, wait = _take(None, 0.0, 0, 1000, 1, 5000)
+    assert wait == 0.0
+
+
+def test_zero_limit_disables_bucket():
+    state, wait = _take(None, 0.0, 0, 0, 1, 10**9)
+    assert wait == 0.0
+
+
+@pytest.mark.parametrize("delta, expected", [(300, 500), (-300, 1000), (-100, 900)])
+def test_adjust_debits_and_credits(delta, expected):
+    state, _ = _take(None, 0.0, 60, 1000, 1, 200)
+    assert _adjust(state, 0.0, 60, 1000, delta)[1] == expected
+
+
+def test_adjust_applies_while_in_debt():
+    state, _ = _take(None, 0.0, 60, 1000, 1, 900)
+    state = _adjust(state, 0.0, 60, 1000, 600) # Used 1500 tokens instead of 900
+    assert state[1] == -500
+    state = _adjust(state, 0.0, 60, 1000, 200) # Further debit while in debt
+    assert state[1] == -700
+    state = _adjust(state, 0.0, 60, 1000, -400) # Release of a failed attempt while in debt
+    assert state[1] == -300
+
+
+def test_debt_is_bounded_by_one_bucket():
+    state = _adjust(None, 0.0, 60, 1000, 10**6)
+    assert state[1] == -1000
+
+
+def test_release_returns_reserved_tokens():
+    limiter = InProcessRateLimiter("test", 60, 1000)
+    limiter.acquire(400)
+    limiter.release(400)
+    assert limiter._state[1] == pytest.approx(1000, abs=1)
+
+
+def test_estimate_prompt_tokens():
+    assert estimate_prompt_tokens("x" * 400, expected_output_tokens=0) == 100
+    assert estimate_prompt_tokens([{"content": "x" * 40}, {"content": "y" * 40}], expected_output_tokens=10) == 30
+
+
+def test_redis_backend_applies_corrections_while_in_debt():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa") # Lua scripting for fakeredis
+    from src.llm.rate_limiter import RedisRateLimiter
+
+    limiter = RedisRateLimiter("test", 60, 1000, redis_client=fakeredis.FakeRedis())
+    tokens = lambda: float(limiter._redis.hget(limiter._key, "tokens"))
+    limiter.acquire(900)
+    limiter.record_usage(900, 1500)
+    assert tokens() == pytest.approx(-500, abs=1)
+    limiter.record_usage(100, 300)
+    assert tokens() == pytest.approx(-700, abs=1)
+    limiter.release(400)
+    assert tokens() == pytest.approx(-300, abs=1)
@@ -0,0 +1,57 @@
+# tests/test_response_cache.py
+"""LLMResponseCache keys, TTL expiry and LRU eviction."""
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.llm.response_cache import LLMResponseCache
+
+RESPONSE = {"content": "5", "response_metadata": {"model_name": "gpt-4o-mini"}, "usage_metadata": {"total_tokens": 12}}
+
+
+def _prompt(date: str, question: str = "Years of Python?"):
+    return [SystemMessage(content=f"today date: {date}\nAna Silva, Backend Engineer"), HumanMessage(content=question)]
+
+
+def test_key_ignores_the_resume_date_line():
+    key = LLMResponseCache.make_key("gpt-4o-mini", _prompt("2026-10-16"), 0.4)
+    assert key == LLMResponseCache.make_key("gpt-4o-mini", _prompt("2026-10-17"), 0.4)
+    assert key != LLMResponseCache.make_key("gpt-4o-mini", _prompt("2026-10-16", "Years of Go?"), 0.4)
+    assert key != LLMResponseCache.make_key("gpt-4o", _prompt("2026-10-16"), 0.4)
+    assert key != LLMResponseCache.make_key("gpt-4o-mini", _prompt("2026-10-16"), 0.0)
+
+
+def test_key_keeps_dates_stated_by_the_task():
+    task = "Start date? Today's date is {}."
+    assert (LLMResponseCache.make_key("m", task.format("2026-10-16"), None)
+            != LLMResponseCache.make_key("m", task.format("2026-10-17"), None))
+
+
+def test_round_trip_and_ttl_expiry(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", ttl_seconds=60)
+    key = LLMResponseCache.make_key("gpt-4o-mini", _prompt("2026-10-16"), 0.4)
+    now = [1000.0]
+    monkeypatch.setattr("src.llm.response_cache.time.time", lambda: now[0])
+
+    assert cache.get(key) is None
+    cache.put(key, "gpt-4o-mini", RESPONSE)
+    hit = cache.get(key)
+    assert hit["content"] == "5" and hit["usage_metadata"] == {"total_tokens": 12}
+
+    now[0] += 61
+    assert cache.get(key) is None # Expired and deleted
+    now[0] -= 61
+    assert cache.get(key) is None
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_entries=2)
+    now = [1000.0]
+    monkeypatch.setattr("src.llm.response_cache.time.time", lambda: now[0])
+    for key in ("a", "b"):
+        cache.put(key, "m", RESPONSE); now[0] += 1
+    assert cache.get("a") is not None; now[0] += 1 # "b" is now the least recently used
+    cache.put("c", "m", RESPONSE)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.close()
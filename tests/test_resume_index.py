@@ -0,0 +1,48 @@
+# tests/test_resume_index.py
+"""ResumeSectionIndex: splitting the HTML resume and retrieving the sections relevant to a question."""
+
+from src.resume_index import ResumeSectionIndex, split_html_resume
+
+RESUME_HTML = """<html><head><style>h1 {color: red}</style></head><body><h1>Ana Silva</h1><p>Backend Engineer &amp; SRE</p>
+<h2>Experience</h2><p>Senior Engineer | Acme | 2019 - 2023</p>
+<ul><li>Ran Kubernetes clusters for 40 services</li><li>Built payment APIs in Python</li></ul>
+<p>Engineer | Beta | 2016 - 2019</p><ul><li>Wrote Go microservices</li><li>Maintained PostgreSQL databases</li></ul>
+<h2>Education</h2><ul><li>BSc Computer Science</li></ul></body></html>"""
+
+HEADER = "## Ana Silva\nBackend Engineer & SRE"
+PRIVATE = "## Informações adicionais\nNeeds visa sponsorship: no"
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def test_bullets_are_split_under_their_section_and_entry_header():
+    chunks = split_html_resume(RESUME_HTML)
+    assert chunks[0].text == "Backend Engineer & SRE" and chunks[0].always
+    go = next(c for c in chunks if c.text == "Wrote Go microservices")
+    assert (go.section, go.entry, go.is_bullet) == ("Experience", "Engineer | Beta | 2016 - 2019", True)
+    assert not any("color" in c.text for c in chunks) # Styles are dropped
+
+
+def test_relevant_text_keeps_the_header_and_the_entry_of_matched_bullets():
+    index = ResumeSectionIndex.from_html(RESUME_HTML, private_context="Needs visa sponsorship: no")
+    assert index.relevant_text("How many years of Kubernetes experience?", top_k=1) == "\n".join([
+        HEADER, "## Experience", "Senior Engineer | Acme | 2019 - 2023", "- Ran Kubernetes clusters for 40 services", PRIVATE])
+    assert index.relevant_text("Do you enjoy cooking?") is None # Callers then send the full resume
+
+
+def test_select_within_fills_the_budget_by_relevance():
+    index = ResumeSectionIndex.from_html(RESUME_HTML, private_context="Needs visa sponsorship: no")
+    selected = index.select_within("PostgreSQL", 30, _words)
+    assert selected == "\n".join([HEADER, "## Experience", "Engineer | Beta | 2016 - 2019",
+                                  "- Maintained PostgreSQL databases", PRIVATE])
+    assert _words(selected) <= 30
+
+    everything = index.select_within("PostgreSQL", 1000, _words)
+    assert everything == index.render(list(range(len(index.chunks))))
+    assert index.select_within("PostgreSQL", 0, _words) == "\n".join([HEADER, PRIVATE]) # Always kept
+
+
+def test_unstructured_resume_is_not_indexed():
+    assert ResumeSectionIndex.from_html("<body><p>Ana Silva</p><p>Engineer</p></body>") is None
@@ -0,0 +1,97 @@
+# tests/test_router_model.py
+"""RoutingModel: task routes, failover, health-based reordering and the cost ceiling."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.llm.exceptions import ConfigurationError
+from src.llm.metrics import task_scope
+from src.llm.models.base_model import AIModel
+from src.llm.models.router_model import RoutingModel
+
+
+class FakeModel(AIModel):
+    """Answers with its own name after `delay` seconds, or raises while `fails` is set."""
+
+    def __init__(self, name: str, delay: float = 0.0, fails: bool = False):
+        self.delay = delay
+        self.fails = fails
+        self.calls = 0
+        super().__init__(model_name=name)
+
+    def _initialize_model(self):
+        return object()
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fails: raise RuntimeError(f"{self.model_name} is down")
+        return self.model_name
+
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
+
+def test_tasks_use_their_route_and_others_the_default():
+    router = RoutingModel({"strong": FakeModel("gpt-4o"), "fast": FakeModel("gpt-4o-mini")},
+                          routes={"options": ["fast"]})
+    with task_scope("options"):
+        assert router.invoke("prompt") == "gpt-4o-mini"
+    with task_scope("cover_letter"):
+        assert router.invoke("prompt") == "gpt-4o"
+        assert router.get_pricing_model_name() == "gpt-4o"
+
+
+def test_fails_over_to_the_next_model():
+    router = RoutingModel({"first": FakeModel("first", fails=True), "second": FakeModel("second")})
+    assert router.invoke("prompt") == "second"
+    assert router.get_pricing_model_name() == "second" # Priced under the model that served the call
+    assert asyncio.run(router.ainvoke("prompt")) == "second"
+    assert router.health()["first"]["error_rate"] == 1.0
+
+
+def test_reraises_the_last_error_when_every_model_fails():
+    router = RoutingModel({"first": FakeModel("first", fails=True), "second": FakeModel("second", fails=True)})
+    with pytest.raises(RuntimeError, match="second is down"):
+        router.invoke("prompt")
+
+
+def test_degraded_model_is_tried_last_until_its_samples_age_out():
+    first, second = FakeModel("first", fails=True), FakeModel("second")
+    router = RoutingModel({"first": first, "second": second}, health_window_seconds=0.2)
+    for _ in range(RoutingModel.MIN_SAMPLES): router.invoke("prompt")
+    assert router.health()["first"]["degraded"]
+
+    router.invoke("prompt")
+    assert first.calls == RoutingModel.MIN_SAMPLES # Skipped: the healthy model served first
+
+    first.fails = False
+    time.sleep(0.25)
+    assert router.invoke("prompt") == "first" # Retried once its bad samples left the window
+
+
+def test_slow_model_is_tried_last():
+    slow, fast = FakeModel("slow", delay=0.02), FakeModel("fast")
+    router = RoutingModel({"slow": slow, "fast": fast}, latency_slo_seconds=0.01)
+    for _ in range(RoutingModel.MIN_SAMPLES): assert router.invoke("prompt") == "slow"
+    assert router.invoke("prompt") == "fast"
+
+
+def test_cost_ceiling_skips_expensive_models_but_keeps_the_cheapest():
+    models = {"strong": FakeModel("gpt-4o"), "fast": FakeModel("gpt-4o-mini")}
+    prompt = "x" * 4000 # ~1000 input tokens
+    assert RoutingModel(models, max_cost_per_call_usd=0.001).invoke(prompt) == "gpt-4o-mini"
+    assert RoutingModel(models, max_cost_per_call_usd=0.000001).invoke(prompt) == "gpt-4o-mini"
+    assert RoutingModel(models).invoke(prompt) == "gpt-4o"
+
+
+@pytest.mark.parametrize("models, routes", [
+    ({}, None),
+    ({"fast": FakeModel("gpt-4o-mini")}, {"options": ["strong"]}),
+    ({"fast": FakeModel("gpt-4o-mini")}, {"options": []}),
+])
+def test_invalid_configuration_is_rejected(models, routes):
+    with pytest.raises(ConfigurationError):
+        RoutingModel(models, routes=routes)
@@ -0,0 +1,42 @@
+# tests/test_token_budget.py
+"""Boilerplate stripping of job descriptions before prompt compression."""
+
+from src.llm.token_budget import strip_boilerplate
+
+ROLE = "We are hiring a backend engineer to build payment APIs in Python."
+DUTIES = ("You will design services. You will handle data protection requirements for card data. "
+          "You will mentor engineers. You will own on-call.")
+EEO = "Acme is an equal opportunity employer. We consider applicants without regard to race or religion."
+PRIVACY = "Read our privacy notice before applying."
+
+
+def test_drops_trailing_boilerplate_section_and_hashtags():
+    description = "\n\n".join([ROLE, DUTIES, EEO, PRIVACY, "#LI-Remote"])
+    assert strip_boilerplate(description) == "\n\n".join([ROLE, DUTIES])
+
+
+def test_drops_closing_paragraph_with_several_boilerplate_sentences():
+    closing = ("We value diversity. Acme is an equal opportunity employer. We offer great snacks. "
+               "Ask us for a reasonable accommodation. We look forward to meeting you.")
+    assert strip_boilerplate("\n\n".join([ROLE, DUTIES, closing])) == "\n\n".join([ROLE, DUTIES])
+    assert strip_boilerplate("\n\n".join([ROLE, closing, DUTIES])) == "\n\n".join([ROLE, closing, DUTIES])
+
+
+def test_keeps_content_paragraph_with_a_passing_mention():
+    description = "\n\n".join([ROLE, DUTIES, "Benefits: remote work, stock options."])
+    assert strip_boilerplate(description) == description
+
+
+def test_drops_dominated_paragraph_in_the_middle():
+    description = "\n\n".join([ROLE, EEO, DUTIES, "Benefits: remote work."])
+    assert strip_boilerplate(description) == "\n\n".join([ROLE, DUTIES, "Benefits: remote work."])
+
+
+def test_never_drops_lines_of_a_single_paragraph():
+    description = f"{ROLE}\n{EEO}\nRequirements: data protection experience (GDPR)."
+    assert strip_boilerplate(description) == description
+
+
+def test_drops_repeated_paragraphs_and_keeps_all_boilerplate_descriptions():
+    assert strip_boilerplate("\n\n".join([ROLE, DUTIES, ROLE])) == "\n\n".join([ROLE, DUTIES])
+    assert strip_boilerplate("\n\n".join([EEO, PRIVACY])) == "\n\n".join([EEO, PRIVACY])